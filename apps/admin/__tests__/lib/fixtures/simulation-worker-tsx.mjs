@@ -0,0 +1,6 @@
+// Starts the real simulation worker (src/lib/simulation/simulation-worker.ts) in a plain Node worker thread.
+// Next.js compiles the entry through webpack; here tsx compiles it and its workspace TypeScript imports.
+import { register } from 'tsx/esm/api';
+
+register();
+await import('../../../src/lib/simulation/simulation-worker.ts');
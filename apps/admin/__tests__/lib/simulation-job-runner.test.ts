@@ -0,0 +1,228 @@
+/**
+ * Tests for the background simulation job runner.
+ * SPEC-WB-005 FR-WB005-03, FR-WB005-04
+ *
+ * Covers: task planning, batched simulation_cases inserts, progress counters,
+ * completion status, cancellation via simulation_runs.status, the real worker entry in worker
+ * threads (started through fixtures/simulation-worker-tsx.mjs) and the in-process fallback.
+ */
+import { describe, it, expect, vi } from 'vitest';
+
+vi.mock('@widget-creator/db', () => ({
+  simulationRuns: { _name: 'simulation_runs', id: 'id', status: 'status', passedCount: 'passed', warnedCount: 'warned', erroredCount: 'errored' },
+  simulationCases: { _name: 'simulation_cases' },
+}));
+
+vi.mock('drizzle-orm', () => ({
+  eq: (column: unknown, value: unknown) => ({ eq: [column, value] }),
+  and: (...conditions: unknown[]) => ({ and: conditions }),
+  sql: (strings: TemplateStringsArray, ...values: unknown[]) => ({ sql: strings.join('?'), values }),
+}));
+
+import { runSimulationJob, planTasks } from '../../src/lib/simulation/job-runner';
+
+interface FakeDbState {
+  inserted: unknown[][];
+  updates: Record<string, unknown>[];
+  /** Number of progress updates to accept before reporting the run as no longer running */
+  cancelAfter: number;
+}
+
+function createFakeDb(state: FakeDbState) {
+  let progressUpdates = 0;
+  return {
+    insert: vi.fn(() => ({
+      values: vi.fn(async (rows: unknown[]) => {
+        state.inserted.push(rows);
+      }),
+    })),
+    update: vi.fn(() => ({
+      set: vi.fn((values: Record<string, unknown>) => {
+        state.updates.push(values);
+        const where = {
+          returning: vi.fn(async () => {
+            progressUpdates++;
+            return progressUpdates > state.cancelAfter ? [] : [{ id: 1 }];
+          }),
+          then: (resolve: (v: unknown) => unknown) => Promise.resolve(undefined).then(resolve),
+        };
+        return { where: vi.fn(() => where) };
+      }),
+    })),
+  };
+}
+
+const optionSets = [
+  { typeKey: 'SIZE', choices: ['S', 'M', 'L'] },
+  { typeKey: 'PAPER', choices: ['A', 'B', 'C', 'D'] },
+  { typeKey: 'COLOR', choices: ['1', '2', '3', '4', '5'] },
+];
+
+describe('planTasks', () => {
+  it('splits a full range into chunk-sized index ranges', () => {
+    const tasks = planTasks({ tooLarge: false, total: 25, indices: null }, 10);
+    expect(tasks).toEqual([
+      { kind: 'range', start: 0, end: 10 },
+      { kind: 'range', start: 10, end: 20 },
+      { kind: 'range', start: 20, end: 25 },
+    ]);
+  });
+
+  it('splits sampled indices into chunks', () => {
+    const tasks = planTasks({ tooLarge: false, total: 3, indices: [1, 5, 9] }, 2);
+    expect(tasks).toEqual([
+      { kind: 'indices', indices: [1, 5] },
+      { kind: 'indices', indices: [9] },
+    ]);
+  });
+});
+
+describe('runSimulationJob', () => {
+  it('stores every case in batches and completes the run', async () => {
+    const state: FakeDbState = { inserted: [], updates: [], cancelAfter: Infinity };
+    const db = createFakeDb(state);
+
+    const summary = await runSimulationJob({
+      db: db as never,
+      runId: 1,
+      plan: { tooLarge: false, total: 60, indices: null },
+      spec: { optionSets, constraints: [], recipeConstraints: [], priceConfig: null },
+      workers: 0,
+      batchSize: 25,
+    });
+
+    expect(summary).toEqual({ status: 'completed', processed: 60, passed: 60, warned: 0, errored: 0 });
+    expect(state.inserted.map((b) => b.length)).toEqual([25, 25, 10]);
+    expect(state.inserted.flat()).toHaveLength(60);
+    expect(state.updates.at(-1)).toMatchObject({ status: 'completed' });
+  });
+
+  it('persists error cases from active constraints', async () => {
+    const state: FakeDbState = { inserted: [], updates: [], cancelAfter: Infinity };
+    const db = createFakeDb(state);
+
+    const summary = await runSimulationJob({
+      db: db as never,
+      runId: 1,
+      plan: { tooLarge: false, total: 60, indices: null },
+      spec: {
+        optionSets,
+        constraints: [{
+          id: 1, productId: 1, constraintType: 'exclude',
+          sourceField: 'SIZE', sourceValue: 'S', targetField: 'PAPER', targetValue: 'A',
+          action: 'error', message: 'S + A not allowed', isActive: true,
+        }],
+        recipeConstraints: [],
+        priceConfig: { pricingModel: 'fixed_unit', basePrice: 1000 },
+      },
+      workers: 0,
+    });
+
+    // 1 SIZE x 1 PAPER x 5 COLOR combinations are excluded
+    expect(summary.errored).toBe(5);
+    expect(summary.passed).toBe(55);
+    const rows = state.inserted.flat() as Array<{ resultStatus: string; totalPrice: string | null }>;
+    expect(rows.filter((r) => r.resultStatus === 'error').every((r) => r.totalPrice === null)).toBe(true);
+    expect(rows.find((r) => r.resultStatus === 'pass')?.totalPrice).toBe('1000');
+  });
+
+  it('stops when the run is no longer running (cancelled)', async () => {
+    const state: FakeDbState = { inserted: [], updates: [], cancelAfter: 1 };
+    const db = createFakeDb(state);
+
+    const summary = await runSimulationJob({
+      db: db as never,
+      runId: 1,
+      plan: { tooLarge: false, total: 60, indices: null },
+      spec: { optionSets, constraints: [], recipeConstraints: [], priceConfig: null },
+      workers: 0,
+      batchSize: 10,
+    });
+
+    expect(summary.status).toBe('cancelled');
+    // The second batch is written before the cancelled status is observed
+    expect(state.inserted).toHaveLength(2);
+    expect(state.updates.at(-1)).toMatchObject({ status: 'cancelled' });
+  });
+});
+
+describe('runSimulationJob with worker threads', () => {
+  // 11^4 = 14,641 combinations — above SIMULATION_MAX_CASES, so the runner uses workers
+  const largeOptionSets = ['A', 'B', 'C', 'D'].map((typeKey) => ({
+    typeKey,
+    choices: Array.from({ length: 11 }, (_, i) => String(i)),
+  }));
+  const largePlan = { tooLarge: false, total: 14_641, indices: null };
+
+  const largeSpec = {
+    optionSets: largeOptionSets,
+    constraints: [{
+      id: 1, productId: 1, constraintType: 'exclude',
+      sourceField: 'A', sourceValue: '0', targetField: 'B', targetValue: '0',
+      action: 'error', message: 'A0 + B0 not allowed', isActive: true,
+    }],
+    recipeConstraints: [{
+      constraintName: 'no C0', triggerOptionType: 'C', triggerOperator: 'IN', triggerValues: ['0'],
+      actions: [{ type: 'block', message: 'C0 not allowed' }], priority: 0,
+    }],
+    priceConfig: { pricingModel: 'fixed_unit', basePrice: 1000 },
+  };
+
+  it('evaluates every task in the real worker entry, matching in-process results', async () => {
+    const workerState: FakeDbState = { inserted: [], updates: [], cancelAfter: Infinity };
+    const warn = vi.spyOn(console, 'warn');
+
+    const summary = await runSimulationJob({
+      db: createFakeDb(workerState) as never,
+      runId: 1,
+      plan: largePlan,
+      spec: largeSpec as never,
+      workers: 2,
+      batchSize: 1_000,
+      chunkSize: 5_000,
+      workerEntry: new URL('./fixtures/simulation-worker-tsx.mjs', import.meta.url),
+    });
+
+    // No fallback: the cases really came from worker threads
+    expect(warn).not.toHaveBeenCalledWith(expect.stringContaining('running in-process'), expect.anything());
+    warn.mockRestore();
+    // 1 A x 1 B x 11 x 11 pairwise exclusions plus 11 x 11 x 1 C x 11 recipe blocks, 11 counted twice
+    expect(summary).toEqual({ status: 'completed', processed: 14_641, passed: 13_200, warned: 0, errored: 1_441 });
+    expect(workerState.updates.at(-1)).toMatchObject({ status: 'completed' });
+
+    const inlineState: FakeDbState = { inserted: [], updates: [], cancelAfter: Infinity };
+    await runSimulationJob({
+      db: createFakeDb(inlineState) as never,
+      runId: 2,
+      plan: largePlan,
+      spec: largeSpec as never,
+      workers: 0,
+    });
+    const key = (r: { selections: Record<string, string> }) => JSON.stringify(r.selections);
+    const sorted = (rows: unknown[][]) =>
+      (rows.flat() as Array<{ selections: Record<string, string> }>).sort((a, b) => key(a).localeCompare(key(b)));
+    expect(sorted(workerState.inserted)).toEqual(sorted(inlineState.inserted));
+  }, 30_000);
+
+  it('falls back in-process when the worker entry cannot be loaded', async () => {
+    const state: FakeDbState = { inserted: [], updates: [], cancelAfter: Infinity };
+    const db = createFakeDb(state);
+    const warn = vi.spyOn(console, 'warn').mockImplementation(() => {});
+
+    const summary = await runSimulationJob({
+      db: db as never,
+      runId: 1,
+      plan: largePlan,
+      spec: { optionSets: largeOptionSets, constraints: [], recipeConstraints: [], priceConfig: null },
+      workers: 2,
+      batchSize: 1_000,
+      chunkSize: 5_000,
+      workerEntry: new URL('./fixtures/missing-worker.mjs', import.meta.url),
+    });
+
+    expect(summary).toEqual({ status: 'completed', processed: 14_641, passed: 14_641, warned: 0, errored: 0 });
+    expect(state.inserted.flat()).toHaveLength(14_641);
+    expect(warn).toHaveBeenCalledWith(expect.stringContaining('running in-process'), expect.anything());
+    warn.mockRestore();
+  });
+});
@@ -6,7 +6,7 @@
 import { useCallback, useEffect, useState } from "react";
 import { use } from "react";
 import { toast } from "sonner";
-import { Play, Download, AlertTriangle, FlaskConical } from "lucide-react";
+import { Play, Download, AlertTriangle, FlaskConical, Square } from "lucide-react";
 import { Button } from "@/components/ui/button";
 import {
   Dialog,
@@ -149,6 +149,22 @@ export default function SimulatePage({ params }: PageProps) {
     setShowSamplingDialog(false);
   }, [productId, startWithOptionsMutation]);
 
+  // Cancel a running simulation — the background job stops at its next batch
+  const cancelMutation = trpc.widgetAdmin.cancelSimulation.useMutation({
+    onSuccess: () => {
+      toast.success("시뮬레이션이 취소되었습니다.");
+      void statusQuery.refetch();
+    },
+    onError: (err) => {
+      toast.error(`시뮬레이션 취소 실패: ${err.message}`);
+    },
+  });
+
+  const handleCancelSimulation = useCallback(() => {
+    if (!activeRunId) return;
+    cancelMutation.mutate({ runId: activeRunId });
+  }, [activeRunId, cancelMutation]);
+
   // Export CSV — use utils.fetch to call a query imperatively
   const handleExportCSV = useCallback(async () => {
     if (!activeRunId) return;
@@ -207,6 +223,16 @@ export default function SimulatePage({ params }: PageProps) {
               CSV 다운로드
             </Button>
           )}
+          {activeRunId && runStatus?.status === "running" && (
+            <Button
+              variant="outline"
+              onClick={handleCancelSimulation}
+              disabled={cancelMutation.isPending}
+            >
+              <Square className="h-4 w-4 mr-1" />
+              취소
+            </Button>
+          )}
           <Button
             onClick={handleStartSimulation}
             disabled={isStarting || runStatus?.status === "running"}
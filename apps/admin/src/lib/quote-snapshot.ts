@@ -0,0 +1,25 @@
+import { sql } from 'drizzle-orm';
+import { QUOTE_SNAPSHOT_CHANNEL, quoteSnapshotPayload } from '@widget-creator/core';
+
+// eslint-disable-next-line @typescript-eslint/no-explicit-any
+type ExecutableDb = { execute: (query: any) => Promise<unknown> };
+
+// @MX:NOTE: [AUTO] Tell widget API processes to drop their compiled quote snapshot for a product
+// @MX:REASON: widget API caches product/recipe/constraint/pricing rows in memory; admin runs in a separate process
+// @MX:SPEC: SPEC-WB-006 FR-WB006-01
+
+/**
+ * NOTIFY widget API processes that a product's quote inputs changed.
+ * productId null invalidates every product (global postprocess/discount rows changed).
+ * Failures are logged only — snapshots still expire after their TTL.
+ */
+export async function notifyQuoteSnapshotChanged(
+  db: ExecutableDb,
+  productId: number | null,
+): Promise<void> {
+  try {
+    await db.execute(sql`SELECT pg_notify(${QUOTE_SNAPSHOT_CHANNEL}, ${quoteSnapshotPayload(productId)})`);
+  } catch (err) {
+    console.warn('[QuoteSnapshot] NOTIFY failed, widget API will refresh after TTL:', err);
+  }
+}
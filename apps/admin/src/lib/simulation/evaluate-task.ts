@@ -0,0 +1,34 @@
+import { iterateCombinations, iterateCombinationsAt } from '@widget-creator/core';
+import type { CaseEvaluator, SimulationCaseResult } from '@widget-creator/core';
+import type { SimulationJobSpec, SimulationTask } from './protocol';
+
+/**
+ * Evaluate one task lazily, handing off results in batches of spec.batchSize.
+ * onBatch resolves false to stop early (run cancelled). Returns whether the task finished.
+ * Shared by the worker thread and the in-process fallback so both produce identical cases.
+ */
+export async function evaluateTask(
+  spec: SimulationJobSpec,
+  evaluator: CaseEvaluator,
+  task: SimulationTask,
+  onBatch: (cases: SimulationCaseResult[]) => Promise<boolean>,
+): Promise<boolean> {
+  const combinations = task.kind === 'range'
+    ? iterateCombinations(spec.optionSets, task.start, task.end)
+    : iterateCombinationsAt(spec.optionSets, task.indices);
+
+  let batch: SimulationCaseResult[] = [];
+  for (const selections of combinations) {
+    batch.push(evaluator.evaluate(selections));
+    if (batch.length >= spec.batchSize) {
+      const keepGoing = await onBatch(batch);
+      batch = [];
+      if (!keepGoing) return false;
+    }
+  }
+
+  if (batch.length > 0) {
+    return onBatch(batch);
+  }
+  return true;
+}
@@ -0,0 +1,291 @@
+import { Worker } from 'node:worker_threads';
+import { availableParallelism } from 'node:os';
+import { eq, and, sql } from 'drizzle-orm';
+import type { PostgresJsDatabase } from 'drizzle-orm/postgres-js';
+import { simulationRuns, simulationCases } from '@widget-creator/db';
+import { createSimulationEvaluator, SIMULATION_MAX_CASES } from '@widget-creator/core';
+import type { SimulationCaseResult, SimulationPlan } from '@widget-creator/core';
+import { evaluateTask } from './evaluate-task';
+import type { RunnerMessage, SimulationJobSpec, SimulationTask, WorkerMessage } from './protocol';
+
+// eslint-disable-next-line @typescript-eslint/no-explicit-any
+type AnyDb = PostgresJsDatabase<any>;
+
+const DEFAULT_BATCH_SIZE = 500;
+const DEFAULT_CHUNK_SIZE = 10_000;
+
+export interface SimulationJobOptions {
+  db: AnyDb;
+  runId: number;
+  spec: Omit<SimulationJobSpec, 'batchSize'>;
+  plan: SimulationPlan;
+  /** Worker threads to use; 0 evaluates in-process. Defaults to SIMULATION_WORKERS or cores - 1 */
+  workers?: number;
+  /** Cases per simulation_cases multi-row insert (default 500) */
+  batchSize?: number;
+  /** Cases per task handed to a worker (default 10,000) */
+  chunkSize?: number;
+  /** Worker entry module override (default: SIMULATION_WORKER_ENTRY, else the bundled simulation-worker.ts) */
+  workerEntry?: URL | string;
+}
+
+export interface SimulationJobSummary {
+  status: 'completed' | 'cancelled' | 'failed';
+  processed: number;
+  passed: number;
+  warned: number;
+  errored: number;
+}
+
+// Runs started by this process, so cancellation can stop them without waiting for the next status check
+const activeJobs = new Map<number, AbortController>();
+
+/** Producer of evaluated case batches — a worker thread or the in-process fallback */
+interface CaseProducer {
+  run(task: SimulationTask, onBatch: (cases: SimulationCaseResult[]) => Promise<boolean>): Promise<boolean>;
+  close(): Promise<void>;
+}
+
+/** The worker died before sending anything back — its task is safe to re-run in-process */
+class WorkerStartupError extends Error {
+  constructor(cause: Error) {
+    super(`Simulation worker failed to start: ${cause.message}`, { cause });
+    this.name = 'WorkerStartupError';
+  }
+}
+
+function defaultWorkerCount(): number {
+  const configured = parseInt(process.env['SIMULATION_WORKERS'] ?? '', 10);
+  if (Number.isFinite(configured) && configured >= 0) return configured;
+  return Math.max(1, availableParallelism() - 1);
+}
+
+/** Split the plan into tasks of at most chunkSize cases */
+export function planTasks(plan: SimulationPlan, chunkSize: number): SimulationTask[] {
+  const tasks: SimulationTask[] = [];
+  if (plan.indices !== null) {
+    for (let i = 0; i < plan.indices.length; i += chunkSize) {
+      tasks.push({ kind: 'indices', indices: plan.indices.slice(i, i + chunkSize) });
+    }
+  } else {
+    for (let start = 0; start < plan.total; start += chunkSize) {
+      tasks.push({ kind: 'range', start, end: Math.min(start + chunkSize, plan.total) });
+    }
+  }
+  return tasks;
+}
+
+function inlineProducer(spec: SimulationJobSpec): CaseProducer {
+  const evaluator = createSimulationEvaluator(spec.constraints, spec.priceConfig, spec.recipeConstraints);
+  return {
+    run: (task, onBatch) => evaluateTask(spec, evaluator, task, onBatch),
+    close: async () => {},
+  };
+}
+
+// @MX:NOTE: [AUTO] The default entry must stay an inline new Worker(new URL('./simulation-worker.ts', import.meta.url))
+// @MX:REASON: webpack only emits the worker chunk (and compiles its TypeScript imports) for that literal pattern
+// @MX:WARN: [AUTO] A missing or unloadable entry does not throw here — it surfaces later as an 'error'/'exit' event
+// @MX:REASON: Failures before the first message become WorkerStartupError so the runner can fall back in-process
+function workerProducer(spec: SimulationJobSpec, entry: URL | string | undefined): CaseProducer {
+  const worker = entry
+    ? new Worker(entry, { workerData: spec })
+    : new Worker(new URL('./simulation-worker.ts', import.meta.url), { workerData: spec });
+
+  const inbox: WorkerMessage[] = [];
+  let waiting: { resolve: (m: WorkerMessage) => void; reject: (e: Error) => void } | null = null;
+  let failure: Error | null = null;
+  let started = false;
+
+  const fail = (err: Error) => {
+    failure = started ? err : new WorkerStartupError(err);
+    if (waiting) {
+      waiting.reject(failure);
+      waiting = null;
+    }
+  };
+
+  worker.on('message', (message: WorkerMessage) => {
+    started = true;
+    if (waiting) {
+      waiting.resolve(message);
+      waiting = null;
+    } else {
+      inbox.push(message);
+    }
+  });
+  worker.on('error', fail);
+  worker.on('exit', (code) => fail(new Error(`Simulation worker exited with code ${code}`)));
+
+  const receive = (): Promise<WorkerMessage> => {
+    const queued = inbox.shift();
+    if (queued) return Promise.resolve(queued);
+    if (failure) return Promise.reject(failure);
+    return new Promise((resolve, reject) => {
+      waiting = { resolve, reject };
+    });
+  };
+  const send = (message: RunnerMessage) => worker.postMessage(message);
+
+  return {
+    async run(task, onBatch) {
+      send({ type: 'task', task });
+      for (;;) {
+        const message = await receive();
+        if (message.type === 'done') return true;
+        if (message.type === 'error') throw new Error(message.message);
+
+        const keepGoing = await onBatch(message.cases);
+        send({ type: keepGoing ? 'continue' : 'stop' });
+        // After 'stop' the worker abandons the task and replies 'done'
+        if (!keepGoing) {
+          await receive();
+          return false;
+        }
+      }
+    },
+    async close() {
+      worker.removeAllListeners('exit');
+      await worker.terminate();
+    },
+  };
+}
+
+// @MX:ANCHOR: [AUTO] runSimulationJob — background simulation: workers evaluate, runner bulk-inserts and tracks progress
+// @MX:REASON: Called by widget-admin startSimulation; owns the simulation_runs status lifecycle after creation
+// @MX:SPEC: SPEC-WB-005 FR-WB005-03, FR-WB005-04
+// @MX:NOTE: [AUTO] Progress = passed/warned/errored counters incremented atomically per inserted batch
+// @MX:NOTE: [AUTO] Cancellation = status changed away from 'running'; the per-batch counter UPDATE matches no row and the job stops
+// @MX:NOTE: [AUTO] A worker that dies before its first message is replaced by an in-process producer and its task re-run
+/**
+ * Run a simulation as a background job and persist results into simulation_cases.
+ * The simulation_runs row must already exist with status 'running'.
+ */
+export async function runSimulationJob(options: SimulationJobOptions): Promise<SimulationJobSummary> {
+  const { db, runId, plan } = options;
+  const batchSize = options.batchSize ?? DEFAULT_BATCH_SIZE;
+  const chunkSize = options.chunkSize ?? DEFAULT_CHUNK_SIZE;
+  const spec: SimulationJobSpec = { ...options.spec, batchSize };
+
+  const tasks = planTasks(plan, chunkSize);
+  // Small runs are not worth the worker start-up cost
+  const requested = plan.total <= SIMULATION_MAX_CASES ? 0 : (options.workers ?? defaultWorkerCount());
+  const workerCount = Math.min(requested, tasks.length);
+
+  const controller = new AbortController();
+  activeJobs.set(runId, controller);
+
+  const summary: SimulationJobSummary = { status: 'completed', processed: 0, passed: 0, warned: 0, errored: 0 };
+  let cancelled = false;
+
+  const persistBatch = async (cases: SimulationCaseResult[]): Promise<boolean> => {
+    if (cancelled || controller.signal.aborted) {
+      cancelled = true;
+      return false;
+    }
+
+    await db.insert(simulationCases).values(cases.map((c) => ({
+      runId,
+      selections: c.selections,
+      resultStatus: c.resultStatus,
+      totalPrice: c.totalPrice !== null ? String(c.totalPrice) : null,
+      constraintViolations: c.constraintViolations ?? null,
+      priceBreakdown: c.priceBreakdown ?? null,
+      message: c.message,
+    })));
+
+    let passed = 0;
+    let warned = 0;
+    let errored = 0;
+    for (const c of cases) {
+      if (c.resultStatus === 'pass') passed++;
+      else if (c.resultStatus === 'warn') warned++;
+      else errored++;
+    }
+    summary.processed += cases.length;
+    summary.passed += passed;
+    summary.warned += warned;
+    summary.errored += errored;
+
+    const updated = await db
+      .update(simulationRuns)
+      .set({
+        passedCount: sql`${simulationRuns.passedCount} + ${passed}`,
+        warnedCount: sql`${simulationRuns.warnedCount} + ${warned}`,
+        erroredCount: sql`${simulationRuns.erroredCount} + ${errored}`,
+      })
+      .where(and(eq(simulationRuns.id, runId), eq(simulationRuns.status, 'running')))
+      .returning({ id: simulationRuns.id });
+
+    if (updated.length === 0) cancelled = true;
+    return !cancelled;
+  };
+
+  const producers: CaseProducer[] = [];
+  try {
+    try {
+      const entry = options.workerEntry ?? process.env['SIMULATION_WORKER_ENTRY'];
+      for (let i = 0; i < workerCount; i++) producers.push(workerProducer(spec, entry));
+      if (producers.length === 0) producers.push(inlineProducer(spec));
+    } catch (err) {
+      // Worker threads unavailable in this runtime — evaluate in-process instead
+      console.warn('[Simulation] Worker threads unavailable, running in-process:', err);
+      await Promise.all(producers.splice(0).map((p) => p.close()));
+      producers.push(inlineProducer(spec));
+    }
+
+    let nextTask = 0;
+    await Promise.all(producers.map(async (_, slot) => {
+      while (!cancelled && nextTask < tasks.length) {
+        const task = tasks[nextTask++]!;
+        let finished: boolean;
+        try {
+          finished = await producers[slot]!.run(task, persistBatch);
+        } catch (err) {
+          if (!(err instanceof WorkerStartupError)) throw err;
+          // Nothing from this task was persisted yet, so it can be re-run in-process
+          console.warn('[Simulation] Worker failed to start, running in-process:', err.cause);
+          await producers[slot]!.close();
+          producers[slot] = inlineProducer(spec);
+          finished = await producers[slot]!.run(task, persistBatch);
+        }
+        if (!finished) break;
+      }
+    }));
+
+    if (cancelled) {
+      summary.status = 'cancelled';
+      await db
+        .update(simulationRuns)
+        .set({ status: 'cancelled', completedAt: new Date() })
+        .where(eq(simulationRuns.id, runId));
+    } else {
+      await db
+        .update(simulationRuns)
+        .set({ status: 'completed', completedAt: new Date() })
+        .where(and(eq(simulationRuns.id, runId), eq(simulationRuns.status, 'running')));
+    }
+  } catch (err) {
+    // Stop the remaining producers at their next batch
+    cancelled = true;
+    summary.status = 'failed';
+    console.error(`[Simulation] Run ${runId} failed:`, err);
+    await db
+      .update(simulationRuns)
+      .set({ status: 'failed', completedAt: new Date() })
+      .where(eq(simulationRuns.id, runId));
+  } finally {
+    activeJobs.delete(runId);
+    await Promise.all(producers.map((p) => p.close()));
+  }
+
+  return summary;
+}
+
+/** Abort a run started by this process (the status update itself is done by the caller) */
+export function abortSimulationJob(runId: number): boolean {
+  const controller = activeJobs.get(runId);
+  if (!controller) return false;
+  controller.abort();
+  return true;
+}
@@ -0,0 +1,37 @@
+import type {
+  EcaConstraint,
+  OptionChoiceSet,
+  SimulationCaseResult,
+  SimulationConstraint,
+  SimulationPriceConfig,
+} from '@widget-creator/core';
+
+// @MX:NOTE: [AUTO] Message protocol between the simulation job runner and its worker threads
+// @MX:SPEC: SPEC-WB-005 FR-WB005-03
+
+/** Everything a worker needs to evaluate cases — plain data, structured-clone safe */
+export interface SimulationJobSpec {
+  optionSets: OptionChoiceSet[];
+  constraints: SimulationConstraint[];
+  /** Active recipe_constraints rows of the simulated recipe */
+  recipeConstraints: EcaConstraint[];
+  /** null = no pricing (totalPrice stays empty for every case) */
+  priceConfig: SimulationPriceConfig | null;
+  batchSize: number;
+}
+
+/** A slice of the combination space: a contiguous index range or explicit (sampled) indices */
+export type SimulationTask =
+  | { kind: 'range'; start: number; end: number }
+  | { kind: 'indices'; indices: number[] };
+
+export type RunnerMessage =
+  | { type: 'task'; task: SimulationTask }
+  // Reply to a batch: keep going, or abandon the current task
+  | { type: 'continue' }
+  | { type: 'stop' };
+
+export type WorkerMessage =
+  | { type: 'batch'; cases: SimulationCaseResult[] }
+  | { type: 'done' }
+  | { type: 'error'; message: string };
@@ -0,0 +1,62 @@
+import { parentPort, workerData } from 'node:worker_threads';
+import { createSimulationEvaluator } from '@widget-creator/core';
+import { evaluateTask } from './evaluate-task';
+import type { RunnerMessage, SimulationJobSpec, WorkerMessage } from './protocol';
+
+// @MX:NOTE: [AUTO] Worker thread entry — evaluates simulation tasks and streams case batches back to the runner
+// @MX:REASON: Each batch waits for the runner's reply, so at most one unsaved batch per worker is in memory
+// @MX:SPEC: SPEC-WB-005 FR-WB005-03
+
+const port = parentPort;
+if (!port) {
+  throw new Error('simulation-worker must be started as a worker thread');
+}
+
+const spec = workerData as SimulationJobSpec;
+const evaluator = createSimulationEvaluator(spec.constraints, spec.priceConfig, spec.recipeConstraints);
+
+// Single persistent listener; replies are consumed in order by the task loop
+const inbox: RunnerMessage[] = [];
+let waiting: ((message: RunnerMessage) => void) | null = null;
+
+port.on('message', (message: RunnerMessage) => {
+  if (waiting) {
+    const resolve = waiting;
+    waiting = null;
+    resolve(message);
+  } else {
+    inbox.push(message);
+  }
+});
+
+function receive(): Promise<RunnerMessage> {
+  const queued = inbox.shift();
+  if (queued) return Promise.resolve(queued);
+  return new Promise((resolve) => {
+    waiting = resolve;
+  });
+}
+
+function send(message: WorkerMessage): void {
+  port!.postMessage(message);
+}
+
+async function main(): Promise<void> {
+  for (;;) {
+    const message = await receive();
+    if (message.type !== 'task') continue;
+
+    try {
+      await evaluateTask(spec, evaluator, message.task, async (cases) => {
+        send({ type: 'batch', cases });
+        const reply = await receive();
+        return reply.type === 'continue';
+      });
+      send({ type: 'done' });
+    } catch (err) {
+      send({ type: 'error', message: err instanceof Error ? err.message : String(err) });
+    }
+  }
+}
+
+void main();
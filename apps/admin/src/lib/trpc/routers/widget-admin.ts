@@ -24,11 +24,13 @@ import {
   optionConstraints,
 } from '@widget-creator/shared/db/schema';
 import { router, protectedProcedure } from '../server';
+import { notifyQuoteSnapshotChanged } from '@/lib/quote-snapshot';
+import { runSimulationJob, abortSimulationJob } from '@/lib/simulation/job-runner';
+import type { SimulationJobSpec } from '@/lib/simulation/protocol';
 import {
   checkCompleteness,
-  cartesianProduct,
-  resolveSimulationCombinations,
-  runSimulationCases,
+  planSimulation,
+  SIMULATION_JOB_MAX_CASES,
   validatePublishReadiness,
   PublishError,
 } from '@widget-creator/core';
@@ -170,6 +172,46 @@ async function fetchOptionChoiceSets(
   return result;
 }
 
+// @MX:NOTE: [AUTO] fetchSimulationRules — the default recipe's active constraints and the product's flat price for simulation jobs
+// @MX:NOTE: [AUTO] Only COMPOSITE baseCost maps to SimulationPriceConfig; LOOKUP/AREA/PAGE prices depend on quantity and cost tables, so they stay null
+// @MX:SPEC: SPEC-WB-005 FR-WB005-03
+async function fetchSimulationRules(
+  db: AnyDb,
+  productId: number,
+): Promise<Pick<SimulationJobSpec, 'recipeConstraints' | 'priceConfig'>> {
+  const [defaultRecipe] = await db
+    .select({ id: productRecipes.id })
+    .from(productRecipes)
+    .where(and(eq(productRecipes.productId, productId), eq(productRecipes.isDefault, true)));
+
+  const recipeConstraintRows = defaultRecipe
+    ? await db
+        .select({
+          constraintName: recipeConstraints.constraintName,
+          triggerOptionType: recipeConstraints.triggerOptionType,
+          triggerOperator: recipeConstraints.triggerOperator,
+          triggerValues: recipeConstraints.triggerValues,
+          actions: recipeConstraints.actions,
+          priority: recipeConstraints.priority,
+        })
+        .from(recipeConstraints)
+        .where(and(eq(recipeConstraints.recipeId, defaultRecipe.id), eq(recipeConstraints.isActive, true)))
+        .orderBy(asc(recipeConstraints.id))
+    : [];
+
+  const [priceConfig] = await db
+    .select({ priceMode: productPriceConfigs.priceMode, baseCost: productPriceConfigs.baseCost })
+    .from(productPriceConfigs)
+    .where(and(eq(productPriceConfigs.productId, productId), eq(productPriceConfigs.isActive, true)));
+
+  return {
+    recipeConstraints: recipeConstraintRows,
+    priceConfig: priceConfig?.priceMode === 'COMPOSITE' && priceConfig.baseCost !== null
+      ? { pricingModel: 'COMPOSITE', basePrice: Number(priceConfig.baseCost) }
+      : null,
+  };
+}
+
 // @MX:ANCHOR: [AUTO] widgetAdminRouter — admin console tRPC router for SPEC-WB-005 simulation, publish, and completeness
 // @MX:REASON: fan_in >= 3: admin dashboard, simulation page, publish flow, single test UI
 // @MX:SPEC: SPEC-WB-005
@@ -216,7 +258,8 @@ export const widgetAdminRouter = router({
     }),
 
   // 3. Start simulation run for a product
-  // Runs synchronously — status is 'completed' when mutation returns
+  // Returns as soon as the run row exists; cases are evaluated and stored by a background job.
+  // Poll simulationStatus for progress (passed + warned + errored vs totalCases).
   startSimulation: protectedProcedure
     .input(
       z.object({
@@ -229,28 +272,33 @@ export const widgetAdminRouter = router({
       const db = ctx.db as unknown as AnyDb;
 
       const optionSets = await fetchOptionChoiceSets(db, input.productId);
-      const allCombinations = cartesianProduct(optionSets);
 
-      const resolved = resolveSimulationCombinations(allCombinations, {
-        sample: input.sample,
-        forceRun: input.forceRun,
-      });
+      // Plan over the combination space without materializing it
+      const plan = planSimulation(
+        optionSets,
+        { sample: input.sample, forceRun: input.forceRun },
+        SIMULATION_JOB_MAX_CASES,
+      );
 
-      if (resolved.tooLarge) {
+      if (plan.tooLarge) {
+        // Spaces up to SIMULATION_JOB_MAX_CASES always run in full, so forceRun cannot help past this point
+        const hint = plan.sampleSize === 0
+          ? 'Reduce the option choices; the space is too large to sample.'
+          : `Use sample=true to test a ${plan.sampleSize.toLocaleString()}-case sample (full runs are limited to ${SIMULATION_JOB_MAX_CASES.toLocaleString()} cases).`;
         throw new TRPCError({
           code: 'PRECONDITION_FAILED',
-          message: `Too many combinations (${resolved.total.toLocaleString()}). Use sample=true to test a 10,000-case sample, or forceRun=true to run all.`,
+          message: `Too many combinations (${plan.total.toLocaleString()}). ${hint}`,
         });
       }
 
-      const combinations = resolved.combinations;
+      const rules = await fetchSimulationRules(db, input.productId);
 
       // Create run record
       const [run] = await db
         .insert(simulationRuns)
         .values({
           productId: input.productId,
-          totalCases: combinations.length,
+          totalCases: plan.total,
           status: 'running',
         })
         .returning({ id: simulationRuns.id });
@@ -259,64 +307,46 @@ export const widgetAdminRouter = router({
         throw new TRPCError({ code: 'INTERNAL_SERVER_ERROR', message: 'Failed to create simulation run' });
       }
 
-      try {
-        // @MX:NOTE: [AUTO] Simulation evaluator is a pass-through stub.
-        // Full constraint + pricing evaluation requires assembling per-combination lookup data,
-        // which is deferred to a future async job queue implementation.
-        const simulationResult = runSimulationCases(combinations, {
-          evaluate: (selections): SimulationCaseResult => ({
-            selections,
-            resultStatus: 'pass',
-            totalPrice: null,
-            constraintViolations: null,
-            priceBreakdown: null,
-            message: null,
-          }),
-        });
-
-        // Batch insert simulation cases (500 per batch)
-        const BATCH_SIZE = 500;
-        const caseValues = simulationResult.cases.map((c) => ({
-          runId: run.id,
-          selections: c.selections,
-          resultStatus: c.resultStatus,
-          totalPrice: c.totalPrice !== null ? String(c.totalPrice) : null,
-          constraintViolations: c.constraintViolations ?? null,
-          priceBreakdown: c.priceBreakdown ?? null,
-          message: c.message,
-        }));
-
-        for (let i = 0; i < caseValues.length; i += BATCH_SIZE) {
-          const batch = caseValues.slice(i, i + BATCH_SIZE);
-          if (batch.length > 0) {
-            await db.insert(simulationCases).values(batch);
-          }
-        }
-
-        await db
-          .update(simulationRuns)
-          .set({
-            status: 'completed',
-            passedCount: simulationResult.passed,
-            warnedCount: simulationResult.warned,
-            erroredCount: simulationResult.errored,
-            completedAt: new Date(),
-          })
-          .where(eq(simulationRuns.id, run.id));
-
-        return { runId: run.id };
-      } catch (err) {
+      // @MX:WARN: [AUTO] Fire-and-forget — the job outlives the request; failures are recorded as status 'failed'
+      // @MX:REASON: Exhaustive runs over hundreds of thousands of cases cannot complete within a request timeout
+      void runSimulationJob({
+        db,
+        runId: run.id,
+        plan,
+        spec: { optionSets, constraints: [], ...rules },
+      }).catch(async (err) => {
+        // The job's own status writes failed — keep the run from staying 'running' forever
+        console.error(`[Simulation] Run ${run.id} crashed:`, err);
         await db
           .update(simulationRuns)
           .set({ status: 'failed', completedAt: new Date() })
-          .where(eq(simulationRuns.id, run.id));
+          .where(and(eq(simulationRuns.id, run.id), eq(simulationRuns.status, 'running')))
+          .catch((updateErr: unknown) => {
+            console.error(`[Simulation] Could not mark run ${run.id} as failed:`, updateErr);
+          });
+      });
 
-        throw new TRPCError({
-          code: 'INTERNAL_SERVER_ERROR',
-          message: 'Simulation failed unexpectedly',
-          cause: err,
-        });
+      return { runId: run.id };
+    }),
+
+  // 3b. Cancel a running simulation — the job stops at its next batch
+  cancelSimulation: protectedProcedure
+    .input(z.object({ runId: z.number() }))
+    .mutation(async ({ ctx, input }) => {
+      const db = ctx.db as unknown as AnyDb;
+
+      const [run] = await db
+        .update(simulationRuns)
+        .set({ status: 'cancelled', completedAt: new Date() })
+        .where(and(eq(simulationRuns.id, input.runId), eq(simulationRuns.status, 'running')))
+        .returning({ id: simulationRuns.id });
+
+      if (!run) {
+        throw new TRPCError({ code: 'PRECONDITION_FAILED', message: 'Simulation run is not running' });
       }
+
+      abortSimulationJob(input.runId);
+      return { runId: run.id, cancelled: true };
     }),
 
   // 4. Get simulation run status and counts
@@ -453,6 +483,8 @@ export const widgetAdminRouter = router({
         completeness,
       });
 
+      await notifyQuoteSnapshotChanged(db, input.productId);
+
       return { success: true as const, completeness };
     }),
 
@@ -473,6 +505,8 @@ export const widgetAdminRouter = router({
         completeness: {},
       });
 
+      await notifyQuoteSnapshotChanged(db, input.productId);
+
       return { success: true as const };
     }),
 
@@ -857,6 +891,8 @@ export const widgetAdminRouter = router({
           })
           .returning();
 
+        await notifyQuoteSnapshotChanged(db, productId);
+
         return result;
       }),
   }),
@@ -896,7 +932,10 @@ export const widgetAdminRouter = router({
           .delete(printCostBase)
           .where(eq(printCostBase.productId, productId));
 
-        if (rows.length === 0) return { count: 0 };
+        if (rows.length === 0) {
+          await notifyQuoteSnapshotChanged(db, productId);
+          return { count: 0 };
+        }
 
         const inserted = await db
           .insert(printCostBase)
@@ -910,6 +949,8 @@ export const widgetAdminRouter = router({
           })))
           .returning({ id: printCostBase.id });
 
+        await notifyQuoteSnapshotChanged(db, productId);
+
         return { count: inserted.length };
       }),
   }),
@@ -954,7 +995,10 @@ export const widgetAdminRouter = router({
           .delete(postprocessCost)
           .where(eq(postprocessCost.productId, productId));
 
-        if (rows.length === 0) return { count: 0 };
+        if (rows.length === 0) {
+          await notifyQuoteSnapshotChanged(db, productId);
+          return { count: 0 };
+        }
 
         const inserted = await db
           .insert(postprocessCost)
@@ -970,6 +1014,8 @@ export const widgetAdminRouter = router({
           })))
           .returning({ id: postprocessCost.id });
 
+        await notifyQuoteSnapshotChanged(db, productId);
+
         return { count: inserted.length };
       }),
   }),
@@ -1013,7 +1059,10 @@ export const widgetAdminRouter = router({
           .delete(qtyDiscount)
           .where(eq(qtyDiscount.productId, productId));
 
-        if (rows.length === 0) return { count: 0 };
+        if (rows.length === 0) {
+          await notifyQuoteSnapshotChanged(db, productId);
+          return { count: 0 };
+        }
 
         const inserted = await db
           .insert(qtyDiscount)
@@ -1028,6 +1077,8 @@ export const widgetAdminRouter = router({
           })))
           .returning({ id: qtyDiscount.id });
 
+        await notifyQuoteSnapshotChanged(db, productId);
+
         return { count: inserted.length };
       }),
   }),
@@ -1094,6 +1145,8 @@ export const widgetAdminRouter = router({
           })
           .returning();
 
+        await notifyQuoteSnapshotChanged(db, input.productId);
+
         return created;
       }),
 
@@ -1148,6 +1201,8 @@ export const widgetAdminRouter = router({
           throw new TRPCError({ code: 'NOT_FOUND', message: 'Constraint not found' });
         }
 
+        await notifyQuoteSnapshotChanged(db, productId);
+
         return updated;
       }),
 
@@ -1179,6 +1234,8 @@ export const widgetAdminRouter = router({
           throw new TRPCError({ code: 'NOT_FOUND', message: 'Constraint not found' });
         }
 
+        await notifyQuoteSnapshotChanged(db, input.productId);
+
         return { success: true };
       }),
 
@@ -1212,6 +1269,8 @@ export const widgetAdminRouter = router({
           throw new TRPCError({ code: 'NOT_FOUND', message: 'Constraint not found' });
         }
 
+        await notifyQuoteSnapshotChanged(db, input.productId);
+
         return updated;
       }),
   }),
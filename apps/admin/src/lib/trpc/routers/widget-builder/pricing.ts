@@ -17,6 +17,7 @@ import {
   wbProducts,
 } from '@widget-creator/db';
 import { router, protectedProcedure } from '../../server';
+import { notifyQuoteSnapshotChanged } from '@/lib/quote-snapshot';
 
 // ─── Price mode enum ──────────────────────────────────────────────────────────
 
@@ -135,12 +136,14 @@ export const pricingRouter = router({
           .set(values)
           .where(eq(productPriceConfigs.id, existing.id))
           .returning();
+        await notifyQuoteSnapshotChanged(ctx.db, input.productId);
         return row;
       } else {
         const [row] = await ctx.db
           .insert(productPriceConfigs)
           .values({ ...values, createdAt: new Date() })
           .returning();
+        await notifyQuoteSnapshotChanged(ctx.db, input.productId);
         return row;
       }
     }),
@@ -166,6 +169,7 @@ export const pricingRouter = router({
         .where(eq(printCostBase.productId, input.productId));
 
       if (input.rows.length === 0) {
+        await notifyQuoteSnapshotChanged(ctx.db, input.productId);
         return [];
       }
 
@@ -185,6 +189,7 @@ export const pricingRouter = router({
         )
         .returning();
 
+      await notifyQuoteSnapshotChanged(ctx.db, input.productId);
       return inserted;
     }),
 
@@ -222,6 +227,7 @@ export const pricingRouter = router({
       }
 
       if (input.rows.length === 0) {
+        await notifyQuoteSnapshotChanged(ctx.db, input.productId);
         return [];
       }
 
@@ -241,6 +247,7 @@ export const pricingRouter = router({
         )
         .returning();
 
+      await notifyQuoteSnapshotChanged(ctx.db, input.productId);
       return inserted;
     }),
 
@@ -278,6 +285,7 @@ export const pricingRouter = router({
       }
 
       if (input.rows.length === 0) {
+        await notifyQuoteSnapshotChanged(ctx.db, input.productId);
         return [];
       }
 
@@ -296,6 +304,7 @@ export const pricingRouter = router({
         )
         .returning();
 
+      await notifyQuoteSnapshotChanged(ctx.db, input.productId);
       return inserted;
     }),
 });
@@ -20,6 +20,7 @@ import {
   optionElementTypes,
 } from '@widget-creator/db';
 import { router, protectedProcedure } from '../../server';
+import { notifyQuoteSnapshotChanged } from '@/lib/quote-snapshot';
 
 // @MX:NOTE: [AUTO] restrictionMode enum mirrors DB CHECK constraint on recipe_choice_restrictions
 const RestrictionModeEnum = z.enum(['allow_only', 'exclude']);
@@ -148,6 +149,7 @@ export const recipesRouter = router({
           description: input.description ?? null,
         })
         .returning();
+      await notifyQuoteSnapshotChanged(ctx.db, input.productId);
       return row;
     }),
 
@@ -157,7 +159,7 @@ export const recipesRouter = router({
   archiveAndCreate: protectedProcedure
     .input(ArchiveAndCreateSchema)
     .mutation(async ({ ctx, input }) => {
-      return ctx.db.transaction(async (tx) => {
+      const newRecipe = await ctx.db.transaction(async (tx) => {
         // Step 1: fetch the old recipe
         const [oldRecipe] = await tx
           .select()
@@ -242,6 +244,9 @@ export const recipesRouter = router({
 
         return newRecipe;
       });
+
+      await notifyQuoteSnapshotChanged(ctx.db, newRecipe.productId);
+      return newRecipe;
     }),
 
   addBinding: protectedProcedure
@@ -3,6 +3,7 @@ import { TRPCError } from '@trpc/server';
 import { eq as _eq, asc as _asc, and as _and } from 'drizzle-orm';
 import { wbProducts, productCategories } from '@widget-creator/db';
 import { router, protectedProcedure } from '../../server';
+import { notifyQuoteSnapshotChanged } from '@/lib/quote-snapshot';
 
 // pnpm resolves two drizzle-orm instances (postgres + libsql), causing SQL<unknown> type conflicts.
 // Cast helpers to any-accepting variants to bypass structural incompatibility at type level.
@@ -151,6 +152,7 @@ export const wbProductsRouter = router({
       if (!updated) {
         throw new TRPCError({ code: 'NOT_FOUND', message: 'Product not found' });
       }
+      await notifyQuoteSnapshotChanged(ctx.db, id);
       return updated;
     }),
 
@@ -165,6 +167,7 @@ export const wbProductsRouter = router({
       if (!updated) {
         throw new TRPCError({ code: 'NOT_FOUND', message: 'Product not found' });
       }
+      await notifyQuoteSnapshotChanged(ctx.db, input.id);
       return { success: true as const };
     }),
 });
@@ -0,0 +1,43 @@
+/**
+ * Table-routed DB select mock for the widget runtime routes (SPEC-WB-006).
+ *
+ * The widget routes load their data through the quote snapshot service, which
+ * issues its queries in parallel. Instead of mocking calls by position, each
+ * db.select().from(table) resolves to the rows registered for that table's
+ * stub name (e.g. 'wb_products', 'recipe_constraints').
+ *
+ * The returned chain supports .where() / .innerJoin() / .orderBy() / .limit(n)
+ * and is awaitable at any point.
+ */
+import { vi } from 'vitest';
+import { db } from '@widget-creator/shared/db';
+
+export type RowsByTable = Record<string, unknown[]>;
+
+function resultChain(rows: unknown[]) {
+  const chain = {
+    where: vi.fn(() => chain),
+    innerJoin: vi.fn(() => chain),
+    orderBy: vi.fn(() => chain),
+    limit: vi.fn((n: number) => Promise.resolve(rows.slice(0, n))),
+    then: (resolve: (v: unknown[]) => unknown, reject?: (e: unknown) => unknown) =>
+      Promise.resolve(rows).then(resolve, reject),
+  };
+  return chain;
+}
+
+/**
+ * Route db.select() by table name. Returns the list of table names queried,
+ * in call order, so tests can assert how many DB reads a request performed.
+ */
+export function mockSelectByTable(rowsByTable: RowsByTable): string[] {
+  const queried: string[] = [];
+  (db.select as ReturnType<typeof vi.fn>).mockImplementation(() => ({
+    from: vi.fn((table: { _name?: string }) => {
+      const name = table?._name ?? 'unknown';
+      queried.push(name);
+      return resultChain(rowsByTable[name] ?? []);
+    }),
+  }));
+  return queried;
+}
@@ -0,0 +1,213 @@
+import { describe, it, expect, beforeAll, beforeEach, afterAll } from 'vitest';
+import { drizzle } from 'drizzle-orm/postgres-js';
+import postgres from 'postgres';
+import {
+  gcra,
+  MemoryRateLimitStore,
+  SharedRateLimitStore,
+  InMemoryAtomicKv,
+} from '../../app/api/_lib/middleware/rate-limit-store.js';
+import type { AtomicKv, RateLimitRule } from '../../app/api/_lib/middleware/rate-limit-store.js';
+import { PostgresAtomicKv } from '../../app/api/_lib/middleware/rate-limit-pg.js';
+import type { SqlExecutor } from '../../app/api/_lib/middleware/rate-limit-pg.js';
+
+// Set to a disposable database to run the shared-store contract against Postgres as well
+const PG_URL = process.env['RATE_LIMIT_TEST_DATABASE_URL'];
+
+const RULE: RateLimitRule = { maxRequests: 10, windowMs: 1000 };
+
+describe('gcra', () => {
+  it('should allow a burst of maxRequests then reject', () => {
+    let tat: number | null = null;
+    for (let i = 0; i < 10; i++) {
+      const { decision, nextTat } = gcra(tat, RULE, 0);
+      expect(decision.allowed).toBe(true);
+      expect(decision.remaining).toBe(9 - i);
+      tat = nextTat;
+    }
+
+    const { decision, nextTat } = gcra(tat, RULE, 0);
+    expect(decision.allowed).toBe(false);
+    expect(decision.remaining).toBe(0);
+    expect(decision.retryAfterMs).toBe(100);
+    expect(nextTat).toBeNull();
+  });
+
+  it('should admit one request per interval once exhausted', () => {
+    let tat: number | null = null;
+    for (let i = 0; i < 10; i++) tat = gcra(tat, RULE, 0).nextTat;
+
+    expect(gcra(tat, RULE, 99).decision.allowed).toBe(false);
+    const next = gcra(tat, RULE, 100);
+    expect(next.decision.allowed).toBe(true);
+    expect(next.decision.remaining).toBe(0);
+  });
+
+  it('should restore the full quota after the window and report resetAt', () => {
+    const first = gcra(null, RULE, 0);
+    expect(first.decision.resetAt).toBe(100);
+
+    const later = gcra(first.nextTat, RULE, 5000);
+    expect(later.decision.remaining).toBe(9);
+  });
+
+  it('should stay exact when the interval is fractional', () => {
+    const rule: RateLimitRule = { maxRequests: 30, windowMs: 1000 };
+    let tat: number | null = null;
+    let allowed = 0;
+    for (let i = 0; i < 40; i++) {
+      const { decision, nextTat } = gcra(tat, rule, 0);
+      if (decision.allowed) allowed++;
+      if (nextTat !== null) tat = nextTat;
+    }
+    expect(allowed).toBe(30);
+  });
+});
+
+describe('MemoryRateLimitStore', () => {
+  it('should keep one entry per key and sweep expired keys', () => {
+    const store = new MemoryRateLimitStore();
+    for (let i = 0; i < 5; i++) store.consume('a', RULE, 0);
+    store.consume('b', RULE, 0);
+    expect(store.size).toBe(2);
+
+    // 'b' is fully restored at 100ms, 'a' at 500ms
+    store.sweep(200);
+    expect(store.size).toBe(1);
+    store.sweep(500);
+    expect(store.size).toBe(0);
+    store.clear();
+  });
+
+  it('should not change state on rejected requests', () => {
+    const store = new MemoryRateLimitStore();
+    for (let i = 0; i < 10; i++) store.consume('k', RULE, 0);
+    for (let i = 0; i < 100; i++) expect(store.consume('k', RULE, 0).allowed).toBe(false);
+    expect(store.consume('k', RULE, 100).allowed).toBe(true);
+    store.clear();
+  });
+});
+
+/**
+ * GCRA behaviour every AtomicKv backend must preserve when shared between instances.
+ * Tests use fixed request times; the backend TTL (a real clock for Postgres) stays well above them.
+ */
+function describeSharedStore(name: string, getKv: () => AtomicKv) {
+  describe(`SharedRateLimitStore on ${name}`, () => {
+    // Postgres keeps rows between tests and runs, so every test gets its own keys
+    let run = 0;
+    let prefix = '';
+    beforeEach(() => {
+      prefix = `test:${Date.now()}:${++run}:`;
+    });
+    const storeFor = (maxAttempts?: number) => new SharedRateLimitStore(getKv(), { prefix, maxAttempts });
+
+    it('should allow a burst of maxRequests then reject', async () => {
+      const store = storeFor();
+      for (let i = 0; i < 10; i++) {
+        const decision = await store.consume('k', RULE, 0);
+        expect(decision.allowed).toBe(true);
+        expect(decision.remaining).toBe(9 - i);
+      }
+
+      const rejected = await store.consume('k', RULE, 0);
+      expect(rejected.allowed).toBe(false);
+      expect(rejected.retryAfterMs).toBe(100);
+    });
+
+    it('should admit one request per interval once exhausted', async () => {
+      const store = storeFor();
+      for (let i = 0; i < 10; i++) await store.consume('k', RULE, 0);
+
+      expect((await store.consume('k', RULE, 99)).allowed).toBe(false);
+      expect((await store.consume('k', RULE, 100)).allowed).toBe(true);
+      expect((await store.consume('k', RULE, 100)).allowed).toBe(false);
+    });
+
+    it('should share quota between instances on one backend', async () => {
+      const a = storeFor();
+      const b = storeFor();
+
+      for (let i = 0; i < 5; i++) await a.consume('k', RULE, 0);
+      for (let i = 0; i < 5; i++) expect((await b.consume('k', RULE, 0)).allowed).toBe(true);
+      expect((await a.consume('k', RULE, 0)).allowed).toBe(false);
+    });
+
+    it('should admit exactly maxRequests under concurrent consumers', async () => {
+      const stores = [storeFor(50), storeFor(50)];
+
+      const decisions = await Promise.all(
+        Array.from({ length: 20 }, (_, i) => stores[i % 2].consume('k', RULE, 0)),
+      );
+      expect(decisions.filter((d) => d.allowed)).toHaveLength(10);
+    });
+  });
+}
+
+const memoryKv = new InMemoryAtomicKv(() => 0);
+describeSharedStore('InMemoryAtomicKv', () => memoryKv);
+
+describe.skipIf(!PG_URL)('PostgresAtomicKv', () => {
+  const TABLE = 'rate_limit_buckets_test';
+  let client: ReturnType<typeof postgres>;
+  let kv: PostgresAtomicKv;
+
+  beforeAll(() => {
+    client = postgres(PG_URL!, { max: 4 });
+    kv = new PostgresAtomicKv(drizzle(client) as unknown as SqlExecutor, { table: TABLE });
+  });
+
+  afterAll(async () => {
+    kv.close();
+    await client.unsafe(`DROP TABLE IF EXISTS ${TABLE}`);
+    await client.end();
+  });
+
+  describeSharedStore('PostgresAtomicKv', () => kv);
+
+  it('should compare-and-set only against the current value', async () => {
+    const key = `cas:${Date.now()}`;
+    expect(await kv.compareAndSet(key, null, '1', 60_000)).toBe(true);
+    expect(await kv.compareAndSet(key, null, '2', 60_000)).toBe(false);
+    expect(await kv.compareAndSet(key, '0', '2', 60_000)).toBe(false);
+    expect(await kv.compareAndSet(key, '1', '2', 60_000)).toBe(true);
+    expect(await kv.get(key)).toBe('2');
+  });
+
+  it('should treat an expired row as absent and overwrite it', async () => {
+    const key = `ttl:${Date.now()}`;
+    await kv.compareAndSet(key, null, '1', 1);
+    await new Promise((resolve) => setTimeout(resolve, 20));
+
+    expect(await kv.get(key)).toBeNull();
+    expect(await kv.compareAndSet(key, '1', '2', 60_000)).toBe(false);
+    expect(await kv.compareAndSet(key, null, '3', 60_000)).toBe(true);
+    expect(await kv.get(key)).toBe('3');
+  });
+});
+
+describe('SharedRateLimitStore', () => {
+  it('should expire keys through the backend TTL', async () => {
+    let now = 0;
+    const kv = new InMemoryAtomicKv(() => now);
+    const store = new SharedRateLimitStore(kv, { prefix: 'test:' });
+
+    await store.consume('k', RULE, now);
+    expect(await kv.get('test:k')).not.toBeNull();
+
+    now = 100;
+    expect(await kv.get('test:k')).toBeNull();
+  });
+
+  it('should reject rather than admit unrecorded requests after repeated compare-and-set conflicts', async () => {
+    const kv: AtomicKv = {
+      get: async () => null,
+      compareAndSet: async () => false,
+    };
+    const store = new SharedRateLimitStore(kv, { maxAttempts: 3 });
+
+    const decision = await store.consume('k', RULE, 0);
+    expect(decision.allowed).toBe(false);
+    expect(decision.retryAfterMs).toBe(100);
+  });
+});
@@ -1,6 +1,12 @@
-import { describe, it, expect, beforeEach } from 'vitest';
+import { describe, it, expect, beforeEach, vi } from 'vitest';
 import { NextRequest } from 'next/server';
-import { withRateLimit, _resetRateLimitStore } from '../../app/api/_lib/middleware/rate-limit.js';
+import {
+  withRateLimit,
+  setRateLimitStore,
+  configureRateLimitStore,
+  _resetRateLimitStore,
+} from '../../app/api/_lib/middleware/rate-limit.js';
+import { SharedRateLimitStore, InMemoryAtomicKv } from '../../app/api/_lib/middleware/rate-limit-store.js';
 import { ApiError } from '../../app/api/_lib/middleware/error-handler.js';
 import type { MiddlewareContext } from '../../app/api/_lib/middleware/with-middleware.js';
 
@@ -106,4 +112,65 @@ describe('withRateLimit', () => {
     await mw(createRequest('10.0.0.2'), ctx);
     expect(ctx.rateLimitHeaders).toBeDefined();
   });
+
+  it('should report remaining quota and reset time in headers', async () => {
+    const mw = withRateLimit('anonymous');
+    const ctx = createContext();
+    const before = Math.floor(Date.now() / 1000);
+
+    await mw(createRequest('10.0.0.3'), ctx);
+
+    expect(ctx.rateLimitHeaders!['X-RateLimit-Remaining']).toBe('29');
+    expect(Number(ctx.rateLimitHeaders!['X-RateLimit-Reset'])).toBeGreaterThanOrEqual(before);
+  });
+
+  it('should enforce the limit through a shared store', async () => {
+    const kv = new InMemoryAtomicKv();
+    setRateLimitStore(new SharedRateLimitStore(kv));
+    const mw = withRateLimit('anonymous');
+
+    for (let i = 0; i < 30; i++) {
+      await mw(createRequest('10.0.0.4'), createContext());
+    }
+
+    // A second instance sharing the backend sees the same exhausted quota
+    setRateLimitStore(new SharedRateLimitStore(kv));
+    await expect(mw(createRequest('10.0.0.4'), createContext())).rejects.toThrow(ApiError);
+  });
+
+  it('should fall back to in-process limits when the shared store fails', async () => {
+    const warn = vi.spyOn(console, 'warn').mockImplementation(() => {});
+    setRateLimitStore({
+      consume: async () => {
+        throw new Error('connection refused');
+      },
+    });
+    const mw = withRateLimit('anonymous');
+    const ctx = createContext();
+
+    await mw(createRequest('10.0.0.5'), ctx);
+
+    expect(ctx.rateLimitHeaders!['X-RateLimit-Remaining']).toBe('29');
+    warn.mockRestore();
+  });
+});
+
+describe('configureRateLimitStore', () => {
+  beforeEach(() => {
+    _resetRateLimitStore();
+  });
+
+  it('should keep the in-process store by default', async () => {
+    await configureRateLimitStore({});
+    const mw = withRateLimit('anonymous');
+    const ctx = createContext();
+
+    await mw(createRequest('10.0.0.6'), ctx);
+
+    expect(ctx.rateLimitHeaders!['X-RateLimit-Remaining']).toBe('29');
+  });
+
+  it('should reject an unknown backend', async () => {
+    await expect(configureRateLimitStore({ RATE_LIMIT_STORE: 'redis' })).rejects.toThrow('Unknown RATE_LIMIT_STORE');
+  });
 });
@@ -0,0 +1,123 @@
+/**
+ * Tests for the quote log write-behind buffer (quote-log.ts)
+ * SPEC-WB-006 FR-WB006-04
+ *
+ * Covers: size-triggered and timer-triggered multi-row flushes, bounded buffering
+ * with counted drops, failed batches and flush on close.
+ */
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import { QuoteLogBuffer } from '../../app/api/_lib/services/quote-log.js';
+import type { NewWbQuoteLog } from '@widget-creator/db';
+
+function row(productId: number): NewWbQuoteLog {
+  return { productId, selections: {}, quoteResult: {}, source: 'server', responseMs: 1 };
+}
+
+function deferred() {
+  let resolve!: () => void;
+  const promise = new Promise<void>((r) => {
+    resolve = r;
+  });
+  return { promise, resolve };
+}
+
+describe('QuoteLogBuffer', () => {
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it('flushes a multi-row batch as soon as maxBatch rows are queued', async () => {
+    const batches: NewWbQuoteLog[][] = [];
+    const buffer = new QuoteLogBuffer({ insert: async (rows) => { batches.push(rows); }, maxBatch: 3 });
+
+    buffer.enqueue(row(1));
+    buffer.enqueue(row(2));
+    expect(batches).toHaveLength(0);
+
+    buffer.enqueue(row(3));
+    await buffer.flush();
+
+    expect(batches.map((b) => b.length)).toEqual([3]);
+    expect(buffer.stats()).toMatchObject({ buffered: 0, written: 3, batches: 1, dropped: 0 });
+    await buffer.close();
+  });
+
+  it('flushes a partial batch when the interval elapses', async () => {
+    vi.useFakeTimers();
+    const insert = vi.fn(async (_rows: NewWbQuoteLog[]) => {});
+    const buffer = new QuoteLogBuffer({ insert, maxBatch: 100, flushIntervalMs: 500 });
+
+    buffer.enqueue(row(1));
+    expect(insert).not.toHaveBeenCalled();
+
+    await vi.advanceTimersByTimeAsync(500);
+    expect(insert).toHaveBeenCalledTimes(1);
+    expect(insert.mock.calls[0]![0]).toHaveLength(1);
+    await buffer.close();
+  });
+
+  it('drops and counts rows once maxBuffered rows are queued or in flight', async () => {
+    const gate = deferred();
+    const buffer = new QuoteLogBuffer({ insert: () => gate.promise, maxBatch: 2, maxBuffered: 3 });
+
+    expect(buffer.enqueue(row(1))).toBe(true);
+    expect(buffer.enqueue(row(2))).toBe(true); // batch of 2 now in flight
+    expect(buffer.enqueue(row(3))).toBe(true);
+    expect(buffer.enqueue(row(4))).toBe(false);
+    expect(buffer.stats()).toMatchObject({ buffered: 3, dropped: 1 });
+
+    gate.resolve();
+    await buffer.close();
+    expect(buffer.stats()).toMatchObject({ buffered: 0, written: 3, dropped: 1 });
+  });
+
+  it('runs one insert at a time', async () => {
+    let active = 0;
+    let maxActive = 0;
+    const buffer = new QuoteLogBuffer({
+      insert: async () => {
+        active++;
+        maxActive = Math.max(maxActive, active);
+        await new Promise((r) => setTimeout(r, 1));
+        active--;
+      },
+      maxBatch: 2,
+    });
+
+    for (let i = 0; i < 10; i++) buffer.enqueue(row(i));
+    await buffer.close();
+
+    expect(maxActive).toBe(1);
+    expect(buffer.stats()).toMatchObject({ written: 10, batches: 5 });
+  });
+
+  it('counts failed batches without retrying them', async () => {
+    const warn = vi.spyOn(console, 'warn').mockImplementation(() => {});
+    const insert = vi.fn(async () => {
+      throw new Error('pool exhausted');
+    });
+    const buffer = new QuoteLogBuffer({ insert, maxBatch: 10 });
+
+    buffer.enqueue(row(1));
+    buffer.enqueue(row(2));
+    await buffer.flush();
+
+    expect(insert).toHaveBeenCalledTimes(1);
+    expect(buffer.stats()).toMatchObject({ buffered: 0, written: 0, failed: 2 });
+    warn.mockRestore();
+    await buffer.close();
+  });
+
+  it('writes the remaining rows on close and rejects rows afterwards', async () => {
+    const batches: NewWbQuoteLog[][] = [];
+    const buffer = new QuoteLogBuffer({ insert: async (rows) => { batches.push(rows); }, maxBatch: 100 });
+
+    buffer.enqueue(row(1));
+    buffer.enqueue(row(2));
+    await buffer.close();
+
+    expect(batches.map((b) => b.length)).toEqual([2]);
+    expect(buffer.enqueue(row(3))).toBe(false);
+    expect(buffer.stats().dropped).toBe(1);
+  });
+});
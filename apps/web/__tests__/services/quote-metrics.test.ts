@@ -0,0 +1,58 @@
+/**
+ * Tests for rolling quote latency histograms (quote-metrics.ts)
+ * SPEC-WB-006 FR-WB006-01
+ */
+import { describe, it, expect } from 'vitest';
+import { QuoteLatencyRecorder } from '../../app/api/_lib/services/quote-metrics.js';
+import type { QuoteStageTimings } from '../../app/api/_lib/services/quote-metrics.js';
+
+function timings(total: number): QuoteStageTimings {
+  return { load: total / 2, constraints: 0.05, pricing: 0.05, serialize: 0.1, total };
+}
+
+describe('QuoteLatencyRecorder', () => {
+  it('reports p50/p95/p99 within one bucket (10%) of the exact percentile', () => {
+    const recorder = new QuoteLatencyRecorder();
+    const now = 1_000_000;
+    for (let ms = 1; ms <= 100; ms++) recorder.record(42, timings(ms), now);
+
+    const latency = recorder.snapshot(42, now)!;
+    expect(latency.stages.total.count).toBe(100);
+    expect(latency.stages.total.p50).toBeGreaterThanOrEqual(50);
+    expect(latency.stages.total.p50).toBeLessThanOrEqual(55);
+    expect(latency.stages.total.p95).toBeGreaterThanOrEqual(95);
+    expect(latency.stages.total.p95).toBeLessThanOrEqual(100);
+    expect(latency.stages.total.p99).toBeGreaterThanOrEqual(99);
+    expect(latency.stages.total.p99).toBeLessThanOrEqual(100);
+    expect(latency.stages.total.max).toBe(100);
+  });
+
+  it('keeps products separate and drops samples older than the rolling window', () => {
+    const recorder = new QuoteLatencyRecorder(1000, 3);
+    recorder.record(1, timings(5), 0);
+    recorder.record(2, timings(50), 2500);
+
+    expect(recorder.snapshot(1, 2500)?.stages.total.count).toBe(1);
+    expect(recorder.snapshot(1, 3000)).toBeNull();
+    expect(recorder.snapshot(2, 3000)?.stages.total.p50).toBeGreaterThanOrEqual(50);
+  });
+
+  it('evicts the least recently recorded product beyond maxProducts', () => {
+    const recorder = new QuoteLatencyRecorder(60_000, 5, 2);
+    recorder.record(1, timings(1), 0);
+    recorder.record(2, timings(1), 0);
+    recorder.record(1, timings(1), 0);
+    recorder.record(3, timings(1), 0);
+
+    expect(recorder.snapshotAll(0).map((p) => p.productId).sort()).toEqual([1, 3]);
+  });
+
+  it('orders snapshotAll by sample count', () => {
+    const recorder = new QuoteLatencyRecorder();
+    recorder.record(1, timings(1), 0);
+    recorder.record(2, timings(1), 0);
+    recorder.record(2, timings(1), 0);
+
+    expect(recorder.snapshotAll(0).map((p) => p.productId)).toEqual([2, 1]);
+  });
+});
@@ -0,0 +1,216 @@
+/**
+ * Tests for the quote snapshot service (quote-snapshot.ts)
+ * SPEC-WB-006 FR-WB006-01
+ *
+ * Covers: compileQuoteSnapshot indexing, priceFromSnapshot (LOOKUP / AREA), priceMatrixFromSnapshot,
+ * QuoteSnapshotCache LRU eviction, TTL expiry and invalidation epochs, change NOTIFY.
+ */
+import { describe, it, expect, vi, afterEach } from 'vitest';
+
+vi.mock('@widget-creator/shared/db', () => ({
+  db: { execute: vi.fn(async () => []) },
+}));
+
+import { db } from '@widget-creator/shared/db';
+import {
+  compileQuoteSnapshot,
+  priceFromSnapshot,
+  priceMatrixFromSnapshot,
+  publishQuoteSnapshotChange,
+  QuoteSnapshotCache,
+} from '../../app/api/_lib/services/quote-snapshot.js';
+import type { QuoteSnapshotSource } from '../../app/api/_lib/services/quote-snapshot.js';
+
+function makeSource(overrides: Partial<QuoteSnapshotSource> = {}): QuoteSnapshotSource {
+  return {
+    product: { id: 42, productKey: 'business-card' },
+    recipe: { id: 10, productId: 42 },
+    priceConfig: { priceMode: 'LOOKUP' },
+    constraints: [],
+    printCostRows: [],
+    postprocessRows: [],
+    discountRows: [],
+    ...overrides,
+  } as unknown as QuoteSnapshotSource;
+}
+
+function snapshotFor(productId: number, productKey = `p-${productId}`) {
+  return compileQuoteSnapshot(
+    makeSource({ product: { id: productId, productKey } } as unknown as Partial<QuoteSnapshotSource>),
+  );
+}
+
+describe('compileQuoteSnapshot', () => {
+  it('sorts active constraints by priority DESC and drops inactive ones', () => {
+    const snapshot = compileQuoteSnapshot(makeSource({
+      constraints: [
+        { constraintName: 'low', priority: 1, isActive: true },
+        { constraintName: 'off', priority: 99, isActive: false },
+        { constraintName: 'high', priority: 10, isActive: true },
+      ],
+    } as unknown as Partial<QuoteSnapshotSource>));
+
+    expect(snapshot.constraints.map((c) => c.constraintName)).toEqual(['high', 'low']);
+  });
+
+  it('prefers product-specific postprocess rows over global rows', () => {
+    const snapshot = compileQuoteSnapshot(makeSource({
+      postprocessRows: [
+        { processCode: 'PP', productId: null, unitPrice: '500', priceType: 'fixed', isActive: true },
+        { processCode: 'PP', productId: 42, unitPrice: '300', priceType: 'fixed', isActive: true },
+      ],
+    } as unknown as Partial<QuoteSnapshotSource>));
+
+    expect(snapshot.postprocessCosts.get('PP')?.unitPrice).toBe('300');
+  });
+
+  it('assigns increasing versions to successive builds', () => {
+    const a = snapshotFor(1);
+    const b = snapshotFor(1);
+    expect(b.version).toBeGreaterThan(a.version);
+  });
+});
+
+describe('priceFromSnapshot', () => {
+  it('resolves LOOKUP tier by plate type, print mode and quantity', () => {
+    const snapshot = compileQuoteSnapshot(makeSource({
+      printCostRows: [
+        { plateType: 'A4', printMode: 'S', qtyMin: 100, qtyMax: 999, unitPrice: '50', isActive: true },
+        { plateType: 'A4', printMode: 'S', qtyMin: 1, qtyMax: 99, unitPrice: '80', isActive: true },
+        { plateType: 'A4', printMode: 'D', qtyMin: 1, qtyMax: 999, unitPrice: '999', isActive: true },
+      ],
+    } as unknown as Partial<QuoteSnapshotSource>));
+
+    expect(priceFromSnapshot(snapshot, { SIZE: 'A4', PRINT_TYPE: 'S', QUANTITY: 50 }).printCost).toBe(4000);
+    expect(priceFromSnapshot(snapshot, { SIZE: 'A4', PRINT_TYPE: 'S', QUANTITY: 200 }).printCost).toBe(10000);
+    expect(priceFromSnapshot(snapshot, { SIZE: 'A5', PRINT_TYPE: 'S', QUANTITY: 200 }).printCost).toBe(0);
+  });
+
+  it('applies AREA pricing with the minimum area floor', () => {
+    const snapshot = compileQuoteSnapshot(makeSource({
+      priceConfig: { priceMode: 'AREA', unitPriceSqm: '50000', minAreaSqm: '0.1' },
+    } as unknown as Partial<QuoteSnapshotSource>));
+
+    const pricing = priceFromSnapshot(snapshot, { SIZE: '200x300mm', QUANTITY: 1 });
+    expect(pricing.priceMode).toBe('AREA');
+    expect(pricing.printCost).toBe(5000);
+  });
+
+  it('returns zero discount when no tier matches', () => {
+    const snapshot = compileQuoteSnapshot(makeSource({
+      discountRows: [
+        { productId: null, qtyMin: 1000, qtyMax: 9999, discountRate: '0.2', discountLabel: null, isActive: true },
+      ],
+    } as unknown as Partial<QuoteSnapshotSource>));
+
+    const pricing = priceFromSnapshot(snapshot, { QUANTITY: 10 });
+    expect(pricing.discountRate).toBe(0);
+    expect(pricing.appliedDiscount).toBeNull();
+  });
+});
+
+describe('priceMatrixFromSnapshot', () => {
+  it('matches priceFromSnapshot for every quantity × variant cell', () => {
+    const snapshot = compileQuoteSnapshot(makeSource({
+      printCostRows: [
+        { plateType: 'A4', printMode: 'S', qtyMin: 1, qtyMax: 99, unitPrice: '80', isActive: true },
+        { plateType: 'A4', printMode: 'S', qtyMin: 100, qtyMax: 999, unitPrice: '50', isActive: true },
+        { plateType: 'A5', printMode: 'S', qtyMin: 1, qtyMax: 999, unitPrice: '30', isActive: true },
+      ],
+      postprocessRows: [
+        { processCode: 'PP', productId: null, unitPrice: '10', priceType: 'per_unit', isActive: true },
+        { processCode: 'FOIL', productId: null, unitPrice: '5000', priceType: 'fixed', isActive: true },
+      ],
+      discountRows: [
+        { productId: null, qtyMin: 100, qtyMax: 9999, discountRate: '0.15', discountLabel: '15%', isActive: true },
+      ],
+    } as unknown as Partial<QuoteSnapshotSource>));
+
+    const base = { SIZE: 'A4', PRINT_TYPE: 'S', FINISHING: ['PP'] };
+    const quantities = [10, 99, 100, 500, 5000];
+    const variants = [{}, { SIZE: 'A5' }, { FINISHING: ['PP', 'FOIL'] }, { FINISHING: [] }];
+
+    const matrix = priceMatrixFromSnapshot(snapshot, base, quantities, variants);
+
+    expect(matrix).toHaveLength(variants.length);
+    variants.forEach((variant, v) => {
+      quantities.forEach((quantity, q) => {
+        expect(matrix[v]![q]).toEqual(priceFromSnapshot(snapshot, { ...base, ...variant, QUANTITY: quantity }));
+      });
+    });
+  });
+});
+
+describe('QuoteSnapshotCache', () => {
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it('evicts the least recently used entry when full', () => {
+    const cache = new QuoteSnapshotCache(2, 60_000);
+    cache.set(snapshotFor(1));
+    cache.set(snapshotFor(2));
+    cache.get(1); // 1 becomes most recent
+    cache.set(snapshotFor(3));
+
+    expect(cache.get(1)).toBeDefined();
+    expect(cache.get(2)).toBeUndefined();
+    expect(cache.get(3)).toBeDefined();
+    expect(cache.size).toBe(2);
+  });
+
+  it('looks snapshots up by productKey', () => {
+    const cache = new QuoteSnapshotCache(10, 60_000);
+    cache.set(snapshotFor(5, 'flyer'));
+    expect(cache.getByKey('flyer')?.product.id).toBe(5);
+
+    cache.invalidate(5);
+    expect(cache.getByKey('flyer')).toBeUndefined();
+  });
+
+  it('expires entries after the TTL', () => {
+    vi.useFakeTimers();
+    const cache = new QuoteSnapshotCache(10, 1_000);
+    cache.set(snapshotFor(1));
+
+    vi.advanceTimersByTime(1_001);
+    expect(cache.get(1)).toBeUndefined();
+  });
+
+  it('discards a build that started before an invalidation', () => {
+    const cache = new QuoteSnapshotCache(10, 60_000);
+    const buildEpoch = cache.currentEpoch;
+    cache.invalidate(1);
+
+    cache.set(snapshotFor(1), buildEpoch);
+    expect(cache.get(1)).toBeUndefined();
+  });
+
+  it('clear() drops every snapshot', () => {
+    const cache = new QuoteSnapshotCache(10, 60_000);
+    cache.set(snapshotFor(1));
+    cache.set(snapshotFor(2));
+    cache.clear();
+    expect(cache.size).toBe(0);
+  });
+});
+
+describe('publishQuoteSnapshotChange', () => {
+  it('sends one NOTIFY for the product', async () => {
+    const execute = vi.mocked(db.execute);
+    execute.mockClear();
+
+    await publishQuoteSnapshotChange(42);
+
+    expect(execute).toHaveBeenCalledTimes(1);
+  });
+
+  it('logs instead of throwing when NOTIFY fails', async () => {
+    vi.mocked(db.execute).mockRejectedValueOnce(new Error('connection lost'));
+    const warn = vi.spyOn(console, 'warn').mockImplementation(() => {});
+
+    await expect(publishQuoteSnapshotChange(42)).resolves.toBeUndefined();
+    expect(warn).toHaveBeenCalled();
+    warn.mockRestore();
+  });
+});
@@ -15,7 +15,8 @@
  */
 import { describe, it, expect, vi, beforeEach } from 'vitest';
 import { NextRequest } from 'next/server';
-import { db } from '@widget-creator/shared/db';
+import { mockSelectByTable } from '../fixtures/widget-db.js';
+import { invalidateQuoteSnapshot } from '../../app/api/_lib/services/quote-snapshot.js';
 
 // Mock all @widget-creator/db exports needed by the init route
 vi.mock('@widget-creator/db', () => {
@@ -178,21 +179,14 @@ const mockConstraintRule = {
 describe('GET /api/widget/products/:productKey/init', () => {
   beforeEach(() => {
     vi.restoreAllMocks();
+    invalidateQuoteSnapshot();
   });
 
   /**
-   * The route makes these DB calls in order:
-   * 1. db.select().from(wbProducts).where(...).limit(1)    -> product by productKey
-   * 2. Promise.all([
-   *      productRecipes (isDefault=true, isArchived=false),
-   *      productPriceConfigs,
-   *    ])
-   * 3. Promise.all([
-   *      recipeOptionBindings innerJoin optionElementTypes (ordered),
-   *      recipeConstraints,
-   *    ])
-   * 4. optionElementChoices (filtered by typeIds)
-   * 5. calculateDefaultPrice -> printCostBase, qtyDiscount queries
+   * The route reads product, default recipe, price config, constraints and pricing rows
+   * through the quote snapshot service (wb_products by productKey first), then loads:
+   * 1. recipe_option_bindings innerJoin option_element_types (ordered)
+   * 2. option_element_choices (filtered by typeIds)
    */
   function mockInitDbCalls(options: {
     product?: Record<string, unknown> | null;
@@ -201,7 +195,7 @@ describe('GET /api/widget/products/:productKey/init', () => {
     bindings?: Record<string, unknown>[];
     constraints?: Record<string, unknown>[];
     choices?: Record<string, unknown>[];
-  } = {}) {
+  } = {}): string[] {
     const {
       product = mockProduct,
       recipe = mockRecipe,
@@ -211,97 +205,13 @@ describe('GET /api/widget/products/:productKey/init', () => {
       choices = [mockChoice],
     } = options;
 
-    let selectCall = 0;
-    (db.select as ReturnType<typeof vi.fn>).mockImplementation((fields?: unknown) => {
-      selectCall++;
-
-      // Call 1: product by productKey
-      if (selectCall === 1) {
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockResolvedValue(product ? [product] : []),
-            }),
-          }),
-        };
-      }
-
-      // Calls 2+3: Promise.all([recipe, priceConfig])
-      if (selectCall === 2) {
-        // productRecipes via .then((rows) => rows[0])
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockReturnValue({
-                then: vi.fn((resolve: (v: unknown) => unknown) =>
-                  Promise.resolve(resolve(recipe ? [recipe] : [])),
-                ),
-              }),
-            }),
-          }),
-        };
-      }
-
-      if (selectCall === 3) {
-        // productPriceConfigs via .then((rows) => rows[0])
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockReturnValue({
-                then: vi.fn((resolve: (v: unknown) => unknown) =>
-                  Promise.resolve(resolve(priceConfig ? [priceConfig] : [])),
-                ),
-              }),
-            }),
-          }),
-        };
-      }
-
-      // Calls 4+5: Promise.all([bindings with innerJoin, constraints])
-      if (selectCall === 4) {
-        // recipeOptionBindings innerJoin optionElementTypes with .orderBy()
-        // db.select({...}).from().innerJoin().where().orderBy()
-        return {
-          from: vi.fn().mockReturnValue({
-            innerJoin: vi.fn().mockReturnValue({
-              where: vi.fn().mockReturnValue({
-                orderBy: vi.fn().mockResolvedValue(bindings),
-              }),
-            }),
-          }),
-        };
-      }
-
-      if (selectCall === 5) {
-        // recipeConstraints
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockResolvedValue(constraints),
-          }),
-        };
-      }
-
-      // Call 6: optionElementChoices (filtered via .then())
-      if (selectCall === 6) {
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              then: vi.fn((resolve: (v: unknown) => unknown) =>
-                Promise.resolve(resolve(choices)),
-              ),
-            }),
-          }),
-        };
-      }
-
-      // Pricing calls for defaultPrice: printCostBase, qtyDiscount (via .limit(1) -> result[0])
-      return {
-        from: vi.fn().mockReturnValue({
-          where: vi.fn().mockReturnValue({
-            limit: vi.fn().mockResolvedValue([]),
-          }),
-        }),
-      };
+    return mockSelectByTable({
+      wb_products: product ? [product] : [],
+      product_recipes: recipe ? [recipe] : [],
+      product_price_configs: priceConfig ? [priceConfig] : [],
+      recipe_constraints: constraints,
+      recipe_option_bindings: bindings,
+      option_element_choices: choices,
     });
   }
 
@@ -478,4 +388,24 @@ describe('GET /api/widget/products/:productKey/init', () => {
     expect(response.status).not.toBe(401);
     expect(response.status).not.toBe(403);
   });
+
+  it('should reuse the quote snapshot across init calls and only reload option bindings', async () => {
+    const queried = mockInitDbCalls();
+
+    const { GET } = await import('../../app/api/widget/products/[productKey]/init/route.js');
+
+    await GET(
+      new NextRequest('http://localhost:3000/api/widget/products/business-card/init'),
+      routeCtx({ productKey: 'business-card' }),
+    );
+    queried.length = 0;
+
+    const response = await GET(
+      new NextRequest('http://localhost:3000/api/widget/products/business-card/init'),
+      routeCtx({ productKey: 'business-card' }),
+    );
+
+    expect(response.status).toBe(200);
+    expect(queried).toEqual(['recipe_option_bindings', 'option_element_choices']);
+  });
 });
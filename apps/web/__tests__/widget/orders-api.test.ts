@@ -4,13 +4,12 @@
  *
  * POST /api/widget/orders:
  *   1. Parse and validate productId, selections, customer from body
- *   2. Product lookup from wbProducts
- *   3. Parallel: active recipe + price config lookup
- *   4. Constraint lookup + server-side re-quote + constraint evaluation
- *   5. Price discrepancy detection (client vs server)
- *   6. Generate unique orderCode (ORD-YYYYMMDD-XXXX)
- *   7. Insert order record into wbOrders table
- *   8. Fire-and-forget MES dispatch if product.mesItemCd is set
+ *   2. Product, active recipe, price config, constraints and pricing rows from the quote snapshot
+ *   3. Server-side re-quote + constraint evaluation (in memory)
+ *   4. Price discrepancy detection (client vs server)
+ *   5. Generate unique orderCode (ORD-YYYYMMDD-XXXX)
+ *   6. Insert order record into wbOrders table
+ *   7. Fire-and-forget MES dispatch if product.mesItemCd is set
  *   Returns: { orderCode, status, totalPrice, priceMatched, mesStatus, createdAt }
  *
  * GET /api/widget/orders/:orderCode:
@@ -20,6 +19,8 @@
 import { describe, it, expect, vi, beforeEach } from 'vitest';
 import { NextRequest } from 'next/server';
 import { db } from '@widget-creator/shared/db';
+import { mockSelectByTable } from '../fixtures/widget-db.js';
+import { invalidateQuoteSnapshot } from '../../app/api/_lib/services/quote-snapshot.js';
 
 // Mock dispatchToMes service
 vi.mock('../../app/api/_lib/services/mes-client.js', () => ({
@@ -183,19 +184,15 @@ const validOrderBody = {
 describe('POST /api/widget/orders', () => {
   beforeEach(() => {
     vi.clearAllMocks();
+    invalidateQuoteSnapshot();
   });
 
   /**
-   * Route DB call sequence:
-   * 1. wbProducts lookup .where(id, isActive).limit(1)
-   * 2. Promise.all([
-   *      productRecipes .where(productId, isDefault=true, isArchived=false).limit(1).then(),
-   *      productPriceConfigs .where(productId, isActive).limit(1).then(),
-   *    ])
-   * 3. recipeConstraints .where(recipeId, isActive)
-   * 4. serverReQuote -> printCostBase, postprocessCost (each .limit(1)), qtyDiscount .limit(1)
-   * 5. wbOrders .where(orderCode).limit(1)  [collision check]
-   * 6. db.insert(wbOrders).values(...).returning()
+   * Route DB reads:
+   * 1. Quote snapshot (wb_products, product_recipes + product_price_configs,
+   *    recipe_constraints + print_cost_base + postprocess_cost + qty_discount)
+   * 2. orders .where(orderCode).limit(1)  [collision check]
+   * 3. db.insert(wbOrders).values(...).returning()
    */
   function mockOrderDbCalls(options: {
     product?: Record<string, unknown> | null;
@@ -214,91 +211,12 @@ describe('POST /api/widget/orders', () => {
       insertedOrder = mockCreatedOrder,
     } = options;
 
-    let selectCall = 0;
-    (db.select as ReturnType<typeof vi.fn>).mockImplementation(() => {
-      selectCall++;
-
-      // Call 1: wbProducts
-      if (selectCall === 1) {
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockResolvedValue(product ? [product] : []),
-            }),
-          }),
-        };
-      }
-
-      // Calls 2+3: Promise.all([recipe, priceConfig])
-      if (selectCall === 2) {
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockReturnValue({
-                then: vi.fn((resolve: (v: unknown) => unknown) =>
-                  Promise.resolve(resolve(recipe ? [recipe] : [])),
-                ),
-              }),
-            }),
-          }),
-        };
-      }
-
-      if (selectCall === 3) {
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockReturnValue({
-                then: vi.fn((resolve: (v: unknown) => unknown) =>
-                  Promise.resolve(resolve(priceConfig ? [priceConfig] : [])),
-                ),
-              }),
-            }),
-          }),
-        };
-      }
-
-      // Call 4: recipeConstraints
-      if (selectCall === 4) {
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockResolvedValue(constraints),
-          }),
-        };
-      }
-
-      // Calls 5-7: serverReQuote -> printCostBase, qtyDiscount (LOOKUP mode without SIZE/PRINT_TYPE defaults to 0)
-      // These calls use .limit(1) directly (not .then())
-      // Call 5: qtyDiscount (main path in serverReQuote when LOOKUP without plateType)
-      if (selectCall === 5) {
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockResolvedValue([]), // no discount
-            }),
-          }),
-        };
-      }
-
-      // Call 6: orderCode collision check (wbOrders)
-      if (selectCall === 6) {
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockResolvedValue(existingOrder ? [existingOrder] : []),
-            }),
-          }),
-        };
-      }
-
-      // Subsequent: empty (extra pricing calls if FINISHING or collision retry)
-      return {
-        from: vi.fn().mockReturnValue({
-          where: vi.fn().mockReturnValue({
-            limit: vi.fn().mockResolvedValue([]),
-          }),
-        }),
-      };
+    mockSelectByTable({
+      wb_products: product ? [product] : [],
+      product_recipes: recipe ? [recipe] : [],
+      product_price_configs: priceConfig ? [priceConfig] : [],
+      recipe_constraints: constraints,
+      orders: existingOrder ? [existingOrder] : [],
     });
 
     // Mock insert returning the created order
@@ -558,92 +476,8 @@ describe('POST /api/widget/orders', () => {
   });
 
   it('should handle orderCode collision by regenerating orderCode', async () => {
-    // First collision check returns an existing order, second returns empty
-    let selectCall = 0;
-    (db.select as ReturnType<typeof vi.fn>).mockImplementation(() => {
-      selectCall++;
-
-      if (selectCall === 1) {
-        // wbProducts
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockResolvedValue([mockProductWithMes]),
-            }),
-          }),
-        };
-      }
-      if (selectCall === 2) {
-        // productRecipes .then
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockReturnValue({
-                then: vi.fn((resolve: (v: unknown) => unknown) =>
-                  Promise.resolve(resolve([mockRecipe])),
-                ),
-              }),
-            }),
-          }),
-        };
-      }
-      if (selectCall === 3) {
-        // productPriceConfigs .then
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockReturnValue({
-                then: vi.fn((resolve: (v: unknown) => unknown) =>
-                  Promise.resolve(resolve([mockPriceConfig])),
-                ),
-              }),
-            }),
-          }),
-        };
-      }
-      if (selectCall === 4) {
-        // recipeConstraints
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockResolvedValue([]),
-          }),
-        };
-      }
-      if (selectCall === 5) {
-        // qtyDiscount (pricing)
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockResolvedValue([]),
-            }),
-          }),
-        };
-      }
-      if (selectCall === 6) {
-        // First orderCode collision check → returns an existing order (collision!)
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockResolvedValue([{ id: 99 }]),
-            }),
-          }),
-        };
-      }
-      // Fallback for any extra calls
-      return {
-        from: vi.fn().mockReturnValue({
-          where: vi.fn().mockReturnValue({
-            limit: vi.fn().mockResolvedValue([]),
-          }),
-        }),
-      };
-    });
-
-    (db.insert as ReturnType<typeof vi.fn>).mockImplementation(() => ({
-      values: vi.fn().mockReturnValue({
-        returning: vi.fn().mockResolvedValue([mockCreatedOrder]),
-      }),
-    }));
+    // The orderCode collision check returns an existing order
+    mockOrderDbCalls({ existingOrder: { id: 99 } });
 
     const { POST } = await import('../../app/api/widget/orders/route.js');
     const req = new NextRequest('http://localhost:3000/api/widget/orders', {
@@ -656,7 +490,6 @@ describe('POST /api/widget/orders', () => {
 
     // Despite collision, order is still created (regenerated code)
     expect(response.status).toBe(201);
-    expect(response.status).toBe(201);
   });
 
   it('should include addon items in order when auto_add constraint fires', async () => {
@@ -11,12 +11,15 @@
  *   3. Parallel: active recipe + price config lookup
  *   4. Constraint rules lookup
  *   5. Evaluate constraints -> uiActions, violations, addons
- *   6. Calculate pricing (LOOKUP or AREA mode)
- *   7. Returns { isValid, uiActions, pricing, violations, addons }
+ *   6. Calculate pricing (LOOKUP or AREA mode) from the compiled product snapshot
+ *   7. Returns { isValid, uiActions, pricing, violations, addons, availableChoices }
  */
 import { describe, it, expect, vi, beforeEach } from 'vitest';
 import { NextRequest } from 'next/server';
 import { db } from '@widget-creator/shared/db';
+import { mockSelectByTable } from '../fixtures/widget-db.js';
+import { invalidateQuoteSnapshot } from '../../app/api/_lib/services/quote-snapshot.js';
+import { quoteLatency } from '../../app/api/_lib/services/quote-metrics.js';
 
 // Mock withWidgetAuth to inject a default widget context (bypasses JWT verification in tests)
 vi.mock('../../app/api/_lib/middleware/auth.js', async (importOriginal) => {
@@ -184,100 +187,43 @@ const validBody = {
 describe('POST /api/widget/quote', () => {
   beforeEach(() => {
     vi.restoreAllMocks();
+    invalidateQuoteSnapshot();
   });
 
   /**
-   * The route makes these DB calls in order:
-   * 1. db.select().from(wbProducts).where(...).limit(1)    -> product
-   * 2. Promise.all([
-   *      productRecipes query,
-   *      productPriceConfigs query,
-   *    ])
-   * 3. db.select().from(recipeConstraints).where(...)       -> constraints
-   * Then pricing DB calls (printCostBase, qtyDiscount, etc.) based on mode/selections
+   * The route reads everything through the quote snapshot service:
+   * 1. wb_products                                          -> product
+   * 2. product_recipes + product_price_configs (parallel)   -> default recipe, price config
+   * 3. recipe_constraints + print_cost_base + postprocess_cost + qty_discount (parallel)
+   * A warm snapshot serves later quotes for the same product without any DB reads.
    */
   function mockQuoteDbCalls(options: {
     product?: Record<string, unknown> | null;
     recipe?: Record<string, unknown> | null;
     priceConfig?: Record<string, unknown> | null;
     constraints?: Record<string, unknown>[];
-    pricingRows?: Record<string, unknown>[];
-  } = {}) {
+    printCosts?: Record<string, unknown>[];
+    postprocessCosts?: Record<string, unknown>[];
+    discounts?: Record<string, unknown>[];
+  } = {}): string[] {
     const {
       product = mockProduct,
       recipe = mockRecipe,
       priceConfig = mockPriceConfig,
       constraints = [mockConstraint],
-      pricingRows = [],
+      printCosts = [],
+      postprocessCosts = [],
+      discounts = [],
     } = options;
 
-    let selectCall = 0;
-    (db.select as ReturnType<typeof vi.fn>).mockImplementation(() => {
-      selectCall++;
-
-      // Call 1: wbProducts lookup
-      if (selectCall === 1) {
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockResolvedValue(product ? [product] : []),
-            }),
-          }),
-        };
-      }
-
-      // Calls 2+3: Promise.all([recipe, priceConfig])
-      if (selectCall === 2) {
-        // productRecipes — returns recipe via .then((rows) => rows[0])
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockReturnValue({
-                then: vi.fn((resolve: (v: unknown) => unknown) =>
-                  Promise.resolve(resolve(recipe ? [recipe] : [])),
-                ),
-              }),
-            }),
-          }),
-        };
-      }
-
-      if (selectCall === 3) {
-        // productPriceConfigs — returns config via .then((rows) => rows[0])
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockReturnValue({
-                then: vi.fn((resolve: (v: unknown) => unknown) =>
-                  Promise.resolve(resolve(priceConfig ? [priceConfig] : [])),
-                ),
-              }),
-            }),
-          }),
-        };
-      }
-
-      // Call 4: recipeConstraints
-      if (selectCall === 4) {
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockResolvedValue(constraints),
-          }),
-        };
-      }
-
-      // Subsequent: printCostBase, postprocessCost, qtyDiscount
-      return {
-        from: vi.fn().mockReturnValue({
-          where: vi.fn().mockReturnValue({
-            limit: vi.fn().mockReturnValue({
-              then: vi.fn((resolve: (v: unknown) => unknown) =>
-                Promise.resolve(resolve([])),
-              ),
-            }),
-          }),
-        }),
-      };
+    const queried = mockSelectByTable({
+      wb_products: product ? [product] : [],
+      product_recipes: recipe ? [recipe] : [],
+      product_price_configs: priceConfig ? [priceConfig] : [],
+      recipe_constraints: constraints,
+      print_cost_base: printCosts,
+      postprocess_cost: postprocessCosts,
+      qty_discount: discounts,
     });
 
     // Mock insert for quote log (fire-and-forget)
@@ -286,6 +232,8 @@ describe('POST /api/widget/quote', () => {
         catch: vi.fn(),
       }),
     }));
+
+    return queried;
   }
 
   it('should return 200 with isValid, pricing, uiActions, violations, addons', async () => {
@@ -552,81 +500,7 @@ describe('POST /api/widget/quote', () => {
       isActive: true,
     };
 
-    // For AREA mode: db calls are product, recipe.then, priceConfig.then (AREA path), constraints,
-    // then in calculatePricing AREA fetches priceConfig again, then qtyDiscount
-    let selectCall = 0;
-    (db.select as ReturnType<typeof vi.fn>).mockImplementation(() => {
-      selectCall++;
-
-      if (selectCall === 1) {
-        // wbProducts
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockResolvedValue([mockProduct]),
-            }),
-          }),
-        };
-      }
-
-      if (selectCall === 2) {
-        // productRecipes via .then
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockReturnValue({
-                then: vi.fn((resolve: (v: unknown) => unknown) =>
-                  Promise.resolve(resolve([mockRecipe])),
-                ),
-              }),
-            }),
-          }),
-        };
-      }
-
-      if (selectCall === 3) {
-        // productPriceConfigs via .then → returns AREA config
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockReturnValue({
-              limit: vi.fn().mockReturnValue({
-                then: vi.fn((resolve: (v: unknown) => unknown) =>
-                  Promise.resolve(resolve([areaPriceConfig])),
-                ),
-              }),
-            }),
-          }),
-        };
-      }
-
-      if (selectCall === 4) {
-        // recipeConstraints
-        return {
-          from: vi.fn().mockReturnValue({
-            where: vi.fn().mockResolvedValue([]),
-          }),
-        };
-      }
-
-      // AREA pricing: productPriceConfigs lookup + qtyDiscount (returns empty for no discount)
-      return {
-        from: vi.fn().mockReturnValue({
-          where: vi.fn().mockReturnValue({
-            limit: vi.fn().mockReturnValue({
-              then: vi.fn((resolve: (v: unknown) => unknown) =>
-                Promise.resolve(resolve([areaPriceConfig])),
-              ),
-            }),
-          }),
-        }),
-      };
-    });
-
-    (db.insert as ReturnType<typeof vi.fn>).mockImplementation(() => ({
-      values: vi.fn().mockReturnValue({
-        catch: vi.fn(),
-      }),
-    }));
+    mockQuoteDbCalls({ priceConfig: areaPriceConfig, constraints: [] });
 
     const { POST } = await import('../../app/api/widget/quote/route.js');
     const req = new NextRequest('http://localhost:3000/api/widget/quote', {
@@ -791,4 +665,218 @@ describe('POST /api/widget/quote', () => {
     expect(body.addons.length).toBeGreaterThan(0);
     expect(body.addons[0].type).toBe('auto_add');
   });
+
+  it('should record per-stage latency for the product', async () => {
+    mockQuoteDbCalls({ constraints: [] });
+    quoteLatency.clear();
+
+    const { POST } = await import('../../app/api/widget/quote/route.js');
+    const req = new NextRequest('http://localhost:3000/api/widget/quote', {
+      method: 'POST',
+      headers: { 'content-type': 'application/json' },
+      body: JSON.stringify(validBody),
+    });
+
+    const response = await POST(req, routeCtx());
+    expect(response.status).toBe(200);
+
+    const latency = quoteLatency.snapshot(42);
+    expect(latency?.stages.total.count).toBe(1);
+    expect(Object.keys(latency!.stages)).toEqual(['load', 'constraints', 'pricing', 'serialize', 'total']);
+  });
+
+  it('should return availableChoices derived from fired exclude/filter actions', async () => {
+    mockQuoteDbCalls({
+      constraints: [
+        {
+          id: 7, recipeId: 10, constraintName: 'pvc-no-coating',
+          triggerOptionType: 'PAPER', triggerOperator: 'IN', triggerValues: ['투명PVC'],
+          actions: [{ type: 'exclude', targetOptionType: 'COATING', excludeValues: ['무광PP', '유광PP'] }],
+          priority: 10, isActive: true,
+        },
+        {
+          id: 8, recipeId: 10, constraintName: 'pvc-size-filter',
+          triggerOptionType: 'PAPER', triggerOperator: 'EQUALS', triggerValues: ['투명PVC'],
+          actions: [{ type: 'filter', targetOptionType: 'SIZE', filterValues: ['90x54mm', '100x148mm'] }],
+          priority: 5, isActive: true,
+        },
+      ],
+    });
+
+    const { POST } = await import('../../app/api/widget/quote/route.js');
+    const req = new NextRequest('http://localhost:3000/api/widget/quote', {
+      method: 'POST',
+      headers: { 'content-type': 'application/json' },
+      body: JSON.stringify({ productId: 42, selections: { PAPER: '투명PVC', QUANTITY: 100 } }),
+    });
+
+    const response = await POST(req, routeCtx());
+    const body = await response.json();
+
+    expect(response.status).toBe(200);
+    expect(body.uiActions.map((a: { type: string }) => a.type)).toEqual(['exclude', 'filter']);
+    expect(body.availableChoices).toEqual({
+      COATING: { excluded: ['무광PP', '유광PP'], allowedOnly: null },
+      SIZE: { excluded: [], allowedOnly: ['90x54mm', '100x148mm'] },
+    });
+  });
+
+  it('should compute LOOKUP pricing from print cost tier, finishing and qty discount', async () => {
+    mockQuoteDbCalls({
+      constraints: [],
+      printCosts: [
+        { id: 1, productId: 42, plateType: '100x148mm', printMode: '단면칼라', qtyMin: 1, qtyMax: 99, unitPrice: '120', isActive: true },
+        { id: 2, productId: 42, plateType: '100x148mm', printMode: '단면칼라', qtyMin: 100, qtyMax: 499, unitPrice: '100', isActive: true },
+      ],
+      postprocessCosts: [
+        { id: 1, productId: null, processCode: '무광PP', priceType: 'fixed', unitPrice: '9000', isActive: true },
+        { id: 2, productId: 42, processCode: '무광PP', priceType: 'per_unit', unitPrice: '10', isActive: true },
+      ],
+      discounts: [
+        { id: 1, productId: 42, qtyMin: 100, qtyMax: 499, discountRate: '0.1000', discountLabel: '10% 할인', isActive: true },
+      ],
+    });
+
+    const { POST } = await import('../../app/api/widget/quote/route.js');
+    const req = new NextRequest('http://localhost:3000/api/widget/quote', {
+      method: 'POST',
+      headers: { 'content-type': 'application/json' },
+      body: JSON.stringify(validBody),
+    });
+
+    const response = await POST(req, routeCtx());
+    const body = await response.json();
+
+    expect(response.status).toBe(200);
+    // 100 x 100 = 10000 print, product-specific per_unit PP wins over global: 10 x 100 = 1000
+    expect(body.pricing.printCost).toBe(10000);
+    expect(body.pricing.processCost).toBe(1000);
+    expect(body.pricing.discountRate).toBe(0.1);
+    expect(body.pricing.discountAmount).toBe(1100);
+    expect(body.pricing.totalPrice).toBe(9900);
+    expect(body.pricing.appliedDiscount).toEqual({ tier: '100~499매', rate: '10%', label: '10% 할인' });
+  });
+
+  it('should serve repeat quotes for the same product from the snapshot without DB reads', async () => {
+    const queried = mockQuoteDbCalls({ constraints: [] });
+
+    const { POST } = await import('../../app/api/widget/quote/route.js');
+    const makeReq = (quantity: number) =>
+      new NextRequest('http://localhost:3000/api/widget/quote', {
+        method: 'POST',
+        headers: { 'content-type': 'application/json' },
+        body: JSON.stringify({ productId: 42, selections: { ...validBody.selections, QUANTITY: quantity } }),
+      });
+
+    const first = await POST(makeReq(100), routeCtx());
+    expect(first.status).toBe(200);
+    const coldReads = queried.length;
+    expect(coldReads).toBeGreaterThan(0);
+
+    const second = await POST(makeReq(200), routeCtx());
+    expect(second.status).toBe(200);
+    expect(queried.length).toBe(coldReads);
+  });
+
+  it('should rebuild the snapshot after invalidation', async () => {
+    const queried = mockQuoteDbCalls({ constraints: [] });
+
+    const { POST } = await import('../../app/api/widget/quote/route.js');
+    const makeReq = () =>
+      new NextRequest('http://localhost:3000/api/widget/quote', {
+        method: 'POST',
+        headers: { 'content-type': 'application/json' },
+        body: JSON.stringify(validBody),
+      });
+
+    await POST(makeReq(), routeCtx());
+    const coldReads = queried.length;
+
+    invalidateQuoteSnapshot(42);
+    await POST(makeReq(), routeCtx());
+
+    expect(queried.length).toBe(coldReads * 2);
+  });
+
+  describe('POST /api/widget/quote/matrix', () => {
+    const matrixReq = (body: unknown) =>
+      new NextRequest('http://localhost:3000/api/widget/quote/matrix', {
+        method: 'POST',
+        headers: { 'content-type': 'application/json' },
+        body: JSON.stringify(body),
+      });
+
+    it('should price every quantity × variant cell from one snapshot read', async () => {
+      const queried = mockQuoteDbCalls({
+        constraints: [{
+          id: 9, recipeId: 10, constraintName: 'min-qty-foil',
+          triggerOptionType: 'QUANTITY', triggerOperator: 'IN', triggerValues: ['10'],
+          actions: [{ type: 'block', message: 'FOIL needs 100+' }],
+          priority: 1, isActive: true,
+        }],
+        printCosts: [
+          { id: 1, productId: 42, plateType: '100x148mm', printMode: '단면칼라', qtyMin: 1, qtyMax: 99, unitPrice: '120', isActive: true },
+          { id: 2, productId: 42, plateType: '100x148mm', printMode: '단면칼라', qtyMin: 100, qtyMax: 999, unitPrice: '100', isActive: true },
+        ],
+        postprocessCosts: [
+          { id: 1, productId: null, processCode: '무광PP', priceType: 'per_unit', unitPrice: '10', isActive: true },
+        ],
+      });
+
+      const { POST } = await import('../../app/api/widget/quote/matrix/route.js');
+      const response = await POST(matrixReq({
+        productId: 42,
+        selections: { SIZE: '100x148mm', PRINT_TYPE: '단면칼라' },
+        quantities: [10, 100],
+        variants: [{}, { FINISHING: ['무광PP'] }],
+      }), routeCtx());
+      const body = await response.json();
+
+      expect(response.status).toBe(200);
+      expect(body.quantities).toEqual([10, 100]);
+      expect(body.rows).toHaveLength(2);
+      expect(body.rows[0].cells.map((c: { pricing: { totalPrice: number } }) => c.pricing.totalPrice)).toEqual([1200, 10000]);
+      expect(body.rows[1].cells.map((c: { pricing: { totalPrice: number } }) => c.pricing.totalPrice)).toEqual([1300, 11000]);
+      expect(body.rows[1].cells[0]).toMatchObject({ quantity: 10, isValid: false });
+      expect(body.rows[1].cells[0].violations[0].message).toBe('FOIL needs 100+');
+      expect(body.rows[1].cells[1].isValid).toBe(true);
+      expect(queried.filter((t) => t === 'wb_products')).toHaveLength(1);
+    });
+
+    it('should default to a single variant of the base selections', async () => {
+      mockQuoteDbCalls({ constraints: [] });
+
+      const { POST } = await import('../../app/api/widget/quote/matrix/route.js');
+      const response = await POST(matrixReq({ productId: 42, selections: {}, quantities: [1, 2, 3] }), routeCtx());
+      const body = await response.json();
+
+      expect(response.status).toBe(200);
+      expect(body.rows).toHaveLength(1);
+      expect(body.rows[0].variant).toEqual({});
+      expect(body.rows[0].cells).toHaveLength(3);
+    });
+
+    it('should return 400 for invalid quantities', async () => {
+      mockQuoteDbCalls();
+
+      const { POST } = await import('../../app/api/widget/quote/matrix/route.js');
+      const response = await POST(matrixReq({ productId: 42, selections: {}, quantities: [0, 1.5] }), routeCtx());
+
+      expect(response.status).toBe(400);
+    });
+
+    it('should return 400 when the matrix exceeds the cell limit', async () => {
+      mockQuoteDbCalls();
+
+      const { POST } = await import('../../app/api/widget/quote/matrix/route.js');
+      const response = await POST(matrixReq({
+        productId: 42,
+        selections: {},
+        quantities: Array.from({ length: 100 }, (_, i) => i + 1),
+        variants: Array.from({ length: 11 }, () => ({})),
+      }), routeCtx());
+
+      expect(response.status).toBe(400);
+    });
+  });
 });
@@ -0,0 +1,104 @@
+import { sql } from 'drizzle-orm';
+import type { SQL } from 'drizzle-orm';
+import type { AtomicKv } from './rate-limit-store.js';
+
+// @MX:NOTE: [AUTO] Postgres AtomicKv for SharedRateLimitStore — one row per key in an UNLOGGED table
+// @MX:NOTE: [AUTO] Expiry uses the database clock, so instances with skewed clocks still agree on TTLs
+// @MX:REASON: Rate-limit state is disposable — UNLOGGED skips WAL, and losing it on a crash only resets quotas
+
+/** Anything that runs a drizzle SQL fragment and returns rows (the postgres-js drizzle db) */
+export interface SqlExecutor {
+  execute(query: SQL): Promise<ArrayLike<Record<string, unknown>>>;
+}
+
+export interface PostgresAtomicKvOptions {
+  /** Table holding the keys, created on first use (default 'rate_limit_buckets') */
+  table?: string;
+  /** How often expired rows are deleted (default 60s) */
+  sweepIntervalMs?: number;
+}
+
+const DEFAULT_TABLE = 'rate_limit_buckets';
+const DEFAULT_SWEEP_INTERVAL_MS = 60_000;
+
+/**
+ * AtomicKv over a Postgres table.
+ * compareAndSet is a single statement — a conditional UPDATE, or for an absent key an
+ * INSERT ... ON CONFLICT that only overwrites an expired row — so concurrent writers cannot both win.
+ */
+export class PostgresAtomicKv implements AtomicKv {
+  private readonly table: SQL;
+  private readonly sweepIntervalMs: number;
+  private ready: Promise<void> | null = null;
+  private sweeper: ReturnType<typeof setInterval> | null = null;
+
+  constructor(
+    private readonly db: SqlExecutor,
+    options: PostgresAtomicKvOptions = {},
+  ) {
+    this.table = sql.identifier(options.table ?? DEFAULT_TABLE);
+    this.sweepIntervalMs = options.sweepIntervalMs ?? DEFAULT_SWEEP_INTERVAL_MS;
+  }
+
+  async get(key: string): Promise<string | null> {
+    await this.ensureTable();
+    const rows = await this.db.execute(
+      sql`SELECT value FROM ${this.table} WHERE key = ${key} AND expires_at > now()`,
+    );
+    return rows.length > 0 ? String(rows[0]!['value']) : null;
+  }
+
+  async compareAndSet(key: string, expected: string | null, next: string, ttlMs: number): Promise<boolean> {
+    await this.ensureTable();
+    const expiresAt = sql`now() + ${ttlMs}::double precision * interval '1 millisecond'`;
+    const rows = expected === null
+      ? await this.db.execute(sql`
+          INSERT INTO ${this.table} (key, value, expires_at) VALUES (${key}, ${next}, ${expiresAt})
+          ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, expires_at = EXCLUDED.expires_at
+          WHERE ${this.table}.expires_at <= now()
+          RETURNING key`)
+      : await this.db.execute(sql`
+          UPDATE ${this.table} SET value = ${next}, expires_at = ${expiresAt}
+          WHERE key = ${key} AND value = ${expected} AND expires_at > now()
+          RETURNING key`);
+    return rows.length > 0;
+  }
+
+  /** Delete rows whose TTL has passed. Runs on a timer; expired rows are already invisible to get. */
+  async sweep(): Promise<void> {
+    await this.ensureTable();
+    await this.db.execute(sql`DELETE FROM ${this.table} WHERE expires_at <= now()`);
+  }
+
+  close(): void {
+    if (this.sweeper) {
+      clearInterval(this.sweeper);
+      this.sweeper = null;
+    }
+  }
+
+  private ensureTable(): Promise<void> {
+    this.ready ??= this.db
+      .execute(sql`
+        CREATE UNLOGGED TABLE IF NOT EXISTS ${this.table} (
+          key text PRIMARY KEY,
+          value text NOT NULL,
+          expires_at timestamptz NOT NULL
+        )`)
+      .then(() => this.startSweeper())
+      .catch((err: unknown) => {
+        // Retry on the next call instead of caching the failure
+        this.ready = null;
+        throw err;
+      });
+    return this.ready;
+  }
+
+  private startSweeper(): void {
+    if (this.sweeper) return;
+    this.sweeper = setInterval(() => {
+      this.sweep().catch((err: unknown) => console.warn('[RateLimit] Sweeping expired keys failed:', err));
+    }, this.sweepIntervalMs);
+    this.sweeper.unref?.();
+  }
+}
@@ -0,0 +1,194 @@
+// @MX:NOTE: [AUTO] GCRA rate limiting — one number (theoretical arrival time, TAT) per key, O(1) time and memory
+// @MX:NOTE: [AUTO] maxRequests per windowMs = one request every windowMs/maxRequests, with a burst of maxRequests
+
+export interface RateLimitRule {
+  maxRequests: number;
+  windowMs: number;
+}
+
+export interface RateLimitDecision {
+  allowed: boolean;
+  /** Requests still allowed right now, after this one */
+  remaining: number;
+  /** Epoch ms at which the full quota is available again */
+  resetAt: number;
+  /** Milliseconds until the next request would be allowed (0 when allowed) */
+  retryAfterMs: number;
+}
+
+/** Backend that consumes one request for a key and reports the decision */
+export interface RateLimitStore {
+  consume(key: string, rule: RateLimitRule, now: number): Promise<RateLimitDecision> | RateLimitDecision;
+}
+
+// Guards against floating point drift when windowMs / maxRequests is not an integer
+const EPSILON_MS = 1e-6;
+
+/**
+ * Pure GCRA step. tat = stored theoretical arrival time (null for an unknown key).
+ * Returns the decision and the TAT to store (null when the request is rejected and nothing changes).
+ */
+export function gcra(
+  tat: number | null,
+  rule: RateLimitRule,
+  now: number,
+): { decision: RateLimitDecision; nextTat: number | null } {
+  const interval = rule.windowMs / rule.maxRequests;
+  const base = tat === null ? now : Math.max(tat, now);
+  const nextTat = base + interval;
+
+  if (nextTat - now > rule.windowMs + EPSILON_MS) {
+    return {
+      decision: {
+        allowed: false,
+        remaining: 0,
+        resetAt: base,
+        retryAfterMs: nextTat - rule.windowMs - now,
+      },
+      nextTat: null,
+    };
+  }
+
+  return {
+    decision: {
+      allowed: true,
+      remaining: Math.floor((rule.windowMs - (nextTat - now)) / interval + EPSILON_MS),
+      resetAt: nextTat,
+      retryAfterMs: 0,
+    },
+    nextTat,
+  };
+}
+
+// ─── In-memory store ──────────────────────────────────────────────────────────
+
+const DEFAULT_SWEEP_INTERVAL_MS = 60_000;
+
+/**
+ * Per-process store: a Map of key -> TAT.
+ * A key whose TAT has passed carries no state, so a background sweep drops it.
+ */
+export class MemoryRateLimitStore implements RateLimitStore {
+  private readonly tats = new Map<string, number>();
+  private sweeper: ReturnType<typeof setInterval> | null = null;
+
+  constructor(private readonly sweepIntervalMs: number = DEFAULT_SWEEP_INTERVAL_MS) {}
+
+  get size(): number {
+    return this.tats.size;
+  }
+
+  consume(key: string, rule: RateLimitRule, now: number): RateLimitDecision {
+    this.startSweeper();
+    const { decision, nextTat } = gcra(this.tats.get(key) ?? null, rule, now);
+    if (nextTat !== null) this.tats.set(key, nextTat);
+    return decision;
+  }
+
+  /** Drop keys whose quota is fully restored. Runs on a timer, never inside consume. */
+  sweep(now: number = Date.now()): void {
+    for (const [key, tat] of this.tats) {
+      if (tat <= now) this.tats.delete(key);
+    }
+  }
+
+  clear(): void {
+    this.tats.clear();
+    if (this.sweeper) {
+      clearInterval(this.sweeper);
+      this.sweeper = null;
+    }
+  }
+
+  private startSweeper(): void {
+    if (this.sweeper) return;
+    this.sweeper = setInterval(() => this.sweep(), this.sweepIntervalMs);
+    this.sweeper.unref?.();
+  }
+}
+
+// ─── Shared store ─────────────────────────────────────────────────────────────
+
+/**
+ * Minimal atomic key/value contract a shared backend must provide.
+ * Postgres: PostgresAtomicKv (rate-limit-pg.ts).
+ * Redis would be GET + a WATCH/MULTI or Lua compare-and-set with PX ttl.
+ */
+export interface AtomicKv {
+  get(key: string): Promise<string | null>;
+  /** Set key to next only if its current value is expected (null = key absent). Returns whether it was set. */
+  compareAndSet(key: string, expected: string | null, next: string, ttlMs: number): Promise<boolean>;
+}
+
+export interface SharedRateLimitStoreOptions {
+  /** Key namespace in the shared backend (default 'rl:') */
+  prefix?: string;
+  /** Compare-and-set attempts under contention before rejecting the request (default 5) */
+  maxAttempts?: number;
+}
+
+/**
+ * Store shared by every instance through an AtomicKv backend.
+ * Each key expires once its TAT passes, so the backend sweeps itself.
+ */
+export class SharedRateLimitStore implements RateLimitStore {
+  private readonly prefix: string;
+  private readonly maxAttempts: number;
+
+  constructor(
+    private readonly kv: AtomicKv,
+    options: SharedRateLimitStoreOptions = {},
+  ) {
+    this.prefix = options.prefix ?? 'rl:';
+    this.maxAttempts = options.maxAttempts ?? 5;
+  }
+
+  async consume(key: string, rule: RateLimitRule, now: number): Promise<RateLimitDecision> {
+    const storeKey = `${this.prefix}${key}`;
+
+    for (let attempt = 0; attempt < this.maxAttempts; attempt++) {
+      const current = await this.kv.get(storeKey);
+      const tat = current === null ? null : Number(current);
+      const { decision, nextTat } = gcra(Number.isFinite(tat) ? tat : null, rule, now);
+      if (nextTat === null) return decision;
+
+      const ttlMs = Math.max(1, Math.ceil(nextTat - now));
+      if (await this.kv.compareAndSet(storeKey, current, String(nextTat), ttlMs)) {
+        return decision;
+      }
+    }
+
+    // Persistent contention on one key: nothing was stored, so the request must not count as admitted
+    const interval = rule.windowMs / rule.maxRequests;
+    return { allowed: false, remaining: 0, resetAt: now + rule.windowMs, retryAfterMs: interval };
+  }
+}
+
+/**
+ * In-process AtomicKv with TTLs — the local stand-in for a shared backend in tests and single-instance setups.
+ */
+export class InMemoryAtomicKv implements AtomicKv {
+  private readonly entries = new Map<string, { value: string; expiresAt: number }>();
+
+  constructor(private readonly clock: () => number = Date.now) {}
+
+  async get(key: string): Promise<string | null> {
+    return this.read(key);
+  }
+
+  async compareAndSet(key: string, expected: string | null, next: string, ttlMs: number): Promise<boolean> {
+    if (this.read(key) !== expected) return false;
+    this.entries.set(key, { value: next, expiresAt: this.clock() + ttlMs });
+    return true;
+  }
+
+  private read(key: string): string | null {
+    const entry = this.entries.get(key);
+    if (!entry) return null;
+    if (entry.expiresAt <= this.clock()) {
+      this.entries.delete(key);
+      return null;
+    }
+    return entry.value;
+  }
+}
@@ -1,12 +1,14 @@
 import { NextRequest } from 'next/server';
 import { rateLimitExceeded } from './error-handler.js';
 import type { MiddlewareFn, MiddlewareContext } from './with-middleware.js';
+import { MemoryRateLimitStore, SharedRateLimitStore } from './rate-limit-store.js';
+import { PostgresAtomicKv } from './rate-limit-pg.js';
+import type { SqlExecutor } from './rate-limit-pg.js';
+import type { RateLimitDecision, RateLimitRule, RateLimitStore } from './rate-limit-store.js';
 
 export type RateLimitType = 'widget-token' | 'api-key' | 'admin' | 'anonymous';
 
-interface RateLimitConfig {
-  maxRequests: number;
-  windowMs: number;
+interface RateLimitConfig extends RateLimitRule {
   windowLabel: string;
 }
 
@@ -17,27 +19,48 @@ const RATE_LIMITS: Record<RateLimitType, RateLimitConfig> = {
   anonymous: { maxRequests: 30, windowMs: 60_000, windowLabel: 'min' },
 };
 
-interface SlidingWindowEntry {
-  timestamps: number[];
-}
+// Per-process by default; RATE_LIMIT_STORE=postgres installs a SharedRateLimitStore at startup (instrumentation.ts)
+const memoryStore = new MemoryRateLimitStore();
+let activeStore: RateLimitStore = memoryStore;
 
-// In-memory store for rate limiting
-const store = new Map<string, SlidingWindowEntry>();
+// Backend failures degrade to per-process limiting; warn at most once a minute
+const FALLBACK_WARN_INTERVAL_MS = 60_000;
+let lastFallbackWarn = 0;
 
-// Cleanup stale entries every 5 minutes
-const CLEANUP_INTERVAL = 5 * 60_000;
-let lastCleanup = Date.now();
+/** Replace the backing store (e.g. a SharedRateLimitStore over Postgres) */
+export function setRateLimitStore(store: RateLimitStore): void {
+  activeStore = store;
+}
 
-function cleanup(windowMs: number): void {
-  const now = Date.now();
-  if (now - lastCleanup < CLEANUP_INTERVAL) return;
-  lastCleanup = now;
+/**
+ * Select the store from RATE_LIMIT_STORE: 'memory' (default, per process) or
+ * 'postgres' (shared by every instance on DATABASE_URL). Called once at server startup.
+ */
+export async function configureRateLimitStore(
+  env: Record<string, string | undefined> = process.env,
+): Promise<void> {
+  const backend = env['RATE_LIMIT_STORE'] || 'memory';
+  if (backend === 'memory') {
+    activeStore = memoryStore;
+    return;
+  }
+  if (backend !== 'postgres') {
+    throw new Error(`Unknown RATE_LIMIT_STORE "${backend}" (expected "memory" or "postgres")`);
+  }
+  const { db } = await import('@widget-creator/shared/db');
+  setRateLimitStore(new SharedRateLimitStore(new PostgresAtomicKv(db as unknown as SqlExecutor)));
+}
 
-  const cutoff = now - windowMs * 2;
-  for (const [key, entry] of store) {
-    if (entry.timestamps.length === 0 || entry.timestamps[entry.timestamps.length - 1] < cutoff) {
-      store.delete(key);
+async function consume(key: string, rule: RateLimitRule, now: number): Promise<RateLimitDecision> {
+  if (activeStore === memoryStore) return memoryStore.consume(key, rule, now);
+  try {
+    return await activeStore.consume(key, rule, now);
+  } catch (err) {
+    if (now - lastFallbackWarn >= FALLBACK_WARN_INTERVAL_MS) {
+      lastFallbackWarn = now;
+      console.warn('[RateLimit] Shared store unavailable, using in-process limits:', err);
     }
+    return memoryStore.consume(key, rule, now);
   }
 }
 
@@ -70,7 +93,7 @@ function getRateLimitKey(req: NextRequest, type: RateLimitType, ctx: MiddlewareC
 }
 
 /**
- * Sliding window rate limiter middleware.
+ * GCRA rate limiter middleware (constant memory per key, see rate-limit-store.ts).
  * Sets X-RateLimit-Limit, X-RateLimit-Remaining, X-RateLimit-Reset headers.
  * Throws 429 when limit exceeded.
  */
@@ -80,35 +103,19 @@ export function withRateLimit(type: RateLimitType): MiddlewareFn {
     const key = getRateLimitKey(req, type, ctx);
     const now = Date.now();
 
-    cleanup(config.windowMs);
-
-    let entry = store.get(key);
-    if (!entry) {
-      entry = { timestamps: [] };
-      store.set(key, entry);
-    }
-
-    // Remove timestamps outside the sliding window
-    const windowStart = now - config.windowMs;
-    entry.timestamps = entry.timestamps.filter((t) => t > windowStart);
-
-    const remaining = Math.max(0, config.maxRequests - entry.timestamps.length);
-    const resetAt = Math.ceil((now + config.windowMs) / 1000);
+    const decision = await consume(key, config, now);
 
     // Set rate limit headers in context for the final response
     ctx.rateLimitHeaders = {
       'X-RateLimit-Limit': String(config.maxRequests),
-      'X-RateLimit-Remaining': String(Math.max(0, remaining - 1)),
-      'X-RateLimit-Reset': String(resetAt),
+      'X-RateLimit-Remaining': String(decision.remaining),
+      'X-RateLimit-Reset': String(Math.ceil(decision.resetAt / 1000)),
     };
 
-    if (entry.timestamps.length >= config.maxRequests) {
-      const oldestInWindow = entry.timestamps[0];
-      const retryAfter = Math.ceil((oldestInWindow + config.windowMs - now) / 1000);
+    if (!decision.allowed) {
+      const retryAfter = Math.max(1, Math.ceil(decision.retryAfterMs / 1000));
       throw rateLimitExceeded(config.maxRequests, config.windowLabel, retryAfter);
     }
-
-    entry.timestamps.push(now);
   };
 }
 
@@ -116,5 +123,6 @@ export function withRateLimit(type: RateLimitType): MiddlewareFn {
  * Reset the rate limit store. For testing only.
  */
 export function _resetRateLimitStore(): void {
-  store.clear();
+  memoryStore.clear();
+  activeStore = memoryStore;
 }
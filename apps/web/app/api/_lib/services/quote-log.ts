@@ -0,0 +1,164 @@
+import { db } from '@widget-creator/shared/db';
+import { wbQuoteLogs } from '@widget-creator/db';
+import type { NewWbQuoteLog } from '@widget-creator/db';
+
+// @MX:ANCHOR: [AUTO] Quote log write-behind buffer — batches quote_logs rows into multi-row inserts
+// @MX:REASON: fan_in >= 3: widget quote route, dashboard.quoteLatency stats, process shutdown flush
+// @MX:SPEC: SPEC-WB-006 FR-WB006-04
+// @MX:WARN: [AUTO] Rows are dropped (and counted) when the buffer is full — quote_logs is best-effort analytics
+// @MX:REASON: A quote must never wait on, or queue unbounded promises behind, its audit log write
+
+const DEFAULT_MAX_BATCH = 200;
+const DEFAULT_FLUSH_INTERVAL_MS = 1000;
+const DEFAULT_MAX_BUFFERED = 5000;
+
+export interface QuoteLogBufferOptions {
+  /** Writes one batch; called by at most one flush at a time */
+  insert: (rows: NewWbQuoteLog[]) => Promise<unknown>;
+  /** Rows per multi-row INSERT; reaching it triggers an immediate flush (default 200) */
+  maxBatch?: number;
+  /** Flush interval for partially filled batches (default 1000ms) */
+  flushIntervalMs?: number;
+  /** Rows held in memory, including the batch being written, before new rows are dropped (default 5000) */
+  maxBuffered?: number;
+}
+
+export interface QuoteLogBufferStats {
+  buffered: number;
+  written: number;
+  dropped: number;
+  failed: number;
+  batches: number;
+}
+
+/**
+ * Bounded in-process write-behind buffer.
+ * A single writer drains the queue batch by batch, so quote logging holds at most one pool connection.
+ */
+export class QuoteLogBuffer {
+  private queue: NewWbQuoteLog[] = [];
+  private inFlight = 0;
+  private flushing: Promise<void> | null = null;
+  private timer: ReturnType<typeof setInterval> | null = null;
+  private closed = false;
+  private readonly counters = { written: 0, dropped: 0, failed: 0, batches: 0 };
+
+  private readonly insert: QuoteLogBufferOptions['insert'];
+  private readonly maxBatch: number;
+  private readonly flushIntervalMs: number;
+  private readonly maxBuffered: number;
+
+  constructor(options: QuoteLogBufferOptions) {
+    this.insert = options.insert;
+    this.maxBatch = options.maxBatch ?? DEFAULT_MAX_BATCH;
+    this.flushIntervalMs = options.flushIntervalMs ?? DEFAULT_FLUSH_INTERVAL_MS;
+    this.maxBuffered = options.maxBuffered ?? DEFAULT_MAX_BUFFERED;
+  }
+
+  /** Queue a row. Returns false when the row was dropped (buffer full or closed). */
+  enqueue(row: NewWbQuoteLog): boolean {
+    if (this.closed || this.queue.length + this.inFlight >= this.maxBuffered) {
+      this.counters.dropped++;
+      return false;
+    }
+
+    this.queue.push(row);
+    this.startTimer();
+    if (this.queue.length >= this.maxBatch) void this.flush();
+    return true;
+  }
+
+  /** Write everything queued so far. Concurrent callers share the running flush. */
+  flush(): Promise<void> {
+    if (!this.flushing) {
+      this.flushing = this.drain().finally(() => {
+        this.flushing = null;
+      });
+    }
+    return this.flushing;
+  }
+
+  /** Stop the timer, refuse new rows and write what is left */
+  async close(): Promise<void> {
+    this.closed = true;
+    this.stopTimer();
+    await this.flush();
+  }
+
+  stats(): QuoteLogBufferStats {
+    return { buffered: this.queue.length + this.inFlight, ...this.counters };
+  }
+
+  private async drain(): Promise<void> {
+    while (this.queue.length > 0) {
+      const batch = this.queue.splice(0, this.maxBatch);
+      this.inFlight = batch.length;
+      try {
+        await this.insert(batch);
+        this.counters.written += batch.length;
+        this.counters.batches++;
+      } catch (err) {
+        // No retry: a failing database must not turn into an ever-growing backlog
+        this.counters.failed += batch.length;
+        console.warn(`[QuoteLog] Failed to insert ${batch.length} quote logs:`, err);
+      } finally {
+        this.inFlight = 0;
+      }
+    }
+    this.stopTimer();
+  }
+
+  private startTimer(): void {
+    if (this.timer || this.closed) return;
+    this.timer = setInterval(() => {
+      void this.flush();
+    }, this.flushIntervalMs);
+    // Never keep the process alive just for the log timer
+    this.timer.unref?.();
+  }
+
+  private stopTimer(): void {
+    if (!this.timer) return;
+    clearInterval(this.timer);
+    this.timer = null;
+  }
+}
+
+function envInt(name: string, fallback: number): number {
+  const value = parseInt(process.env[name] ?? '', 10);
+  return Number.isFinite(value) && value > 0 ? value : fallback;
+}
+
+export const quoteLogBuffer = new QuoteLogBuffer({
+  insert: (rows) => db.insert(wbQuoteLogs).values(rows),
+  maxBatch: envInt('QUOTE_LOG_MAX_BATCH', DEFAULT_MAX_BATCH),
+  flushIntervalMs: envInt('QUOTE_LOG_FLUSH_MS', DEFAULT_FLUSH_INTERVAL_MS),
+  maxBuffered: envInt('QUOTE_LOG_MAX_BUFFERED', DEFAULT_MAX_BUFFERED),
+});
+
+// ─── Shutdown flush ───────────────────────────────────────────────────────────
+
+let shutdownHookInstalled = false;
+
+function installShutdownFlush(): void {
+  if (shutdownHookInstalled || typeof process.once !== 'function') return;
+  shutdownHookInstalled = true;
+
+  const onSignal = (signal: NodeJS.Signals) => {
+    void quoteLogBuffer.close().finally(() => {
+      // Keep the default "terminate on signal" behaviour when nobody else handles it
+      if (process.listenerCount(signal) === 0) process.kill(process.pid, signal);
+    });
+  };
+  process.once('SIGTERM', onSignal);
+  process.once('SIGINT', onSignal);
+  process.once('beforeExit', () => {
+    void quoteLogBuffer.close();
+  });
+}
+
+/** Queue one quote_logs row for the next batch insert (never blocks the request) */
+export function logQuote(row: NewWbQuoteLog): boolean {
+  installShutdownFlush();
+  return quoteLogBuffer.enqueue(row);
+}
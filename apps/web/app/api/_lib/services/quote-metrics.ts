@@ -0,0 +1,156 @@
+// @MX:NOTE: [AUTO] Rolling per-product, per-stage latency histograms for the widget quote path
+// @MX:SPEC: SPEC-WB-006 FR-WB006-01
+// @MX:NOTE: [AUTO] Fixed log-scale buckets (+10% per bucket) — percentiles are bucket upper bounds, memory is constant per product
+
+export const QUOTE_STAGES = ['load', 'constraints', 'pricing', 'serialize', 'total'] as const;
+export type QuoteStage = (typeof QUOTE_STAGES)[number];
+export type QuoteStageTimings = Record<QuoteStage, number>;
+
+export interface LatencyPercentiles {
+  count: number;
+  p50: number;
+  p95: number;
+  p99: number;
+  max: number;
+}
+
+export interface ProductLatency {
+  productId: number;
+  stages: Record<QuoteStage, LatencyPercentiles>;
+}
+
+// Bucket i covers (MIN_MS * GROWTH^(i-1), MIN_MS * GROWTH^i]; bucket 0 holds everything <= MIN_MS
+const MIN_MS = 0.01;
+const GROWTH = 1.1;
+const MAX_MS = 60_000;
+const BUCKETS = Math.ceil(Math.log(MAX_MS / MIN_MS) / Math.log(GROWTH)) + 1;
+
+const DEFAULT_WINDOW_MS = 60_000;
+const DEFAULT_WINDOWS = 5;
+const DEFAULT_MAX_PRODUCTS = 200;
+
+function bucketOf(ms: number): number {
+  if (!(ms > MIN_MS)) return 0;
+  return Math.min(BUCKETS - 1, Math.ceil(Math.log(ms / MIN_MS) / Math.log(GROWTH)));
+}
+
+function bucketUpperBound(bucket: number): number {
+  return MIN_MS * GROWTH ** bucket;
+}
+
+function round(ms: number): number {
+  return Math.round(ms * 100) / 100;
+}
+
+/** One time slice of the rolling window: a bucket array per stage */
+interface Slice {
+  start: number;
+  counts: Uint32Array[];
+  max: Float64Array;
+}
+
+function emptySlice(start: number): Slice {
+  return {
+    start,
+    counts: QUOTE_STAGES.map(() => new Uint32Array(BUCKETS)),
+    max: new Float64Array(QUOTE_STAGES.length),
+  };
+}
+
+/**
+ * Per-product histograms over a rolling window made of `windows` slices of `windowMs` each.
+ * Recording is O(1); reading merges the live slices.
+ */
+export class QuoteLatencyRecorder {
+  // Map order doubles as recency order, as in QuoteSnapshotCache
+  private readonly products = new Map<number, Slice[]>();
+
+  constructor(
+    private readonly windowMs: number = DEFAULT_WINDOW_MS,
+    private readonly windows: number = DEFAULT_WINDOWS,
+    private readonly maxProducts: number = DEFAULT_MAX_PRODUCTS,
+  ) {}
+
+  record(productId: number, timings: QuoteStageTimings, now: number = Date.now()): void {
+    let ring = this.products.get(productId);
+    if (ring) {
+      this.products.delete(productId);
+    } else {
+      ring = [];
+      while (this.products.size >= this.maxProducts) {
+        this.products.delete(this.products.keys().next().value as number);
+      }
+    }
+    this.products.set(productId, ring);
+
+    const start = now - (now % this.windowMs);
+    let current = ring[ring.length - 1];
+    if (!current || current.start !== start) {
+      current = emptySlice(start);
+      ring.push(current);
+      if (ring.length > this.windows) ring.shift();
+    }
+
+    const slice = current;
+    QUOTE_STAGES.forEach((stage, s) => {
+      const ms = timings[stage];
+      slice.counts[s][bucketOf(ms)]++;
+      if (ms > slice.max[s]) slice.max[s] = ms;
+    });
+  }
+
+  /** Percentiles for one product over the rolling window, or null when nothing was recorded */
+  snapshot(productId: number, now: number = Date.now()): ProductLatency | null {
+    const ring = this.products.get(productId);
+    if (!ring) return null;
+
+    const oldest = now - (now % this.windowMs) - (this.windows - 1) * this.windowMs;
+    const live = ring.filter((w) => w.start >= oldest);
+    if (live.length === 0) return null;
+
+    const stages = {} as Record<QuoteStage, LatencyPercentiles>;
+    QUOTE_STAGES.forEach((stage, s) => {
+      const merged = new Float64Array(BUCKETS);
+      let count = 0;
+      let max = 0;
+      for (const slice of live) {
+        const counts = slice.counts[s];
+        for (let b = 0; b < BUCKETS; b++) merged[b] += counts[b];
+        max = Math.max(max, slice.max[s]);
+      }
+      for (let b = 0; b < BUCKETS; b++) count += merged[b];
+
+      const percentile = (p: number): number => {
+        if (count === 0) return 0;
+        const rank = Math.ceil(p * count);
+        let seen = 0;
+        for (let b = 0; b < BUCKETS; b++) {
+          seen += merged[b];
+          // The bucket bound can overshoot the slowest observation; never report more than max
+          if (seen >= rank) return round(Math.min(bucketUpperBound(b), max));
+        }
+        return round(max);
+      };
+
+      stages[stage] = { count, p50: percentile(0.5), p95: percentile(0.95), p99: percentile(0.99), max: round(max) };
+    });
+
+    return { productId, stages };
+  }
+
+  /** Snapshots for every product with samples in the rolling window, busiest first */
+  snapshotAll(now: number = Date.now()): ProductLatency[] {
+    const result: ProductLatency[] = [];
+    for (const productId of this.products.keys()) {
+      const latency = this.snapshot(productId, now);
+      if (latency) result.push(latency);
+    }
+    return result.sort((a, b) => b.stages.total.count - a.stages.total.count);
+  }
+
+  clear(): void {
+    this.products.clear();
+  }
+}
+
+export const quoteLatency = new QuoteLatencyRecorder();
@@ -0,0 +1,535 @@
+import { eq, and, or, isNull, sql } from 'drizzle-orm';
+import type { SQL } from 'drizzle-orm';
+import { db } from '@widget-creator/shared/db';
+import {
+  wbProducts,
+  productRecipes,
+  recipeConstraints,
+  productPriceConfigs,
+  printCostBase,
+  postprocessCost,
+  qtyDiscount,
+} from '@widget-creator/db';
+import type {
+  WbProduct,
+  ProductRecipe,
+  RecipeConstraint,
+  ProductPriceConfig,
+  PrintCostBase,
+  PostprocessCost,
+  QtyDiscount,
+} from '@widget-creator/db';
+import {
+  QUOTE_SNAPSHOT_CHANNEL,
+  parseQuoteSnapshotPayload,
+  quoteSnapshotPayload,
+  ConstraintProgram,
+} from '@widget-creator/core';
+import { notFound, ApiError } from '../middleware/error-handler.js';
+
+// @MX:ANCHOR: [AUTO] Quote snapshot cache — compiled per-product pricing/constraint data for widget runtime routes
+// @MX:REASON: fan_in >= 3: widget quote, widget init, widget order re-quote
+// @MX:SPEC: SPEC-WB-006 FR-WB006-01, FR-WB006-03, FR-WB006-04
+// @MX:WARN: [AUTO] Snapshots are per process — admin writes must NOTIFY QUOTE_SNAPSHOT_CHANNEL or wait for TTL expiry
+// @MX:REASON: admin app and widget API run as separate Next.js processes
+
+export type Selections = Record<string, string | string[] | number>;
+
+export interface QuotePricing {
+  priceMode: string;
+  printCost: number;
+  processCost: number;
+  subtotal: number;
+  discountRate: number;
+  discountAmount: number;
+  totalPrice: number;
+  pricePerUnit: number;
+  appliedDiscount: { tier: string; rate: string; label: string } | null;
+}
+
+/**
+ * Immutable, pre-indexed view of everything a widget quote needs for one product.
+ * Built once from the DB and served from memory until invalidated.
+ */
+export interface QuoteSnapshot {
+  /** Monotonic build number — a newer snapshot always has a higher version */
+  version: number;
+  builtAt: number;
+  product: WbProduct;
+  recipe: ProductRecipe;
+  priceConfig: ProductPriceConfig | null;
+  priceMode: string;
+  /** Active constraints, sorted by priority DESC at build time */
+  constraints: RecipeConstraint[];
+  /** constraints compiled into per-option-type trigger tables (shared by quote, init and orders) */
+  constraintProgram: ConstraintProgram;
+  /** Active print_cost_base rows keyed by plateType + printMode, sorted by qtyMin */
+  printCosts: Map<string, PrintCostBase[]>;
+  /** Active postprocess_cost row per processCode (product-specific wins over global) */
+  postprocessCosts: Map<string, PostprocessCost>;
+  /** Active qty_discount tiers, product-specific first, then global, each sorted by qtyMin */
+  discounts: QtyDiscount[];
+}
+
+export interface QuoteSnapshotSource {
+  product: WbProduct;
+  recipe: ProductRecipe;
+  priceConfig: ProductPriceConfig | null | undefined;
+  constraints: RecipeConstraint[];
+  printCostRows: PrintCostBase[];
+  postprocessRows: PostprocessCost[];
+  discountRows: QtyDiscount[];
+}
+
+const DEFAULT_MAX_ENTRIES = 500;
+const DEFAULT_TTL_MS = 5 * 60 * 1000;
+
+let nextVersion = 1;
+
+function printCostKey(plateType: string, printMode: string): string {
+  return `${plateType}\u0000${printMode}`;
+}
+
+/**
+ * Compile raw DB rows into a QuoteSnapshot.
+ * Pure function — all sorting and indexing happens here so the request path only does map lookups.
+ */
+export function compileQuoteSnapshot(source: QuoteSnapshotSource): QuoteSnapshot {
+  const { product, recipe, priceConfig } = source;
+
+  const constraints = source.constraints
+    .filter((c) => c.isActive)
+    .sort((a, b) => b.priority - a.priority);
+
+  const printCosts = new Map<string, PrintCostBase[]>();
+  for (const row of source.printCostRows) {
+    if (!row.isActive) continue;
+    const key = printCostKey(row.plateType, row.printMode);
+    const bucket = printCosts.get(key);
+    if (bucket) bucket.push(row);
+    else printCosts.set(key, [row]);
+  }
+  for (const bucket of printCosts.values()) {
+    bucket.sort((a, b) => a.qtyMin - b.qtyMin);
+  }
+
+  // Product-specific rows take precedence over global (productId IS NULL) rows
+  const postprocessCosts = new Map<string, PostprocessCost>();
+  const ppRows = source.postprocessRows
+    .filter((r) => r.isActive)
+    .sort((a, b) => Number(a.productId === null) - Number(b.productId === null));
+  for (const row of ppRows) {
+    if (!postprocessCosts.has(row.processCode)) {
+      postprocessCosts.set(row.processCode, row);
+    }
+  }
+
+  const discounts = source.discountRows
+    .filter((r) => r.isActive)
+    .sort(
+      (a, b) =>
+        Number(a.productId === null) - Number(b.productId === null) || a.qtyMin - b.qtyMin,
+    );
+
+  return {
+    version: nextVersion++,
+    builtAt: Date.now(),
+    product,
+    recipe,
+    priceConfig: priceConfig ?? null,
+    priceMode: priceConfig?.priceMode ?? 'LOOKUP',
+    constraints,
+    constraintProgram: new ConstraintProgram(constraints),
+    printCosts,
+    postprocessCosts,
+    discounts,
+  };
+}
+
+/** Quantity-independent pricing inputs for one selection, resolved once from the snapshot */
+interface ResolvedPricing {
+  /** LOOKUP: print cost tiers for the selected plateType + printMode */
+  printTiers: PrintCostBase[] | undefined;
+  /** AREA: print cost per unit (unit price × chargeable area), null when not priceable */
+  areaUnitCost: number | null;
+  /** Postprocess rows for the selected finishings, in selection order */
+  processRows: PostprocessCost[];
+}
+
+function resolvePricing(snapshot: QuoteSnapshot, selections: Selections): ResolvedPricing {
+  const { priceMode, priceConfig } = snapshot;
+  const plateType = typeof selections['SIZE'] === 'string' ? selections['SIZE'] : '';
+  const printMode = typeof selections['PRINT_TYPE'] === 'string' ? selections['PRINT_TYPE'] : '';
+
+  let printTiers: PrintCostBase[] | undefined;
+  let areaUnitCost: number | null = null;
+
+  if (priceMode === 'LOOKUP' && plateType && printMode) {
+    printTiers = snapshot.printCosts.get(printCostKey(plateType, printMode));
+  } else if (priceMode === 'AREA') {
+    if (priceConfig?.unitPriceSqm) {
+      const sizeStr = plateType.replace('mm', '');
+      const parts = sizeStr.split('x').map(Number);
+      if (parts.length === 2 && !isNaN(parts[0]) && !isNaN(parts[1])) {
+        const areaSqm = (parts[0] / 1000) * (parts[1] / 1000);
+        const minArea = Number(priceConfig.minAreaSqm ?? 0.1);
+        const effectiveArea = Math.max(areaSqm, minArea);
+        areaUnitCost = Number(priceConfig.unitPriceSqm) * effectiveArea;
+      }
+    }
+  }
+
+  const processRows: PostprocessCost[] = [];
+  const finishing = selections['FINISHING'];
+  if (finishing) {
+    const finishings = Array.isArray(finishing) ? finishing : [finishing];
+    for (const finishCode of finishings) {
+      const ppRow = snapshot.postprocessCosts.get(String(finishCode));
+      if (ppRow) processRows.push(ppRow);
+    }
+  }
+
+  return { printTiers, areaUnitCost, processRows };
+}
+
+function findDiscount(snapshot: QuoteSnapshot, quantity: number): QtyDiscount | undefined {
+  return snapshot.discounts.find((r) => r.qtyMin <= quantity && r.qtyMax >= quantity);
+}
+
+function priceResolved(
+  snapshot: QuoteSnapshot,
+  resolved: ResolvedPricing,
+  quantity: number,
+  discountRow: QtyDiscount | undefined,
+): QuotePricing {
+  let printCost = 0;
+  if (resolved.printTiers) {
+    const costRow = resolved.printTiers.find((r) => r.qtyMin <= quantity && r.qtyMax >= quantity);
+    if (costRow) {
+      printCost = Number(costRow.unitPrice) * quantity;
+    }
+  } else if (resolved.areaUnitCost !== null) {
+    printCost = resolved.areaUnitCost * quantity;
+  }
+
+  let processCost = 0;
+  for (const ppRow of resolved.processRows) {
+    processCost += ppRow.priceType === 'per_unit'
+      ? Number(ppRow.unitPrice) * quantity
+      : Number(ppRow.unitPrice);
+  }
+
+  const subtotal = printCost + processCost;
+
+  const discountRate = discountRow ? Number(discountRow.discountRate) : 0;
+  const discountAmount = Math.round(subtotal * discountRate);
+  const totalPrice = subtotal - discountAmount;
+  const pricePerUnit = quantity > 0 ? totalPrice / quantity : 0;
+
+  return {
+    priceMode: snapshot.priceMode,
+    printCost,
+    processCost,
+    subtotal,
+    discountRate,
+    discountAmount,
+    totalPrice,
+    pricePerUnit,
+    appliedDiscount: discountRow
+      ? {
+          tier: `${discountRow.qtyMin}~${discountRow.qtyMax}매`,
+          rate: `${(discountRate * 100).toFixed(0)}%`,
+          label: discountRow.discountLabel ?? '',
+        }
+      : null,
+  };
+}
+
+// @MX:NOTE: [AUTO] priceFromSnapshot — LOOKUP/AREA widget pricing evaluated purely from memory (zero DB queries)
+export function priceFromSnapshot(snapshot: QuoteSnapshot, selections: Selections): QuotePricing {
+  const quantity = typeof selections['QUANTITY'] === 'number' ? selections['QUANTITY'] : 1;
+  return priceResolved(snapshot, resolvePricing(snapshot, selections), quantity, findDiscount(snapshot, quantity));
+}
+
+// @MX:NOTE: [AUTO] priceMatrixFromSnapshot — one pass over quantities × variants; every cell equals priceFromSnapshot
+/**
+ * Price every quantity for every variant (option overrides merged onto the base selections).
+ * Tier/finishing rows are resolved once per variant and discount tiers once per quantity.
+ * Returns prices[variantIndex][quantityIndex].
+ */
+export function priceMatrixFromSnapshot(
+  snapshot: QuoteSnapshot,
+  base: Selections,
+  quantities: number[],
+  variants: Selections[],
+): QuotePricing[][] {
+  const discounts = quantities.map((quantity) => findDiscount(snapshot, quantity));
+
+  return variants.map((variant) => {
+    const resolved = resolvePricing(snapshot, { ...base, ...variant });
+    return quantities.map((quantity, q) => priceResolved(snapshot, resolved, quantity, discounts[q]));
+  });
+}
+
+/**
+ * Bounded LRU of compiled snapshots keyed by productId.
+ * Map insertion order doubles as recency order: a hit re-inserts the entry at the tail.
+ */
+export class QuoteSnapshotCache {
+  private readonly entries = new Map<number, QuoteSnapshot>();
+  private readonly productKeys = new Map<string, number>();
+  // Bumped on every invalidation; builds started under an older epoch are not stored
+  private epoch = 0;
+
+  constructor(
+    private readonly maxEntries: number = DEFAULT_MAX_ENTRIES,
+    private readonly ttlMs: number = DEFAULT_TTL_MS,
+  ) {}
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  get currentEpoch(): number {
+    return this.epoch;
+  }
+
+  get(productId: number): QuoteSnapshot | undefined {
+    const snapshot = this.entries.get(productId);
+    if (!snapshot) return undefined;
+
+    if (Date.now() - snapshot.builtAt > this.ttlMs) {
+      this.delete(productId);
+      return undefined;
+    }
+
+    this.entries.delete(productId);
+    this.entries.set(productId, snapshot);
+    return snapshot;
+  }
+
+  getByKey(productKey: string): QuoteSnapshot | undefined {
+    const productId = this.productKeys.get(productKey);
+    return productId === undefined ? undefined : this.get(productId);
+  }
+
+  /** Store a snapshot unless an invalidation happened after its build started */
+  set(snapshot: QuoteSnapshot, buildEpoch: number = this.epoch): void {
+    if (buildEpoch !== this.epoch) return;
+
+    const productId = snapshot.product.id;
+    this.delete(productId);
+    this.entries.set(productId, snapshot);
+    this.productKeys.set(snapshot.product.productKey, productId);
+
+    while (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value as number;
+      this.delete(oldest);
+    }
+  }
+
+  invalidate(productId: number): void {
+    this.epoch++;
+    this.delete(productId);
+  }
+
+  clear(): void {
+    this.epoch++;
+    this.entries.clear();
+    this.productKeys.clear();
+  }
+
+  private delete(productId: number): void {
+    const snapshot = this.entries.get(productId);
+    if (!snapshot) return;
+    this.entries.delete(productId);
+    if (this.productKeys.get(snapshot.product.productKey) === productId) {
+      this.productKeys.delete(snapshot.product.productKey);
+    }
+  }
+}
+
+function envInt(name: string, fallback: number): number {
+  const value = parseInt(process.env[name] ?? '', 10);
+  return Number.isFinite(value) && value > 0 ? value : fallback;
+}
+
+export const quoteSnapshotCache = new QuoteSnapshotCache(
+  envInt('QUOTE_SNAPSHOT_MAX_ENTRIES', DEFAULT_MAX_ENTRIES),
+  envInt('QUOTE_SNAPSHOT_TTL_MS', DEFAULT_TTL_MS),
+);
+
+// Concurrent misses for the same product share one build (no thundering herd on cold start)
+const inflight = new Map<string, Promise<QuoteSnapshot>>();
+
+// ─── Cross-process invalidation (Postgres LISTEN) ─────────────────────────────
+
+type ListenClient = {
+  listen?: (channel: string, onNotify: (payload: string) => void) => Promise<unknown>;
+};
+
+let listenerState: 'idle' | 'listening' | 'unavailable' = 'idle';
+
+/**
+ * Subscribe once to QUOTE_SNAPSHOT_CHANNEL. If the driver cannot LISTEN,
+ * snapshots still expire after QUOTE_SNAPSHOT_TTL_MS.
+ */
+function ensureInvalidationListener(): void {
+  if (listenerState !== 'idle') return;
+
+  const client = (db as unknown as { $client?: ListenClient }).$client;
+  if (typeof client?.listen !== 'function') {
+    listenerState = 'unavailable';
+    return;
+  }
+
+  listenerState = 'listening';
+  client
+    .listen(QUOTE_SNAPSHOT_CHANNEL, (payload) => {
+      const productId = parseQuoteSnapshotPayload(payload);
+      if (productId === null) quoteSnapshotCache.clear();
+      else quoteSnapshotCache.invalidate(productId);
+    })
+    .catch((err: unknown) => {
+      listenerState = 'idle';
+      console.warn('[QuoteSnapshot] LISTEN failed, relying on TTL expiry:', err);
+    });
+}
+
+/** Drop the snapshot for one product, or every snapshot when productId is omitted */
+export function invalidateQuoteSnapshot(productId?: number): void {
+  if (productId === undefined) quoteSnapshotCache.clear();
+  else quoteSnapshotCache.invalidate(productId);
+}
+
+/**
+ * For writes made by this process: drop the snapshot here and NOTIFY the other widget API processes.
+ * Call after the transaction that changed the source rows has committed.
+ * NOTIFY failures are logged only — other processes refresh after their TTL.
+ */
+export async function publishQuoteSnapshotChange(productId: number): Promise<void> {
+  invalidateQuoteSnapshot(productId);
+  try {
+    await db.execute(sql`SELECT pg_notify(${QUOTE_SNAPSHOT_CHANNEL}, ${quoteSnapshotPayload(productId)})`);
+  } catch (err) {
+    console.warn('[QuoteSnapshot] NOTIFY failed, other processes will refresh after TTL:', err);
+  }
+}
+
+// ─── Loading ──────────────────────────────────────────────────────────────────
+
+async function buildSnapshot(productWhere: SQL | undefined, ref: number | string): Promise<QuoteSnapshot> {
+  const buildEpoch = quoteSnapshotCache.currentEpoch;
+
+  const [product] = await db
+    .select()
+    .from(wbProducts)
+    .where(and(productWhere, eq(wbProducts.isActive, true)))
+    .limit(1);
+
+  if (!product) {
+    throw notFound('Product', ref);
+  }
+
+  const [[recipe], [priceConfig]] = await Promise.all([
+    db
+      .select()
+      .from(productRecipes)
+      .where(
+        and(
+          eq(productRecipes.productId, product.id),
+          eq(productRecipes.isDefault, true),
+          eq(productRecipes.isArchived, false),
+        ),
+      )
+      .limit(1),
+    db
+      .select()
+      .from(productPriceConfigs)
+      .where(and(eq(productPriceConfigs.productId, product.id), eq(productPriceConfigs.isActive, true)))
+      .limit(1),
+  ]);
+
+  if (!recipe) {
+    throw new ApiError(
+      'https://widget.huni.co.kr/errors/not-found',
+      'Not Found',
+      404,
+      `No active recipe found for product ${ref}`,
+    );
+  }
+
+  const [constraints, printCostRows, postprocessRows, discountRows] = await Promise.all([
+    db
+      .select()
+      .from(recipeConstraints)
+      .where(and(eq(recipeConstraints.recipeId, recipe.id), eq(recipeConstraints.isActive, true))),
+    db
+      .select()
+      .from(printCostBase)
+      .where(and(eq(printCostBase.productId, product.id), eq(printCostBase.isActive, true))),
+    db
+      .select()
+      .from(postprocessCost)
+      .where(
+        and(
+          or(eq(postprocessCost.productId, product.id), isNull(postprocessCost.productId)),
+          eq(postprocessCost.isActive, true),
+        ),
+      ),
+    db
+      .select()
+      .from(qtyDiscount)
+      .where(
+        and(
+          or(eq(qtyDiscount.productId, product.id), isNull(qtyDiscount.productId)),
+          eq(qtyDiscount.isActive, true),
+        ),
+      ),
+  ]);
+
+  const snapshot = compileQuoteSnapshot({
+    product,
+    recipe,
+    priceConfig,
+    constraints,
+    printCostRows,
+    postprocessRows,
+    discountRows,
+  });
+  quoteSnapshotCache.set(snapshot, buildEpoch);
+  return snapshot;
+}
+
+function loadOnce(inflightKey: string, build: () => Promise<QuoteSnapshot>): Promise<QuoteSnapshot> {
+  const pending = inflight.get(inflightKey);
+  if (pending) return pending;
+
+  const promise = build().finally(() => {
+    inflight.delete(inflightKey);
+  });
+  inflight.set(inflightKey, promise);
+  return promise;
+}
+
+/**
+ * Get the compiled snapshot for an active product by id.
+ * Throws 404 ApiError when the product or its default recipe does not exist.
+ */
+export async function getQuoteSnapshot(productId: number): Promise<QuoteSnapshot> {
+  ensureInvalidationListener();
+  const cached = quoteSnapshotCache.get(productId);
+  if (cached) return cached;
+  return loadOnce(`id:${productId}`, () => buildSnapshot(eq(wbProducts.id, productId), productId));
+}
+
+/**
+ * Get the compiled snapshot for an active product by productKey (widget init path).
+ * Throws 404 ApiError when the product or its default recipe does not exist.
+ */
+export async function getQuoteSnapshotByKey(productKey: string): Promise<QuoteSnapshot> {
+  ensureInvalidationListener();
+  const cached = quoteSnapshotCache.getByKey(productKey);
+  if (cached) return cached;
+  return loadOnce(`key:${productKey}`, () => buildSnapshot(eq(wbProducts.productKey, productKey), productKey));
+}
@@ -2,6 +2,8 @@ import { z } from 'zod';
 import { sql, eq, gte, and } from 'drizzle-orm';
 import { products, orders, widgets } from '@widget-creator/shared/db';
 import { router, protectedProcedure } from '../trpc.js';
+import { quoteLatency } from '../../_lib/services/quote-metrics.js';
+import { quoteLogBuffer } from '../../_lib/services/quote-log.js';
 
 export const dashboardRouter = router({
   /**
@@ -93,4 +95,23 @@ export const dashboardRouter = router({
         timestamp: p.updatedAt.toISOString(),
       }));
     }),
+
+  /**
+   * Widget quote latency: rolling p50/p95/p99 per stage (load, constraints, pricing, serialize, total)
+   * per product, plus quote log write-behind buffer counters. Served from memory of this process.
+   * SPEC-WB-006 FR-WB006-01
+   */
+  quoteLatency: protectedProcedure
+    .input(z.object({ productId: z.number().int().positive().optional() }).optional())
+    .query(({ input }) => {
+      let products = quoteLatency.snapshotAll();
+      if (input?.productId !== undefined) {
+        products = products.filter((p) => p.productId === input.productId);
+      }
+
+      return {
+        products,
+        quoteLog: quoteLogBuffer.stats(),
+      };
+    }),
 });
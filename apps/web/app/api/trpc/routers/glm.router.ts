@@ -3,12 +3,15 @@
 // @MX:SPEC: SPEC-WB-007 FR-WB007-02, FR-WB007-03
 
 import { TRPCError } from '@trpc/server';
+import { eq } from 'drizzle-orm';
 import { z } from 'zod';
 import { router, protectedProcedure } from '../trpc.js';
 import { convertConstraint, convertPriceRule, GlmConstraintOutputSchema, GlmPriceRuleOutputSchema } from '../../_lib/services/glm.service.js';
 import { transformConstraintToInsert } from '../utils/constraint-transformer.js';
 import { extractQtyDiscountTiers } from '../utils/price-rule-transformer.js';
+import { publishQuoteSnapshotChange } from '../../_lib/services/quote-snapshot.js';
 import {
+  productRecipes,
   recipeConstraints,
   constraintNlHistory,
   priceNlHistory,
@@ -57,7 +60,7 @@ export const glmRouter = router({
       const userId = ctx.user?.id ?? 'unknown';
       const glmOutput = input.glmOutput;
 
-      return await ctx.db.transaction(async (tx) => {
+      const result = await ctx.db.transaction(async (tx) => {
         // 1. Insert recipe_constraints
         const inserts = transformConstraintToInsert(glmOutput, input.recipeId, userId);
         const inserted = await tx
@@ -80,8 +83,18 @@ export const glmRouter = router({
           createdBy: userId,
         });
 
-        return { success: true, constraintIds: inserted.map((r) => r.id) };
+        const [recipe] = await tx
+          .select({ productId: productRecipes.productId })
+          .from(productRecipes)
+          .where(eq(productRecipes.id, input.recipeId));
+
+        return { success: true, constraintIds: inserted.map((r) => r.id), productId: recipe?.productId ?? null };
       });
+
+      // recipe_constraints feeds the quote snapshot — refresh it once the insert is committed
+      if (result.productId !== null) await publishQuoteSnapshotChange(result.productId);
+
+      return { success: result.success, constraintIds: result.constraintIds };
     }),
 
   // NL → Price Rule conversion (preview, no DB save)
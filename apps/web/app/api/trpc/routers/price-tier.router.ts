@@ -1,5 +1,6 @@
 import { z } from 'zod';
-import { eq, and } from 'drizzle-orm';
+import { eq, and, inArray, sql } from 'drizzle-orm';
+import type { SQL } from 'drizzle-orm';
 import { createInsertSchema } from 'drizzle-zod';
 import { priceTiers } from '@widget-creator/shared/db';
 import { createCrudRouter } from '../utils/create-crud-router.js';
@@ -21,6 +22,31 @@ const PriceTierRowSchema = z.object({
   isActive: z.boolean().default(true),
 });
 
+type PriceTierRow = z.infer<typeof PriceTierRowSchema>;
+type PriceTier = typeof priceTiers.$inferSelect;
+
+// @MX:NOTE: [AUTO] Rows per import statement — the merge UPDATE binds 7 parameters per row and the INSERT 6,
+// keeping every statement far below Postgres' 65535 bind parameter limit
+const IMPORT_BATCH_SIZE = 1000;
+
+function chunkRows<T>(rows: readonly T[]): T[][] {
+  const batches: T[][] = [];
+  for (let i = 0; i < rows.length; i += IMPORT_BATCH_SIZE) {
+    batches.push(rows.slice(i, i + IMPORT_BATCH_SIZE));
+  }
+  return batches;
+}
+
+function tierKey(optionCode: string, minQty: number): string {
+  return `${optionCode}\u0000${minQty}`;
+}
+
+/** `CASE id WHEN ... THEN ... END` so one UPDATE can give every matched row its own value */
+function caseById(updates: { id: number; row: PriceTierRow }[], value: (row: PriceTierRow) => SQL): SQL {
+  const whens = updates.map(({ id, row }) => sql`when ${id} then ${value(row)}`);
+  return sql`case ${priceTiers.id} ${sql.join(whens, sql` `)} end`;
+}
+
 const crudRouter = createCrudRouter({
   table: priceTiers,
   createSchema: createPriceTierSchema,
@@ -46,72 +72,88 @@ export const priceTierRouter = router({
     .mutation(async ({ input, ctx }) => {
       const { price_table_id, data, mode } = input;
 
+      const toValues = (row: PriceTierRow) => ({
+        priceTableId: price_table_id,
+        optionCode: row.optionCode,
+        minQty: row.minQty,
+        maxQty: row.maxQty,
+        unitPrice: row.unitPrice,
+        isActive: row.isActive,
+      });
+
       if (mode === 'replace') {
-        // Delete all existing tiers for this price table
-        await ctx.db
-          .delete(priceTiers)
-          .where(eq(priceTiers.priceTableId, price_table_id));
-
-        // Insert all new tiers
-        const inserted = await ctx.db
-          .insert(priceTiers)
-          .values(
-            data.map((row) => ({
-              priceTableId: price_table_id,
-              optionCode: row.optionCode,
-              minQty: row.minQty,
-              maxQty: row.maxQty,
-              unitPrice: row.unitPrice,
-              isActive: row.isActive,
-            })),
-          )
-          .returning();
-
-        return { mode: 'replace', imported: inserted.length, data: inserted };
+        return ctx.db.transaction(async (tx) => {
+          // Delete all existing tiers for this price table
+          await tx
+            .delete(priceTiers)
+            .where(eq(priceTiers.priceTableId, price_table_id));
+
+          // Insert all new tiers
+          const inserted: PriceTier[] = [];
+          for (const batch of chunkRows(data)) {
+            inserted.push(...await tx.insert(priceTiers).values(batch.map(toValues)).returning());
+          }
+
+          return { mode: 'replace', imported: inserted.length, data: inserted };
+        });
       }
 
-      // Merge mode: upsert by optionCode + minQty
-      const results = [];
-      for (const row of data) {
-        const [existing] = await ctx.db
-          .select()
-          .from(priceTiers)
-          .where(
-            and(
-              eq(priceTiers.priceTableId, price_table_id),
-              eq(priceTiers.optionCode, row.optionCode),
-              eq(priceTiers.minQty, row.minQty),
-            ),
-          );
-
-        if (existing) {
-          const [updated] = await ctx.db
+      // Merge mode: upsert by optionCode + minQty.
+      // @MX:NOTE: [AUTO] Set-based merge — one SELECT, UPDATE and INSERT per IMPORT_BATCH_SIZE rows, inside one transaction
+      // @MX:REASON: price_tiers has no unique key on (price_table_id, option_code, min_qty), so ON CONFLICT cannot target it
+
+      // A key repeated in the input resolves to its last row, as the per-row loop did
+      const rowsByKey = new Map<string, PriceTierRow>();
+      for (const row of data) rowsByKey.set(tierKey(row.optionCode, row.minQty), row);
+      const rows = [...rowsByKey.values()];
+
+      return ctx.db.transaction(async (tx) => {
+        const existing: Pick<PriceTier, 'id' | 'optionCode' | 'minQty'>[] = [];
+        for (const optionCodes of chunkRows([...new Set(rows.map((row) => row.optionCode))])) {
+          existing.push(...await tx
+            .select({ id: priceTiers.id, optionCode: priceTiers.optionCode, minQty: priceTiers.minQty })
+            .from(priceTiers)
+            .where(and(eq(priceTiers.priceTableId, price_table_id), inArray(priceTiers.optionCode, optionCodes))));
+        }
+        existing.sort((a, b) => a.id - b.id);
+
+        // Existing duplicates: only the oldest row per key is merged into
+        const idByKey = new Map<string, number>();
+        for (const tier of existing) {
+          const key = tierKey(tier.optionCode, tier.minQty);
+          if (!idByKey.has(key)) idByKey.set(key, tier.id);
+        }
+
+        const updates: { id: number; row: PriceTierRow }[] = [];
+        const toInsert: PriceTierRow[] = [];
+        for (const row of rows) {
+          const id = idByKey.get(tierKey(row.optionCode, row.minQty));
+          if (id === undefined) toInsert.push(row);
+          else updates.push({ id, row });
+        }
+
+        const written: PriceTier[] = [];
+        for (const batch of chunkRows(updates)) {
+          written.push(...await tx
             .update(priceTiers)
             .set({
-              maxQty: row.maxQty,
-              unitPrice: row.unitPrice,
-              isActive: row.isActive,
+              maxQty: caseById(batch, (row) => sql`${row.maxQty}::integer`),
+              unitPrice: caseById(batch, (row) => sql`${row.unitPrice}::numeric`),
+              isActive: caseById(batch, (row) => sql`${row.isActive}::boolean`),
             })
-            .where(eq(priceTiers.id, existing.id))
-            .returning();
-          results.push(updated);
-        } else {
-          const [created] = await ctx.db
-            .insert(priceTiers)
-            .values({
-              priceTableId: price_table_id,
-              optionCode: row.optionCode,
-              minQty: row.minQty,
-              maxQty: row.maxQty,
-              unitPrice: row.unitPrice,
-              isActive: row.isActive,
-            })
-            .returning();
-          results.push(created);
+            .where(inArray(priceTiers.id, batch.map((u) => u.id)))
+            .returning());
         }
-      }
+        for (const batch of chunkRows(toInsert)) {
+          written.push(...await tx.insert(priceTiers).values(batch.map(toValues)).returning());
+        }
+
+        // One entry per input row, in input order, as the per-row loop reported; a repeated key shows its final tier
+        const byKey = new Map(written.map((tier) => [tierKey(tier.optionCode, tier.minQty), tier]));
+        const results = data.map((row) => byKey.get(tierKey(row.optionCode, row.minQty))!);
 
-      return { mode: 'merge', imported: results.length, data: results };
+        return { mode: 'merge', imported: results.length, data: results };
+      });
     }),
 
   /**
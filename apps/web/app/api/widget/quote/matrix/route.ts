@@ -0,0 +1,100 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { withMiddleware } from '../../../_lib/middleware/with-middleware.js';
+import { withCors } from '../../../_lib/middleware/cors.js';
+import { withRateLimit } from '../../../_lib/middleware/rate-limit.js';
+import { ApiError } from '../../../_lib/middleware/error-handler.js';
+import { getQuoteSnapshot, priceMatrixFromSnapshot } from '../../../_lib/services/quote-snapshot.js';
+import type { Selections } from '../../../_lib/services/quote-snapshot.js';
+
+// @MX:ANCHOR: [AUTO] Widget quote matrix endpoint — prices many quantities × option variants in one call
+// @MX:REASON: Replaces per-point /api/widget/quote round trips from QuantitySlider and PriceSummary price tables
+// @MX:SPEC: SPEC-WB-006 FR-WB006-01, FR-WB006-02
+// @MX:NOTE: [AUTO] Every cell equals what POST /api/widget/quote returns for { ...selections, ...variant, QUANTITY }
+
+const MAX_MATRIX_QUANTITIES = 100;
+const MAX_MATRIX_VARIANTS = 50;
+const MAX_MATRIX_CELLS = 1000;
+
+function validationError(detail: string): ApiError {
+  return new ApiError(
+    'https://widget.huni.co.kr/errors/validation',
+    'Validation Error',
+    400,
+    detail,
+  );
+}
+
+function isSelections(value: unknown): value is Selections {
+  return !!value && typeof value === 'object' && !Array.isArray(value);
+}
+
+export const POST = withMiddleware(
+  withCors('public'),
+  withRateLimit('anonymous'),
+)(async (req: NextRequest) => {
+  let body: { productId: unknown; selections: unknown; quantities: unknown; variants?: unknown };
+  try {
+    body = await req.json() as typeof body;
+  } catch {
+    throw validationError('Invalid JSON body');
+  }
+
+  const { productId, selections, quantities, variants = [{}] } = body;
+
+  if (typeof productId !== 'number' || !productId) {
+    throw validationError('productId must be a positive number');
+  }
+
+  if (!isSelections(selections)) {
+    throw validationError('selections must be an object');
+  }
+
+  if (
+    !Array.isArray(quantities) ||
+    quantities.length === 0 ||
+    !quantities.every((q) => typeof q === 'number' && Number.isInteger(q) && q > 0)
+  ) {
+    throw validationError('quantities must be a non-empty array of positive integers');
+  }
+
+  if (!Array.isArray(variants) || variants.length === 0 || !variants.every(isSelections)) {
+    throw validationError('variants must be a non-empty array of objects');
+  }
+
+  if (
+    quantities.length > MAX_MATRIX_QUANTITIES ||
+    variants.length > MAX_MATRIX_VARIANTS ||
+    quantities.length * variants.length > MAX_MATRIX_CELLS
+  ) {
+    throw validationError(
+      `Matrix too large: at most ${MAX_MATRIX_QUANTITIES} quantities, ${MAX_MATRIX_VARIANTS} variants and ${MAX_MATRIX_CELLS} cells`,
+    );
+  }
+
+  const typedQuantities = quantities as number[];
+  const typedVariants = variants as Selections[];
+
+  // One snapshot read serves every cell
+  const snapshot = await getQuoteSnapshot(productId);
+  const prices = priceMatrixFromSnapshot(snapshot, selections, typedQuantities, typedVariants);
+
+  const rows = typedVariants.map((variant, v) => ({
+    variant,
+    cells: typedQuantities.map((quantity, q) => {
+      // QUANTITY may itself be a constraint trigger, so constraints are evaluated per cell (memoized by the program)
+      const { violations } = snapshot.constraintProgram.evaluate({ ...selections, ...variant, QUANTITY: quantity });
+      return {
+        quantity,
+        isValid: violations.length === 0,
+        pricing: prices[v]![q]!,
+        violations,
+      };
+    }),
+  }));
+
+  return NextResponse.json({
+    productId,
+    quantities: typedQuantities,
+    rows,
+  });
+});
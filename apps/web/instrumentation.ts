@@ -0,0 +1,10 @@
+// @MX:NOTE: [AUTO] Next.js startup hook — runs once per server instance before requests are served
+// @MX:NOTE: [AUTO] Selects the rate-limit backend from RATE_LIMIT_STORE (memory | postgres)
+
+export async function register(): Promise<void> {
+  // Middleware and edge bundles cannot open a Postgres connection; API routes run on the Node.js runtime
+  if (process.env.NEXT_RUNTIME !== 'nodejs') return;
+
+  const { configureRateLimitStore } = await import('./app/api/_lib/middleware/rate-limit.js');
+  await configureRateLimitStore();
+}
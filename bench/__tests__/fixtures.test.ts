@@ -0,0 +1,73 @@
+// Tests for the seeded benchmark catalogs (bench/fixtures).
+// A query that misses would make a benchmark time the error path instead of the lookup.
+
+import { describe, it, expect } from "vitest";
+import {
+  lookupTier,
+  lookupImposition,
+  lookupFixedPrice,
+  lookupPackagePrice,
+} from "../../packages/core/src/pricing/lookup.js";
+import { SIMULATION_MAX_CASES, countCombinations, toOptionChoiceSets } from "../../packages/core/src/simulation/engine.js";
+import { PriceCalculator } from "../../packages/pricing-engine/src/calculator.js";
+import { SCALES, createRng } from "../fixtures/scales.js";
+import { BENCH_PRODUCT_ID, createPricingCatalog, createSimulationInput } from "../fixtures/core-catalog.js";
+import { createPricingEngineCatalog } from "../fixtures/pricing-engine-catalog.js";
+
+const largest = SCALES.find((s) => s.name === "largest")!;
+
+describe("createRng", () => {
+  it("is deterministic per seed", () => {
+    const a = createRng(42);
+    const b = createRng(42);
+    const c = createRng(43);
+    const first = [a(), a(), a()];
+
+    expect([b(), b(), b()]).toEqual(first);
+    expect(c()).not.toBe(first[0]);
+  });
+});
+
+describe("pricing catalog", () => {
+  it("generates the same tables for the same scale", () => {
+    expect(createPricingCatalog(SCALES[0])).toEqual(createPricingCatalog(SCALES[0]));
+  });
+
+  it.each(SCALES.map((s) => [s.name, s] as const))("resolves every %s query", (_name, scale) => {
+    const c = createPricingCatalog(scale);
+
+    for (const q of c.tierQueries) {
+      expect(() => lookupTier(c.priceTiers, q.optionCode, q.quantity, q.sheetStandard)).not.toThrow();
+    }
+    for (const q of c.impositionQueries) {
+      expect(() => lookupImposition(q.cutWidth, q.cutHeight, q.sheetStandard, c.impositionRules)).not.toThrow();
+    }
+    for (const q of c.fixedPriceQueries) {
+      expect(() => lookupFixedPrice(BENCH_PRODUCT_ID, q.sizeId, q.paperId, q.printModeId, c.fixedPrices)).not.toThrow();
+    }
+    for (const q of c.packagePriceQueries) {
+      expect(() =>
+        lookupPackagePrice(BENCH_PRODUCT_ID, q.sizeId, q.printModeId, q.pageCount, q.quantity, c.packagePrices),
+      ).not.toThrow();
+    }
+  });
+});
+
+describe("simulation input", () => {
+  it("sizes the largest product at exactly SIMULATION_MAX_CASES", () => {
+    const sets = toOptionChoiceSets(createSimulationInput(largest).optionTypes);
+
+    expect(countCombinations(sets)).toBe(SIMULATION_MAX_CASES);
+  });
+});
+
+describe("pricing-engine catalog", () => {
+  it("prices every request", () => {
+    const c = createPricingEngineCatalog(SCALES[1]);
+    const calculator = new PriceCalculator(c.pricingTable, c.awkjobPricing);
+
+    const unpriced = c.requests.filter((r) => !calculator.calculate(r).isAvailable);
+
+    expect(unpriced).toEqual([]);
+  });
+});
@@ -0,0 +1,114 @@
+// Tests for the benchmark regression rules (bench/lib/regressions.ts).
+
+import { describe, it, expect } from "vitest";
+import { benchKey, collectStats, compareWithBaseline, isFailure } from "../lib/regressions.js";
+import type { Baseline, BenchStats, Thresholds, VitestBenchReport } from "../lib/regressions.js";
+
+function stats(mean: number): BenchStats {
+  return { mean, p99: mean * 2, hz: 1000 / mean, rme: 1, sampleCount: 100 };
+}
+
+function baselineOf(benchmarks: Record<string, number>): Baseline {
+  return {
+    createdAt: "2026-01-01T00:00:00.000Z",
+    node: "v22.0.0",
+    platform: "linux-x64",
+    benchmarks: Object.fromEntries(Object.entries(benchmarks).map(([name, mean]) => [name, stats(mean)])),
+  };
+}
+
+const THRESHOLDS: Thresholds = {
+  maxRegression: 0.2,
+  regressions: [{ match: "(cold", maxRegression: 0.5 }],
+  budgets: [{ match: "runSimulation > largest", maxMeanMs: 5000 }],
+};
+
+describe("benchKey", () => {
+  it("drops the bench file from the group name", () => {
+    expect(benchKey("bench/core/lookup.bench.ts > lookupTier", "small (50 tiers)")).toBe("lookupTier > small (50 tiers)");
+  });
+
+  it("keeps nested describe names", () => {
+    expect(benchKey("a.bench.ts > outer > inner", "x")).toBe("outer > inner > x");
+  });
+});
+
+describe("collectStats", () => {
+  it("flattens files and groups into keyed stats", () => {
+    const report: VitestBenchReport = {
+      files: [
+        {
+          filepath: "/repo/bench/core/simulation.bench.ts",
+          groups: [
+            {
+              fullName: "bench/core/simulation.bench.ts > runSimulation",
+              benchmarks: [{ name: "small (81 cases)", mean: 0.5, p99: 0.9, hz: 2000, rme: 1.2, sampleCount: 900 }],
+            },
+          ],
+        },
+      ],
+    };
+
+    expect(collectStats(report)).toEqual({
+      "runSimulation > small (81 cases)": { mean: 0.5, p99: 0.9, hz: 2000, rme: 1.2, sampleCount: 900 },
+    });
+  });
+});
+
+describe("compareWithBaseline", () => {
+  it("flags a slowdown beyond maxRegression", () => {
+    const [result] = compareWithBaseline({ "lookupTier > small": stats(1.3) }, baselineOf({ "lookupTier > small": 1 }), THRESHOLDS);
+
+    expect(result.status).toBe("regressed");
+    expect(result.change).toBeCloseTo(0.3);
+    expect(isFailure(result)).toBe(true);
+  });
+
+  it("accepts changes within maxRegression and reports large speedups", () => {
+    const results = compareWithBaseline(
+      { a: stats(1.1), b: stats(0.5) },
+      baselineOf({ a: 1, b: 1 }),
+      THRESHOLDS,
+    );
+
+    expect(results.map((r) => r.status)).toEqual(["ok", "improved"]);
+    expect(results.some(isFailure)).toBe(false);
+  });
+
+  it("applies the last matching per-benchmark override", () => {
+    const [result] = compareWithBaseline(
+      { "lookupTier (cold index) > small": stats(1.4) },
+      baselineOf({ "lookupTier (cold index) > small": 1 }),
+      THRESHOLDS,
+    );
+
+    expect(result.maxRegression).toBe(0.5);
+    expect(result.status).toBe("ok");
+  });
+
+  it("marks benchmarks without a baseline entry as new", () => {
+    const [result] = compareWithBaseline({ "lookupTier > small": stats(1) }, null, THRESHOLDS);
+
+    expect(result.status).toBe("new");
+    expect(result.change).toBeNull();
+    expect(isFailure(result)).toBe(false);
+  });
+
+  it("fails an over-budget benchmark even without a baseline", () => {
+    const [result] = compareWithBaseline({ "runSimulation > largest (10000 cases)": stats(5200) }, null, THRESHOLDS);
+
+    expect(result.status).toBe("over-budget");
+    expect(result.budgetMs).toBe(5000);
+    expect(isFailure(result)).toBe(true);
+  });
+
+  it("checks the budget before the relative threshold", () => {
+    const [result] = compareWithBaseline(
+      { "runSimulation > largest (10000 cases)": stats(6000) },
+      baselineOf({ "runSimulation > largest (10000 cases)": 5900 }),
+      THRESHOLDS,
+    );
+
+    expect(result.status).toBe("over-budget");
+  });
+});
@@ -0,0 +1,145 @@
+// @MX:NOTE: [AUTO] Benchmark gate — compares vitest bench JSON output with bench/baseline.json and absolute budgets
+// @MX:NOTE: [AUTO] Flags: --results=, --baseline=, --thresholds=, --report=, --max-regression=0.25, --update-baseline
+// @MX:WARN: [AUTO] Baselines are machine-specific — record them with bench:baseline on the machine that runs bench:check
+// @MX:REASON: Relative thresholds only mean something when both runs share hardware and Node version
+
+import * as fs from "fs";
+import * as path from "path";
+import { collectStats, compareWithBaseline, isFailure } from "./lib/regressions.js";
+import type { Baseline, BenchResult, Thresholds, VitestBenchReport } from "./lib/regressions.js";
+
+// ---------------------------------------------------------------------------
+// CLI Flags
+// ---------------------------------------------------------------------------
+
+const LABEL = "[bench/check]";
+
+const args = process.argv.slice(2);
+
+function flag(name: string, fallback: string): string {
+  const arg = args.find((a) => a.startsWith(`--${name}=`));
+  return arg ? arg.slice(name.length + 3) : fallback;
+}
+
+const resultsPath = path.resolve(
+  flag("results", process.env.BENCH_OUTPUT_JSON ?? path.join(__dirname, "results/latest.json")),
+);
+const baselinePath = path.resolve(flag("baseline", path.join(__dirname, "baseline.json")));
+const thresholdsPath = path.resolve(flag("thresholds", path.join(__dirname, "thresholds.json")));
+const reportPath = path.resolve(flag("report", path.join(__dirname, "results/report.json")));
+const maxRegressionArg = flag("max-regression", "");
+const isUpdateBaseline = args.includes("--update-baseline");
+
+const PLATFORM = `${process.platform}-${process.arch}`;
+
+// ---------------------------------------------------------------------------
+// Helpers
+// ---------------------------------------------------------------------------
+
+function readJson<T>(file: string): T {
+  return JSON.parse(fs.readFileSync(file, "utf-8")) as T;
+}
+
+function writeJson(file: string, value: unknown): void {
+  fs.mkdirSync(path.dirname(file), { recursive: true });
+  fs.writeFileSync(file, `${JSON.stringify(value, null, 2)}\n`);
+}
+
+function formatMs(ms: number): string {
+  if (ms >= 100) return `${ms.toFixed(0)}ms`;
+  if (ms >= 1) return `${ms.toFixed(2)}ms`;
+  return `${(ms * 1000).toFixed(1)}µs`;
+}
+
+function printTable(results: BenchResult[]): void {
+  const width = Math.max(...results.map((r) => r.name.length));
+  for (const r of results) {
+    const change = r.change === null ? "" : `${r.change >= 0 ? "+" : ""}${(r.change * 100).toFixed(1)}%`;
+    const baseline = r.baselineMean === null ? "-" : formatMs(r.baselineMean);
+    const budget = r.budgetMs === null ? "" : ` (budget ${formatMs(r.budgetMs)})`;
+    console.log(
+      `${LABEL} ${r.status.padEnd(11)} ${r.name.padEnd(width)} ${formatMs(r.mean).padStart(9)}  ` +
+        `baseline ${baseline.padStart(9)} ${change.padStart(8)}${budget}`,
+    );
+  }
+}
+
+// ---------------------------------------------------------------------------
+// Main
+// ---------------------------------------------------------------------------
+
+function main(): void {
+  if (!fs.existsSync(resultsPath)) {
+    console.error(`${LABEL} No benchmark results at ${resultsPath} — run \`pnpm bench\` first`);
+    process.exit(1);
+  }
+
+  const current = collectStats(readJson<VitestBenchReport>(resultsPath));
+  if (Object.keys(current).length === 0) {
+    console.error(`${LABEL} ${resultsPath} contains no benchmarks`);
+    process.exit(1);
+  }
+
+  if (isUpdateBaseline) {
+    const baseline: Baseline = {
+      createdAt: new Date().toISOString(),
+      node: process.version,
+      platform: PLATFORM,
+      benchmarks: current,
+    };
+    writeJson(baselinePath, baseline);
+    console.log(`${LABEL} Baseline with ${Object.keys(current).length} benchmarks written to ${baselinePath}`);
+    return;
+  }
+
+  const thresholds = readJson<Thresholds>(thresholdsPath);
+  if (maxRegressionArg) {
+    const value = Number(maxRegressionArg);
+    if (!Number.isFinite(value) || value < 0) {
+      console.error(`${LABEL} --max-regression must be a non-negative number, got "${maxRegressionArg}"`);
+      process.exit(1);
+    }
+    // The flag replaces the default and every per-benchmark override; budgets still apply
+    thresholds.maxRegression = value;
+    thresholds.regressions = [];
+  }
+
+  const baseline = fs.existsSync(baselinePath) ? readJson<Baseline>(baselinePath) : null;
+  if (!baseline) {
+    console.warn(
+      `${LABEL} No baseline at ${baselinePath} — only absolute budgets are checked (record one with \`pnpm bench:baseline\`)`,
+    );
+  } else if (baseline.node !== process.version || baseline.platform !== PLATFORM) {
+    console.warn(
+      `${LABEL} Baseline was recorded on ${baseline.platform} / Node ${baseline.node}, ` +
+        `this run is ${PLATFORM} / Node ${process.version}`,
+    );
+  }
+
+  const results = compareWithBaseline(current, baseline, thresholds);
+  printTable(results);
+
+  const missing = baseline ? Object.keys(baseline.benchmarks).filter((name) => !(name in current)) : [];
+  for (const name of missing) {
+    console.warn(`${LABEL} missing     ${name} (in baseline, not in this run)`);
+  }
+
+  const failed = results.filter(isFailure);
+  writeJson(reportPath, {
+    createdAt: new Date().toISOString(),
+    results: resultsPath,
+    baseline: baseline ? baselinePath : null,
+    passed: failed.length === 0,
+    benchmarks: results,
+    missing,
+  });
+  console.log(`${LABEL} Report written to ${reportPath}`);
+
+  if (failed.length > 0) {
+    console.error(`${LABEL} ${failed.length} benchmark(s) regressed or exceeded their budget`);
+    process.exit(1);
+  }
+  console.log(`${LABEL} ${results.length} benchmarks within thresholds`);
+}
+
+main();
@@ -0,0 +1,19 @@
+// Constraint evaluation (packages/core/src/constraints/evaluator.ts).
+// Each iteration evaluates every seeded selection state against one product's constraint set.
+
+import { bench, describe } from 'vitest';
+import { evaluateConstraints } from '../../packages/core/src/constraints/evaluator.js';
+import { SCALES } from '../fixtures/scales.js';
+import { createConstraintCatalog } from '../fixtures/core-catalog.js';
+
+const catalogs = SCALES.map((scale) => ({ scale, catalog: createConstraintCatalog(scale) }));
+
+describe('evaluateConstraints', () => {
+  for (const { scale, catalog } of catalogs) {
+    bench(`${scale.name} (${scale.constraints} constraints x ${catalog.inputs.length} selections)`, () => {
+      for (const input of catalog.inputs) {
+        evaluateConstraints(input);
+      }
+    });
+  }
+});
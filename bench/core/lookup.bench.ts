@@ -0,0 +1,72 @@
+// Pricing table lookups (packages/core/src/pricing/lookup.ts).
+// Each iteration resolves LOOKUPS_PER_ITERATION seeded queries against one scale's tables.
+
+import { bench, describe } from 'vitest';
+import {
+  lookupTier,
+  lookupImposition,
+  lookupFixedPrice,
+  lookupPackagePrice,
+} from '../../packages/core/src/pricing/lookup.js';
+import { SCALES } from '../fixtures/scales.js';
+import { BENCH_PRODUCT_ID, createPricingCatalog } from '../fixtures/core-catalog.js';
+
+const catalogs = SCALES.map((scale) => ({ scale, catalog: createPricingCatalog(scale) }));
+
+describe('lookupTier', () => {
+  for (const { scale, catalog } of catalogs) {
+    bench(`${scale.name} (${catalog.priceTiers.length} tiers)`, () => {
+      for (const q of catalog.tierQueries) {
+        lookupTier(catalog.priceTiers, q.optionCode, q.quantity, q.sheetStandard);
+      }
+    });
+  }
+});
+
+// @MX:NOTE: [AUTO] Indexes are cached per table array; a fresh copy per iteration measures the index build a cold quote pays
+describe('lookupTier (cold index)', () => {
+  for (const { scale, catalog } of catalogs) {
+    bench(`${scale.name} (${catalog.priceTiers.length} tiers)`, () => {
+      const tiers = catalog.priceTiers.slice();
+      const q = catalog.tierQueries[0];
+      lookupTier(tiers, q.optionCode, q.quantity, q.sheetStandard);
+    });
+  }
+});
+
+describe('lookupImposition', () => {
+  for (const { scale, catalog } of catalogs) {
+    bench(`${scale.name} (${catalog.impositionRules.length} rules)`, () => {
+      for (const q of catalog.impositionQueries) {
+        lookupImposition(q.cutWidth, q.cutHeight, q.sheetStandard, catalog.impositionRules);
+      }
+    });
+  }
+});
+
+describe('lookupFixedPrice', () => {
+  for (const { scale, catalog } of catalogs) {
+    bench(`${scale.name} (${catalog.fixedPrices.length} rows)`, () => {
+      for (const q of catalog.fixedPriceQueries) {
+        lookupFixedPrice(BENCH_PRODUCT_ID, q.sizeId, q.paperId, q.printModeId, catalog.fixedPrices);
+      }
+    });
+  }
+});
+
+describe('lookupPackagePrice', () => {
+  for (const { scale, catalog } of catalogs) {
+    bench(`${scale.name} (${catalog.packagePrices.length} rows)`, () => {
+      for (const q of catalog.packagePriceQueries) {
+        lookupPackagePrice(
+          BENCH_PRODUCT_ID,
+          q.sizeId,
+          q.printModeId,
+          q.pageCount,
+          q.quantity,
+          catalog.packagePrices,
+        );
+      }
+    });
+  }
+});
@@ -0,0 +1,34 @@
+// Admin simulation (packages/core/src/simulation/engine.ts).
+// The largest scale is exactly SIMULATION_MAX_CASES combinations — the "< 5 sec per 10K cases" budget
+// in bench/thresholds.json applies to it.
+
+import { bench, describe } from 'vitest';
+import { cartesianProduct, runSimulation, toOptionChoiceSets } from '../../packages/core/src/simulation/engine.js';
+import { SCALES } from '../fixtures/scales.js';
+import type { CatalogScale } from '../fixtures/scales.js';
+import { createSimulationInput } from '../fixtures/core-catalog.js';
+
+const inputs = SCALES.map((scale) => {
+  const input = createSimulationInput(scale);
+  return { scale, input, optionSets: toOptionChoiceSets(input.optionTypes) };
+});
+
+function cases(scale: CatalogScale): number {
+  return scale.choicesPerType ** scale.optionTypes;
+}
+
+describe('runSimulation', () => {
+  for (const { scale, input } of inputs) {
+    bench(`${scale.name} (${cases(scale)} cases)`, async () => {
+      await runSimulation(input);
+    });
+  }
+});
+
+describe('cartesianProduct', () => {
+  for (const { scale, optionSets } of inputs) {
+    bench(`${scale.name} (${cases(scale)} combinations)`, () => {
+      cartesianProduct(optionSets);
+    });
+  }
+});
@@ -0,0 +1,324 @@
+// Seeded synthetic catalogs for @widget-creator/core: pricing lookup tables,
+// constraint evaluation input and simulation input at a given CatalogScale.
+
+import type {
+  PriceTier,
+  ImpositionRule,
+  FixedPriceRecord,
+  PackagePriceRecord,
+} from '../../packages/core/src/pricing/types.js';
+import type { OptionConstraint, OptionChoice, SelectedOption } from '../../packages/core/src/options/types.js';
+import type { ConstraintEvalInput, Paper } from '../../packages/core/src/constraints/types.js';
+import type { SimulationInput, OptionType, SimulationConstraint } from '../../packages/core/src/simulation/engine.js';
+import { createRng, pick, quantityBands, randomInt, LOOKUPS_PER_ITERATION } from './scales.js';
+import type { CatalogScale, Rng } from './scales.js';
+
+export const BENCH_PRODUCT_ID = 1;
+
+const SHEET_STANDARDS = ['A3', 'T3', '4X6'] as const;
+const PAGE_COUNTS = [4, 8, 12, 16, 24, 32];
+
+// ─── Pricing lookups ──────────────────────────────────────────────────────────
+
+export interface TierQuery {
+  optionCode: string;
+  quantity: number;
+  sheetStandard: string | null;
+}
+
+export interface ImpositionQuery {
+  cutWidth: number;
+  cutHeight: number;
+  sheetStandard: string;
+}
+
+export interface FixedPriceQuery {
+  sizeId: number | null;
+  paperId: number | null;
+  printModeId: number | null;
+}
+
+export interface PackagePriceQuery {
+  sizeId: number;
+  printModeId: number;
+  pageCount: number;
+  quantity: number;
+}
+
+export interface PricingCatalog {
+  priceTiers: PriceTier[];
+  impositionRules: ImpositionRule[];
+  fixedPrices: FixedPriceRecord[];
+  packagePrices: PackagePriceRecord[];
+  /** LOOKUPS_PER_ITERATION queries per table, all of which resolve */
+  tierQueries: TierQuery[];
+  impositionQueries: ImpositionQuery[];
+  fixedPriceQueries: FixedPriceQuery[];
+  packagePriceQueries: PackagePriceQuery[];
+}
+
+export function createPricingCatalog(scale: CatalogScale): PricingCatalog {
+  const rng = createRng(scale.seed);
+  const bands = quantityBands(scale.quantityBands);
+
+  const priceTiers: PriceTier[] = [];
+  const codeSheets: Array<{ code: string; sheet: string | null }> = [];
+  for (let c = 0; c < scale.tierCodes; c++) {
+    const code = `OPT_${String(c).padStart(4, '0')}`;
+    // A third of the codes are sheet-independent (sheetStandard null)
+    const sheet = rng() < 0.33 ? null : pick(rng, SHEET_STANDARDS);
+    codeSheets.push({ code, sheet });
+    let unitPrice = randomInt(rng, 200, 2_000);
+    for (const band of bands) {
+      priceTiers.push({ optionCode: code, ...band, unitPrice, sheetStandard: sheet });
+      unitPrice = Math.max(10, Math.round(unitPrice * 0.92));
+    }
+  }
+
+  const impositionRules: ImpositionRule[] = [];
+  for (let s = 0; s < scale.sizes; s++) {
+    const cutWidth = randomInt(rng, 50, 400);
+    const cutHeight = randomInt(rng, 50, 400);
+    for (const sheet of SHEET_STANDARDS) {
+      impositionRules.push({ cutWidth, cutHeight, sheetStandard: sheet, impositionCount: randomInt(rng, 1, 32) });
+    }
+  }
+
+  const fixedPrices: FixedPriceRecord[] = [];
+  for (let s = 1; s <= scale.sizes; s++) {
+    for (let p = 1; p <= scale.papers; p++) {
+      fixedPrices.push({
+        productId: BENCH_PRODUCT_ID,
+        sizeId: s,
+        paperId: p,
+        printModeId: rng() < 0.5 ? null : randomInt(rng, 1, scale.printMethods),
+        sellingPrice: randomInt(rng, 1_000, 90_000),
+        costPrice: randomInt(rng, 500, 40_000),
+        baseQty: pick(rng, [1, 10, 100]),
+      });
+    }
+  }
+  // Product-wide fallback row so wildcard queries always resolve
+  fixedPrices.push({
+    productId: BENCH_PRODUCT_ID,
+    sizeId: null,
+    paperId: null,
+    printModeId: null,
+    sellingPrice: 10_000,
+    costPrice: 5_000,
+    baseQty: 1,
+  });
+
+  const packagePrices: PackagePriceRecord[] = [];
+  const packageBands = bands.slice(0, Math.max(2, Math.ceil(bands.length / 2)));
+  packageBands[packageBands.length - 1] = { ...packageBands[packageBands.length - 1], maxQty: 1_000_000 };
+  for (let s = 1; s <= scale.sizes; s++) {
+    for (let m = 1; m <= scale.printMethods; m++) {
+      for (const pageCount of PAGE_COUNTS) {
+        for (const band of packageBands) {
+          packagePrices.push({
+            productId: BENCH_PRODUCT_ID,
+            sizeId: s,
+            printModeId: m,
+            pageCount,
+            ...band,
+            sellingPrice: randomInt(rng, 5_000, 500_000),
+          });
+        }
+      }
+    }
+  }
+
+  const maxQty = bands[bands.length - 1].minQty * 2;
+  const tierQueries: TierQuery[] = [];
+  const impositionQueries: ImpositionQuery[] = [];
+  const fixedPriceQueries: FixedPriceQuery[] = [];
+  const packagePriceQueries: PackagePriceQuery[] = [];
+
+  for (let i = 0; i < LOOKUPS_PER_ITERATION; i++) {
+    const { code, sheet } = pick(rng, codeSheets);
+    tierQueries.push({ optionCode: code, quantity: randomInt(rng, 1, maxQty), sheetStandard: sheet });
+
+    const rule = pick(rng, impositionRules);
+    // Sub-tolerance jitter exercises the 0.5mm matching path
+    impositionQueries.push({
+      cutWidth: rule.cutWidth + (rng() - 0.5) * 0.6,
+      cutHeight: rule.cutHeight + (rng() - 0.5) * 0.6,
+      sheetStandard: rule.sheetStandard,
+    });
+
+    fixedPriceQueries.push({
+      sizeId: randomInt(rng, 1, scale.sizes),
+      paperId: randomInt(rng, 1, scale.papers),
+      printModeId: rng() < 0.3 ? null : randomInt(rng, 1, scale.printMethods),
+    });
+
+    packagePriceQueries.push({
+      sizeId: randomInt(rng, 1, scale.sizes),
+      printModeId: randomInt(rng, 1, scale.printMethods),
+      pageCount: pick(rng, PAGE_COUNTS),
+      quantity: randomInt(rng, 1, maxQty),
+    });
+  }
+
+  return {
+    priceTiers,
+    impositionRules,
+    fixedPrices,
+    packagePrices,
+    tierQueries,
+    impositionQueries,
+    fixedPriceQueries,
+    packagePriceQueries,
+  };
+}
+
+// ─── Constraint evaluation ────────────────────────────────────────────────────
+
+const CONSTRAINT_TYPES = ['size_show', 'size_range', 'paper_condition'] as const;
+
+function randomSize(rng: Rng): { width: number; height: number } {
+  return { width: randomInt(rng, 5, 60) * 5, height: randomInt(rng, 5, 60) * 5 };
+}
+
+/** One selection state per iteration slot; sizes and papers are drawn from the catalog */
+export interface ConstraintCatalog {
+  inputs: ConstraintEvalInput[];
+}
+
+export function createConstraintCatalog(scale: CatalogScale, selectionStates = 64): ConstraintCatalog {
+  const rng = createRng(scale.seed ^ 0xc0_57);
+
+  const sizes = Array.from({ length: scale.sizes }, () => randomSize(rng));
+  const papers: Paper[] = Array.from({ length: scale.papers }, (_, i) => ({
+    id: i + 1,
+    name: `Paper ${i + 1}`,
+    weight: pick(rng, [80, 100, 120, 150, 180, 200, 250, 300, 350]),
+    costPer4Cut: randomInt(rng, 20, 200),
+    sellingPer4Cut: randomInt(rng, 40, 400),
+  }));
+
+  const constraints: OptionConstraint[] = [];
+  for (let i = 0; i < scale.constraints; i++) {
+    const constraintType = pick(rng, CONSTRAINT_TYPES);
+    const base = {
+      id: i + 1,
+      productId: BENCH_PRODUCT_ID,
+      constraintType,
+      targetField: `option_${randomInt(rng, 1, Math.max(2, scale.optionTypes * 2))}`,
+      priority: randomInt(rng, 1, 100),
+      // A few inactive rows, like real catalogs carry
+      isActive: rng() > 0.05,
+      description: null,
+      valueMin: null,
+      valueMax: null,
+      targetValue: null,
+    };
+
+    if (constraintType === 'size_show') {
+      const size = pick(rng, sizes);
+      constraints.push({
+        ...base,
+        sourceField: 'size',
+        operator: rng() < 0.8 ? 'eq' : 'neq',
+        value: `${size.width}x${size.height}`,
+        targetValue: `choice_${i}`,
+      });
+    } else if (constraintType === 'size_range') {
+      const min = randomInt(rng, 10, 50);
+      const max = randomInt(rng, 100, 300);
+      constraints.push({
+        ...base,
+        sourceField: 'foilSize',
+        operator: 'between',
+        value: null,
+        valueMin: `${min}x${min}`,
+        valueMax: `${max}x${max}`,
+      });
+    } else {
+      constraints.push({
+        ...base,
+        sourceField: 'paperType',
+        operator: pick(rng, ['gte', 'lte', 'eq']),
+        value: String(pick(rng, [120, 180, 250])),
+      });
+    }
+  }
+
+  const allChoices: OptionChoice[] = Array.from({ length: scale.optionTypes * scale.choicesPerType }, (_, i) => ({
+    id: i + 1,
+    optionDefinitionId: Math.floor(i / scale.choicesPerType) + 1,
+    code: `choice_${i}`,
+    label: `Choice ${i}`,
+    priceKey: null,
+    refPaperId: null,
+    refPrintModeId: null,
+    refSizeId: null,
+    isDefault: i % scale.choicesPerType === 0,
+    sortOrder: i % scale.choicesPerType,
+  }));
+
+  const inputs: ConstraintEvalInput[] = [];
+  for (let i = 0; i < selectionStates; i++) {
+    const size = pick(rng, sizes);
+    const paper = pick(rng, papers);
+    const currentSelections = new Map<string, SelectedOption>([
+      ['size', { optionKey: 'size', choiceCode: `${size.width}x${size.height}`, cutWidth: size.width, cutHeight: size.height }],
+      ['paperType', { optionKey: 'paperType', choiceCode: `paper_${paper.id}`, refPaperId: paper.id }],
+    ]);
+    inputs.push({
+      productId: BENCH_PRODUCT_ID,
+      currentSelections,
+      // Same array every time: evaluateConstraints compiles it once per array
+      constraints,
+      dependencies: [],
+      allChoices,
+      papers,
+    });
+  }
+
+  return { inputs };
+}
+
+// ─── Simulation ───────────────────────────────────────────────────────────────
+
+export function createSimulationInput(scale: CatalogScale): SimulationInput {
+  const rng = createRng(scale.seed ^ 0x51_4a);
+
+  const optionTypes: OptionType[] = Array.from({ length: scale.optionTypes }, (_, t) => ({
+    id: t + 1,
+    key: `TYPE_${t}`,
+    name: `Type ${t}`,
+    choices: Array.from({ length: scale.choicesPerType }, (_, c) => ({
+      id: t * 100 + c + 1,
+      code: `T${t}C${c}`,
+      name: `Choice ${c}`,
+      isActive: true,
+    })),
+  }));
+
+  const constraints: SimulationConstraint[] = Array.from({ length: scale.constraints }, (_, i) => {
+    const source = randomInt(rng, 0, scale.optionTypes - 1);
+    let target = randomInt(rng, 0, scale.optionTypes - 1);
+    if (target === source) target = (target + 1) % scale.optionTypes;
+    return {
+      id: i + 1,
+      productId: BENCH_PRODUCT_ID,
+      constraintType: 'combination',
+      sourceField: `TYPE_${source}`,
+      sourceValue: `T${source}C${randomInt(rng, 0, scale.choicesPerType - 1)}`,
+      targetField: `TYPE_${target}`,
+      targetValue: `T${target}C${randomInt(rng, 0, scale.choicesPerType - 1)}`,
+      action: pick(rng, ['error', 'warn', 'warn', 'show'] as const),
+      message: `Constraint ${i + 1}`,
+      isActive: rng() > 0.05,
+    };
+  });
+
+  return {
+    productId: BENCH_PRODUCT_ID,
+    optionTypes,
+    constraints,
+    priceConfig: { pricingModel: 'fixed_unit', basePrice: 12_000 },
+  };
+}
@@ -0,0 +1,37 @@
+// In-memory stand-in for the Drizzle client behind @widget-creator/shared/db.
+//
+// Reads are routed by table name to the rows of the active catalog (predicates are not
+// evaluated — the catalog holds exactly one product's rows), and resolve on a microtask
+// like a pooled driver would on a local socket. Inserts are accepted and discarded.
+// Benchmarks through it measure the route's own CPU cost, not Postgres.
+
+import { getTableName } from 'drizzle-orm';
+import type { Table } from 'drizzle-orm';
+import type { RowsByTable } from './widget-catalog.js';
+
+let activeRows: RowsByTable = {};
+
+function resultChain(rows: unknown[]) {
+  const chain = {
+    where: () => chain,
+    innerJoin: () => chain,
+    orderBy: () => chain,
+    limit: (n: number) => Promise.resolve(rows.slice(0, n)),
+    then: <T>(resolve: (v: unknown[]) => T, reject?: (e: unknown) => T) => Promise.resolve(rows).then(resolve, reject),
+  };
+  return chain;
+}
+
+export const memoryDb = {
+  select: () => ({
+    from: (table: Table) => resultChain(activeRows[getTableName(table)] ?? []),
+  }),
+  insert: () => ({
+    values: () => Promise.resolve(),
+  }),
+};
+
+/** Serve this catalog's rows from now on */
+export function useCatalogRows(rows: RowsByTable): void {
+  activeRows = rows;
+}
@@ -0,0 +1,319 @@
+// Seeded synthetic WowPress-style products for @widget-creator/pricing-engine:
+// ProductData for the OptionEngine and pricing / awkjob tables for the PriceCalculator.
+
+import type {
+  PrintProduct,
+  ProductSize,
+  ProductPaper,
+  ProductColor,
+  ProductPrintMethod,
+  ProductPostProcess,
+  ProductOrderQty,
+  PricingTable,
+} from '../../packages/shared/src/types/print-product.js';
+import type { OptionSelection, AwkjobSelection } from '../../packages/shared/src/types/option-types.js';
+import type { PriceCalculationRequest } from '../../packages/shared/src/types/pricing-types.js';
+import type { ProductData, OptionLevel } from '../../packages/pricing-engine/src/types.js';
+import type { AwkjobPricingEntry } from '../../packages/pricing-engine/src/calculator.js';
+import type { AwkjobData } from '../../packages/pricing-engine/src/constraints/post-process-constraint.js';
+import { createRng, pick, randomInt, LOOKUPS_PER_ITERATION } from './scales.js';
+import type { CatalogScale, Rng } from './scales.js';
+
+const PRODUCT_ID = 'bench-product';
+const ORDER_QUANTITIES = [100, 200, 300, 500, 1000, 2000, 3000, 5000, 10000];
+const AWKJOBS_PER_GROUP = 4;
+
+/** Share of (size, paper, color) combinations with their own price rows; the rest hit the paper wildcard row */
+const EXACT_PRICE_SHARE = 0.25;
+
+export interface PricingEngineCatalog {
+  productData: ProductData;
+  pricingTable: PricingTable[];
+  awkjobPricing: AwkjobPricingEntry[];
+  /** LOOKUPS_PER_ITERATION complete requests, all of which price */
+  requests: PriceCalculationRequest[];
+  /** LOOKUPS_PER_ITERATION complete selections with post-processes */
+  selections: OptionSelection[];
+  /** Click-through paths: each is the ordered selectOption calls a customer makes */
+  cascades: Array<Array<{ level: OptionLevel; value: number }>>;
+}
+
+function maybe<T>(rng: Rng, probability: number, value: () => T): T | null {
+  return rng() < probability ? value() : null;
+}
+
+function pickSome<T>(rng: Rng, items: readonly T[], max: number): T[] {
+  const count = randomInt(rng, 1, Math.min(max, items.length));
+  const picked = new Set<T>();
+  while (picked.size < count) picked.add(pick(rng, items));
+  return [...picked];
+}
+
+export function createPricingEngineCatalog(scale: CatalogScale): PricingEngineCatalog {
+  const rng = createRng(scale.seed ^ 0x9e_11);
+
+  const product: PrintProduct = {
+    id: PRODUCT_ID,
+    externalId: 40000 + scale.seed % 1000,
+    name: `Bench product (${scale.name})`,
+    categoryId: 'cat-bench',
+    selType: 'option',
+    pjoin: 0,
+    unit: 'ea',
+    fileTypes: ['pdf', 'ai'],
+    coverInfo: null,
+    deliveryGroupNo: 1,
+    deliveryGroupName: 'Standard',
+    deliveryPrepay: false,
+    cutoffTime: '14:00',
+    syncedAt: new Date('2025-01-01'),
+    rawData: null,
+  };
+
+  const sizeNos = Array.from({ length: scale.sizes }, (_, i) => 5000 + i);
+  const paperNos = Array.from({ length: scale.papers }, (_, i) => 2000 + i);
+  const colorNos = Array.from({ length: scale.colors }, (_, i) => 300 + i);
+  const jobPresetNos = Array.from({ length: scale.printMethods }, (_, i) => 3100 + i);
+  const awkjobNos = Array.from({ length: scale.postProcesses }, (_, i) => 30000 + i);
+
+  const sizes: ProductSize[] = sizeNos.map((sizeNo, i) => ({
+    id: `size-${i}`,
+    productId: PRODUCT_ID,
+    externalSizeNo: sizeNo,
+    coverCd: 0,
+    sizeName: `Size ${i}`,
+    width: randomInt(rng, 50, 420),
+    height: randomInt(rng, 50, 600),
+    cutSize: 2,
+    isNonStandard: false,
+    reqWidth: null,
+    reqHeight: null,
+    reqAwkjob: null,
+    rstOrdqty: maybe(rng, 0.2, () => ({ ordqtymin: 100, ordqtymax: 5000 })),
+    rstAwkjob: maybe(rng, 0.2, () => [{ jobno: pick(rng, awkjobNos), jobname: 'Restricted' }]),
+  }));
+
+  const papers: ProductPaper[] = paperNos.map((paperNo, i) => ({
+    id: `paper-${i}`,
+    productId: PRODUCT_ID,
+    externalPaperNo: paperNo,
+    coverCd: 0,
+    paperName: `Paper ${i}`,
+    paperGroup: `Group ${i % 8}`,
+    pGram: pick(rng, [80, 100, 120, 150, 180, 200, 250, 300]),
+    reqWidth: null,
+    reqHeight: null,
+    reqAwkjob: null,
+    rstOrdqty: null,
+    rstPrsjob: maybe(rng, 0.1, () => [{ jobno: pick(rng, jobPresetNos), jobname: 'Restricted' }]),
+    rstAwkjob: maybe(rng, 0.15, () => [{ jobno: pick(rng, awkjobNos), jobname: 'Restricted' }]),
+  }));
+
+  const colors: ProductColor[] = colorNos.map((colorNo, i) => ({
+    id: `color-${i}`,
+    productId: PRODUCT_ID,
+    externalColorNo: colorNo,
+    coverCd: 0,
+    pageCd: 0,
+    colorName: `Color ${i}`,
+    pdfPage: i % 2 === 0 ? 1 : 2,
+    isAdditional: false,
+    reqPrsjob: null,
+    reqAwkjob: null,
+    rstPrsjob: null,
+    rstAwkjob: null,
+  }));
+
+  const printMethods: ProductPrintMethod[] = jobPresetNos.map((jobPresetNo, i) => {
+    const rstPaper = maybe(rng, 0.3, () =>
+      pickSome(rng, paperNos, 3).map((paperno) => ({ paperno, papername: `Paper ${paperno}` })),
+    );
+    return {
+      id: `pm-${i}`,
+      productId: PRODUCT_ID,
+      externalJobPresetNo: jobPresetNo,
+      jobPreset: `Print method ${i}`,
+      prsjobList: [
+        {
+          covercd: 0,
+          jobno: jobPresetNo,
+          jobname: `Print method ${i}`,
+          unit: 'ea',
+          reqColor: null,
+          rstPaper,
+          rstAwkjob: null,
+        },
+      ],
+      reqColor: null,
+      rstPaper,
+      rstAwkjob: null,
+    };
+  });
+
+  const awkjobs: AwkjobData[] = awkjobNos.map((awkjobNo, i) => ({
+    awkjobno: awkjobNo,
+    awkjobname: `Post-process ${i}`,
+    inputtype: 'checkbox',
+    req_joboption: null,
+    req_jobsize: null,
+    req_jobqty: null,
+    req_awkjob: null,
+    rst_jobqty: null,
+    rst_cutcnt: null,
+    rst_size: maybe(rng, 0.15, () => [{ sizeno: pick(rng, sizeNos), sizename: 'Restricted' }]),
+    rst_paper: maybe(rng, 0.15, () => [{ paperno: pick(rng, paperNos), papername: 'Restricted' }]),
+    rst_color: null,
+    // Mutual exclusion inside the group, the case checkMutualConstraints exists for
+    rst_awkjob: maybe(rng, 0.3, () => [{ jobno: awkjobNos[i ^ 1] ?? awkjobNo, jobname: 'Exclusive' }]),
+  }));
+
+  const postProcesses: ProductPostProcess[] = [
+    {
+      id: 'pp-0',
+      productId: PRODUCT_ID,
+      coverCd: 0,
+      inputType: 'checkbox',
+      jobGroupList: Array.from({ length: Math.ceil(awkjobs.length / AWKJOBS_PER_GROUP) }, (_, g) => ({
+        jobgroupno: 10000 + g,
+        jobgroup: `Group ${g}`,
+        type: 'checkbox',
+        displayloc: 'bottom',
+        awkjoblist: awkjobs.slice(g * AWKJOBS_PER_GROUP, (g + 1) * AWKJOBS_PER_GROUP),
+      })),
+    },
+  ];
+
+  // Combination-type quantities: a product-wide default plus per-size overrides
+  const orderQuantities: ProductOrderQty[] = [
+    {
+      id: 'qty-default',
+      productId: PRODUCT_ID,
+      displayType: 'list',
+      jobPresetNo: null,
+      sizeNo: null,
+      paperNo: null,
+      optNo: null,
+      colorNo: null,
+      colorNoAdd: null,
+      minQty: ORDER_QUANTITIES[0],
+      maxQty: ORDER_QUANTITIES[ORDER_QUANTITIES.length - 1],
+      interval: null,
+      qtyList: ORDER_QUANTITIES,
+    },
+    ...sizeNos
+      .filter(() => rng() < 0.25)
+      .map((sizeNo) => ({
+        id: `qty-size-${sizeNo}`,
+        productId: PRODUCT_ID,
+        displayType: 'list',
+        jobPresetNo: null,
+        sizeNo,
+        paperNo: null,
+        optNo: null,
+        colorNo: null,
+        colorNoAdd: null,
+        minQty: ORDER_QUANTITIES[0],
+        maxQty: 5000,
+        interval: null,
+        qtyList: ORDER_QUANTITIES.filter((q) => q <= 5000),
+      })),
+  ];
+
+  const pricingTable: PricingTable[] = [];
+  let rowId = 0;
+  const priceRow = (fields: Pick<PricingTable, 'jobPresetNo' | 'sizeNo' | 'paperNo' | 'colorNo'>, quantity: number) => {
+    const unitPrice = randomInt(rng, 20, 400);
+    pricingTable.push({
+      id: `price-${rowId++}`,
+      productId: PRODUCT_ID,
+      colorNoAdd: null,
+      optNo: null,
+      ...fields,
+      quantity,
+      unitPrice,
+      totalPrice: unitPrice * quantity,
+    });
+  };
+  for (const sizeNo of sizeNos) {
+    for (const colorNo of colorNos) {
+      for (const quantity of ORDER_QUANTITIES) {
+        priceRow({ jobPresetNo: null, sizeNo, paperNo: null, colorNo }, quantity);
+      }
+      for (const paperNo of paperNos) {
+        if (rng() >= EXACT_PRICE_SHARE) continue;
+        const jobPresetNo = rng() < 0.5 ? pick(rng, jobPresetNos) : null;
+        for (const quantity of ORDER_QUANTITIES) {
+          priceRow({ jobPresetNo, sizeNo, paperNo, colorNo }, quantity);
+        }
+      }
+    }
+  }
+
+  const awkjobPricing: AwkjobPricingEntry[] = awkjobNos.flatMap((awkjobNo, i) =>
+    ORDER_QUANTITIES.map((quantity) => {
+      const unitPrice = randomInt(rng, 5, 80);
+      return { awkjobNo, awkjobName: `Post-process ${i}`, quantity, unitPrice, totalPrice: unitPrice * quantity };
+    }),
+  );
+
+  const awkjobSelections = (): AwkjobSelection[] =>
+    awkjobNos.length === 0
+      ? []
+      : pickSome(rng, awkjobNos, 3).map((jobno) => ({
+          jobgroupno: 10000 + Math.floor((jobno - 30000) / AWKJOBS_PER_GROUP),
+          jobno,
+        }));
+
+  const requests: PriceCalculationRequest[] = [];
+  const selections: OptionSelection[] = [];
+  for (let i = 0; i < LOOKUPS_PER_ITERATION; i++) {
+    const jobPresetNo = pick(rng, jobPresetNos);
+    const sizeNo = pick(rng, sizeNos);
+    const paperNo = pick(rng, paperNos);
+    const colorNo = pick(rng, colorNos);
+    const quantity = pick(rng, ORDER_QUANTITIES);
+    const selected = awkjobSelections();
+
+    requests.push({
+      productId: PRODUCT_ID,
+      jobPresetNo,
+      sizeNo,
+      paperNo,
+      colorNo,
+      colorNoAdd: null,
+      optNo: null,
+      quantity,
+      awkjobSelections: selected,
+    });
+    selections.push({
+      productId: PRODUCT_ID,
+      jobPresetNo,
+      sizeNo,
+      paperNo,
+      colorNo,
+      coverCd: 0,
+      quantity,
+      awkjobSelections: selected,
+    });
+  }
+
+  // A customer picks top-down, then goes back and changes the size (resetting paper and color)
+  const cascades = Array.from({ length: 32 }, () => [
+    { level: 'jobPreset' as const, value: pick(rng, jobPresetNos) },
+    { level: 'size' as const, value: pick(rng, sizeNos) },
+    { level: 'paper' as const, value: pick(rng, paperNos) },
+    { level: 'color' as const, value: pick(rng, colorNos) },
+    { level: 'size' as const, value: pick(rng, sizeNos) },
+    { level: 'paper' as const, value: pick(rng, paperNos) },
+    { level: 'color' as const, value: pick(rng, colorNos) },
+  ]);
+
+  return {
+    productData: { product, sizes, papers, colors, printMethods, postProcesses, orderQuantities },
+    pricingTable,
+    awkjobPricing,
+    requests,
+    selections,
+    cascades,
+  };
+}
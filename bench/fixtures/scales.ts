@@ -0,0 +1,112 @@
+// Catalog scales and seeded randomness shared by every benchmark fixture.
+// Same seed -> same catalog, so results are comparable across runs and machines.
+
+export type ScaleName = 'small' | 'typical' | 'largest';
+
+export interface CatalogScale {
+  name: ScaleName;
+  seed: number;
+  /** Option types on the product (simulation dimensions) */
+  optionTypes: number;
+  /** Choices per option type — cartesian product = choicesPerType ** optionTypes */
+  choicesPerType: number;
+  /** Constraints attached to the product / recipe */
+  constraints: number;
+  /** Distinct option codes in the price tier table */
+  tierCodes: number;
+  /** Quantity bands per option code */
+  quantityBands: number;
+  sizes: number;
+  papers: number;
+  colors: number;
+  printMethods: number;
+  /** Post-process (awkjob) items across all job groups */
+  postProcesses: number;
+}
+
+// @MX:NOTE: [AUTO] largest = the biggest live product: 10,000 simulation cases (SIMULATION_MAX_CASES) and ~8K price tier rows
+export const SCALES: readonly CatalogScale[] = [
+  {
+    name: 'small',
+    seed: 0x5eed_0001,
+    optionTypes: 4,
+    choicesPerType: 3, // 81 combinations
+    constraints: 10,
+    tierCodes: 10,
+    quantityBands: 5,
+    sizes: 4,
+    papers: 6,
+    colors: 2,
+    printMethods: 2,
+    postProcesses: 4,
+  },
+  {
+    name: 'typical',
+    seed: 0x5eed_0002,
+    optionTypes: 5,
+    choicesPerType: 5, // 3,125 combinations
+    constraints: 60,
+    tierCodes: 60,
+    quantityBands: 12,
+    sizes: 12,
+    papers: 25,
+    colors: 4,
+    printMethods: 4,
+    postProcesses: 12,
+  },
+  {
+    name: 'largest',
+    seed: 0x5eed_0003,
+    optionTypes: 4,
+    choicesPerType: 10, // 10,000 combinations
+    constraints: 400,
+    tierCodes: 400,
+    quantityBands: 20,
+    sizes: 40,
+    papers: 120,
+    colors: 8,
+    printMethods: 8,
+    postProcesses: 40,
+  },
+];
+
+/** Uniform float in [0, 1) */
+export type Rng = () => number;
+
+/** mulberry32 — small, fast, deterministic; not for anything but fixtures */
+export function createRng(seed: number): Rng {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+/** Integer in [min, max] */
+export function randomInt(rng: Rng, min: number, max: number): number {
+  return min + Math.floor(rng() * (max - min + 1));
+}
+
+export function pick<T>(rng: Rng, items: readonly T[]): T {
+  return items[Math.floor(rng() * items.length)];
+}
+
+/** Quantity band edges: 1..100, 101..200, ... growing geometrically like real print price tables */
+export function quantityBands(count: number): Array<{ minQty: number; maxQty: number }> {
+  const bands: Array<{ minQty: number; maxQty: number }> = [];
+  let minQty = 1;
+  let width = 100;
+  for (let i = 0; i < count; i++) {
+    const maxQty = i === count - 1 ? 1_000_000 : minQty + width - 1;
+    bands.push({ minQty, maxQty });
+    minQty = maxQty + 1;
+    width = Math.round(width * 1.5);
+  }
+  return bands;
+}
+
+/** Number of lookups per benchmark iteration — keeps per-iteration time well above timer resolution */
+export const LOOKUPS_PER_ITERATION = 1_000;
@@ -0,0 +1,222 @@
+// Seeded synthetic widget products (wb_products + recipe + LOOKUP pricing rows) for the
+// quote route, shaped like the rows the quote snapshot service reads.
+
+import type {
+  WbProduct,
+  ProductRecipe,
+  RecipeConstraint,
+  ProductPriceConfig,
+  PrintCostBase,
+  PostprocessCost,
+  QtyDiscount,
+} from '../../packages/db/src/index.js';
+import { createRng, pick, quantityBands, randomInt } from './scales.js';
+import type { CatalogScale, Rng } from './scales.js';
+
+/** Table name -> rows, as served by the in-memory DB stand-in */
+export type RowsByTable = Record<string, unknown[]>;
+
+export interface QuoteBody {
+  productId: number;
+  selections: Record<string, string | string[] | number>;
+}
+
+export interface WidgetCatalog {
+  productId: number;
+  rows: RowsByTable;
+  /** Distinct quote requests, cycled through by the benchmark */
+  bodies: QuoteBody[];
+}
+
+const CREATED_AT = new Date('2025-01-01T00:00:00Z');
+const QUANTITIES = [50, 100, 200, 300, 500, 1000, 2000, 5000];
+
+function pickSome<T>(rng: Rng, items: readonly T[], max: number): T[] {
+  const count = randomInt(rng, 1, Math.min(max, items.length));
+  const picked = new Set<T>();
+  while (picked.size < count) picked.add(pick(rng, items));
+  return [...picked];
+}
+
+export function createWidgetCatalog(scale: CatalogScale, productId: number, bodyCount = 256): WidgetCatalog {
+  const rng = createRng(scale.seed ^ 0x3b_07);
+  const recipeId = productId * 10;
+
+  const sizeValues = Array.from({ length: scale.sizes }, () => `${randomInt(rng, 50, 300)}x${randomInt(rng, 50, 420)}mm`);
+  const printTypes = Array.from({ length: scale.printMethods }, (_, i) => `PRINT_${i}`);
+  const paperValues = Array.from({ length: scale.papers }, (_, i) => `PAPER_${i}`);
+  const finishings = Array.from({ length: scale.postProcesses }, (_, i) => `FIN_${i}`);
+  const valuesByType: Record<string, string[]> = {
+    SIZE: sizeValues,
+    PRINT_TYPE: printTypes,
+    PAPER: paperValues,
+    FINISHING: finishings,
+  };
+
+  const product: WbProduct = {
+    id: productId,
+    mesItemCd: `MES-${productId}`,
+    edicusCode: null,
+    edicusPsCode: null,
+    shopbyProductNo: null,
+    productKey: `bench-${scale.name}`,
+    productNameKo: `벤치마크 상품 (${scale.name})`,
+    productNameEn: `Bench product (${scale.name})`,
+    categoryId: 1,
+    subcategory: null,
+    productType: 'digital-print',
+    isPremium: false,
+    hasEditor: false,
+    hasUpload: true,
+    fileSpec: null,
+    thumbnailUrl: null,
+    displayOrder: 0,
+    isActive: true,
+    isVisible: true,
+    createdAt: CREATED_AT,
+    updatedAt: CREATED_AT,
+  };
+
+  const recipe: ProductRecipe = {
+    id: recipeId,
+    productId,
+    recipeName: 'default',
+    recipeVersion: 1,
+    isDefault: true,
+    isArchived: false,
+    description: null,
+    createdAt: CREATED_AT,
+    updatedAt: CREATED_AT,
+  };
+
+  const priceConfig: ProductPriceConfig = {
+    id: productId,
+    productId,
+    priceMode: 'LOOKUP',
+    formulaText: null,
+    unitPriceSqm: null,
+    minAreaSqm: '0.1',
+    imposition: null,
+    coverPrice: null,
+    bindingCost: null,
+    baseCost: null,
+    isActive: true,
+    createdAt: CREATED_AT,
+    updatedAt: CREATED_AT,
+  };
+
+  const constraints: RecipeConstraint[] = Array.from({ length: scale.constraints }, (_, i) => {
+    const triggerOptionType = pick(rng, ['SIZE', 'PRINT_TYPE', 'PAPER', 'FINISHING']);
+    const triggerOperator =
+      triggerOptionType === 'FINISHING' ? 'CONTAINS' : pick(rng, ['IN', 'IN', 'EQUALS', 'NOT_IN', 'NOT_EQUALS']);
+    const targetOptionType = triggerOptionType === 'PAPER' ? 'FINISHING' : 'PAPER';
+    const roll = rng();
+    const action =
+      roll < 0.45
+        ? { type: 'exclude', targetOptionType, excludeValues: pickSome(rng, valuesByType[targetOptionType], 4) }
+        : roll < 0.65
+          ? { type: 'filter', targetOptionType, filterValues: pickSome(rng, valuesByType[targetOptionType], 8) }
+          : roll < 0.9
+            ? { type: 'show_message', message: `Notice ${i}`, level: 'info' }
+            : { type: 'block', message: `Blocked by rule ${i}` };
+    return {
+      id: recipeId * 1000 + i,
+      recipeId,
+      constraintName: `rule-${i}`,
+      triggerOptionType,
+      triggerOperator,
+      triggerValues: pickSome(rng, valuesByType[triggerOptionType], 3),
+      extraConditions: null,
+      actions: [action],
+      priority: randomInt(rng, 0, 100),
+      isActive: rng() > 0.05,
+      inputMode: 'manual',
+      templateId: null,
+      comment: null,
+      createdBy: null,
+      createdAt: CREATED_AT,
+      updatedAt: CREATED_AT,
+    };
+  });
+
+  let costId = productId * 100_000;
+  const printCosts: PrintCostBase[] = [];
+  const bands = quantityBands(scale.quantityBands);
+  for (const plateType of sizeValues) {
+    for (const printMode of printTypes) {
+      let unitPrice = randomInt(rng, 50, 900);
+      for (const band of bands) {
+        printCosts.push({
+          id: costId++,
+          productId,
+          plateType,
+          printMode,
+          qtyMin: band.minQty,
+          qtyMax: band.maxQty,
+          unitPrice: unitPrice.toFixed(2),
+          isActive: true,
+          createdAt: CREATED_AT,
+          updatedAt: CREATED_AT,
+        });
+        unitPrice = Math.max(5, Math.round(unitPrice * 0.9));
+      }
+    }
+  }
+
+  const postprocessCosts: PostprocessCost[] = finishings.map((processCode, i) => ({
+    id: costId++,
+    // Every fourth finishing is priced from the global (productId NULL) catalog
+    productId: i % 4 === 3 ? null : productId,
+    processCode,
+    processNameKo: `후가공 ${i}`,
+    qtyMin: 0,
+    qtyMax: 999_999,
+    unitPrice: randomInt(rng, 5, 300).toFixed(2),
+    priceType: rng() < 0.6 ? 'per_unit' : 'fixed',
+    isActive: true,
+    createdAt: CREATED_AT,
+    updatedAt: CREATED_AT,
+  }));
+
+  const discounts: QtyDiscount[] = [
+    [100, 499, '0.0300'],
+    [500, 999, '0.0500'],
+    [1000, 4999, '0.0800'],
+    [5000, 999_999, '0.1200'],
+  ].map(([qtyMin, qtyMax, discountRate], i) => ({
+    id: costId++,
+    productId: i % 2 === 0 ? productId : null,
+    qtyMin: qtyMin as number,
+    qtyMax: qtyMax as number,
+    discountRate: discountRate as string,
+    discountLabel: `${qtyMin}+`,
+    displayOrder: i,
+    isActive: true,
+    createdAt: CREATED_AT,
+  }));
+
+  const bodies: QuoteBody[] = Array.from({ length: bodyCount }, () => ({
+    productId,
+    selections: {
+      SIZE: pick(rng, sizeValues),
+      PRINT_TYPE: pick(rng, printTypes),
+      PAPER: pick(rng, paperValues),
+      FINISHING: rng() < 0.2 ? [] : pickSome(rng, finishings, 3),
+      QUANTITY: pick(rng, QUANTITIES),
+    },
+  }));
+
+  return {
+    productId,
+    rows: {
+      wb_products: [product],
+      product_recipes: [recipe],
+      product_price_configs: [priceConfig],
+      recipe_constraints: constraints,
+      print_cost_base: printCosts,
+      postprocess_cost: postprocessCosts,
+      qty_discount: discounts,
+    },
+    bodies,
+  };
+}
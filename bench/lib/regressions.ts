@@ -0,0 +1,111 @@
+// @MX:NOTE: [AUTO] Benchmark regression rules — vitest bench JSON -> per-benchmark stats -> status against baseline and budgets
+// @MX:NOTE: [AUTO] A budget breach fails regardless of the baseline; relative checks need a baseline entry
+
+/** The subset of vitest's --outputJson report read here */
+export interface VitestBenchReport {
+  files: Array<{
+    filepath: string;
+    groups: Array<{
+      fullName: string;
+      benchmarks: Array<{
+        name: string;
+        mean: number;
+        p99: number;
+        hz: number;
+        rme: number;
+        sampleCount: number;
+      }>;
+    }>;
+  }>;
+}
+
+export interface BenchStats {
+  /** Milliseconds per iteration */
+  mean: number;
+  p99: number;
+  hz: number;
+  /** Relative margin of error, in percent */
+  rme: number;
+  sampleCount: number;
+}
+
+export interface Baseline {
+  createdAt: string;
+  node: string;
+  platform: string;
+  benchmarks: Record<string, BenchStats>;
+}
+
+export interface Thresholds {
+  /** Allowed slowdown of the mean as a fraction of the baseline mean (0.25 = 25%) */
+  maxRegression: number;
+  /** Per-benchmark overrides; the last entry whose match is a substring of the name wins */
+  regressions?: Array<{ match: string; maxRegression: number }>;
+  /** Absolute ceilings on the mean, independent of any baseline */
+  budgets?: Array<{ match: string; maxMeanMs: number; reason?: string }>;
+}
+
+export type BenchStatus = "ok" | "improved" | "regressed" | "over-budget" | "new";
+
+export interface BenchResult {
+  name: string;
+  status: BenchStatus;
+  mean: number;
+  baselineMean: number | null;
+  /** (mean - baselineMean) / baselineMean, null without a baseline entry */
+  change: number | null;
+  maxRegression: number;
+  budgetMs: number | null;
+}
+
+/** "<describe> > <bench>" — the file part is dropped so keys survive moving a bench file */
+export function benchKey(groupFullName: string, benchName: string): string {
+  const group = groupFullName.split(" > ").filter((part) => !part.endsWith(".bench.ts"));
+  return [...group, benchName].join(" > ");
+}
+
+export function collectStats(report: VitestBenchReport): Record<string, BenchStats> {
+  const stats: Record<string, BenchStats> = {};
+  for (const file of report.files) {
+    for (const group of file.groups) {
+      for (const b of group.benchmarks) {
+        stats[benchKey(group.fullName, b.name)] = {
+          mean: b.mean,
+          p99: b.p99,
+          hz: b.hz,
+          rme: b.rme,
+          sampleCount: b.sampleCount,
+        };
+      }
+    }
+  }
+  return stats;
+}
+
+export function compareWithBaseline(
+  current: Record<string, BenchStats>,
+  baseline: Baseline | null,
+  thresholds: Thresholds,
+): BenchResult[] {
+  return Object.entries(current).map(([name, stats]) => {
+    const override = thresholds.regressions?.filter((r) => name.includes(r.match)).pop();
+    const maxRegression = override?.maxRegression ?? thresholds.maxRegression;
+    const budgetMs = thresholds.budgets?.filter((b) => name.includes(b.match)).pop()?.maxMeanMs ?? null;
+
+    const baselineMean = baseline?.benchmarks[name]?.mean ?? null;
+    const change = baselineMean !== null && baselineMean > 0 ? (stats.mean - baselineMean) / baselineMean : null;
+
+    let status: BenchStatus;
+    if (budgetMs !== null && stats.mean > budgetMs) status = "over-budget";
+    else if (change === null) status = "new";
+    else if (change > maxRegression) status = "regressed";
+    else if (change < -maxRegression) status = "improved";
+    else status = "ok";
+
+    return { name, status, mean: stats.mean, baselineMean, change, maxRegression, budgetMs };
+  });
+}
+
+export function isFailure(result: BenchResult): boolean {
+  return result.status === "regressed" || result.status === "over-budget";
+}
@@ -0,0 +1,38 @@
+// Option priority chain (packages/pricing-engine/src/option-engine.ts).
+// validateSelection runs LOOKUPS_PER_ITERATION complete selections; the cascade replays
+// seeded click-through paths, each selectOption recomputing the available options.
+
+import { bench, describe } from 'vitest';
+import { OptionEngine } from '../../packages/pricing-engine/src/option-engine.js';
+import type { OptionSelection } from '../../packages/shared/src/types/option-types.js';
+import { SCALES } from '../fixtures/scales.js';
+import { createPricingEngineCatalog } from '../fixtures/pricing-engine-catalog.js';
+
+const engines = SCALES.map((scale) => {
+  const catalog = createPricingEngineCatalog(scale);
+  return { scale, catalog, engine: new OptionEngine(catalog.productData) };
+});
+
+describe('OptionEngine.validateSelection', () => {
+  for (const { scale, catalog, engine } of engines) {
+    bench(`${scale.name} (${catalog.selections.length} selections)`, () => {
+      for (const selection of catalog.selections) {
+        engine.validateSelection(selection);
+      }
+    });
+  }
+});
+
+describe('OptionEngine.selectOption cascade', () => {
+  for (const { scale, catalog, engine } of engines) {
+    const steps = catalog.cascades.reduce((n, path) => n + path.length, 0);
+    bench(`${scale.name} (${steps} selection changes)`, () => {
+      for (const path of catalog.cascades) {
+        let selection: OptionSelection = { productId: catalog.productData.product.id, coverCd: 0 };
+        for (const { level, value } of path) {
+          selection = engine.selectOption(selection, level, value).selection;
+        }
+      }
+    });
+  }
+});
@@ -0,0 +1,31 @@
+// Print price calculation (packages/pricing-engine/src/calculator.ts).
+// Each iteration prices LOOKUPS_PER_ITERATION seeded requests, post-processes included.
+
+import { bench, describe } from 'vitest';
+import { PriceCalculator } from '../../packages/pricing-engine/src/calculator.js';
+import { SCALES } from '../fixtures/scales.js';
+import { createPricingEngineCatalog } from '../fixtures/pricing-engine-catalog.js';
+
+const catalogs = SCALES.map((scale) => {
+  const catalog = createPricingEngineCatalog(scale);
+  return { scale, catalog, calculator: new PriceCalculator(catalog.pricingTable, catalog.awkjobPricing) };
+});
+
+describe('PriceCalculator.calculate', () => {
+  for (const { scale, catalog, calculator } of catalogs) {
+    bench(`${scale.name} (${catalog.pricingTable.length} price rows)`, () => {
+      for (const request of catalog.requests) {
+        calculator.calculate(request);
+      }
+    });
+  }
+});
+
+// Indexes are built in the constructor — this is what a cold quote path pays per product
+describe('PriceCalculator (construct)', () => {
+  for (const { scale, catalog } of catalogs) {
+    bench(`${scale.name} (${catalog.pricingTable.length} price rows)`, () => {
+      new PriceCalculator(catalog.pricingTable, catalog.awkjobPricing);
+    });
+  }
+});
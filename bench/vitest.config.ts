@@ -0,0 +1,30 @@
+import { defineConfig } from 'vitest/config';
+import { createRequire } from 'module';
+import path from 'path';
+
+const root = path.resolve(__dirname, '..');
+// The quote route's next/server must be the same module instance the bench builds requests with
+const webRequire = createRequire(path.resolve(root, 'apps/web/package.json'));
+
+export default defineConfig({
+  root,
+  test: {
+    environment: 'node',
+    include: [],
+    benchmark: {
+      include: ['bench/**/*.bench.ts'],
+      // Machine-readable results; bench/check-regressions.ts compares them with bench/baseline.json
+      outputJson: process.env.BENCH_OUTPUT_JSON ?? 'bench/results/latest.json',
+    },
+  },
+  resolve: {
+    alias: {
+      // More specific aliases must come before less specific ones
+      '@widget-creator/shared/db/schema': path.resolve(root, 'packages/shared/src/db/schema/index.ts'),
+      '@widget-creator/shared/db': path.resolve(root, 'packages/shared/src/db/index.ts'),
+      '@widget-creator/core': path.resolve(root, 'packages/core/src/index.ts'),
+      '@widget-creator/db': path.resolve(root, 'packages/db/src/index.ts'),
+      'next/server': webRequire.resolve('next/server'),
+    },
+  },
+});
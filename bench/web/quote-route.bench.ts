@@ -0,0 +1,74 @@
+// POST /api/widget/quote end to end: middleware, snapshot load, constraint program,
+// pricing, serialization and quote logging — against the in-memory DB stand-in.
+//
+// warm: snapshot cached, the steady state of a product page (SPEC-WB-004 AC-WB004-04: < 100ms per quote)
+// cold: snapshot invalidated before every quote — DB reads plus compileQuoteSnapshot
+
+import { bench, describe, vi } from 'vitest';
+import { NextRequest } from 'next/server';
+import { POST } from '../../apps/web/app/api/widget/quote/route.js';
+import { invalidateQuoteSnapshot } from '../../apps/web/app/api/_lib/services/quote-snapshot.js';
+import { setRateLimitStore } from '../../apps/web/app/api/_lib/middleware/rate-limit.js';
+import { useCatalogRows } from '../fixtures/memory-db.js';
+import { SCALES } from '../fixtures/scales.js';
+import { createWidgetCatalog } from '../fixtures/widget-catalog.js';
+import type { WidgetCatalog } from '../fixtures/widget-catalog.js';
+
+vi.mock('@widget-creator/shared/db', async () => ({
+  db: (await import('../fixtures/memory-db.js')).memoryDb,
+}));
+
+// The anonymous limit (30/min) would turn every timed request after the first into a 429
+setRateLimitStore({
+  consume: (_key, _rule, now) => ({ allowed: true, remaining: 1, resetAt: now, retryAfterMs: 0 }),
+});
+
+const routeCtx = { params: Promise.resolve({}) };
+
+function quoteRequest(body: WidgetCatalog['bodies'][number]): NextRequest {
+  return new NextRequest('http://localhost:3000/api/widget/quote', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', 'x-forwarded-for': '10.0.0.1' },
+    body: JSON.stringify(body),
+  });
+}
+
+const catalogs = SCALES.map((scale, i) => ({ scale, catalog: createWidgetCatalog(scale, 9001 + i) }));
+
+// A fixture that 404s or 400s would benchmark the error path; fail before timing anything
+invalidateQuoteSnapshot();
+for (const { scale, catalog } of catalogs) {
+  useCatalogRows(catalog.rows);
+  const response = await POST(quoteRequest(catalog.bodies[0]), routeCtx);
+  if (response.status !== 200) {
+    throw new Error(`quote fixture for ${scale.name} returned ${response.status}: ${await response.text()}`);
+  }
+}
+
+function rotation(catalog: WidgetCatalog): () => WidgetCatalog['bodies'][number] {
+  let next = 0;
+  return () => catalog.bodies[next++ % catalog.bodies.length];
+}
+
+describe('POST /api/widget/quote (warm snapshot)', () => {
+  for (const { scale, catalog } of catalogs) {
+    const nextBody = rotation(catalog);
+    bench(`${scale.name} (${scale.constraints} constraints)`, async () => {
+      useCatalogRows(catalog.rows);
+      const response = await POST(quoteRequest(nextBody()), routeCtx);
+      await response.text();
+    });
+  }
+});
+
+describe('POST /api/widget/quote (cold snapshot)', () => {
+  for (const { scale, catalog } of catalogs) {
+    const nextBody = rotation(catalog);
+    bench(`${scale.name} (${catalog.rows.print_cost_base.length} print cost rows)`, async () => {
+      useCatalogRows(catalog.rows);
+      invalidateQuoteSnapshot(catalog.productId);
+      const response = await POST(quoteRequest(nextBody()), routeCtx);
+      await response.text();
+    });
+  }
+});
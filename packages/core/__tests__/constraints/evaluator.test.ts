@@ -1,5 +1,5 @@
 import { describe, it, expect } from 'vitest';
-import { evaluateConstraints, evaluateSingleConstraint } from '../../src/constraints/evaluator.js';
+import { evaluateConstraints, evaluateSingleConstraint, applicableConstraints } from '../../src/constraints/evaluator.js';
 import type { ConstraintEvalInput } from '../../src/constraints/types.js';
 import type { OptionConstraint, SelectedOption } from '../../src/options/types.js';
 
@@ -108,6 +108,40 @@ describe('evaluateConstraints', () => {
     expect(rangeValues?.[0]).toContain('range:');
   });
 
+  it('reuses the outcome for a repeated trigger value without sharing the returned maps', () => {
+    const constraints = [
+      makeConstraint('size_show', { id: 1, targetField: 'envelope', targetValue: 'env_a6' }),
+      makeConstraint('paper_condition', { id: 2, operator: 'gte', value: '180', targetField: 'coating' }),
+    ];
+    const papers = [
+      { id: 7, name: 'Art 200', weight: 200, costPer4Cut: 0, sellingPer4Cut: 0 },
+      { id: 8, name: 'Art 120', weight: 120, costPer4Cut: 0, sellingPer4Cut: 0 },
+    ];
+    const select = (cutWidth: number, refPaperId: number) => makeInput({
+      constraints,
+      papers,
+      currentSelections: new Map<string, SelectedOption>([
+        ['size', { optionKey: 'size', choiceCode: 'S', cutWidth, cutHeight: 150 }],
+        ['paperType', { optionKey: 'paperType', choiceCode: 'P', refPaperId }],
+      ]),
+    });
+
+    const first = evaluateConstraints(select(100, 7));
+    expect(first.availableOptions.get('envelope')).toEqual(['env_a6']);
+    expect(first.disabledOptions.has('coating')).toBe(false);
+    first.availableOptions.get('envelope')!.push('mutated');
+    first.disabledOptions.set('coating', { type: 'CONSTRAINT' });
+
+    const repeat = evaluateConstraints(select(100, 7));
+    expect(repeat.availableOptions.get('envelope')).toEqual(['env_a6']);
+    expect(repeat.disabledOptions.has('coating')).toBe(false);
+
+    const other = evaluateConstraints(select(90, 8));
+    expect(other.availableOptions.get('envelope')).toBeUndefined();
+    expect(other.disabledOptions.get('envelope')).toMatchObject({ constraintId: 1 });
+    expect(other.disabledOptions.get('coating')).toMatchObject({ constraintId: 2 });
+  });
+
   it('tracks evaluationTimeMs', () => {
     const result = evaluateConstraints(makeInput());
     expect(typeof result.evaluationTimeMs).toBe('number');
@@ -149,3 +183,27 @@ describe('evaluateSingleConstraint', () => {
     expect(result.violated).toBe(false);
   });
 });
+
+describe('applicableConstraints', () => {
+  it('groups active constraints by product in stable priority order', () => {
+    const constraints = [
+      makeConstraint('size_show', { id: 1, productId: 1, priority: 5 }),
+      makeConstraint('size_show', { id: 2, productId: 2, priority: 1 }),
+      makeConstraint('size_show', { id: 3, productId: 1, priority: 1 }),
+      makeConstraint('size_show', { id: 4, productId: 1, priority: 5 }),
+      makeConstraint('size_show', { id: 5, productId: 1, priority: 0, isActive: false }),
+    ];
+    expect(applicableConstraints(constraints, 1).map((c) => c.id)).toEqual([3, 1, 4]);
+    expect(applicableConstraints(constraints, 2).map((c) => c.id)).toEqual([2]);
+    expect(applicableConstraints(constraints, 99)).toEqual([]);
+  });
+
+  it('returns the compiled list for the same array and recompiles after it grows', () => {
+    const constraints = [makeConstraint('size_show', { id: 1, priority: 2 })];
+    const first = applicableConstraints(constraints, 1);
+    expect(applicableConstraints(constraints, 1)).toBe(first);
+
+    constraints.push(makeConstraint('size_show', { id: 2, priority: 1 }));
+    expect(applicableConstraints(constraints, 1).map((c) => c.id)).toEqual([2, 1]);
+  });
+});
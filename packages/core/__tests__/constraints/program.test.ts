@@ -0,0 +1,212 @@
+import { describe, it, expect } from 'vitest';
+import { ConstraintProgram, compileConstraintProgram } from '../../src/constraints/program.js';
+import type {
+  EcaConstraint,
+  EcaAction,
+  EcaEvaluation,
+  ConstraintSelections,
+} from '../../src/constraints/program.js';
+
+// Linear reference: the original per-request ECA evaluation the program replaces
+function evaluateLinear(constraints: EcaConstraint[], selections: ConstraintSelections): EcaEvaluation {
+  const result: EcaEvaluation = { uiActions: [], violations: [], addons: [] };
+  const sorted = [...constraints].sort((a, b) => b.priority - a.priority);
+
+  for (const constraint of sorted) {
+    const selectedValue = selections[constraint.triggerOptionType];
+    if (selectedValue === undefined) continue;
+
+    const triggerValues = constraint.triggerValues as unknown[];
+    const valStr: unknown[] = Array.isArray(selectedValue) ? selectedValue : [String(selectedValue)];
+    let triggered = false;
+    switch (constraint.triggerOperator) {
+      case 'IN': triggered = valStr.some((v) => triggerValues.includes(v)); break;
+      case 'NOT_IN': triggered = !valStr.some((v) => triggerValues.includes(v)); break;
+      case 'EQUALS': triggered = String(selectedValue) === triggerValues[0]; break;
+      case 'NOT_EQUALS': triggered = String(selectedValue) !== triggerValues[0]; break;
+      case 'CONTAINS':
+        triggered = Array.isArray(selectedValue) && selectedValue.some((v) => triggerValues.includes(String(v)));
+        break;
+    }
+    if (!triggered) continue;
+
+    for (const action of constraint.actions as EcaAction[]) {
+      if (action.type === 'exclude' || action.type === 'filter') {
+        result.uiActions.push({
+          type: action.type,
+          targetOptionType: action.targetOptionType,
+          excludeValues: action.excludeValues,
+          filterValues: action.filterValues,
+        });
+      } else if (action.type === 'show_message') {
+        result.uiActions.push({ type: 'show_message', message: action.message, level: action.level ?? 'info' });
+      } else if (action.type === 'block') {
+        result.violations.push({
+          constraintName: constraint.constraintName,
+          message: action.message ?? `Option combination blocked by constraint: ${constraint.constraintName}`,
+        });
+      } else if (action.type === 'auto_add') {
+        result.addons.push({ type: 'auto_add', addonGroupId: action.addonGroupId, addonItemId: action.addonItemId });
+        result.uiActions.push({ type: 'auto_add', addonGroupId: action.addonGroupId, addonItemId: action.addonItemId });
+      } else if (action.type === 'show_addon_list') {
+        result.uiActions.push({ type: 'show_addon_list', addonGroupId: action.addonGroupId });
+      }
+    }
+  }
+
+  return result;
+}
+
+// Deterministic PRNG (mulberry32) so equivalence checks are reproducible
+function rng(seed: number): () => number {
+  let a = seed;
+  return () => {
+    a |= 0;
+    a = (a + 0x6d2b79f5) | 0;
+    let t = Math.imul(a ^ (a >>> 15), 1 | a);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function pick<T>(rand: () => number, values: T[]): T {
+  return values[Math.floor(rand() * values.length)]!;
+}
+
+const TYPES = ['SIZE', 'PAPER', 'FINISHING', 'QUANTITY'];
+const VALUES = ['a', 'b', 'c', 'd', '100'];
+const OPERATORS = ['IN', 'NOT_IN', 'EQUALS', 'NOT_EQUALS', 'CONTAINS', 'UNKNOWN'];
+const ACTIONS: EcaAction[] = [
+  { type: 'exclude', targetOptionType: 'PAPER', excludeValues: ['a'] },
+  { type: 'filter', targetOptionType: 'SIZE', filterValues: ['b', 'c'] },
+  { type: 'show_message', message: 'note' },
+  { type: 'block', message: 'blocked' },
+  { type: 'block' },
+  { type: 'auto_add', addonGroupId: 1, addonItemId: 2 },
+  { type: 'show_addon_list', addonGroupId: 3 },
+];
+
+function constraint(overrides: Partial<EcaConstraint>): EcaConstraint {
+  return {
+    constraintName: 'c',
+    triggerOptionType: 'PAPER',
+    triggerOperator: 'IN',
+    triggerValues: ['a'],
+    actions: [{ type: 'show_message', message: 'm' }],
+    priority: 0,
+    ...overrides,
+  };
+}
+
+describe('ConstraintProgram', () => {
+  it('should match the linear evaluator for random constraints and selections', () => {
+    const rand = rng(7);
+    for (let round = 0; round < 50; round++) {
+      const constraints: EcaConstraint[] = Array.from({ length: 1 + Math.floor(rand() * 30) }, (_, i) => ({
+        constraintName: `c${i}`,
+        triggerOptionType: pick(rand, TYPES),
+        triggerOperator: pick(rand, OPERATORS),
+        triggerValues: Array.from({ length: Math.floor(rand() * 3) }, () => pick(rand, VALUES)),
+        actions: Array.from({ length: 1 + Math.floor(rand() * 2) }, () => pick(rand, ACTIONS)),
+        priority: Math.floor(rand() * 4),
+      }));
+      const program = new ConstraintProgram(constraints);
+
+      for (let q = 0; q < 40; q++) {
+        const selections: ConstraintSelections = {};
+        for (const type of TYPES) {
+          const roll = rand();
+          if (roll < 0.2) continue;
+          if (roll < 0.5) selections[type] = Array.from({ length: Math.floor(rand() * 3) }, () => pick(rand, VALUES));
+          else if (type === 'QUANTITY') selections[type] = 100;
+          else selections[type] = pick(rand, VALUES);
+        }
+        expect(program.evaluate(selections)).toEqual(evaluateLinear(constraints, selections));
+      }
+    }
+  });
+
+  it('should emit effects in priority DESC order, ties in list order', () => {
+    const program = new ConstraintProgram([
+      constraint({ constraintName: 'low', priority: 1, actions: [{ type: 'show_message', message: 'low' }] }),
+      constraint({ constraintName: 'high', priority: 9, actions: [{ type: 'show_message', message: 'high' }] }),
+      constraint({ constraintName: 'low2', priority: 1, actions: [{ type: 'show_message', message: 'low2' }] }),
+    ]);
+
+    const { uiActions } = program.evaluate({ PAPER: 'a' });
+    expect(uiActions.map((a) => a.message)).toEqual(['high', 'low', 'low2']);
+  });
+
+  it('should skip constraints whose trigger option type is not selected', () => {
+    const program = new ConstraintProgram([
+      constraint({ triggerOperator: 'NOT_IN', triggerValues: ['x'] }),
+    ]);
+    expect(program.evaluate({ SIZE: 'a' }).uiActions).toEqual([]);
+    expect(program.evaluate({ PAPER: 'a' }).uiActions).toHaveLength(1);
+  });
+
+  it('should treat missing triggerValues and actions as empty', () => {
+    const program = new ConstraintProgram([
+      constraint({ triggerOperator: 'NOT_IN', triggerValues: null, actions: null }),
+      constraint({ triggerOperator: 'IN', triggerValues: null }),
+    ]);
+    expect(program.evaluate({ PAPER: 'a' })).toEqual({ uiActions: [], violations: [], addons: [] });
+  });
+
+  it('should memoize evaluations per trigger-relevant selections', () => {
+    const program = new ConstraintProgram([constraint({})]);
+    const first = program.evaluate({ PAPER: 'a', QUANTITY: 100 });
+    // QUANTITY is not a trigger type, so it does not affect the key
+    expect(program.evaluate({ PAPER: 'a', QUANTITY: 500 })).toBe(first);
+    expect(program.evaluate({ PAPER: 'b' })).not.toBe(first);
+  });
+
+  it('should bound the memo size', () => {
+    const program = new ConstraintProgram([constraint({})], 2);
+    const first = program.evaluate({ PAPER: 'a' });
+    program.evaluate({ PAPER: 'b' });
+    program.evaluate({ PAPER: 'c' });
+    expect(program.evaluate({ PAPER: 'a' })).not.toBe(first);
+    expect(program.evaluate({ PAPER: 'a' })).toEqual(first);
+  });
+
+  describe('availableChoices', () => {
+    it('should union excludes and intersect filters per target option type', () => {
+      const program = new ConstraintProgram([
+        constraint({ actions: [{ type: 'exclude', targetOptionType: 'COATING', excludeValues: ['matte', 'gloss'] }] }),
+        constraint({ actions: [{ type: 'exclude', targetOptionType: 'COATING', excludeValues: ['gloss', 'soft'] }] }),
+        constraint({ actions: [{ type: 'filter', targetOptionType: 'SIZE', filterValues: ['A4', 'A5', 'B5'] }] }),
+        constraint({ actions: [{ type: 'filter', targetOptionType: 'SIZE', filterValues: ['A5', 'B5', 'A3'] }] }),
+        constraint({ triggerValues: ['z'], actions: [{ type: 'exclude', targetOptionType: 'FINISHING', excludeValues: ['x'] }] }),
+      ]);
+
+      expect(program.availableChoices({ PAPER: 'a' })).toEqual({
+        COATING: { excluded: ['matte', 'gloss', 'soft'], allowedOnly: null },
+        SIZE: { excluded: [], allowedOnly: ['A5', 'B5'] },
+      });
+    });
+
+    it('should return an empty map when nothing restricts choices', () => {
+      const program = new ConstraintProgram([constraint({})]);
+      expect(program.availableChoices({ PAPER: 'b' })).toEqual({});
+    });
+  });
+});
+
+describe('compileConstraintProgram', () => {
+  it('should reuse the program for the same constraint array', () => {
+    const constraints = [constraint({})];
+    const program = compileConstraintProgram(constraints);
+    expect(compileConstraintProgram(constraints)).toBe(program);
+    expect(compileConstraintProgram([...constraints])).not.toBe(program);
+  });
+
+  it('should recompile when the array length changes', () => {
+    const constraints = [constraint({})];
+    const program = compileConstraintProgram(constraints);
+    constraints.push(constraint({ constraintName: 'more' }));
+    const recompiled = compileConstraintProgram(constraints);
+    expect(recompiled).not.toBe(program);
+    expect(recompiled.size).toBe(2);
+  });
+});
@@ -0,0 +1,195 @@
+import { describe, it, expect } from 'vitest';
+import {
+  TierIndex,
+  ImpositionIndex,
+  FixedPriceIndex,
+  PackagePriceIndex,
+  tierIndexFor,
+} from '../../src/pricing/pricing-index.js';
+import { lookupTier } from '../../src/pricing/lookup.js';
+import type {
+  PriceTier,
+  ImpositionRule,
+  FixedPriceRecord,
+  PackagePriceRecord,
+} from '../../src/pricing/types.js';
+import { MOCK_PRICE_TIERS } from '../fixtures/price-tiers.js';
+
+// Deterministic PRNG (mulberry32) so equivalence checks are reproducible
+function rng(seed: number): () => number {
+  let a = seed;
+  return () => {
+    a |= 0;
+    a = (a + 0x6d2b79f5) | 0;
+    let t = Math.imul(a ^ (a >>> 15), 1 | a);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function pick<T>(rand: () => number, values: T[]): T {
+  return values[Math.floor(rand() * values.length)];
+}
+
+const SHEETS = ['A3', 'T3', '4x6', null];
+const CODES = ['4', '8', 'coating', 'pp_1', 'pp_2'];
+
+describe('TierIndex', () => {
+  it('should resolve the same tier as the linear scan for fixture data', () => {
+    const index = new TierIndex(MOCK_PRICE_TIERS);
+    expect(index.find('8', 13, 'A3')?.unitPrice).toBe(1500);
+    expect(index.find('8', 5, 'T3')?.unitPrice).toBe(2500);
+    expect(index.find('lamination', 50, null)?.unitPrice).toBe(50);
+    expect(index.find('8', 0, 'A3')).toBeUndefined();
+    expect(index.find('unknown', 5, 'A3')).toBeUndefined();
+  });
+
+  it('should return the first tier in array order when intervals overlap', () => {
+    const tiers: PriceTier[] = [
+      { optionCode: 'x', minQty: 50, maxQty: 100, unitPrice: 1, sheetStandard: 'A3' },
+      { optionCode: 'x', minQty: 1, maxQty: 1000, unitPrice: 2, sheetStandard: null },
+      { optionCode: 'x', minQty: 60, maxQty: 70, unitPrice: 3, sheetStandard: 'A3' },
+    ];
+    const index = new TierIndex(tiers);
+    expect(index.find('x', 65, 'A3')?.unitPrice).toBe(1);
+    expect(index.find('x', 10, 'A3')?.unitPrice).toBe(2);
+    expect(index.find('x', 65, 'T3')?.unitPrice).toBe(2);
+  });
+
+  it('should match the linear scan on random overlapping tier sets', () => {
+    const rand = rng(42);
+    const tiers: PriceTier[] = Array.from({ length: 2000 }, () => {
+      const minQty = Math.floor(rand() * 500);
+      return {
+        optionCode: pick(rand, CODES),
+        minQty,
+        maxQty: minQty + Math.floor(rand() * 200),
+        unitPrice: Math.floor(rand() * 5000),
+        sheetStandard: pick(rand, SHEETS),
+      };
+    });
+    const index = new TierIndex(tiers);
+
+    for (let i = 0; i < 2000; i++) {
+      const code = pick(rand, CODES);
+      const qty = Math.floor(rand() * 800);
+      const sheet = pick(rand, SHEETS);
+      const expected = tiers.find(t =>
+        t.optionCode === code &&
+        t.minQty <= qty &&
+        qty <= t.maxQty &&
+        (sheet === null || t.sheetStandard === null || t.sheetStandard === sheet),
+      );
+      expect(index.find(code, qty, sheet)).toBe(expected);
+    }
+  });
+});
+
+describe('ImpositionIndex', () => {
+  it('should match the linear scan including the 0.5mm tolerance edges', () => {
+    const rand = rng(7);
+    const rules: ImpositionRule[] = Array.from({ length: 500 }, () => ({
+      cutWidth: Math.round(rand() * 3000) / 10,
+      cutHeight: Math.round(rand() * 3000) / 10,
+      sheetStandard: pick(rand, ['A3', 'T3']),
+      impositionCount: 1 + Math.floor(rand() * 32),
+    }));
+    const index = new ImpositionIndex(rules);
+
+    for (let i = 0; i < 3000; i++) {
+      const base = pick(rand, rules);
+      const w = base.cutWidth + pick(rand, [0, 0.3, -0.49, 0.5, -0.5, 0.51, 1.2]);
+      const h = base.cutHeight + pick(rand, [0, 0.2, -0.4, 0.5, 0.9]);
+      const sheet = pick(rand, ['A3', 'T3']);
+      const expected = rules.find(r =>
+        Math.abs(r.cutWidth - w) < 0.5 &&
+        Math.abs(r.cutHeight - h) < 0.5 &&
+        r.sheetStandard === sheet,
+      );
+      expect(index.find(w, h, sheet)).toBe(expected);
+    }
+  });
+});
+
+describe('FixedPriceIndex', () => {
+  it('should match the linear scan for exact and wildcard queries', () => {
+    const rand = rng(99);
+    const ids = [1, 2, 3, null];
+    const records: FixedPriceRecord[] = Array.from({ length: 400 }, () => ({
+      productId: pick(rand, [10, 11, 12]),
+      sizeId: pick(rand, ids),
+      paperId: pick(rand, ids),
+      printModeId: pick(rand, ids),
+      sellingPrice: Math.floor(rand() * 10000),
+      costPrice: 0,
+      baseQty: 1,
+    }));
+    const index = new FixedPriceIndex(records);
+
+    for (let i = 0; i < 2000; i++) {
+      const productId = pick(rand, [10, 11, 12, 13]);
+      const sizeId = pick(rand, [...ids, 4]);
+      const paperId = pick(rand, [...ids, 4]);
+      const printModeId = pick(rand, [...ids, 4]);
+      const expected = records.find(fp =>
+        fp.productId === productId &&
+        (sizeId === null || fp.sizeId === null || fp.sizeId === sizeId) &&
+        (paperId === null || fp.paperId === null || fp.paperId === paperId) &&
+        (printModeId === null || fp.printModeId === null || fp.printModeId === printModeId),
+      );
+      expect(index.find(productId, sizeId, paperId, printModeId)).toBe(expected);
+    }
+  });
+});
+
+describe('PackagePriceIndex', () => {
+  it('should match the linear scan on random package tiers', () => {
+    const rand = rng(3);
+    const records: PackagePriceRecord[] = Array.from({ length: 600 }, () => {
+      const minQty = Math.floor(rand() * 300);
+      return {
+        productId: pick(rand, [1, 2]),
+        sizeId: pick(rand, [5, 6]),
+        printModeId: pick(rand, [7, 8]),
+        pageCount: pick(rand, [8, 16, 24]),
+        minQty,
+        maxQty: minQty + Math.floor(rand() * 100),
+        sellingPrice: Math.floor(rand() * 100000),
+      };
+    });
+    const index = new PackagePriceIndex(records);
+
+    for (let i = 0; i < 2000; i++) {
+      const [productId, sizeId, printModeId, pageCount] = [
+        pick(rand, [1, 2]), pick(rand, [5, 6]), pick(rand, [7, 8]), pick(rand, [8, 16, 24]),
+      ];
+      const qty = Math.floor(rand() * 450);
+      const expected = records.find(pp =>
+        pp.productId === productId &&
+        pp.sizeId === sizeId &&
+        pp.printModeId === printModeId &&
+        pp.pageCount === pageCount &&
+        pp.minQty <= qty &&
+        qty <= pp.maxQty,
+      );
+      expect(index.find(productId, sizeId, printModeId, pageCount, qty)).toBe(expected);
+    }
+  });
+});
+
+describe('index memoization', () => {
+  it('should reuse the index for the same array', () => {
+    const tiers = [...MOCK_PRICE_TIERS];
+    expect(tierIndexFor(tiers)).toBe(tierIndexFor(tiers));
+  });
+
+  it('should rebuild when rows are appended', () => {
+    const tiers: PriceTier[] = [
+      { optionCode: 'new', minQty: 1, maxQty: 10, unitPrice: 100, sheetStandard: null },
+    ];
+    expect(lookupTier(tiers, 'new', 5, null)).toBe(100);
+
+    tiers.push({ optionCode: 'new', minQty: 11, maxQty: 20, unitPrice: 80, sheetStandard: null });
+    expect(lookupTier(tiers, 'new', 15, null)).toBe(80);
+  });
+});
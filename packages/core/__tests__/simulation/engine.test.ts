@@ -7,6 +7,8 @@
  *   - resolveSimulationCombinations: 10K threshold and sampling
  *   - runSimulationCases: result classification and aggregate counts
  *   - Performance: 1000 cases in < 30 seconds (AC-WB005-03)
+ *   - iterateCombinations / combinationAt: lazy mixed-radix enumeration
+ *   - planSimulation: threshold planning without materializing combinations
  */
 import { describe, it, expect, vi } from 'vitest';
 import {
@@ -15,8 +17,17 @@ import {
   runSimulationCases,
   sampleN,
   SIMULATION_MAX_CASES,
+  countCombinations,
+  combinationAt,
+  iterateCombinations,
+  sampleCombinationIndices,
+  generateCombinations,
+  planSimulation,
+  runSimulation,
+  createSimulationEvaluator,
+  SIMULATION_JOB_MAX_CASES,
 } from '../../src/simulation/engine.js';
-import type { OptionChoiceSet, CaseEvaluator } from '../../src/simulation/engine.js';
+import type { OptionChoiceSet, CaseEvaluator, SimulationConstraint } from '../../src/simulation/engine.js';
 import type { SimulationCaseResult, SimulationOptions } from '../../src/simulation/types.js';
 
 // ─── Helpers ─────────────────────────────────────────────────────────────────
@@ -466,3 +477,249 @@ describe('runSimulationCases — performance', () => {
     expect(elapsed).toBeLessThan(30_000); // 30 seconds
   }, 35_000); // vitest timeout: 35 seconds
 });
+
+// ─── Lazy combination enumeration ─────────────────────────────────────────────
+
+/** The former recursive implementation, kept as an ordering reference */
+function recursiveProduct(optionSets: OptionChoiceSet[]): Record<string, string>[] {
+  if (optionSets.length === 0) return [{}];
+  const [first, ...rest] = optionSets;
+  const restProduct = recursiveProduct(rest);
+  const result: Record<string, string>[] = [];
+  for (const choice of first!.choices) {
+    for (const combination of restProduct) {
+      result.push({ [first!.typeKey]: choice, ...combination });
+    }
+  }
+  return result;
+}
+
+describe('iterateCombinations', () => {
+  const sets = makeOptionSets([
+    { typeKey: 'SIZE', count: 3 },
+    { typeKey: 'PAPER', count: 4 },
+    { typeKey: 'COLOR', count: 2 },
+  ]);
+
+  it('yields the same combinations in the same order as the recursive product', () => {
+    expect([...iterateCombinations(sets)]).toEqual(recursiveProduct(sets));
+  });
+
+  it('yields a sub-range [start, end)', () => {
+    const all = recursiveProduct(sets);
+    expect([...iterateCombinations(sets, 5, 13)]).toEqual(all.slice(5, 13));
+  });
+
+  it('combinationAt decodes any index directly', () => {
+    const all = recursiveProduct(sets);
+    for (let i = 0; i < all.length; i++) {
+      expect(combinationAt(sets, i)).toEqual(all[i]);
+    }
+  });
+
+  it('countCombinations is the product of choice counts', () => {
+    expect(countCombinations(sets)).toBe(24);
+    expect(countCombinations([])).toBe(1);
+    expect(countCombinations([{ typeKey: 'X', choices: [] }])).toBe(0);
+  });
+
+  it('yields nothing when any set is empty', () => {
+    expect([...iterateCombinations([...sets, { typeKey: 'X', choices: [] }])]).toEqual([]);
+  });
+});
+
+describe('generateCombinations', () => {
+  const choice = (code: string, isActive = true) => ({ id: 0, code, name: code, isActive });
+
+  it('enumerates active choices only', () => {
+    const result = generateCombinations([
+      { id: 1, key: 'A', name: 'A', choices: [choice('a1'), choice('a2', false)] },
+      { id: 2, key: 'B', name: 'B', choices: [choice('b1'), choice('b2')] },
+    ]);
+    expect(result).toEqual([{ A: 'a1', B: 'b1' }, { A: 'a1', B: 'b2' }]);
+  });
+
+  it('stops at the first type without active choices', () => {
+    const result = generateCombinations([
+      { id: 1, key: 'A', name: 'A', choices: [choice('a1')] },
+      { id: 2, key: 'B', name: 'B', choices: [choice('b1', false)] },
+      { id: 3, key: 'C', name: 'C', choices: [choice('c1')] },
+    ]);
+    expect(result).toEqual([{ A: 'a1' }]);
+  });
+});
+
+describe('sampleCombinationIndices', () => {
+  it('returns n distinct sorted indices within range', () => {
+    const indices = sampleCombinationIndices(1_000_000, 500);
+    expect(indices).toHaveLength(500);
+    expect(new Set(indices).size).toBe(500);
+    expect(indices.every((i) => i >= 0 && i < 1_000_000)).toBe(true);
+    expect([...indices].sort((a, b) => a - b)).toEqual(indices);
+  });
+
+  it('returns every index when n >= total', () => {
+    expect(sampleCombinationIndices(5, 10)).toEqual([0, 1, 2, 3, 4]);
+  });
+});
+
+describe('planSimulation', () => {
+  // 30 x 30 x 20 = 18,000 combinations
+  const sets = makeOptionSets([
+    { typeKey: 'A', count: 30 },
+    { typeKey: 'B', count: 30 },
+    { typeKey: 'C', count: 20 },
+  ]);
+
+  it('returns tooLarge above the ceiling without sample/forceRun', () => {
+    expect(planSimulation(sets)).toEqual({ tooLarge: true, total: 18_000, sampleSize: SIMULATION_MAX_CASES });
+  });
+
+  it('plans sampled indices when sample=true', () => {
+    const plan = planSimulation(sets, { sample: true });
+    expect(plan.tooLarge).toBe(false);
+    if (!plan.tooLarge) {
+      expect(plan.total).toBe(SIMULATION_MAX_CASES);
+      expect(plan.indices).toHaveLength(SIMULATION_MAX_CASES);
+    }
+  });
+
+  it('plans the full range under a raised ceiling', () => {
+    expect(planSimulation(sets, undefined, 1_000_000)).toEqual({ tooLarge: false, total: 18_000, indices: null });
+  });
+
+  it('plans the full range with forceRun', () => {
+    expect(planSimulation(sets, { forceRun: true })).toEqual({ tooLarge: false, total: 18_000, indices: null });
+  });
+
+  it('refuses forceRun above SIMULATION_JOB_MAX_CASES but still samples', () => {
+    // 100^4 = 100,000,000 combinations
+    const huge = makeOptionSets(['A', 'B', 'C', 'D'].map((typeKey) => ({ typeKey, count: 100 })));
+
+    expect(planSimulation(huge, { forceRun: true }, SIMULATION_JOB_MAX_CASES)).toEqual({
+      tooLarge: true,
+      total: 100_000_000,
+      sampleSize: SIMULATION_MAX_CASES,
+    });
+    const sampled = planSimulation(huge, { sample: true }, SIMULATION_JOB_MAX_CASES);
+    expect(sampled.tooLarge === false && sampled.indices).toHaveLength(SIMULATION_MAX_CASES);
+  });
+
+  it('refuses to sample spaces beyond exact integer indices', () => {
+    // 1000^6 = 1e18 > Number.MAX_SAFE_INTEGER
+    const astronomical = makeOptionSets(['A', 'B', 'C', 'D', 'E', 'F'].map((typeKey) => ({ typeKey, count: 1000 })));
+
+    expect(planSimulation(astronomical, { sample: true, forceRun: true })).toMatchObject({ tooLarge: true, sampleSize: 0 });
+  });
+});
+
+describe('runSimulation — streaming', () => {
+  it('evaluates every combination with forceRun above the threshold', async () => {
+    const optionTypes = [
+      { id: 1, key: 'A', name: 'A', choices: Array.from({ length: 120 }, (_, i) => ({ id: i, code: `a${i}`, name: '', isActive: true })) },
+      { id: 2, key: 'B', name: 'B', choices: Array.from({ length: 100 }, (_, i) => ({ id: i, code: `b${i}`, name: '', isActive: true })) },
+    ];
+    const result = await runSimulation(
+      {
+        productId: 1,
+        optionTypes,
+        constraints: [{
+          id: 1, productId: 1, constraintType: 'exclude',
+          sourceField: 'A', sourceValue: 'a0', targetField: 'B', targetValue: 'b0',
+          action: 'error', message: 'blocked', isActive: true,
+        }],
+        priceConfig: { pricingModel: 'fixed_unit', basePrice: 500 },
+      },
+      { forceRun: true },
+    );
+
+    expect('tooLarge' in result).toBe(false);
+    if (!('tooLarge' in result)) {
+      expect(result.total).toBe(12_000);
+      expect(result.errored).toBe(1);
+      expect(result.passed).toBe(11_999);
+      expect(result.cases[1]).toMatchObject({ selections: { A: 'a0', B: 'b1' }, totalPrice: 500 });
+    }
+  });
+});
+
+describe('createSimulationEvaluator — indexed constraints', () => {
+  function constraint(overrides: Partial<SimulationConstraint>): SimulationConstraint {
+    return {
+      id: 1, productId: 1, constraintType: 'exclude',
+      sourceField: 'SIZE', sourceValue: 'S', targetField: 'PAPER', targetValue: 'A',
+      action: 'error', message: 'error', isActive: true,
+      ...overrides,
+    };
+  }
+
+  it('reports the message of the last matching constraint in list order', () => {
+    const evaluator = createSimulationEvaluator([
+      constraint({ id: 1, sourceField: 'COLOR', sourceValue: '1', targetField: 'PAPER', targetValue: 'A', message: 'first' }),
+      constraint({ id: 2, message: 'second' }),
+      constraint({ id: 3, sourceField: 'COLOR', sourceValue: '1', targetField: 'SIZE', targetValue: 'S', message: 'third' }),
+    ], null);
+
+    const result = evaluator.evaluate({ SIZE: 'S', PAPER: 'A', COLOR: '1' });
+    expect(result.resultStatus).toBe('error');
+    expect(result.message).toBe('third');
+  });
+
+  it('prefers errors over warnings and ignores inactive, show and hide constraints', () => {
+    const evaluator = createSimulationEvaluator([
+      constraint({ id: 1, action: 'error', message: 'inactive', isActive: false }),
+      constraint({ id: 2, action: 'warn', message: 'warned' }),
+      constraint({ id: 3, action: 'hide', message: 'hidden' }),
+    ], null);
+
+    expect(evaluator.evaluate({ SIZE: 'S', PAPER: 'A' })).toMatchObject({ resultStatus: 'warn', message: 'warned' });
+    expect(evaluator.evaluate({ SIZE: 'S', PAPER: 'B' })).toMatchObject({ resultStatus: 'pass', message: null });
+    expect(evaluator.evaluate({ SIZE: 'M', PAPER: 'A' })).toMatchObject({ resultStatus: 'pass', message: null });
+  });
+});
+
+describe('createSimulationEvaluator — recipe constraints', () => {
+  const recipeConstraints = [
+    {
+      constraintName: 'no gloss on kraft', triggerOptionType: 'PAPER', triggerOperator: 'IN', triggerValues: ['KRAFT'],
+      actions: [{ type: 'exclude', targetOptionType: 'COATING', excludeValues: ['GLOSS'] }], priority: 0,
+    },
+    {
+      constraintName: 'mini only', triggerOptionType: 'SIZE', triggerOperator: 'EQUALS', triggerValues: ['MINI'],
+      actions: [{ type: 'filter', targetOptionType: 'PAPER', filterValues: ['ART'] }], priority: 0,
+    },
+    {
+      constraintName: 'no huge', triggerOptionType: 'SIZE', triggerOperator: 'IN', triggerValues: ['HUGE'],
+      actions: [{ type: 'block', message: 'HUGE is discontinued' }], priority: 0,
+    },
+    {
+      constraintName: 'slow coating', triggerOptionType: 'COATING', triggerOperator: 'IN', triggerValues: ['MATTE'],
+      actions: [{ type: 'show_message', level: 'warn', message: 'Matte adds a day' }], priority: 0,
+    },
+  ];
+  const priceConfig = { pricingModel: 'COMPOSITE', basePrice: 500 };
+
+  it('fails cases the widget would block or grey out', () => {
+    const evaluator = createSimulationEvaluator([], priceConfig, recipeConstraints);
+
+    expect(evaluator.evaluate({ SIZE: 'HUGE', PAPER: 'ART', COATING: 'NONE' }))
+      .toMatchObject({ resultStatus: 'error', message: 'HUGE is discontinued', totalPrice: null });
+    expect(evaluator.evaluate({ SIZE: 'A4', PAPER: 'KRAFT', COATING: 'GLOSS' })).toMatchObject({ resultStatus: 'error' });
+    expect(evaluator.evaluate({ SIZE: 'MINI', PAPER: 'KRAFT', COATING: 'NONE' })).toMatchObject({ resultStatus: 'error' });
+    expect(evaluator.evaluate({ SIZE: 'MINI', PAPER: 'ART', COATING: 'GLOSS' }))
+      .toMatchObject({ resultStatus: 'pass', totalPrice: 500 });
+  });
+
+  it('turns warning messages into warn cases, below pairwise errors', () => {
+    const evaluator = createSimulationEvaluator([{
+      id: 1, productId: 1, constraintType: 'exclude',
+      sourceField: 'SIZE', sourceValue: 'A4', targetField: 'PAPER', targetValue: 'ART',
+      action: 'error', message: 'A4 + ART not allowed', isActive: true,
+    }], priceConfig, recipeConstraints);
+
+    expect(evaluator.evaluate({ SIZE: 'A5', PAPER: 'ART', COATING: 'MATTE' }))
+      .toMatchObject({ resultStatus: 'warn', message: 'Matte adds a day', totalPrice: 500 });
+    expect(evaluator.evaluate({ SIZE: 'A4', PAPER: 'ART', COATING: 'MATTE' }))
+      .toMatchObject({ resultStatus: 'error', message: 'A4 + ART not allowed' });
+  });
+});
@@ -11,7 +11,13 @@
  * Those are tested via the admin router test file.
  */
 import { describe, it, expect } from 'vitest';
-import { validatePublishReadiness, PublishError } from '../../src/simulation/publish.js';
+import {
+  validatePublishReadiness,
+  PublishError,
+  QUOTE_SNAPSHOT_ALL,
+  quoteSnapshotPayload,
+  parseQuoteSnapshotPayload,
+} from '../../src/simulation/publish.js';
 import type { CompletenessInput } from '../../src/simulation/completeness.js';
 
 // ─── Fixtures ────────────────────────────────────────────────────────────────
@@ -240,3 +246,25 @@ describe('PublishError', () => {
     expect(err.message).toContain('mesMapping');
   });
 });
+
+// ─── Quote snapshot invalidation payload ─────────────────────────────────────
+
+describe('quote snapshot invalidation payload', () => {
+  it('encodes a product id as its decimal string', () => {
+    expect(quoteSnapshotPayload(42)).toBe('42');
+  });
+
+  it('encodes a global change as the wildcard payload', () => {
+    expect(quoteSnapshotPayload(null)).toBe(QUOTE_SNAPSHOT_ALL);
+  });
+
+  it('round-trips product ids', () => {
+    expect(parseQuoteSnapshotPayload(quoteSnapshotPayload(7))).toBe(7);
+  });
+
+  it('parses wildcard and malformed payloads as null (invalidate everything)', () => {
+    expect(parseQuoteSnapshotPayload(QUOTE_SNAPSHOT_ALL)).toBeNull();
+    expect(parseQuoteSnapshotPayload('abc')).toBeNull();
+    expect(parseQuoteSnapshotPayload('-1')).toBeNull();
+  });
+});
@@ -6,35 +6,100 @@ import { evaluateSizeShow } from './handlers/size-show.js';
 import { evaluateSizeRange } from './handlers/size-range.js';
 import { evaluatePaperCondition } from './handlers/paper-condition.js';
 
+/** Outcome of one product's constraints for one trigger value, before post-processing */
+interface LceOutcome {
+  available: Map<string, string[]>;
+  disabled: Map<string, DisabledReason>;
+  violations: ConstraintViolation[];
+}
+
+interface CompiledProduct {
+  /** Active constraints sorted by priority ascending (stable) */
+  constraints: OptionConstraint[];
+  /** Trigger fields the outcome depends on — the memo key covers exactly these */
+  readsSize: boolean;
+  readsPaper: boolean;
+  memo: Map<string, LceOutcome>;
+}
+
+interface CompiledConstraintSet {
+  byProduct: Map<number, CompiledProduct>;
+  length: number;
+}
+
+/** Cached outcomes per product and trigger value */
+const MEMO_SIZE = 1024;
+
+// Compiled once per constraint array; a changed length (in-place push/splice) recompiles
+const compiledSets = new WeakMap<OptionConstraint[], CompiledConstraintSet>();
+
+function compileConstraintSet(constraints: OptionConstraint[]): CompiledConstraintSet {
+  let compiled = compiledSets.get(constraints);
+  if (compiled && compiled.length === constraints.length) return compiled;
+
+  const byProduct = new Map<number, CompiledProduct>();
+  for (const constraint of constraints) {
+    if (!constraint.isActive) continue;
+    let product = byProduct.get(constraint.productId);
+    if (!product) {
+      product = { constraints: [], readsSize: false, readsPaper: false, memo: new Map() };
+      byProduct.set(constraint.productId, product);
+    }
+    product.constraints.push(constraint);
+    if (constraint.constraintType === 'size_show') product.readsSize = true;
+    if (constraint.constraintType === 'paper_condition') product.readsPaper = true;
+  }
+  for (const product of byProduct.values()) {
+    product.constraints.sort((a, b) => a.priority - b.priority);
+  }
+
+  compiled = { byProduct, length: constraints.length };
+  compiledSets.set(constraints, compiled);
+  return compiled;
+}
+
 /**
- * Evaluate all constraints using 4-phase LCE algorithm.
- * Phase 1: Filter applicable constraints for current product
- * Phase 2: Sort by priority, evaluate each constraint
- * Phase 3: Post-process special cases
- * Phase 4: Return combined result with timing
+ * Active constraints for one product in evaluation order.
+ * Grouping and the priority sort happen once per constraint array instead of on every evaluation.
  */
-export function evaluateConstraints(input: ConstraintEvalInput): ConstraintEvalResult {
-  const startTime = performance.now();
-
-  const results = new Map<string, string[]>();
-  const disabled = new Map<string, DisabledReason>();
-  const violations: ConstraintViolation[] = [];
+export function applicableConstraints(constraints: OptionConstraint[], productId: number): OptionConstraint[] {
+  return compileConstraintSet(constraints).byProduct.get(productId)?.constraints ?? [];
+}
 
-  // Phase 1: Filter applicable constraints
-  const applicable = input.constraints.filter(
-    c => c.productId === input.productId && c.isActive,
-  );
+/**
+ * The selection values the handlers read, as a memo key: the cut size for size_show and
+ * the selected paper's weight for paper_condition. size_range and unknown types read nothing.
+ */
+function triggerKey(product: CompiledProduct, input: ConstraintEvalInput): string {
+  let key = '';
+  if (product.readsSize) {
+    const size = input.currentSelections.get('size');
+    key += size ? `s${size.cutWidth}x${size.cutHeight}` : '-';
+  }
+  if (product.readsPaper) {
+    const paperSelection = input.currentSelections.get('paperType');
+    const paper = paperSelection ? input.papers?.find((p) => p.id === paperSelection.refPaperId) : undefined;
+    key += paper ? `\u0000w${paper.weight ?? 0}` : '\u0000-';
+  }
+  return key;
+}
 
-  // Phase 2: Sort by priority (ascending) and evaluate
-  const sorted = applicable.sort((a, b) => a.priority - b.priority);
+// @MX:NOTE: [AUTO] Outcomes are memoized per product and trigger value (cut size, paper weight)
+// @MX:REASON: Every LCE constraint yields an outcome (show/hide/disable) whether or not it matches, so a repeat
+// evaluation costs the size of the outcome instead of the product's constraint count
+function productOutcome(product: CompiledProduct, input: ConstraintEvalInput): LceOutcome {
+  const key = triggerKey(product, input);
+  const cached = product.memo.get(key);
+  if (cached) return cached;
 
-  for (const constraint of sorted) {
+  const outcome: LceOutcome = { available: new Map(), disabled: new Map(), violations: [] };
+  for (const constraint of product.constraints) {
     const evalResult = evaluateSingleConstraint(constraint, input);
 
     if (evalResult.action === 'show') {
-      mergeAvailable(results, constraint.targetField, evalResult.values ?? []);
+      mergeAvailable(outcome.available, constraint.targetField, evalResult.values ?? []);
     } else if (evalResult.action === 'hide' || evalResult.action === 'disable') {
-      disabled.set(constraint.targetField, {
+      outcome.disabled.set(constraint.targetField, {
         type: 'CONSTRAINT',
         constraintId: constraint.id,
         description: constraint.description ?? '',
@@ -42,14 +107,14 @@ export function evaluateConstraints(input: ConstraintEvalInput): ConstraintEvalR
     } else if (evalResult.action === 'limit_range') {
       // Range limits are applied as metadata, stored via values encoding
       if (evalResult.min && evalResult.max) {
-        mergeAvailable(results, constraint.targetField, [
+        mergeAvailable(outcome.available, constraint.targetField, [
           `range:${evalResult.min.width}x${evalResult.min.height}:${evalResult.max.width}x${evalResult.max.height}`,
         ]);
       }
     }
 
     if (evalResult.violated) {
-      violations.push({
+      outcome.violations.push({
         constraintId: constraint.id,
         constraintType: constraint.constraintType,
         message: constraint.description ?? `Constraint ${constraint.id} violated`,
@@ -59,6 +124,35 @@ export function evaluateConstraints(input: ConstraintEvalInput): ConstraintEvalR
     }
   }
 
+  if (product.memo.size >= MEMO_SIZE) product.memo.clear();
+  product.memo.set(key, outcome);
+  return outcome;
+}
+
+/**
+ * Evaluate all constraints using 4-phase LCE algorithm.
+ * Phase 1: Filter applicable constraints for current product
+ * Phase 2: Sort by priority, evaluate each constraint (memoized per trigger value)
+ * Phase 3: Post-process special cases
+ * Phase 4: Return combined result with timing
+ */
+export function evaluateConstraints(input: ConstraintEvalInput): ConstraintEvalResult {
+  const startTime = performance.now();
+
+  const results = new Map<string, string[]>();
+  const disabled = new Map<string, DisabledReason>();
+  const violations: ConstraintViolation[] = [];
+
+  // Phase 1 + 2: compiled once per constraint array, outcome reused for a repeated trigger value
+  const product = compileConstraintSet(input.constraints).byProduct.get(input.productId);
+  if (product) {
+    // Callers own the returned maps, so the memoized outcome is copied
+    const outcome = productOutcome(product, input);
+    for (const [field, values] of outcome.available) results.set(field, [...values]);
+    for (const [field, reason] of outcome.disabled) disabled.set(field, { ...reason });
+    for (const violation of outcome.violations) violations.push({ ...violation });
+  }
+
   // Phase 3: Post-process special cases
   postProcessSizeConstraints(results, disabled, input);
   postProcessPaperConstraints(results, disabled, input);
@@ -0,0 +1,347 @@
+// Compiled ECA constraint program for recipe_constraints (SPEC-WB-006 FR-WB006-01)
+//
+// A recipe's constraint list is compiled once into per-option-type trigger
+// tables, so evaluating a selection only touches the constraints whose
+// trigger matches. Output order is identical to the linear evaluator:
+// priority DESC, ties in list order.
+
+export type ConstraintSelectionValue = string | number | string[];
+export type ConstraintSelections = Record<string, ConstraintSelectionValue>;
+
+/** recipe_constraints row shape consumed by the program (extra columns are ignored) */
+export interface EcaConstraint {
+  constraintName: string;
+  triggerOptionType: string;
+  triggerOperator: string;
+  triggerValues: unknown;
+  actions: unknown;
+  priority: number;
+}
+
+export interface EcaAction {
+  type: string;
+  targetOptionType?: string;
+  excludeValues?: string[];
+  filterValues?: string[];
+  message?: string;
+  level?: string;
+  addonGroupId?: number;
+  addonItemId?: number;
+}
+
+export interface EcaUiAction {
+  type: string;
+  targetOptionType?: string;
+  excludeValues?: string[];
+  filterValues?: string[];
+  message?: string;
+  level?: string;
+  addonGroupId?: number;
+  addonItemId?: number;
+}
+
+export interface EcaViolation {
+  constraintName: string;
+  message: string;
+}
+
+export interface EcaAddon {
+  type: string;
+  addonGroupId?: number;
+  addonItemId?: number;
+}
+
+export interface EcaEvaluation {
+  uiActions: EcaUiAction[];
+  violations: EcaViolation[];
+  addons: EcaAddon[];
+}
+
+/**
+ * Choices of one option type that the current selections leave selectable.
+ * excluded = union of exclude actions; allowedOnly = intersection of filter actions (null = no filter).
+ */
+export interface ChoiceAvailability {
+  excluded: string[];
+  allowedOnly: string[] | null;
+}
+
+/** Cached evaluations per distinct trigger-relevant selection prefix */
+const DEFAULT_MEMO_SIZE = 1024;
+
+interface TriggerTable {
+  /** IN: trigger value -> ranks */
+  in: Map<unknown, number[]>;
+  /** CONTAINS: trigger value -> ranks (array selections only) */
+  contains: Map<unknown, number[]>;
+  /** EQUALS: triggerValues[0] -> ranks */
+  equals: Map<unknown, number[]>;
+  /** NOT_IN: all ranks, plus trigger value -> ranks that a matching value suppresses */
+  notIn: number[];
+  notInValues: Map<unknown, number[]>;
+  /** NOT_EQUALS: all ranks, plus triggerValues[0] -> ranks that a matching value suppresses */
+  notEquals: number[];
+  notEqualsValues: Map<unknown, number[]>;
+}
+
+interface MemoEntry {
+  evaluation: EcaEvaluation;
+  availability?: Record<string, ChoiceAvailability>;
+}
+
+function addRank(index: Map<unknown, number[]>, value: unknown, rank: number): void {
+  const ranks = index.get(value);
+  if (!ranks) index.set(value, [rank]);
+  // Duplicate trigger values within one constraint register once
+  else if (ranks[ranks.length - 1] !== rank) ranks.push(rank);
+}
+
+function addAll(target: Set<number>, ranks: number[] | undefined): void {
+  if (!ranks) return;
+  for (const rank of ranks) target.add(rank);
+}
+
+function emptyTable(): TriggerTable {
+  return {
+    in: new Map(),
+    contains: new Map(),
+    equals: new Map(),
+    notIn: [],
+    notInValues: new Map(),
+    notEquals: [],
+    notEqualsValues: new Map(),
+  };
+}
+
+/** Prebuild the outputs of one constraint; they are emitted as-is whenever it fires */
+function compileEffects(constraint: EcaConstraint): EcaEvaluation {
+  const uiActions: EcaUiAction[] = [];
+  const violations: EcaViolation[] = [];
+  const addons: EcaAddon[] = [];
+
+  const actions = Array.isArray(constraint.actions) ? (constraint.actions as EcaAction[]) : [];
+  for (const action of actions) {
+    if (action.type === 'exclude' || action.type === 'filter') {
+      uiActions.push({
+        type: action.type,
+        targetOptionType: action.targetOptionType,
+        excludeValues: action.excludeValues,
+        filterValues: action.filterValues,
+      });
+    } else if (action.type === 'show_message') {
+      uiActions.push({
+        type: 'show_message',
+        message: action.message,
+        level: action.level ?? 'info',
+      });
+    } else if (action.type === 'block') {
+      violations.push({
+        constraintName: constraint.constraintName,
+        message: action.message ?? `Option combination blocked by constraint: ${constraint.constraintName}`,
+      });
+    } else if (action.type === 'auto_add') {
+      addons.push({
+        type: 'auto_add',
+        addonGroupId: action.addonGroupId,
+        addonItemId: action.addonItemId,
+      });
+      uiActions.push({
+        type: 'auto_add',
+        addonGroupId: action.addonGroupId,
+        addonItemId: action.addonItemId,
+      });
+    } else if (action.type === 'show_addon_list') {
+      uiActions.push({
+        type: 'show_addon_list',
+        addonGroupId: action.addonGroupId,
+      });
+    }
+  }
+
+  return { uiActions, violations, addons };
+}
+
+function selectionKeyPart(value: ConstraintSelectionValue | undefined): string {
+  if (value === undefined) return '-';
+  if (Array.isArray(value)) return `a${JSON.stringify(value)}`;
+  // Scalars are only ever compared as strings
+  return `s${String(value)}`;
+}
+
+// @MX:ANCHOR: [AUTO] ConstraintProgram — compiled recipe constraint evaluator shared by widget quote/init/orders
+// @MX:REASON: fan_in >= 3: widget quote, widget init, widget order re-quote (via the quote snapshot)
+// @MX:SPEC: SPEC-WB-006 FR-WB006-01
+// @MX:NOTE: [AUTO] Cost per evaluation = trigger option types + fired constraints; memoized per trigger-relevant selection prefix
+// @MX:WARN: [AUTO] Returned arrays and objects are shared between calls — treat them as read-only
+// @MX:REASON: Memoized evaluations and prebuilt per-constraint effects are returned without copying
+/**
+ * Compiled form of one recipe's constraints.
+ * Trigger operators: IN, NOT_IN, EQUALS, NOT_EQUALS, CONTAINS (case-sensitive, unknown operators never fire).
+ * A constraint is skipped when its trigger option type has no selection.
+ */
+export class ConstraintProgram {
+  /** Prebuilt effects, indexed by rank (position in priority order) */
+  private readonly effects: EcaEvaluation[] = [];
+  private readonly triggers = new Map<string, TriggerTable>();
+  /** Trigger option types in a fixed order — the memo key covers exactly these */
+  private readonly triggerTypes: string[];
+  private readonly memo = new Map<string, MemoEntry>();
+
+  constructor(
+    constraints: readonly EcaConstraint[],
+    private readonly memoSize: number = DEFAULT_MEMO_SIZE,
+  ) {
+    // Priority order is fixed here; Array.prototype.sort is stable, so ties keep list order
+    const ordered = [...constraints].sort((a, b) => b.priority - a.priority);
+
+    ordered.forEach((constraint, rank) => {
+      this.effects.push(compileEffects(constraint));
+
+      let table = this.triggers.get(constraint.triggerOptionType);
+      if (!table) {
+        table = emptyTable();
+        this.triggers.set(constraint.triggerOptionType, table);
+      }
+
+      const values: unknown[] = Array.isArray(constraint.triggerValues) ? constraint.triggerValues : [];
+      switch (constraint.triggerOperator) {
+        case 'IN':
+          for (const value of values) addRank(table.in, value, rank);
+          break;
+        case 'CONTAINS':
+          for (const value of values) addRank(table.contains, value, rank);
+          break;
+        case 'EQUALS':
+          if (values.length > 0) addRank(table.equals, values[0], rank);
+          break;
+        case 'NOT_IN':
+          table.notIn.push(rank);
+          for (const value of values) addRank(table.notInValues, value, rank);
+          break;
+        case 'NOT_EQUALS':
+          table.notEquals.push(rank);
+          if (values.length > 0) addRank(table.notEqualsValues, values[0], rank);
+          break;
+        default:
+          break;
+      }
+    });
+
+    this.triggerTypes = [...this.triggers.keys()];
+  }
+
+  /** Number of compiled constraints */
+  get size(): number {
+    return this.effects.length;
+  }
+
+  /** Evaluate selections: UI actions, block violations and auto-added addons in priority order */
+  evaluate(selections: ConstraintSelections): EcaEvaluation {
+    return this.lookup(selections).evaluation;
+  }
+
+  /**
+   * Per target option type, which choices remain selectable after the exclude/filter
+   * actions fired by these selections. Option types without such actions are omitted.
+   */
+  availableChoices(selections: ConstraintSelections): Record<string, ChoiceAvailability> {
+    const entry = this.lookup(selections);
+    entry.availability ??= this.buildAvailability(entry.evaluation.uiActions);
+    return entry.availability;
+  }
+
+  private lookup(selections: ConstraintSelections): MemoEntry {
+    let key = '';
+    for (const type of this.triggerTypes) {
+      key += `${selectionKeyPart(selections[type])}\u0000`;
+    }
+
+    const cached = this.memo.get(key);
+    if (cached) return cached;
+
+    const entry: MemoEntry = { evaluation: this.run(selections) };
+    if (this.memo.size >= this.memoSize) this.memo.clear();
+    this.memo.set(key, entry);
+    return entry;
+  }
+
+  private run(selections: ConstraintSelections): EcaEvaluation {
+    const fired = new Set<number>();
+
+    for (const [type, table] of this.triggers) {
+      const selected = selections[type];
+      if (selected === undefined) continue;
+
+      // IN / NOT_IN compare raw array elements, or the stringified scalar
+      const values: unknown[] = Array.isArray(selected) ? selected : [String(selected)];
+      const asString = String(selected);
+
+      for (const value of values) addAll(fired, table.in.get(value));
+      if (Array.isArray(selected)) {
+        for (const value of selected) addAll(fired, table.contains.get(String(value)));
+      }
+      addAll(fired, table.equals.get(asString));
+
+      if (table.notIn.length > 0) {
+        const suppressed = new Set<number>();
+        for (const value of values) addAll(suppressed, table.notInValues.get(value));
+        for (const rank of table.notIn) {
+          if (!suppressed.has(rank)) fired.add(rank);
+        }
+      }
+      if (table.notEquals.length > 0) {
+        const suppressed = table.notEqualsValues.get(asString);
+        for (const rank of table.notEquals) {
+          if (!suppressed?.includes(rank)) fired.add(rank);
+        }
+      }
+    }
+
+    const uiActions: EcaUiAction[] = [];
+    const violations: EcaViolation[] = [];
+    const addons: EcaAddon[] = [];
+    for (const rank of [...fired].sort((a, b) => a - b)) {
+      const effects = this.effects[rank]!;
+      uiActions.push(...effects.uiActions);
+      violations.push(...effects.violations);
+      addons.push(...effects.addons);
+    }
+
+    return { uiActions, violations, addons };
+  }
+
+  private buildAvailability(uiActions: EcaUiAction[]): Record<string, ChoiceAvailability> {
+    const availability: Record<string, ChoiceAvailability> = {};
+
+    for (const action of uiActions) {
+      if ((action.type !== 'exclude' && action.type !== 'filter') || !action.targetOptionType) continue;
+
+      const entry = (availability[action.targetOptionType] ??= { excluded: [], allowedOnly: null });
+      if (action.type === 'exclude') {
+        for (const value of action.excludeValues ?? []) {
+          if (!entry.excluded.includes(value)) entry.excluded.push(value);
+        }
+      } else {
+        const allowed = action.filterValues ?? [];
+        entry.allowedOnly = entry.allowedOnly === null
+          ? [...new Set(allowed)]
+          : entry.allowedOnly.filter((value) => allowed.includes(value));
+      }
+    }
+
+    return availability;
+  }
+}
+
+// Programs are compiled once per constraint array (e.g. one per quote snapshot)
+const programCache = new WeakMap<readonly EcaConstraint[], { program: ConstraintProgram; length: number }>();
+
+/** Compiled program for a constraint array, memoized per array instance */
+export function compileConstraintProgram(constraints: readonly EcaConstraint[]): ConstraintProgram {
+  const cached = programCache.get(constraints);
+  if (cached && cached.length === constraints.length) return cached.program;
+
+  const program = new ConstraintProgram(constraints);
+  programCache.set(constraints, { program, length: constraints.length });
+  return program;
+}
@@ -37,6 +37,18 @@ export type {
 export { evaluateConstraints } from './constraints/evaluator.js';
 export { mergeConstraintLayers } from './constraints/merger.js';
 export { detectCycles } from './constraints/cycle-detector.js';
+export { ConstraintProgram, compileConstraintProgram } from './constraints/program.js';
+export type {
+  EcaConstraint,
+  EcaAction,
+  EcaUiAction,
+  EcaViolation,
+  EcaAddon,
+  EcaEvaluation,
+  ChoiceAvailability,
+  ConstraintSelections,
+  ConstraintSelectionValue,
+} from './constraints/program.js';
 export type {
   ConstraintEvalInput,
   ConstraintEvalResult,
@@ -65,9 +77,22 @@ export {
   sampleN,
   runSimulationCases,
   resolveSimulationCombinations,
+  planSimulation,
+  countCombinations,
+  combinationAt,
+  iterateCombinations,
+  iterateCombinationsAt,
+  sampleCombinationIndices,
+  toOptionChoiceSets,
+  createSimulationEvaluator,
   SIMULATION_MAX_CASES,
+  SIMULATION_JOB_MAX_CASES,
   validatePublishReadiness,
   PublishError,
+  QUOTE_SNAPSHOT_CHANNEL,
+  QUOTE_SNAPSHOT_ALL,
+  quoteSnapshotPayload,
+  parseQuoteSnapshotPayload,
 } from './simulation/index.js';
 export type {
   CompletenessInput,
@@ -81,6 +106,7 @@ export type {
   SimulationPriceConfig,
   OptionChoiceSet,
   CaseEvaluator,
+  SimulationPlan,
   SimulationCaseResult,
   SimulationResult,
   TooLargeResult,
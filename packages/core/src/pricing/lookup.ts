@@ -1,12 +1,14 @@
 // Tier and imposition lookup functions (REQ-PRICE-009, REQ-PRICE-010)
 
 import { PricingError } from '../errors.js';
+import { tierIndexFor, impositionIndexFor, fixedPriceIndexFor, packagePriceIndexFor } from './pricing-index.js';
 import type { PriceTier, ImpositionRule, FixedPriceRecord, PackagePriceRecord, PricingLookupData, SelectedOption } from './types.js';
 
 /**
  * Look up unit price from price tiers by option code and quantity range.
  * Finds first tier where optionCode matches AND minQty <= quantity <= maxQty
  * AND (sheetStandard null OR matches).
+ * Resolved through a prebuilt TierIndex (binary search over qty intervals).
  */
 export function lookupTier(
   tiers: PriceTier[],
@@ -14,12 +16,7 @@ export function lookupTier(
   quantity: number,
   sheetStandard: string | null,
 ): number {
-  const matched = tiers.find(t =>
-    t.optionCode === optionCode &&
-    t.minQty <= quantity &&
-    quantity <= t.maxQty &&
-    (sheetStandard === null || t.sheetStandard === null || t.sheetStandard === sheetStandard),
-  );
+  const matched = tierIndexFor(tiers).find(optionCode, quantity, sheetStandard);
 
   if (!matched) {
     throw new PricingError('TIER_NOT_FOUND', {
@@ -35,6 +32,7 @@ export function lookupTier(
 /**
  * Look up imposition count from rules by cut dimensions and sheet standard.
  * Uses tolerance of 0.5mm for floating point comparison.
+ * Resolved through a prebuilt ImpositionIndex (tolerance-aware hash grid on cut size).
  */
 export function lookupImposition(
   cutWidth: number,
@@ -42,11 +40,7 @@ export function lookupImposition(
   sheetStandard: string,
   rules: ImpositionRule[],
 ): number {
-  const matched = rules.find(r =>
-    Math.abs(r.cutWidth - cutWidth) < 0.5 &&
-    Math.abs(r.cutHeight - cutHeight) < 0.5 &&
-    r.sheetStandard === sheetStandard,
-  );
+  const matched = impositionIndexFor(rules).find(cutWidth, cutHeight, sheetStandard);
 
   if (!matched) {
     throw new PricingError('IMPOSITION_NOT_FOUND', {
@@ -62,6 +56,7 @@ export function lookupImposition(
 /**
  * Look up fixed price by product, size, paper, and print mode.
  * Null parameters act as wildcards (match any).
+ * Resolved through a prebuilt FixedPriceIndex (wildcard-aware composite key).
  */
 export function lookupFixedPrice(
   productId: number,
@@ -70,12 +65,7 @@ export function lookupFixedPrice(
   printModeId: number | null,
   fixedPrices: FixedPriceRecord[],
 ): FixedPriceRecord {
-  const matched = fixedPrices.find(fp =>
-    fp.productId === productId &&
-    (sizeId === null || fp.sizeId === null || fp.sizeId === sizeId) &&
-    (paperId === null || fp.paperId === null || fp.paperId === paperId) &&
-    (printModeId === null || fp.printModeId === null || fp.printModeId === printModeId),
-  );
+  const matched = fixedPriceIndexFor(fixedPrices).find(productId, sizeId, paperId, printModeId);
 
   if (!matched) {
     throw new PricingError('FIXED_PRICE_NOT_FOUND', {
@@ -100,13 +90,8 @@ export function lookupPackagePrice(
   quantity: number,
   packagePrices: PackagePriceRecord[],
 ): number {
-  const matched = packagePrices.find(pp =>
-    pp.productId === productId &&
-    pp.sizeId === sizeId &&
-    pp.printModeId === printModeId &&
-    pp.pageCount === pageCount &&
-    pp.minQty <= quantity &&
-    quantity <= pp.maxQty,
+  const matched = packagePriceIndexFor(packagePrices).find(
+    productId, sizeId, printModeId, pageCount, quantity,
   );
 
   if (!matched) {
@@ -0,0 +1,319 @@
+// Prebuilt lookup indexes over pricing data (REQ-PRICE-009, REQ-PRICE-010)
+//
+// Every index reproduces the linear "first match in array order" semantics of
+// the original Array.find lookups: when several rows match, the one with the
+// lowest array position wins.
+
+import type {
+  PriceTier,
+  ImpositionRule,
+  FixedPriceRecord,
+  PackagePriceRecord,
+} from './types.js';
+
+/** Tolerance (mm) for imposition cut size matching */
+export const IMPOSITION_TOLERANCE_MM = 0.5;
+
+const WILDCARD = '*';
+
+interface Ranked<T> {
+  item: T;
+  order: number;
+}
+
+function pickFirst<T>(a: Ranked<T> | undefined, b: Ranked<T> | undefined): Ranked<T> | undefined {
+  if (!a) return b;
+  if (!b) return a;
+  return a.order <= b.order ? a : b;
+}
+
+// === Quantity intervals ===
+
+interface QtyInterval<T> extends Ranked<T> {
+  minQty: number;
+  maxQty: number;
+}
+
+/**
+ * Inclusive [minQty, maxQty] intervals sorted by minQty.
+ * Disjoint interval sets (the normal case) resolve with one binary search;
+ * overlapping sets scan only the intervals starting at or below the quantity.
+ */
+class QtyIntervalIndex<T> {
+  private readonly intervals: QtyInterval<T>[] = [];
+  private disjoint = true;
+
+  add(item: T, order: number, minQty: number, maxQty: number): void {
+    // NaN bounds never satisfy minQty <= qty <= maxQty
+    if (Number.isNaN(minQty) || Number.isNaN(maxQty)) return;
+    this.intervals.push({ item, order, minQty, maxQty });
+  }
+
+  seal(): void {
+    this.intervals.sort((a, b) => a.minQty - b.minQty || a.order - b.order);
+    for (let i = 1; i < this.intervals.length; i++) {
+      if (this.intervals[i].minQty <= this.intervals[i - 1].maxQty) {
+        this.disjoint = false;
+        break;
+      }
+    }
+  }
+
+  find(quantity: number): Ranked<T> | undefined {
+    const list = this.intervals;
+
+    // Last interval with minQty <= quantity
+    let lo = 0;
+    let hi = list.length - 1;
+    let last = -1;
+    while (lo <= hi) {
+      const mid = (lo + hi) >>> 1;
+      if (list[mid].minQty <= quantity) {
+        last = mid;
+        lo = mid + 1;
+      } else {
+        hi = mid - 1;
+      }
+    }
+    if (last < 0) return undefined;
+
+    if (this.disjoint) {
+      return quantity <= list[last].maxQty ? list[last] : undefined;
+    }
+
+    let best: Ranked<T> | undefined;
+    for (let i = 0; i <= last; i++) {
+      if (quantity <= list[i].maxQty) best = pickFirst(best, list[i]);
+    }
+    return best;
+  }
+}
+
+// === Price tiers ===
+
+interface TierBucket {
+  any: QtyIntervalIndex<PriceTier>;
+  bySheet: Map<string | null, QtyIntervalIndex<PriceTier>>;
+}
+
+/** Price tiers keyed by optionCode, then by sheetStandard, with qty intervals per key */
+export class TierIndex {
+  private readonly byCode = new Map<string, TierBucket>();
+
+  constructor(tiers: PriceTier[]) {
+    tiers.forEach((tier, order) => {
+      let bucket = this.byCode.get(tier.optionCode);
+      if (!bucket) {
+        bucket = { any: new QtyIntervalIndex(), bySheet: new Map() };
+        this.byCode.set(tier.optionCode, bucket);
+      }
+      bucket.any.add(tier, order, tier.minQty, tier.maxQty);
+
+      let sheetIndex = bucket.bySheet.get(tier.sheetStandard);
+      if (!sheetIndex) {
+        sheetIndex = new QtyIntervalIndex();
+        bucket.bySheet.set(tier.sheetStandard, sheetIndex);
+      }
+      sheetIndex.add(tier, order, tier.minQty, tier.maxQty);
+    });
+
+    for (const bucket of this.byCode.values()) {
+      bucket.any.seal();
+      for (const sheetIndex of bucket.bySheet.values()) sheetIndex.seal();
+    }
+  }
+
+  /** A null sheetStandard on either side matches any sheet standard */
+  find(optionCode: string, quantity: number, sheetStandard: string | null): PriceTier | undefined {
+    const bucket = this.byCode.get(optionCode);
+    if (!bucket) return undefined;
+
+    if (sheetStandard === null) {
+      return bucket.any.find(quantity)?.item;
+    }
+
+    return pickFirst(
+      bucket.bySheet.get(null)?.find(quantity),
+      bucket.bySheet.get(sheetStandard)?.find(quantity),
+    )?.item;
+  }
+}
+
+// === Imposition rules ===
+
+/**
+ * Imposition rules in a hash grid of 1mm cells (2x tolerance) per sheet standard.
+ * A rule within tolerance of the query always lies in one of the 3x3 neighbouring cells.
+ */
+export class ImpositionIndex {
+  private readonly bySheet = new Map<string, Map<string, Ranked<ImpositionRule>[]>>();
+
+  constructor(rules: ImpositionRule[]) {
+    rules.forEach((rule, order) => {
+      // Non-finite dimensions can never satisfy the tolerance check
+      if (!Number.isFinite(rule.cutWidth) || !Number.isFinite(rule.cutHeight)) return;
+
+      let grid = this.bySheet.get(rule.sheetStandard);
+      if (!grid) {
+        grid = new Map();
+        this.bySheet.set(rule.sheetStandard, grid);
+      }
+      const key = cellKey(Math.floor(rule.cutWidth), Math.floor(rule.cutHeight));
+      const cell = grid.get(key);
+      if (cell) cell.push({ item: rule, order });
+      else grid.set(key, [{ item: rule, order }]);
+    });
+  }
+
+  find(cutWidth: number, cutHeight: number, sheetStandard: string): ImpositionRule | undefined {
+    const grid = this.bySheet.get(sheetStandard);
+    if (!grid || !Number.isFinite(cutWidth) || !Number.isFinite(cutHeight)) return undefined;
+
+    const cx = Math.floor(cutWidth);
+    const cy = Math.floor(cutHeight);
+    let best: Ranked<ImpositionRule> | undefined;
+
+    for (let dx = -1; dx <= 1; dx++) {
+      for (let dy = -1; dy <= 1; dy++) {
+        const cell = grid.get(cellKey(cx + dx, cy + dy));
+        if (!cell) continue;
+        for (const candidate of cell) {
+          const r = candidate.item;
+          if (
+            Math.abs(r.cutWidth - cutWidth) < IMPOSITION_TOLERANCE_MM &&
+            Math.abs(r.cutHeight - cutHeight) < IMPOSITION_TOLERANCE_MM
+          ) {
+            best = pickFirst(best, candidate);
+          }
+        }
+      }
+    }
+    return best?.item;
+  }
+}
+
+function cellKey(x: number, y: number): string {
+  return `${x}:${y}`;
+}
+
+// === Fixed prices ===
+
+interface FixedPriceBucket {
+  rows: FixedPriceRecord[];
+  byKey: Map<string, Ranked<FixedPriceRecord>>;
+}
+
+/**
+ * Fixed prices keyed by productId, then by a size|paper|printMode composite key
+ * in which null record fields are stored as a wildcard.
+ */
+export class FixedPriceIndex {
+  private readonly byProduct = new Map<number, FixedPriceBucket>();
+
+  constructor(fixedPrices: FixedPriceRecord[]) {
+    fixedPrices.forEach((fp, order) => {
+      let bucket = this.byProduct.get(fp.productId);
+      if (!bucket) {
+        bucket = { rows: [], byKey: new Map() };
+        this.byProduct.set(fp.productId, bucket);
+      }
+      bucket.rows.push(fp);
+
+      const key = compositeKey(fp.sizeId, fp.paperId, fp.printModeId);
+      if (!bucket.byKey.has(key)) bucket.byKey.set(key, { item: fp, order });
+    });
+  }
+
+  /** Null parameters act as wildcards on the query side as well */
+  find(
+    productId: number,
+    sizeId: number | null,
+    paperId: number | null,
+    printModeId: number | null,
+  ): FixedPriceRecord | undefined {
+    const bucket = this.byProduct.get(productId);
+    if (!bucket) return undefined;
+
+    // A null query field matches every record value, which no key can express
+    if (sizeId === null || paperId === null || printModeId === null) {
+      return bucket.rows.find(fp =>
+        (sizeId === null || fp.sizeId === null || fp.sizeId === sizeId) &&
+        (paperId === null || fp.paperId === null || fp.paperId === paperId) &&
+        (printModeId === null || fp.printModeId === null || fp.printModeId === printModeId),
+      );
+    }
+
+    // Each record field is either the queried value or a wildcard: 2^3 keys
+    let best: Ranked<FixedPriceRecord> | undefined;
+    for (const s of [sizeId, null]) {
+      for (const p of [paperId, null]) {
+        for (const m of [printModeId, null]) {
+          best = pickFirst(best, bucket.byKey.get(compositeKey(s, p, m)));
+        }
+      }
+    }
+    return best?.item;
+  }
+}
+
+function compositeKey(...values: (number | string | null)[]): string {
+  return values.map(v => (v === null ? WILDCARD : String(v))).join('|');
+}
+
+// === Package prices ===
+
+/** Package prices keyed by product|size|printMode|pageCount with qty intervals per key */
+export class PackagePriceIndex {
+  private readonly byKey = new Map<string, QtyIntervalIndex<PackagePriceRecord>>();
+
+  constructor(packagePrices: PackagePriceRecord[]) {
+    packagePrices.forEach((pp, order) => {
+      const key = compositeKey(pp.productId, pp.sizeId, pp.printModeId, pp.pageCount);
+      let index = this.byKey.get(key);
+      if (!index) {
+        index = new QtyIntervalIndex();
+        this.byKey.set(key, index);
+      }
+      index.add(pp, order, pp.minQty, pp.maxQty);
+    });
+
+    for (const index of this.byKey.values()) index.seal();
+  }
+
+  find(
+    productId: number,
+    sizeId: number,
+    printModeId: number,
+    pageCount: number,
+    quantity: number,
+  ): PackagePriceRecord | undefined {
+    return this.byKey
+      .get(compositeKey(productId, sizeId, printModeId, pageCount))
+      ?.find(quantity)?.item;
+  }
+}
+
+// === Index cache ===
+
+// @MX:ANCHOR: [AUTO] Per-array index cache — lookup.ts resolves every tier/imposition/fixed/package lookup through it
+// @MX:REASON: fan_in >= 3: all pricing models reach these indexes via lookup.ts, so one array is indexed once across quotes
+// @MX:NOTE: [AUTO] Indexes are memoized per source array; lookup data is treated as immutable once priced
+// @MX:WARN: [AUTO] In-place edits to existing rows are not detected — replace the array (or append) to refresh
+// @MX:REASON: Arrays are compared by length only, so appending rows rebuilds but mutating a row does not
+
+function memoize<T, I>(build: (rows: T[]) => I): (rows: T[]) => I {
+  const cache = new WeakMap<T[], { index: I; length: number }>();
+  return (rows) => {
+    let entry = cache.get(rows);
+    if (!entry || entry.length !== rows.length) {
+      entry = { index: build(rows), length: rows.length };
+      cache.set(rows, entry);
+    }
+    return entry.index;
+  };
+}
+
+export const tierIndexFor = memoize((rows: PriceTier[]) => new TierIndex(rows));
+export const impositionIndexFor = memoize((rows: ImpositionRule[]) => new ImpositionIndex(rows));
+export const fixedPriceIndexFor = memoize((rows: FixedPriceRecord[]) => new FixedPriceIndex(rows));
+export const packagePriceIndexFor = memoize((rows: PackagePriceRecord[]) => new PackagePriceIndex(rows));
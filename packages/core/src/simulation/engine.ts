@@ -1,10 +1,16 @@
 // Simulation engine — cartesian product + constraint/price evaluation
 // SPEC-WB-005 FR-WB005-03, FR-WB005-04
 
+import { ConstraintProgram } from '../constraints/program.js';
+import type { EcaConstraint } from '../constraints/program.js';
 import type { SimulationCaseResult, SimulationResult, TooLargeResult } from './types.js';
 
 export const SIMULATION_MAX_CASES = 10_000;
 
+// @MX:NOTE: [AUTO] Ceiling for exhaustive background simulation jobs (cases are streamed to the DB, not held in memory)
+// @MX:NOTE: [AUTO] Hard limit — forceRun skips sampling below it but never lifts it
+export const SIMULATION_JOB_MAX_CASES = 1_000_000;
+
 // ─── Input types ──────────────────────────────────────────────────────────────
 
 export interface SimOptionChoice {
@@ -52,36 +58,148 @@ export interface SimulationOptions {
   onProgress?: (current: number, total: number) => void;
 }
 
-// ─── Cartesian product generation ─────────────────────────────────────────────
+// ─── Combination space (lazy mixed-radix enumeration) ─────────────────────────
 
-/**
- * Generate all combinations of option choices.
- * Returns array of {typeKey: choiceCode} maps.
- * Returns empty array if no option types provided.
- */
-export function generateCombinations(optionTypes: OptionType[]): Record<string, string>[] {
-  if (optionTypes.length === 0) return [];
+export interface OptionChoiceSet {
+  typeKey: string;
+  choices: string[];
+}
 
-  const first = optionTypes[0];
-  if (first === undefined) return [];
+// @MX:NOTE: [AUTO] Combination i is the mixed-radix number whose digits index each set's choices
+// @MX:REASON: The first set is the most significant digit, matching the order of the former recursive generators
+// @MX:SPEC: SPEC-WB-005 FR-WB005-03
 
-  const activeChoices = first.choices.filter((c) => c.isActive);
-  if (activeChoices.length === 0) return [];
+/**
+ * Number of combinations in the cartesian product of the option sets.
+ * An empty list of sets has exactly one (empty) combination.
+ */
+export function countCombinations(optionSets: readonly OptionChoiceSet[]): number {
+  let total = 1;
+  for (const set of optionSets) total *= set.choices.length;
+  return total;
+}
 
-  const rest = optionTypes.slice(1);
-  const restCombinations = rest.length > 0 ? generateCombinations(rest) : [{}];
+/**
+ * Decode the combination at a given index without enumerating its predecessors.
+ */
+export function combinationAt(
+  optionSets: readonly OptionChoiceSet[],
+  index: number,
+): Record<string, string> {
+  const digits = decodeIndex(optionSets, index);
+  return buildCombination(optionSets, digits);
+}
 
-  const result: Record<string, string>[] = [];
-  for (const choice of activeChoices) {
-    if (restCombinations.length === 0) {
-      result.push({ [first.key]: choice.code });
-    } else {
-      for (const combination of restCombinations) {
-        result.push({ [first.key]: choice.code, ...combination });
+/**
+ * Lazily enumerate combinations in [start, end).
+ * Only the current digit vector is kept in memory; each yielded object is fresh.
+ */
+export function* iterateCombinations(
+  optionSets: readonly OptionChoiceSet[],
+  start = 0,
+  end: number = countCombinations(optionSets),
+): Generator<Record<string, string>> {
+  const total = countCombinations(optionSets);
+  const stop = Math.min(end, total);
+  if (start >= stop) return;
+
+  const digits = decodeIndex(optionSets, start);
+  for (let i = start; i < stop; i++) {
+    yield buildCombination(optionSets, digits);
+
+    // Increment the least significant (last) digit, carrying leftwards
+    for (let d = digits.length - 1; d >= 0; d--) {
+      const radix = optionSets[d]?.choices.length ?? 0;
+      const next = (digits[d] ?? 0) + 1;
+      if (next < radix) {
+        digits[d] = next;
+        break;
       }
+      digits[d] = 0;
     }
   }
-  return result;
+}
+
+/**
+ * Lazily decode combinations at the given indices (e.g. a random sample).
+ */
+export function* iterateCombinationsAt(
+  optionSets: readonly OptionChoiceSet[],
+  indices: Iterable<number>,
+): Generator<Record<string, string>> {
+  for (const index of indices) {
+    yield combinationAt(optionSets, index);
+  }
+}
+
+/**
+ * Draw n distinct indices from [0, total) uniformly (Floyd's algorithm), sorted ascending.
+ * Memory is O(n) regardless of total.
+ */
+export function sampleCombinationIndices(
+  total: number,
+  n: number,
+  random: () => number = Math.random,
+): number[] {
+  if (n >= total) return Array.from({ length: total }, (_, i) => i);
+
+  const picked = new Set<number>();
+  for (let j = total - n; j < total; j++) {
+    const t = Math.floor(random() * (j + 1));
+    picked.add(picked.has(t) ? j : t);
+  }
+  return [...picked].sort((a, b) => a - b);
+}
+
+function decodeIndex(optionSets: readonly OptionChoiceSet[], index: number): number[] {
+  const digits = new Array<number>(optionSets.length).fill(0);
+  let rest = index;
+  for (let d = optionSets.length - 1; d >= 0; d--) {
+    const radix = optionSets[d]?.choices.length ?? 0;
+    if (radix === 0) break;
+    digits[d] = rest % radix;
+    rest = Math.floor(rest / radix);
+  }
+  return digits;
+}
+
+function buildCombination(
+  optionSets: readonly OptionChoiceSet[],
+  digits: readonly number[],
+): Record<string, string> {
+  const combination: Record<string, string> = {};
+  for (let d = 0; d < optionSets.length; d++) {
+    const set = optionSets[d];
+    const choice = set?.choices[digits[d] ?? 0];
+    if (set !== undefined && choice !== undefined) combination[set.typeKey] = choice;
+  }
+  return combination;
+}
+
+/**
+ * Convert option types to choice sets of their active choices.
+ * Enumeration stops at the first type without active choices (and yields
+ * nothing if that is the first type), as generateCombinations always has.
+ */
+export function toOptionChoiceSets(optionTypes: readonly OptionType[]): OptionChoiceSet[] {
+  const sets: OptionChoiceSet[] = [];
+  for (const type of optionTypes) {
+    const choices = type.choices.filter((c) => c.isActive).map((c) => c.code);
+    if (choices.length === 0) break;
+    sets.push({ typeKey: type.key, choices });
+  }
+  return sets;
+}
+
+/**
+ * Generate all combinations of option choices.
+ * Returns array of {typeKey: choiceCode} maps.
+ * Returns empty array if no option types provided.
+ */
+export function generateCombinations(optionTypes: OptionType[]): Record<string, string>[] {
+  const sets = toOptionChoiceSets(optionTypes);
+  if (sets.length === 0) return [];
+  return [...iterateCombinations(sets)];
 }
 
 // ─── Constraint evaluation ────────────────────────────────────────────────────
@@ -92,38 +210,100 @@ interface ConstraintCheckResult {
   message: string | null;
 }
 
+interface IndexedConstraint {
+  /** Position in the original list — the last matching constraint supplies the message */
+  order: number;
+  constraint: SimulationConstraint;
+}
+
+/** Active error/warn constraints indexed sourceField -> sourceValue, in list order */
+type CombinationConstraintIndex = Map<string, Map<string, IndexedConstraint[]>>;
+
+function compileCombinationConstraints(constraints: SimulationConstraint[]): CombinationConstraintIndex {
+  const index: CombinationConstraintIndex = new Map();
+  constraints.forEach((constraint, order) => {
+    // show/hide never change a case's status
+    if (!constraint.isActive || (constraint.action !== 'error' && constraint.action !== 'warn')) return;
+
+    let byValue = index.get(constraint.sourceField);
+    if (!byValue) {
+      byValue = new Map();
+      index.set(constraint.sourceField, byValue);
+    }
+    const bucket = byValue.get(constraint.sourceValue);
+    if (bucket) bucket.push({ order, constraint });
+    else byValue.set(constraint.sourceValue, [{ order, constraint }]);
+  });
+  return index;
+}
+
+// @MX:NOTE: [AUTO] Only constraints whose sourceField/sourceValue match the combination are visited
 function evaluateCombinationConstraints(
   selections: Record<string, string>,
-  constraints: SimulationConstraint[],
+  index: CombinationConstraintIndex,
 ): ConstraintCheckResult {
-  let hasError = false;
-  let hasWarn = false;
-  let errorMessage: string | null = null;
-  let warnMessage: string | null = null;
+  let error: IndexedConstraint | null = null;
+  let warn: IndexedConstraint | null = null;
 
-  for (const constraint of constraints) {
-    if (!constraint.isActive) continue;
+  for (const [sourceField, byValue] of index) {
+    const sourceValue = selections[sourceField];
+    if (sourceValue === undefined) continue;
 
-    const sourceValue = selections[constraint.sourceField];
-    if (sourceValue !== constraint.sourceValue) continue;
+    const candidates = byValue.get(sourceValue);
+    if (!candidates) continue;
 
-    const targetValue = selections[constraint.targetField];
-    if (targetValue === constraint.targetValue) {
+    for (const candidate of candidates) {
+      const { constraint } = candidate;
+      if (selections[constraint.targetField] !== constraint.targetValue) continue;
       if (constraint.action === 'error') {
-        hasError = true;
-        errorMessage = constraint.message;
-      } else if (constraint.action === 'warn') {
-        hasWarn = true;
-        warnMessage = constraint.message;
+        if (!error || candidate.order > error.order) error = candidate;
+      } else if (!warn || candidate.order > warn.order) {
+        warn = candidate;
       }
     }
   }
 
-  if (hasError) return { violated: true, action: 'error', message: errorMessage };
-  if (hasWarn) return { violated: false, action: 'warn', message: warnMessage };
+  if (error) return { violated: true, action: 'error', message: error.constraint.message };
+  if (warn) return { violated: false, action: 'warn', message: warn.constraint.message };
   return { violated: false, action: null, message: null };
 }
 
+// @MX:NOTE: [AUTO] Recipe (ECA) constraints go through the same ConstraintProgram the widget routes use
+// @MX:REASON: A case fails exactly when the widget would block it or grey out one of its choices
+function evaluateRecipeConstraints(
+  selections: Record<string, string>,
+  program: ConstraintProgram,
+): ConstraintCheckResult {
+  const evaluation = program.evaluate(selections);
+  const blocked = evaluation.violations[0];
+  if (blocked) return { violated: true, action: 'error', message: blocked.message };
+
+  const availability = program.availableChoices(selections);
+  for (const [optionType, available] of Object.entries(availability)) {
+    const selected = selections[optionType];
+    if (selected === undefined) continue;
+    if (available.excluded.includes(selected) || (available.allowedOnly !== null && !available.allowedOnly.includes(selected))) {
+      return { violated: true, action: 'error', message: `${optionType}=${selected} is not selectable with these options` };
+    }
+  }
+
+  for (const action of evaluation.uiActions) {
+    if (action.type === 'show_message' && (action.level === 'warn' || action.level === 'error')) {
+      return { violated: false, action: 'warn', message: action.message ?? null };
+    }
+  }
+  return { violated: false, action: null, message: null };
+}
+
+/** A pairwise error outranks a recipe warning; otherwise the first warning wins */
+function mergeConstraintResults(
+  recipe: ConstraintCheckResult | null,
+  pairwise: ConstraintCheckResult,
+): ConstraintCheckResult {
+  if (!recipe || pairwise.violated || recipe.action === null) return pairwise;
+  return recipe;
+}
+
 // ─── Price calculation ────────────────────────────────────────────────────────
 
 function calculateSimulationPrice(priceConfig: SimulationPriceConfig): number {
@@ -131,93 +311,98 @@ function calculateSimulationPrice(priceConfig: SimulationPriceConfig): number {
   return priceConfig.basePrice;
 }
 
+// ─── Case evaluation ──────────────────────────────────────────────────────────
+
+/**
+ * Build the per-combination evaluator used by runSimulation and the batch job runner.
+ * A null priceConfig leaves totalPrice and priceBreakdown empty for non-error cases.
+ * recipeConstraints (recipe_constraints rows) are checked first; the pairwise constraints only
+ * run when no recipe constraint blocks the case.
+ * Plain data in, plain data out — safe to construct inside a worker thread.
+ */
+export function createSimulationEvaluator(
+  constraints: SimulationConstraint[],
+  priceConfig: SimulationPriceConfig | null,
+  recipeConstraints: readonly EcaConstraint[] = [],
+): CaseEvaluator {
+  const constraintIndex = compileCombinationConstraints(constraints);
+  const program = recipeConstraints.length > 0 ? new ConstraintProgram(recipeConstraints) : null;
+  return {
+    evaluate: (selections): SimulationCaseResult => {
+      const recipeResult = program ? evaluateRecipeConstraints(selections, program) : null;
+      const constraintResult = recipeResult?.violated
+        ? recipeResult
+        : mergeConstraintResults(recipeResult, evaluateCombinationConstraints(selections, constraintIndex));
+      const price = priceConfig !== null ? calculateSimulationPrice(priceConfig) : null;
+
+      if (constraintResult.violated) {
+        return {
+          selections,
+          resultStatus: 'error',
+          totalPrice: null,
+          constraintViolations: [{ message: constraintResult.message }],
+          priceBreakdown: null,
+          message: constraintResult.message,
+        };
+      }
+
+      return {
+        selections,
+        resultStatus: constraintResult.action === 'warn' ? 'warn' : 'pass',
+        totalPrice: price,
+        constraintViolations: null,
+        priceBreakdown: price !== null ? { basePrice: price } : null,
+        message: constraintResult.action === 'warn' ? constraintResult.message : null,
+      };
+    },
+  };
+}
+
 // ─── Core simulation loop ─────────────────────────────────────────────────────
 
 // @MX:ANCHOR: [AUTO] runSimulation — async simulation entry point; processes all option combinations
 // @MX:REASON: fan_in >= 3: engine.test.ts, widget-admin tRPC startSimulation, future batch job runner
 // @MX:SPEC: SPEC-WB-005 FR-WB005-03, FR-WB005-04
-// @MX:WARN: [AUTO] Synchronous execution for up to 10K iterations in calling thread — no async job queue
-// @MX:REASON: Acceptable for current scale (< 5 sec per 10K cases); monitor for tRPC timeout issues if workload increases
+// @MX:NOTE: [AUTO] Combinations are streamed from the mixed-radix iterator; only the returned cases are held in memory
+// @MX:REASON: Large products run through the admin simulation job runner, which persists cases in batches instead
 export async function runSimulation(
   input: SimulationInput,
   options?: SimulationOptions,
 ): Promise<SimulationResult | TooLargeResult> {
-  const allCombinations = generateCombinations(input.optionTypes);
-  const total = allCombinations.length;
+  const optionSets = toOptionChoiceSets(input.optionTypes);
+  const total = optionSets.length === 0 ? 0 : countCombinations(optionSets);
+  const evaluator = createSimulationEvaluator(input.constraints, input.priceConfig);
 
   // 10K threshold check
-  if (total > SIMULATION_MAX_CASES && options?.forceRun !== true) {
-    if (options?.sample === true) {
+  if (mustLimit(total, SIMULATION_MAX_CASES, options)) {
+    if (options?.sample === true && canSample(total)) {
       // Sample 10K combinations and proceed
-      const sampled = sampleN(allCombinations, SIMULATION_MAX_CASES);
-      return runSimulationCombinations(sampled, input, options);
+      const indices = sampleCombinationIndices(total, SIMULATION_MAX_CASES);
+      return runSimulationCases(iterateCombinationsAt(optionSets, indices), evaluator, options, indices.length);
     }
-    return { tooLarge: true, total, sampleSize: SIMULATION_MAX_CASES };
+    return tooLargeResult(total);
   }
 
-  return runSimulationCombinations(allCombinations, input, options);
+  return runSimulationCases(iterateCombinations(optionSets, 0, total), evaluator, options, total);
 }
 
-function runSimulationCombinations(
-  combinations: Record<string, string>[],
-  input: SimulationInput,
-  options?: SimulationOptions,
-): SimulationResult {
-  const cases: SimulationCaseResult[] = [];
-  let passed = 0;
-  let warned = 0;
-  let errored = 0;
-
-  const PROGRESS_INTERVAL = 100;
-
-  for (let i = 0; i < combinations.length; i++) {
-    const combo = combinations[i];
-    if (combo === undefined) continue;
-
-    const constraintResult = evaluateCombinationConstraints(combo, input.constraints);
-
-    let resultStatus: 'pass' | 'warn' | 'error';
-    let totalPrice: number | null;
-    let message: string | null;
-    let constraintViolations: unknown[] | null = null;
-
-    if (constraintResult.violated) {
-      resultStatus = 'error';
-      totalPrice = null;
-      message = constraintResult.message;
-      constraintViolations = [{ message: constraintResult.message }];
-    } else if (constraintResult.action === 'warn') {
-      resultStatus = 'warn';
-      totalPrice = calculateSimulationPrice(input.priceConfig);
-      message = constraintResult.message;
-    } else {
-      resultStatus = 'pass';
-      totalPrice = calculateSimulationPrice(input.priceConfig);
-      message = null;
-    }
-
-    cases.push({
-      selections: combo,
-      resultStatus,
-      totalPrice,
-      constraintViolations,
-      priceBreakdown: totalPrice !== null ? { basePrice: totalPrice } : null,
-      message,
-    });
-
-    if (resultStatus === 'pass') passed++;
-    else if (resultStatus === 'warn') warned++;
-    else errored++;
+// ─── Utilities ────────────────────────────────────────────────────────────────
 
-    if (options?.onProgress !== undefined && (i + 1) % PROGRESS_INTERVAL === 0) {
-      options.onProgress(i + 1, combinations.length);
-    }
-  }
+/** Whether a run must be sampled or refused: forceRun skips the threshold, but never past SIMULATION_JOB_MAX_CASES */
+function mustLimit(total: number, maxCases: number, options?: { forceRun?: boolean }): boolean {
+  if (total > SIMULATION_JOB_MAX_CASES) return true;
+  return total > maxCases && options?.forceRun !== true;
+}
 
-  return { total: combinations.length, passed, warned, errored, cases };
+/** Combination indices are doubles — sampling (and decoding) is only exact up to 2^53 */
+function canSample(total: number): boolean {
+  return total <= Number.MAX_SAFE_INTEGER;
 }
 
-// ─── Utilities ────────────────────────────────────────────────────────────────
+/** sampleSize 0 = the space is too large to sample */
+function tooLargeResult(total: number): TooLargeResult {
+  return { tooLarge: true, total, sampleSize: canSample(total) ? SIMULATION_MAX_CASES : 0 };
+}
 
 function sampleN<T>(items: readonly T[], n: number): T[] {
   if (n >= items.length) return [...items];
@@ -237,11 +422,6 @@ function sampleN<T>(items: readonly T[], n: number): T[] {
 // Legacy exports kept for tRPC router compatibility
 export { sampleN };
 
-export interface OptionChoiceSet {
-  typeKey: string;
-  choices: string[];
-}
-
 export interface CaseEvaluator {
   evaluate: (selections: Record<string, string>) => SimulationCaseResult;
 }
@@ -250,24 +430,11 @@ export interface CaseEvaluator {
 // @MX:REASON: fan_in >= 3: widget-admin tRPC router startSimulation, engine.test.ts, resolveSimulationCombinations
 // @MX:SPEC: SPEC-WB-005 FR-WB005-03
 /**
- * Low-level cartesian product for OptionChoiceSet (used in tRPC router)
+ * Low-level cartesian product for OptionChoiceSet (used in tRPC router).
+ * Materializes every combination — prefer iterateCombinations for large spaces.
  */
 export function cartesianProduct(optionSets: OptionChoiceSet[]): Record<string, string>[] {
-  if (optionSets.length === 0) return [{}];
-
-  const first = optionSets[0];
-  if (first === undefined) return [{}];
-
-  const rest = optionSets.slice(1);
-  const restProduct = cartesianProduct(rest);
-
-  const result: Record<string, string>[] = [];
-  for (const choice of first.choices) {
-    for (const combination of restProduct) {
-      result.push({ [first.typeKey]: choice, ...combination });
-    }
-  }
-  return result;
+  return [...iterateCombinations(optionSets)];
 }
 
 /**
@@ -289,36 +456,70 @@ export function resolveSimulationCombinations(
   return { tooLarge: false, combinations: allCombinations };
 }
 
+export interface SimulationPlan {
+  tooLarge: false;
+  total: number;
+  /** Sorted combination indices to evaluate, or null for the full range [0, total) */
+  indices: number[] | null;
+}
+
+/**
+ * Plan a simulation over a combination space without materializing it.
+ * Above maxCases a run needs sample or forceRun; above SIMULATION_JOB_MAX_CASES only a sample can run,
+ * and above Number.MAX_SAFE_INTEGER nothing can.
+ */
+export function planSimulation(
+  optionSets: readonly OptionChoiceSet[],
+  options?: { sample?: boolean; forceRun?: boolean },
+  maxCases: number = SIMULATION_MAX_CASES,
+): SimulationPlan | TooLargeResult {
+  const total = countCombinations(optionSets);
+
+  if (mustLimit(total, maxCases, options)) {
+    if (options?.sample === true && canSample(total)) {
+      const indices = sampleCombinationIndices(total, SIMULATION_MAX_CASES);
+      return { tooLarge: false, total: indices.length, indices };
+    }
+    return tooLargeResult(total);
+  }
+
+  return { tooLarge: false, total, indices: null };
+}
+
 /**
- * Low-level simulation case runner (used in tRPC router with custom evaluator)
+ * Low-level simulation case runner (used in tRPC router with custom evaluator).
+ * Accepts any iterable of combinations; pass `total` for progress reporting
+ * when the iterable is lazy.
  */
 export function runSimulationCases(
-  combinations: Record<string, string>[],
+  combinations: Iterable<Record<string, string>>,
   evaluator: CaseEvaluator,
   options?: SimulationOptions,
+  total: number = Array.isArray(combinations) ? combinations.length : 0,
 ): SimulationResult {
   const cases: SimulationCaseResult[] = [];
   let passed = 0;
   let warned = 0;
   let errored = 0;
+  let processed = 0;
 
   const PROGRESS_INTERVAL = 100;
 
-  for (let i = 0; i < combinations.length; i++) {
-    const combo = combinations[i];
+  for (const combo of combinations) {
     if (combo === undefined) continue;
 
     const result = evaluator.evaluate(combo);
     cases.push(result);
+    processed++;
 
     if (result.resultStatus === 'pass') passed++;
     else if (result.resultStatus === 'warn') warned++;
     else errored++;
 
-    if (options?.onProgress !== undefined && (i + 1) % PROGRESS_INTERVAL === 0) {
-      options.onProgress(i + 1, combinations.length);
+    if (options?.onProgress !== undefined && processed % PROGRESS_INTERVAL === 0) {
+      options.onProgress(processed, Math.max(total, processed));
     }
   }
 
-  return { total: combinations.length, passed, warned, errored, cases };
+  return { total: processed, passed, warned, errored, cases };
 }
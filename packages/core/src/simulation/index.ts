@@ -18,7 +18,16 @@ export {
   sampleN,
   runSimulationCases,
   resolveSimulationCombinations,
+  planSimulation,
+  countCombinations,
+  combinationAt,
+  iterateCombinations,
+  iterateCombinationsAt,
+  sampleCombinationIndices,
+  toOptionChoiceSets,
+  createSimulationEvaluator,
   SIMULATION_MAX_CASES,
+  SIMULATION_JOB_MAX_CASES,
 } from './engine.js';
 export type {
   OptionType,
@@ -29,11 +38,16 @@ export type {
   SimulationPriceConfig,
   OptionChoiceSet,
   CaseEvaluator,
+  SimulationPlan,
 } from './engine.js';
 
 export {
   validatePublishReadiness,
   PublishError,
+  QUOTE_SNAPSHOT_CHANNEL,
+  QUOTE_SNAPSHOT_ALL,
+  quoteSnapshotPayload,
+  parseQuoteSnapshotPayload,
 } from './publish.js';
 export type {
   PublishServiceInput,
@@ -57,3 +57,33 @@ export interface PublishResult {
 export interface UnpublishResult {
   success: true;
 }
+
+// ─── Quote snapshot invalidation ──────────────────────────────────────────────
+
+// @MX:NOTE: [AUTO] Widget API processes keep a compiled per-product quote snapshot in memory.
+// Publish, unpublish and pricing/constraint edits must NOTIFY this channel so stale snapshots are dropped.
+// @MX:SPEC: SPEC-WB-005 FR-WB005-05, SPEC-WB-006 FR-WB006-01
+
+/** Postgres LISTEN/NOTIFY channel for quote snapshot invalidation */
+export const QUOTE_SNAPSHOT_CHANNEL = 'quote_snapshot_invalidate';
+
+/** Payload that invalidates every product (shared rows such as global qty_discount changed) */
+export const QUOTE_SNAPSHOT_ALL = '*';
+
+/**
+ * Build the NOTIFY payload for a product.
+ * productId null means a global (product-agnostic) pricing row changed.
+ */
+export function quoteSnapshotPayload(productId: number | null): string {
+  return productId === null ? QUOTE_SNAPSHOT_ALL : String(productId);
+}
+
+/**
+ * Parse a NOTIFY payload back into a product id.
+ * Returns null for the global payload or anything unparseable (caller clears everything).
+ */
+export function parseQuoteSnapshotPayload(payload: string): number | null {
+  if (payload === QUOTE_SNAPSHOT_ALL) return null;
+  const id = Number(payload);
+  return Number.isInteger(id) && id > 0 ? id : null;
+}
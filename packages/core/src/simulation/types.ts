@@ -31,10 +31,12 @@ export interface SimulationResult {
   cases: SimulationCaseResult[];
 }
 
-// @MX:NOTE: [AUTO] TooLargeResult is returned when combinations exceed 10K and forceRun is not set
+// @MX:NOTE: [AUTO] TooLargeResult is returned when combinations exceed 10K and forceRun is not set,
+// or exceed SIMULATION_JOB_MAX_CASES regardless of forceRun
 export interface TooLargeResult {
   tooLarge: true;
   total: number;
+  /** Cases a sample=true run would evaluate; 0 when the space is too large to sample */
   sampleSize: number;
 }
 
@@ -694,3 +694,92 @@ describe("PriceCalculator", () => {
     });
   });
 });
+
+// ============================================================
+// Indexed lookup equivalence
+// ============================================================
+
+describe("PriceCalculator - indexed lookup", () => {
+  const FIELDS = ["jobPresetNo", "sizeNo", "paperNo", "colorNo", "colorNoAdd", "optNo"] as const;
+
+  /** Reference implementation: the original filter + specificity reduce */
+  function linearLookup(
+    table: PricingTable[],
+    request: Pick<PricingTable, (typeof FIELDS)[number] | "quantity">,
+  ): PricingTable | null {
+    const candidates = table.filter((entry) =>
+      entry.quantity === request.quantity &&
+      FIELDS.every((f) => entry[f] === null || entry[f] === request[f]),
+    );
+    if (candidates.length === 0) return null;
+    const score = (e: PricingTable) => FIELDS.filter((f) => e[f] !== null).length;
+    return candidates.reduce((best, cur) => (score(cur) > score(best) ? cur : best));
+  }
+
+  it("should pick the first entry among equally specific matches", () => {
+    const base = createPricingTable()[0];
+    const pricingTable: PricingTable[] = [
+      { ...base, id: "a", jobPresetNo: 3110, sizeNo: null, unitPrice: 1, totalPrice: 100 },
+      { ...base, id: "b", jobPresetNo: null, sizeNo: 5001, unitPrice: 2, totalPrice: 200 },
+    ];
+    const calculator = new PriceCalculator(pricingTable, []);
+
+    const result = calculator.calculate({
+      productId: "prod-001",
+      jobPresetNo: 3110,
+      sizeNo: 5001,
+      paperNo: base.paperNo,
+      colorNo: base.colorNo,
+      colorNoAdd: null,
+      optNo: null,
+      quantity: base.quantity,
+      awkjobSelections: [],
+    });
+
+    expect(result.subtotal).toBe(100);
+  });
+
+  it("should match the linear scan on a randomized pricing table", () => {
+    let seed = 12345;
+    const rand = () => {
+      seed = (seed * 1103515245 + 12345) & 0x7fffffff;
+      return seed / 0x7fffffff;
+    };
+    const pick = <T,>(values: T[]): T => values[Math.floor(rand() * values.length)];
+    const values = [1, 2, null];
+
+    const pricingTable: PricingTable[] = Array.from({ length: 1500 }, (_, i) => ({
+      id: `pt-${i}`,
+      productId: "prod-001",
+      jobPresetNo: pick(values),
+      sizeNo: pick(values),
+      paperNo: pick(values),
+      colorNo: pick(values),
+      colorNoAdd: pick(values),
+      optNo: pick(values),
+      quantity: pick([100, 200, 300]),
+      unitPrice: i,
+      totalPrice: i * 100,
+    }));
+    const calculator = new PriceCalculator(pricingTable, []);
+
+    for (let i = 0; i < 500; i++) {
+      const request = {
+        productId: "prod-001",
+        jobPresetNo: pick(values),
+        sizeNo: pick([1, 2, 3]),
+        paperNo: pick([1, 2, 3]),
+        colorNo: pick([1, 2, 3]),
+        colorNoAdd: pick(values),
+        optNo: pick(values),
+        quantity: pick([100, 200, 300, 400]),
+        awkjobSelections: [],
+      };
+      const expected = linearLookup(pricingTable, request);
+      const result = calculator.calculate(request);
+
+      expect(result.isAvailable).toBe(expected !== null);
+      expect(result.subtotal).toBe(expected ? expected.totalPrice : 0);
+    }
+  });
+});
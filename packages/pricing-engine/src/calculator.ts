@@ -9,6 +9,9 @@
  * - Null fields in pricing table act as wildcards
  * - Exact matches are preferred over wildcard matches
  * - Returns explicit error when no price is found (R-PRC-005)
+ *
+ * Both tables are indexed once at construction: pricing entries by quantity and
+ * a wildcard-aware composite key, awkjob entries by (awkjobNo, quantity).
  */
 import type {
   PriceCalculationRequest,
@@ -17,6 +20,29 @@ import type {
   PricingTable,
 } from "@widget-creator/shared";
 
+type MatchField = keyof Pick<
+  PricingTable,
+  "jobPresetNo" | "sizeNo" | "paperNo" | "colorNo" | "colorNoAdd" | "optNo"
+>;
+
+const MATCH_FIELDS: MatchField[] = ["jobPresetNo", "sizeNo", "paperNo", "colorNo", "colorNoAdd", "optNo"];
+
+const WILDCARD = "*";
+
+/** Pricing entries sharing one quantity, keyed by their composite field key */
+interface QuantityBucket {
+  /** Bit i set = MATCH_FIELDS[i] is non-null; distinct masks, most specific first */
+  masks: number[];
+  /** First entry (by table order) for each composite key */
+  byKey: Map<string, { entry: PricingTable; order: number; score: number }>;
+}
+
+function popcount(mask: number): number {
+  let count = 0;
+  for (let m = mask; m !== 0; m &= m - 1) count++;
+  return count;
+}
+
 /** Awkjob (post-process) pricing entry for cost lookups */
 export interface AwkjobPricingEntry {
   awkjobNo: number;
@@ -35,6 +61,8 @@ export interface AwkjobPricingEntry {
 export class PriceCalculator {
   private readonly pricingTable: PricingTable[];
   private readonly awkjobPricing: AwkjobPricingEntry[];
+  private readonly pricingIndex = new Map<number, QuantityBucket>();
+  private readonly awkjobIndex = new Map<string, AwkjobPricingEntry>();
 
   constructor(
     pricingTable: PricingTable[],
@@ -42,6 +70,8 @@ export class PriceCalculator {
   ) {
     this.pricingTable = pricingTable;
     this.awkjobPricing = awkjobPricing;
+    this.buildPricingIndex();
+    this.buildAwkjobIndex();
   }
 
   /**
@@ -109,59 +139,30 @@ export class PriceCalculator {
 
   /**
    * Find the best matching pricing table entry for a request.
-   * Exact matches on non-null fields are preferred over wildcard matches.
+   * Exact matches on non-null fields are preferred over wildcard matches;
+   * among equally specific entries the first in table order wins.
+   *
+   * Only the wildcard patterns (masks) present in the table are probed, so a
+   * lookup costs O(distinct masks) instead of O(table size).
    */
   private findPricingEntry(request: PriceCalculationRequest): PricingTable | null {
-    const matchingFields: Array<keyof Pick<
-      PricingTable,
-      "jobPresetNo" | "sizeNo" | "paperNo" | "colorNo" | "colorNoAdd" | "optNo"
-    >> = ["jobPresetNo", "sizeNo", "paperNo", "colorNo", "colorNoAdd", "optNo"];
-
-    // Filter entries that match the selection (null in table = wildcard)
-    const candidates = this.pricingTable.filter((entry) => {
-      // Quantity must match exactly
-      if (entry.quantity !== request.quantity) return false;
-
-      // Check each selection field
-      for (const field of matchingFields) {
-        const entryVal = entry[field];
-        const requestVal = request[field];
-
-        // If the pricing table entry has a non-null value, it must match the request
-        if (entryVal !== null && entryVal !== requestVal) {
-          return false;
-        }
-
-        // If the request has a null value but the entry has a non-null value,
-        // it should not match
-        // (already covered by the check above: entryVal !== requestVal handles this)
-      }
-      return true;
-    });
-
-    if (candidates.length === 0) return null;
-    if (candidates.length === 1) return candidates[0];
-
-    // Score candidates: prefer entries with more exact (non-null) matches
-    return candidates.reduce((best, current) => {
-      const bestScore = this.specificityScore(best, matchingFields);
-      const currentScore = this.specificityScore(current, matchingFields);
-      return currentScore > bestScore ? current : best;
-    });
-  }
+    const bucket = this.pricingIndex.get(request.quantity);
+    if (!bucket) return null;
+
+    let best: { entry: PricingTable; order: number; score: number } | undefined;
+    for (const mask of bucket.masks) {
+      const score = popcount(mask);
+      // Masks are sorted by specificity; nothing later can beat the current best
+      if (best && score < best.score) break;
+
+      const key = MATCH_FIELDS.map((field, i) =>
+        mask & (1 << i) ? String(request[field]) : WILDCARD,
+      ).join("|");
+      const hit = bucket.byKey.get(key);
+      if (hit && (!best || hit.order < best.order)) best = hit;
+    }
 
-  /**
-   * Count the number of non-null fields in a pricing entry.
-   * Higher score means more specific (exact) match.
-   */
-  private specificityScore(
-    entry: PricingTable,
-    fields: Array<keyof Pick<
-      PricingTable,
-      "jobPresetNo" | "sizeNo" | "paperNo" | "colorNo" | "colorNoAdd" | "optNo"
-    >>,
-  ): number {
-    return fields.reduce((score, field) => score + (entry[field] !== null ? 1 : 0), 0);
+    return best?.entry ?? null;
   }
 
   /**
@@ -172,11 +173,44 @@ export class PriceCalculator {
     awkjobNo: number,
     quantity: number,
   ): AwkjobPricingEntry | null {
-    return (
-      this.awkjobPricing.find(
-        (entry) => entry.awkjobNo === awkjobNo && entry.quantity === quantity,
-      ) ?? null
-    );
+    return this.awkjobIndex.get(`${awkjobNo}|${quantity}`) ?? null;
+  }
+
+  /** Index pricing entries by quantity, then by composite key (null fields = wildcard). */
+  private buildPricingIndex(): void {
+    this.pricingTable.forEach((entry, order) => {
+      let bucket = this.pricingIndex.get(entry.quantity);
+      if (!bucket) {
+        bucket = { masks: [], byKey: new Map() };
+        this.pricingIndex.set(entry.quantity, bucket);
+      }
+
+      let mask = 0;
+      const parts = MATCH_FIELDS.map((field, i) => {
+        const value = entry[field];
+        if (value === null) return WILDCARD;
+        mask |= 1 << i;
+        return String(value);
+      });
+      const key = parts.join("|");
+
+      if (!bucket.masks.includes(mask)) bucket.masks.push(mask);
+      if (!bucket.byKey.has(key)) {
+        bucket.byKey.set(key, { entry, order, score: popcount(mask) });
+      }
+    });
+
+    for (const bucket of this.pricingIndex.values()) {
+      bucket.masks.sort((a, b) => popcount(b) - popcount(a));
+    }
+  }
+
+  /** Index awkjob entries by (awkjobNo, quantity), keeping the first occurrence. */
+  private buildAwkjobIndex(): void {
+    for (const entry of this.awkjobPricing) {
+      const key = `${entry.awkjobNo}|${entry.quantity}`;
+      if (!this.awkjobIndex.has(key)) this.awkjobIndex.set(key, entry);
+    }
   }
 
   /** Build an error result with zero prices and unavailable status. */
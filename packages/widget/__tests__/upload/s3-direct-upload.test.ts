@@ -0,0 +1,374 @@
+/**
+ * S3 Direct Upload Tests
+ * @see SPEC-SHOPBY-005 Section: S3 Direct Upload
+ *
+ * Tests multipart part sizing, the concurrent part window,
+ * resume from persisted state and progress reporting.
+ */
+
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest';
+import { S3DirectUpload } from '@/upload/s3-direct-upload';
+import {
+  FileLifecycleManager,
+  fileFingerprint,
+  type MultipartStateStorage,
+} from '@/upload/file-lifecycle';
+import type { FileUploadProgress } from '@/upload/types';
+
+const MB = 1024 * 1024;
+const API = 'https://api.example.com/s3';
+
+/** Storage that keeps items in a Map */
+function createStorage(): MultipartStateStorage & { items: Map<string, string> } {
+  const items = new Map<string, string>();
+  return {
+    items,
+    getItem: (key) => items.get(key) ?? null,
+    setItem: (key, value) => void items.set(key, value),
+    removeItem: (key) => void items.delete(key),
+  };
+}
+
+interface PartRequest {
+  url: string;
+  size: number;
+}
+
+/**
+ * Minimal XMLHttpRequest double: reports half the body as progress,
+ * then answers with the status chosen by FakeXhr.respond.
+ */
+class FakeXhr {
+  static requests: PartRequest[] = [];
+  static inFlight = 0;
+  static maxInFlight = 0;
+  static respond: (url: string) => number = () => 200;
+
+  status = 0;
+  statusText = '';
+  private url = '';
+  private listeners = new Map<string, () => void>();
+  upload = {
+    listeners: new Map<string, (event: ProgressEvent) => void>(),
+    addEventListener(type: string, fn: (event: ProgressEvent) => void) {
+      this.listeners.set(type, fn);
+    },
+  };
+
+  addEventListener(type: string, fn: () => void) {
+    this.listeners.set(type, fn);
+  }
+
+  open(_method: string, url: string) {
+    this.url = url;
+  }
+
+  setRequestHeader() {}
+
+  getResponseHeader(name: string) {
+    return name === 'ETag' ? `"etag-${this.url.split('/').pop()}"` : null;
+  }
+
+  send(body: Blob) {
+    FakeXhr.requests.push({ url: this.url, size: body.size });
+    FakeXhr.inFlight++;
+    FakeXhr.maxInFlight = Math.max(FakeXhr.maxInFlight, FakeXhr.inFlight);
+
+    setTimeout(() => {
+      this.upload.listeners.get('progress')?.({
+        lengthComputable: true,
+        loaded: body.size / 2,
+        total: body.size,
+      } as ProgressEvent);
+
+      setTimeout(() => {
+        FakeXhr.inFlight--;
+        this.status = FakeXhr.respond(this.url);
+        this.listeners.get('load')?.();
+      }, 1);
+    }, 1);
+  }
+}
+
+function jsonResponse(body: unknown, status = 200) {
+  return {
+    ok: status >= 200 && status < 300,
+    status,
+    statusText: '',
+    json: () => Promise.resolve(body),
+    text: () => Promise.resolve(''),
+  };
+}
+
+function partUrls(partNumbers: number[]) {
+  return partNumbers.map((partNumber) => ({
+    partNumber,
+    uploadUrl: `https://bucket.example.com/part/${partNumber}`,
+  }));
+}
+
+function createFile(size: number): File {
+  return new File([new Uint8Array(size)], 'design.pdf', {
+    type: 'application/pdf',
+    lastModified: 1700000000000,
+  });
+}
+
+describe('upload/s3-direct-upload', () => {
+  let mockFetch: ReturnType<typeof vi.fn>;
+  let storage: ReturnType<typeof createStorage>;
+  let lifecycle: FileLifecycleManager;
+
+  beforeEach(() => {
+    FakeXhr.requests = [];
+    FakeXhr.inFlight = 0;
+    FakeXhr.maxInFlight = 0;
+    FakeXhr.respond = () => 200;
+    vi.stubGlobal('XMLHttpRequest', FakeXhr);
+
+    mockFetch = vi.fn(async (url: string, init: RequestInit) => {
+      const body = JSON.parse(String(init.body ?? '{}'));
+      if (url.endsWith('/multipart/initiate')) {
+        return jsonResponse({
+          uploadId: 'mpu-1',
+          objectKey: 'designs/design.pdf',
+          parts: partUrls(Array.from({ length: body.totalParts }, (_, i) => i + 1)),
+        });
+      }
+      if (url.endsWith('/multipart/parts')) {
+        return jsonResponse({ parts: partUrls(body.partNumbers) });
+      }
+      if (url.endsWith('/multipart/complete')) {
+        return jsonResponse({ accessUrl: 'https://cdn.example.com/design.pdf', objectKey: body.objectKey });
+      }
+      if (url.endsWith('/multipart/abort')) {
+        return jsonResponse({});
+      }
+      return jsonResponse({}, 404);
+    });
+    global.fetch = mockFetch as unknown as typeof fetch;
+
+    storage = createStorage();
+    lifecycle = new FileLifecycleManager({ apiEndpoint: API, multipartStorage: storage });
+  });
+
+  afterEach(() => {
+    vi.unstubAllGlobals();
+    vi.restoreAllMocks();
+  });
+
+  function completeBody() {
+    const call = mockFetch.mock.calls.find(([url]) => String(url).endsWith('/multipart/complete'));
+    return JSON.parse(String(call?.[1].body));
+  }
+
+  describe('getPartSize()', () => {
+    it('keeps the 5MB minimum for files up to 320MB', () => {
+      const uploader = new S3DirectUpload({ apiEndpoint: API, lifecycle });
+      expect(uploader.getPartSize(200 * MB)).toBe(5 * MB);
+    });
+
+    it('grows parts for large files', () => {
+      const uploader = new S3DirectUpload({ apiEndpoint: API, lifecycle });
+      expect(uploader.getPartSize(500 * MB)).toBe(8 * MB);
+    });
+
+    it('never goes below the S3 minimum part size', () => {
+      const uploader = new S3DirectUpload({ apiEndpoint: API, chunkSize: 1 * MB, lifecycle });
+      expect(uploader.getPartSize(20 * MB)).toBe(5 * MB);
+    });
+  });
+
+  describe('upload() - multipart', () => {
+    it('uploads parts concurrently within the window and completes in part order', async () => {
+      const uploader = new S3DirectUpload({ apiEndpoint: API, concurrency: 2, lifecycle });
+
+      const url = await uploader.upload(createFile(22 * MB));
+
+      expect(url).toBe('https://cdn.example.com/design.pdf');
+      expect(FakeXhr.requests).toHaveLength(5);
+      expect(FakeXhr.maxInFlight).toBe(2);
+      expect(completeBody().parts.map((p: { partNumber: number }) => p.partNumber)).toEqual([1, 2, 3, 4, 5]);
+      // Last part carries the remainder
+      expect(FakeXhr.requests.find((r) => r.url.endsWith('/5'))?.size).toBe(2 * MB);
+      // Resume state is cleared after completion
+      expect(storage.items.size).toBe(0);
+    });
+
+    it('reports byte-accurate, monotonic progress including in-flight parts', async () => {
+      const uploader = new S3DirectUpload({ apiEndpoint: API, concurrency: 3, lifecycle });
+      const file = createFile(22 * MB);
+      const updates: FileUploadProgress[] = [];
+
+      await uploader.upload(file, (p) => updates.push(p));
+
+      const uploading = updates.filter((p) => p.state === 'uploading').map((p) => p.uploadedBytes);
+      // In-flight halves show up between part boundaries
+      expect(uploading.some((bytes) => bytes % (5 * MB) !== 0 && bytes !== file.size)).toBe(true);
+      for (let i = 1; i < uploading.length; i++) {
+        expect(uploading[i]).toBeGreaterThanOrEqual(uploading[i - 1]);
+      }
+      expect(uploading[uploading.length - 1]).toBe(file.size);
+      expect(updates[updates.length - 1].state).toBe('completed');
+    });
+
+    it('keeps finished parts in resume state when a part fails', async () => {
+      FakeXhr.respond = (url) => (url.endsWith('/3') ? 403 : 200);
+      const uploader = new S3DirectUpload({ apiEndpoint: API, concurrency: 1, lifecycle });
+      const file = createFile(22 * MB);
+
+      await expect(uploader.upload(file)).rejects.toMatchObject({ code: 'S3_ERROR' });
+
+      const saved = lifecycle.loadMultipartState(fileFingerprint(file));
+      expect(saved?.uploadId).toBe('mpu-1');
+      expect(saved?.parts.map((p) => p.partNumber)).toEqual([1, 2]);
+    });
+
+    it('retries throttled parts', async () => {
+      let throttled = false;
+      FakeXhr.respond = (url) => {
+        if (url.endsWith('/2') && !throttled) {
+          throttled = true;
+          return 503;
+        }
+        return 200;
+      };
+      const uploader = new S3DirectUpload({ apiEndpoint: API, retryDelayMs: 0, lifecycle });
+
+      await uploader.upload(createFile(12 * MB));
+
+      expect(FakeXhr.requests.filter((r) => r.url.endsWith('/2'))).toHaveLength(2);
+    });
+
+    it('resumes an interrupted upload with only the missing parts', async () => {
+      const file = createFile(22 * MB);
+      lifecycle.saveMultipartState({
+        fingerprint: fileFingerprint(file),
+        uploadId: 'mpu-saved',
+        objectKey: 'designs/saved.pdf',
+        partSize: 5 * MB,
+        totalParts: 5,
+        parts: [
+          { partNumber: 1, eTag: 'etag-1' },
+          { partNumber: 4, eTag: 'etag-4' },
+        ],
+        updatedAt: Date.now(),
+      });
+      const uploader = new S3DirectUpload({ apiEndpoint: API, lifecycle });
+      const updates: FileUploadProgress[] = [];
+
+      await uploader.upload(file, (p) => updates.push(p));
+
+      expect(mockFetch.mock.calls.some(([url]) => String(url).endsWith('/multipart/initiate'))).toBe(false);
+      const refresh = mockFetch.mock.calls.find(([url]) => String(url).endsWith('/multipart/parts'));
+      expect(JSON.parse(String(refresh?.[1].body))).toMatchObject({ uploadId: 'mpu-saved', partNumbers: [2, 3, 5] });
+      expect(FakeXhr.requests.map((r) => r.url.split('/').pop()).sort()).toEqual(['2', '3', '5']);
+      expect(completeBody()).toMatchObject({ uploadId: 'mpu-saved', objectKey: 'designs/saved.pdf' });
+      expect(completeBody().parts.map((p: { partNumber: number }) => p.partNumber)).toEqual([1, 2, 3, 4, 5]);
+      // Progress starts from the bytes already uploaded
+      expect(updates.find((p) => p.state === 'uploading')?.uploadedBytes).toBe(10 * MB);
+    });
+
+    it('starts over when the backend no longer knows the saved upload', async () => {
+      const file = createFile(12 * MB);
+      lifecycle.saveMultipartState({
+        fingerprint: fileFingerprint(file),
+        uploadId: 'mpu-gone',
+        objectKey: 'designs/gone.pdf',
+        partSize: 5 * MB,
+        totalParts: 3,
+        parts: [{ partNumber: 1, eTag: 'etag-1' }],
+        updatedAt: Date.now(),
+      });
+      const defaultFetch = mockFetch.getMockImplementation()!;
+      mockFetch.mockImplementation(async (url: string, init: RequestInit) =>
+        url.endsWith('/multipart/parts') ? jsonResponse({}, 404) : defaultFetch(url, init),
+      );
+      const uploader = new S3DirectUpload({ apiEndpoint: API, lifecycle });
+
+      await uploader.upload(file);
+
+      expect(completeBody().uploadId).toBe('mpu-1');
+      expect(FakeXhr.requests).toHaveLength(3);
+      // The discarded upload is aborted so S3 does not keep its parts
+      const abort = mockFetch.mock.calls.find(([url]) => String(url).endsWith('/multipart/abort'));
+      expect(JSON.parse(String(abort?.[1].body))).toEqual({ uploadId: 'mpu-gone', objectKey: 'designs/gone.pdf' });
+    });
+
+    it('keeps the saved upload when refreshing part URLs fails temporarily', async () => {
+      const file = createFile(12 * MB);
+      const saved = {
+        fingerprint: fileFingerprint(file),
+        uploadId: 'mpu-saved',
+        objectKey: 'designs/saved.pdf',
+        partSize: 5 * MB,
+        totalParts: 3,
+        parts: [{ partNumber: 1, eTag: 'etag-1' }],
+        updatedAt: Date.now(),
+      };
+      lifecycle.saveMultipartState(saved);
+      const defaultFetch = mockFetch.getMockImplementation()!;
+      mockFetch.mockImplementation(async (url: string, init: RequestInit) =>
+        url.endsWith('/multipart/parts') ? jsonResponse({}, 503) : defaultFetch(url, init),
+      );
+      const uploader = new S3DirectUpload({ apiEndpoint: API, lifecycle });
+
+      await expect(uploader.upload(file)).rejects.toMatchObject({ details: { status: 503 } });
+
+      expect(lifecycle.loadMultipartState(saved.fingerprint)).toMatchObject({ uploadId: 'mpu-saved', parts: saved.parts });
+      const urls = mockFetch.mock.calls.map(([url]) => String(url));
+      expect(urls.some((url) => url.endsWith('/multipart/initiate') || url.endsWith('/multipart/abort'))).toBe(false);
+    });
+  });
+});
+
+describe('upload/file-lifecycle - multipart resume state', () => {
+  it('discards expired state', () => {
+    const storage = createStorage();
+    const lifecycle = new FileLifecycleManager({
+      apiEndpoint: API,
+      multipartStorage: storage,
+      multipartStateTtlMs: 1000,
+    });
+    lifecycle.saveMultipartState({
+      fingerprint: 'f',
+      uploadId: 'u',
+      objectKey: 'k',
+      partSize: 5 * MB,
+      totalParts: 2,
+      parts: [],
+      updatedAt: 0,
+    });
+
+    vi.spyOn(Date, 'now').mockReturnValue(Date.now() + 2000);
+
+    expect(lifecycle.loadMultipartState('f')).toBeNull();
+    expect(storage.items.size).toBe(0);
+    vi.restoreAllMocks();
+  });
+
+  it('ignores storage failures when saving', () => {
+    const lifecycle = new FileLifecycleManager({
+      apiEndpoint: API,
+      multipartStorage: {
+        getItem: () => null,
+        setItem: () => {
+          throw new Error('QuotaExceededError');
+        },
+        removeItem: () => {},
+      },
+    });
+
+    expect(() =>
+      lifecycle.saveMultipartState({
+        fingerprint: 'f',
+        uploadId: 'u',
+        objectKey: 'k',
+        partSize: 5 * MB,
+        totalParts: 1,
+        parts: [],
+        updatedAt: 0,
+      }),
+    ).not.toThrow();
+  });
+});
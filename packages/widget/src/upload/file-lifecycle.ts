@@ -54,6 +54,37 @@ export interface FileLifecycleEvent {
   data?: Record<string, unknown>;
 }
 
+/**
+ * Persisted state of an interrupted multipart upload.
+ * Enough to resume: the S3 upload, the part layout and the ETags of every finished part.
+ */
+export interface MultipartResumeState {
+  /** Fingerprint of the local file the upload belongs to (see fileFingerprint) */
+  fingerprint: string;
+  /** S3 multipart upload ID */
+  uploadId: string;
+  /** S3 object key */
+  objectKey: string;
+  /** Bytes per part (the last part may be shorter) */
+  partSize: number;
+  /** Total number of parts */
+  totalParts: number;
+  /** Finished parts */
+  parts: Array<{ partNumber: number; eTag: string }>;
+  /** Last update timestamp (epoch ms) */
+  updatedAt: number;
+}
+
+/**
+ * Key/value storage for multipart resume state.
+ * window.localStorage satisfies this interface.
+ */
+export interface MultipartStateStorage {
+  getItem(key: string): string | null;
+  setItem(key: string, value: string): void;
+  removeItem(key: string): void;
+}
+
 /**
  * File lifecycle manager configuration options.
  */
@@ -66,6 +97,10 @@ export interface FileLifecycleManagerOptions {
   defaultOrphanExpiryDays?: number;
   /** Event callback */
   onEvent?: (event: FileLifecycleEvent) => void;
+  /** Storage for multipart resume state (default: localStorage, in-memory when unavailable) */
+  multipartStorage?: MultipartStateStorage;
+  /** Age after which resume state is discarded (default: 24 hours) */
+  multipartStateTtlMs?: number;
 }
 
 /**
@@ -77,6 +112,60 @@ interface ApiResponse<T> {
   error?: string;
 }
 
+/**
+ * Storage key prefix for multipart resume state.
+ */
+const MULTIPART_STATE_PREFIX = 'huni:s3-multipart:';
+
+/**
+ * Default resume state lifetime (24 hours).
+ * Presigned part URLs are re-issued on resume, but the S3 upload itself
+ * is eventually aborted by the bucket lifecycle rule.
+ */
+const DEFAULT_MULTIPART_STATE_TTL_MS = 24 * 60 * 60 * 1000;
+
+/**
+ * Identify a local file across page reloads without reading its contents.
+ * A re-saved file changes lastModified, so it never resumes a stale upload.
+ */
+export function fileFingerprint(file: File): string {
+  return [file.name, file.size, file.lastModified, file.type].join(':');
+}
+
+/**
+ * In-memory MultipartStateStorage for environments without localStorage.
+ */
+class MemoryMultipartStorage implements MultipartStateStorage {
+  private items: Map<string, string> = new Map();
+
+  getItem(key: string): string | null {
+    return this.items.get(key) ?? null;
+  }
+
+  setItem(key: string, value: string): void {
+    this.items.set(key, value);
+  }
+
+  removeItem(key: string): void {
+    this.items.delete(key);
+  }
+}
+
+/**
+ * localStorage when it is accessible, otherwise an in-memory fallback.
+ */
+function defaultMultipartStorage(): MultipartStateStorage {
+  try {
+    // Sandboxed iframes and some private modes throw on access
+    if (typeof localStorage !== 'undefined' && localStorage !== null) {
+      return localStorage;
+    }
+  } catch {
+    // Fall through to memory storage
+  }
+  return new MemoryMultipartStorage();
+}
+
 /**
  * Manages file lifecycle operations including confirmation,
  * archiving, orphaning, and replacement requests.
@@ -86,6 +175,8 @@ export class FileLifecycleManager {
   private authToken?: string;
   private defaultOrphanExpiryDays: number;
   private onEvent?: (event: FileLifecycleEvent) => void;
+  private multipartStorage: MultipartStateStorage;
+  private multipartStateTtlMs: number;
 
   /** Cache of replacement requests */
   private replacementRequests: Map<string, FileReplacementRequest> = new Map();
@@ -95,6 +186,8 @@ export class FileLifecycleManager {
     this.authToken = options.authToken;
     this.defaultOrphanExpiryDays = options.defaultOrphanExpiryDays ?? 30;
     this.onEvent = options.onEvent;
+    this.multipartStorage = options.multipartStorage ?? defaultMultipartStorage();
+    this.multipartStateTtlMs = options.multipartStateTtlMs ?? DEFAULT_MULTIPART_STATE_TTL_MS;
   }
 
   /**
@@ -404,6 +497,72 @@ export class FileLifecycleManager {
     return response.data.requests;
   }
 
+  /**
+   * Load resume state for an interrupted multipart upload.
+   * Expired or unreadable state is removed.
+   *
+   * @param fingerprint - File fingerprint (see fileFingerprint)
+   * @returns Resume state, or null when there is nothing to resume
+   */
+  loadMultipartState(fingerprint: string): MultipartResumeState | null {
+    const key = MULTIPART_STATE_PREFIX + fingerprint;
+    let state: MultipartResumeState | null = null;
+
+    try {
+      const raw = this.multipartStorage.getItem(key);
+      state = raw ? (JSON.parse(raw) as MultipartResumeState) : null;
+    } catch {
+      state = null;
+    }
+
+    if (!state) {
+      return null;
+    }
+
+    const valid =
+      state.fingerprint === fingerprint &&
+      typeof state.uploadId === 'string' &&
+      Array.isArray(state.parts) &&
+      Date.now() - state.updatedAt <= this.multipartStateTtlMs;
+
+    if (!valid) {
+      this.clearMultipartState(fingerprint);
+      return null;
+    }
+
+    return state;
+  }
+
+  /**
+   * Persist resume state after a part finishes.
+   * Best effort: a full or blocked storage only disables resuming.
+   *
+   * @param state - Current multipart upload state
+   */
+  saveMultipartState(state: MultipartResumeState): void {
+    try {
+      this.multipartStorage.setItem(
+        MULTIPART_STATE_PREFIX + state.fingerprint,
+        JSON.stringify({ ...state, updatedAt: Date.now() }),
+      );
+    } catch {
+      // QuotaExceededError / SecurityError - the upload itself is unaffected
+    }
+  }
+
+  /**
+   * Remove resume state once the upload completes or can no longer be resumed.
+   *
+   * @param fingerprint - File fingerprint (see fileFingerprint)
+   */
+  clearMultipartState(fingerprint: string): void {
+    try {
+      this.multipartStorage.removeItem(MULTIPART_STATE_PREFIX + fingerprint);
+    } catch {
+      // Ignore storage failures
+    }
+  }
+
   /**
    * Set authentication token.
    */
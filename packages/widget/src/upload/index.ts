@@ -84,4 +84,7 @@ export {
   type FileReplacementRequest,
   type FileLifecycleEvent,
   type FileLifecycleManagerOptions,
+  type MultipartResumeState,
+  type MultipartStateStorage,
+  fileFingerprint,
 } from './file-lifecycle';
@@ -2,7 +2,17 @@
  * S3 Direct Upload Client
  *
  * Handles file uploads directly to S3 using presigned URLs.
- * Supports multipart uploads for files >= 5MB with retry logic.
+ * Supports multipart uploads for files >= 5MB with retry logic,
+ * parallel part uploads and resume after a reload or network loss.
+ *
+ * Backend contract (relative to apiEndpoint):
+ * - POST /presigned-url { fileName, fileSize, mimeType } -> PresignedUrlResponse
+ * - POST /multipart/initiate { fileName, fileSize, mimeType, totalParts, partSize }
+ *     -> { uploadId, objectKey, parts: MultipartPartResponse[] }
+ * - POST /multipart/parts { uploadId, objectKey, partNumbers } -> { parts: MultipartPartResponse[] }
+ *     Fresh part URLs for an existing upload, used when resuming. 404/410 = unknown upload.
+ * - POST /multipart/complete { uploadId, objectKey, parts: { partNumber, eTag }[] } -> MultipartCompleteResponse
+ * - POST /multipart/abort { uploadId, objectKey } -> 2xx (AbortMultipartUpload)
  *
  * @see SPEC-SHOPBY-005 Section: S3 Direct Upload
  * @MX:ANCHOR: Large file upload handler - supports files up to 500MB with multipart
@@ -17,6 +27,8 @@ import type {
   DesignFile,
 } from './types';
 import { FILE_SIZE_LIMITS } from './types';
+import { fileFingerprint, fileLifecycleManager } from './file-lifecycle';
+import type { FileLifecycleManager, MultipartResumeState } from './file-lifecycle';
 
 /**
  * Presigned URL response from backend API.
@@ -69,37 +81,59 @@ export interface S3DirectUploadOptions {
   apiEndpoint: string;
   /** Authentication token for API requests */
   authToken?: string;
-  /** Chunk size for multipart uploads (default: 5MB) */
+  /** Minimum chunk size for multipart uploads (default: 5MB, grows with file size) */
   chunkSize?: number;
+  /** Parts uploaded in parallel (default: 4) */
+  concurrency?: number;
   /** Maximum retry attempts for failed chunks */
   maxRetries?: number;
   /** Retry delay in ms (doubles on each retry) */
   retryDelayMs?: number;
   /** Progress callback */
   onProgress?: ProgressCallback;
+  /** Keeps multipart resume state (default: shared fileLifecycleManager) */
+  lifecycle?: FileLifecycleManager;
 }
 
 /**
- * Multipart upload state.
+ * In-progress multipart upload: the persisted resume state plus the part URLs of this session.
  */
-interface MultipartUploadState {
-  uploadId: string;
-  objectKey: string;
-  parts: Array<{ partNumber: number; eTag: string }>;
-  totalParts: number;
-  uploadedParts: number;
+interface MultipartUploadState extends MultipartResumeState {
+  /** Presigned URL per part still to upload */
+  partUrls: Map<number, string>;
 }
 
 /**
- * Default chunk size for multipart uploads (5MB).
+ * Minimum part size (5MB). S3 rejects smaller parts except the last one.
  */
 const DEFAULT_CHUNK_SIZE = 5 * 1024 * 1024;
 
+/**
+ * Maximum part size (5GB, S3 limit).
+ */
+const MAX_PART_SIZE = 5 * 1024 * 1024 * 1024;
+
 /**
  * Maximum number of parts in a multipart upload (S3 limit).
  */
 const MAX_PARTS = 10000;
 
+/**
+ * Part count the adaptive part size aims for.
+ * 500MB -> 8MB parts (63 parts); files up to 320MB keep the 5MB minimum.
+ */
+const TARGET_PARTS = 64;
+
+/**
+ * Part sizes are rounded up to whole megabytes.
+ */
+const PART_SIZE_ALIGNMENT = 1024 * 1024;
+
+/**
+ * Parts uploaded in parallel.
+ */
+const DEFAULT_CONCURRENCY = 4;
+
 /**
  * Maximum retry attempts for failed chunks.
  */
@@ -118,8 +152,10 @@ export class S3DirectUpload {
   private apiEndpoint: string;
   private authToken?: string;
   private chunkSize: number;
+  private concurrency: number;
   private maxRetries: number;
   private retryDelayMs: number;
+  private lifecycle: FileLifecycleManager;
 
   /** Active multipart upload states */
   private activeMultipartUploads: Map<string, MultipartUploadState> = new Map();
@@ -127,9 +163,11 @@ export class S3DirectUpload {
   constructor(options: S3DirectUploadOptions) {
     this.apiEndpoint = options.apiEndpoint;
     this.authToken = options.authToken;
-    this.chunkSize = options.chunkSize ?? DEFAULT_CHUNK_SIZE;
+    this.chunkSize = Math.max(options.chunkSize ?? DEFAULT_CHUNK_SIZE, DEFAULT_CHUNK_SIZE);
+    this.concurrency = Math.max(1, options.concurrency ?? DEFAULT_CONCURRENCY);
     this.maxRetries = options.maxRetries ?? DEFAULT_MAX_RETRIES;
     this.retryDelayMs = options.retryDelayMs ?? DEFAULT_RETRY_DELAY_MS;
+    this.lifecycle = options.lifecycle ?? fileLifecycleManager;
   }
 
   /**
@@ -228,10 +266,7 @@ export class S3DirectUpload {
   ): Promise<PresignedUrlResponse> {
     const response = await fetch(`${this.apiEndpoint}/presigned-url`, {
       method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        ...(this.authToken ? { Authorization: `Bearer ${this.authToken}` } : {}),
-      },
+      headers: this.jsonHeaders(),
       body: JSON.stringify({
         fileName,
         fileSize,
@@ -276,9 +311,12 @@ export class S3DirectUpload {
     return presigned.accessUrl;
   }
 
+  // @MX:NOTE: [AUTO] Resume state (upload ID, finished part ETags, file fingerprint) is saved through FileLifecycleManager after every part
+  // @MX:NOTE: [AUTO] An interrupted upload re-sends only the missing parts; state is cleared once the upload completes
   /**
    * Multipart upload for files >= 5MB.
-   * Splits file into chunks and uploads sequentially with retry logic.
+   * Resumes a persisted upload of the same file when there is one, otherwise starts a new one.
+   * Parts are uploaded through a bounded concurrency window with retry logic.
    */
   private async uploadMultipart(
     file: File,
@@ -286,8 +324,53 @@ export class S3DirectUpload {
     designFile: DesignFile,
     onProgress?: ProgressCallback,
   ): Promise<string> {
-    // Calculate number of parts
-    const totalParts = Math.ceil(file.size / this.chunkSize);
+    const fingerprint = fileFingerprint(file);
+    const state =
+      (await this.resumeMultipart(file, fingerprint)) ??
+      (await this.initiateMultipart(file, fingerprint));
+
+    this.activeMultipartUploads.set(uploadId, state);
+
+    try {
+      await this.uploadParts(file, state, uploadId, designFile, onProgress);
+
+      // Complete multipart upload
+      const completeResponse = await fetch(`${this.apiEndpoint}/multipart/complete`, {
+        method: 'POST',
+        headers: this.jsonHeaders(),
+        body: JSON.stringify({
+          uploadId: state.uploadId,
+          objectKey: state.objectKey,
+          parts: [...state.parts].sort((a, b) => a.partNumber - b.partNumber),
+        }),
+      });
+
+      if (!completeResponse.ok) {
+        // Resume state is kept: a retry only has to repeat this request
+        throw this.createError('S3_ERROR', 'Failed to complete multipart upload', {
+          status: completeResponse.status,
+        });
+      }
+
+      const result: MultipartCompleteResponse = await completeResponse.json();
+      this.lifecycle.clearMultipartState(fingerprint);
+
+      return result.accessUrl;
+    } finally {
+      // Cleanup multipart state
+      this.activeMultipartUploads.delete(uploadId);
+    }
+  }
+
+  /**
+   * Start a new multipart upload and persist its resume state.
+   */
+  private async initiateMultipart(
+    file: File,
+    fingerprint: string,
+  ): Promise<MultipartUploadState> {
+    const partSize = this.getPartSize(file.size);
+    const totalParts = Math.ceil(file.size / partSize);
 
     if (totalParts > MAX_PARTS) {
       throw this.createError(
@@ -300,15 +383,13 @@ export class S3DirectUpload {
     // Request multipart upload initiation
     const initiateResponse = await fetch(`${this.apiEndpoint}/multipart/initiate`, {
       method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        ...(this.authToken ? { Authorization: `Bearer ${this.authToken}` } : {}),
-      },
+      headers: this.jsonHeaders(),
       body: JSON.stringify({
         fileName: file.name,
         fileSize: file.size,
         mimeType: file.type,
         totalParts,
+        partSize,
       }),
     });
 
@@ -316,116 +397,227 @@ export class S3DirectUpload {
       throw this.createError('S3_ERROR', 'Failed to initiate multipart upload');
     }
 
-    const { uploadId: s3UploadId, objectKey, parts } = await initiateResponse.json();
+    const { uploadId, objectKey, parts } = await initiateResponse.json();
 
-    // Initialize multipart state
     const state: MultipartUploadState = {
-      uploadId: s3UploadId,
+      fingerprint,
+      uploadId,
       objectKey,
-      parts: [],
+      partSize,
       totalParts,
-      uploadedParts: 0,
+      parts: [],
+      updatedAt: Date.now(),
+      partUrls: this.indexPartUrls(parts),
     };
-    this.activeMultipartUploads.set(uploadId, state);
 
-    // Upload each part with retry logic
-    for (let partNumber = 1; partNumber <= totalParts; partNumber++) {
-      const start = (partNumber - 1) * this.chunkSize;
-      const end = Math.min(partNumber * this.chunkSize, file.size);
-      const chunk = file.slice(start, end);
+    // Persist before the first part so a reload reuses this upload instead of leaking it
+    this.lifecycle.saveMultipartState(this.toResumeState(state));
+
+    return state;
+  }
 
-      const partUrl = parts[partNumber - 1]?.uploadUrl;
-      if (!partUrl) {
-        throw this.createError('S3_ERROR', `Missing presigned URL for part ${partNumber}`);
+  /**
+   * Restore a persisted multipart upload of the same file.
+   * Requests fresh presigned URLs for the missing parts - the original ones may have expired.
+   *
+   * @returns Restored state, or null when there is nothing (valid) to resume
+   */
+  private async resumeMultipart(
+    file: File,
+    fingerprint: string,
+  ): Promise<MultipartUploadState | null> {
+    const saved = this.lifecycle.loadMultipartState(fingerprint);
+    if (!saved) {
+      return null;
+    }
+
+    if (saved.partSize <= 0 || Math.ceil(file.size / saved.partSize) !== saved.totalParts) {
+      await this.discardMultipart(saved);
+      return null;
+    }
+
+    const finished = new Set(saved.parts.map((part) => part.partNumber));
+    const missing: number[] = [];
+    for (let partNumber = 1; partNumber <= saved.totalParts; partNumber++) {
+      if (!finished.has(partNumber)) {
+        missing.push(partNumber);
       }
+    }
 
-      // Upload part with retry
-      const eTag = await this.uploadPartWithRetry(
-        chunk,
-        partUrl,
-        partNumber,
-        uploadId,
-        designFile,
-        state,
-        onProgress,
-      );
+    try {
+      const partUrls = missing.length > 0
+        ? await this.requestPartUrls(saved.uploadId, saved.objectKey, missing)
+        : new Map<number, string>();
 
-      state.parts.push({ partNumber, eTag });
-      state.uploadedParts++;
+      return { ...saved, parts: [...saved.parts], partUrls };
+    } catch (error) {
+      // Anything but "unknown upload" may be temporary: keep the saved parts for the next attempt
+      const status = (error as Partial<UploadError> | null)?.details?.status;
+      if (status !== 404 && status !== 410) {
+        throw error;
+      }
+      // The backend no longer knows the upload (aborted or expired): start over
+      await this.discardMultipart(saved);
+      return null;
     }
+  }
 
-    // Complete multipart upload
-    const completeResponse = await fetch(`${this.apiEndpoint}/multipart/complete`, {
+  /**
+   * Drop saved resume state and abort its multipart upload so S3 does not keep the orphaned parts.
+   * The abort is best effort and never fails the new upload.
+   */
+  private async discardMultipart(saved: MultipartResumeState): Promise<void> {
+    this.lifecycle.clearMultipartState(saved.fingerprint);
+    try {
+      await fetch(`${this.apiEndpoint}/multipart/abort`, {
+        method: 'POST',
+        headers: this.jsonHeaders(),
+        body: JSON.stringify({ uploadId: saved.uploadId, objectKey: saved.objectKey }),
+      });
+    } catch {
+      // Ignore: the new upload does not depend on the old one being aborted
+    }
+  }
+
+  /**
+   * Request presigned URLs for parts of an existing multipart upload.
+   * POST {apiEndpoint}/multipart/parts { uploadId, objectKey, partNumbers } -> { parts }
+   * The backend answers 404 or 410 when it no longer knows the upload.
+   */
+  private async requestPartUrls(
+    s3UploadId: string,
+    objectKey: string,
+    partNumbers: number[],
+  ): Promise<Map<number, string>> {
+    const response = await fetch(`${this.apiEndpoint}/multipart/parts`, {
       method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        ...(this.authToken ? { Authorization: `Bearer ${this.authToken}` } : {}),
-      },
+      headers: this.jsonHeaders(),
       body: JSON.stringify({
         uploadId: s3UploadId,
         objectKey,
-        parts: state.parts,
+        partNumbers,
       }),
     });
 
-    if (!completeResponse.ok) {
-      throw this.createError('S3_ERROR', 'Failed to complete multipart upload');
+    if (!response.ok) {
+      throw this.createError(
+        'S3_ERROR',
+        `Failed to refresh multipart part URLs: ${response.status}`,
+        { status: response.status },
+      );
     }
 
-    const result: MultipartCompleteResponse = await completeResponse.json();
+    const { parts } = await response.json();
+    return this.indexPartUrls(parts);
+  }
 
-    // Cleanup multipart state
-    this.activeMultipartUploads.delete(uploadId);
+  /**
+   * Upload every unfinished part, at most `concurrency` at a time.
+   * Each finished part is persisted immediately; the first failure stops new parts from starting.
+   */
+  private async uploadParts(
+    file: File,
+    state: MultipartUploadState,
+    uploadId: string,
+    designFile: DesignFile,
+    onProgress?: ProgressCallback,
+  ): Promise<void> {
+    const finished = new Set(state.parts.map((part) => part.partNumber));
+    const queue: number[] = [];
+    let completedBytes = 0;
+
+    for (let partNumber = 1; partNumber <= state.totalParts; partNumber++) {
+      if (finished.has(partNumber)) {
+        completedBytes += this.partRange(state, partNumber, file.size).size;
+      } else {
+        queue.push(partNumber);
+      }
+    }
 
-    return result.accessUrl;
+    // Bytes sent so far by each in-flight part; reset when a part is retried
+    const inFlightBytes = new Map<number, number>();
+    const reportProgress = () => {
+      let uploadedBytes = completedBytes;
+      for (const bytes of inFlightBytes.values()) {
+        uploadedBytes += bytes;
+      }
+      this.updateMultipartProgress(uploadId, designFile, uploadedBytes, onProgress);
+    };
+
+    const errors: unknown[] = [];
+
+    const worker = async (): Promise<void> => {
+      while (errors.length === 0 && queue.length > 0) {
+        const partNumber = queue.shift()!;
+        const { start, end, size } = this.partRange(state, partNumber, file.size);
+
+        try {
+          const partUrl = state.partUrls.get(partNumber);
+          if (!partUrl) {
+            throw this.createError('S3_ERROR', `Missing presigned URL for part ${partNumber}`);
+          }
+
+          const eTag = await this.uploadPartWithRetry(
+            file.slice(start, end),
+            partUrl,
+            partNumber,
+            (loaded) => {
+              inFlightBytes.set(partNumber, loaded);
+              reportProgress();
+            },
+          );
+
+          inFlightBytes.delete(partNumber);
+          completedBytes += size;
+          state.parts.push({ partNumber, eTag });
+          state.partUrls.delete(partNumber);
+          this.lifecycle.saveMultipartState(this.toResumeState(state));
+          reportProgress();
+        } catch (error) {
+          inFlightBytes.delete(partNumber);
+          errors.push(error);
+        }
+      }
+    };
+
+    reportProgress();
+
+    const workers = Math.min(this.concurrency, queue.length);
+    await Promise.all(Array.from({ length: workers }, () => worker()));
+
+    if (errors.length > 0) {
+      throw errors[0];
+    }
   }
 
   /**
    * Upload a single part with retry logic.
+   * Retries network errors and S3 throttling / server errors with exponential backoff.
    */
   private async uploadPartWithRetry(
     chunk: Blob,
     partUrl: string,
     partNumber: number,
-    uploadId: string,
-    designFile: DesignFile,
-    state: MultipartUploadState,
-    onProgress?: ProgressCallback,
+    onLoaded: (loadedBytes: number) => void,
   ): Promise<string> {
     let lastError: unknown;
 
     for (let attempt = 0; attempt <= this.maxRetries; attempt++) {
       try {
-        const response = await fetch(partUrl, {
-          method: 'PUT',
-          body: chunk,
-          headers: {
-            'Content-Type': 'application/octet-stream',
-          },
-        });
+        onLoaded(0);
+        const xhr = await this.putWithProgress(chunk, partUrl, `Part ${partNumber} upload`, onLoaded);
 
-        if (!response.ok) {
-          throw this.createError(
-            'S3_ERROR',
-            `Part ${partNumber} upload failed: ${response.status}`,
-          );
-        }
-
-        // Extract ETag from response
-        const eTag = response.headers.get('ETag')?.replace(/"/g, '');
+        // Extract ETag from response (bucket CORS must expose the ETag header)
+        const eTag = xhr.getResponseHeader('ETag')?.replace(/"/g, '');
         if (!eTag) {
           throw this.createError('S3_ERROR', `Missing ETag for part ${partNumber}`);
         }
 
-        // Update progress
-        this.updateMultipartProgress(uploadId, designFile, state, onProgress);
-
         return eTag;
       } catch (error) {
         lastError = error;
 
-        // Retry on network errors
-        if (this.isNetworkError(error) && attempt < this.maxRetries) {
+        if (this.isRetryableError(error) && attempt < this.maxRetries) {
           await this.delay(this.retryDelayMs * Math.pow(2, attempt));
           continue;
         }
@@ -447,34 +639,49 @@ export class S3DirectUpload {
     designFile: DesignFile,
     onProgress?: ProgressCallback,
   ): Promise<void> {
+    await this.putWithProgress(file, uploadUrl, 'S3 upload', (loaded) => {
+      onProgress?.({
+        uploadId,
+        file: designFile,
+        target: 'S3',
+        uploadedBytes: loaded,
+        totalBytes: file.size,
+        percentage: Math.round((loaded / file.size) * 100),
+        state: 'uploading',
+      });
+    });
+  }
+
+  /**
+   * PUT a body to a presigned URL, reporting bytes sent.
+   * Resolves with the finished request so callers can read response headers.
+   */
+  private putWithProgress(
+    body: Blob,
+    url: string,
+    label: string,
+    onLoaded: (loadedBytes: number) => void,
+  ): Promise<XMLHttpRequest> {
     return new Promise((resolve, reject) => {
       const xhr = new XMLHttpRequest();
 
       // Track upload progress
       xhr.upload.addEventListener('progress', (event) => {
         if (event.lengthComputable) {
-          const percentage = Math.round((event.loaded / event.total) * 100);
-          onProgress?.({
-            uploadId,
-            file: designFile,
-            target: 'S3',
-            uploadedBytes: event.loaded,
-            totalBytes: event.total,
-            percentage,
-            state: 'uploading',
-          });
+          onLoaded(Math.min(event.loaded, body.size));
         }
       });
 
       // Handle completion
       xhr.addEventListener('load', () => {
         if (xhr.status >= 200 && xhr.status < 300) {
-          resolve();
+          resolve(xhr);
         } else {
           reject(
             this.createError(
               'S3_ERROR',
-              `S3 upload failed: ${xhr.status} ${xhr.statusText}`,
+              `${label} failed: ${xhr.status} ${xhr.statusText}`,
+              { status: xhr.status },
             ),
           );
         }
@@ -482,29 +689,29 @@ export class S3DirectUpload {
 
       // Handle errors
       xhr.addEventListener('error', () => {
-        reject(this.createError('NETWORK_ERROR', 'Network error during S3 upload'));
+        reject(this.createError('NETWORK_ERROR', `Network error during ${label}`));
       });
 
       xhr.addEventListener('abort', () => {
         reject(this.createError('CANCELLED', 'Upload cancelled'));
       });
 
-      xhr.open('PUT', uploadUrl);
+      xhr.open('PUT', url);
       xhr.setRequestHeader('Content-Type', 'application/octet-stream');
-      xhr.send(file);
+      xhr.send(body);
     });
   }
 
   /**
    * Update progress for multipart upload.
+   * uploadedBytes counts finished parts in full plus the bytes sent by in-flight parts.
    */
   private updateMultipartProgress(
     uploadId: string,
     designFile: DesignFile,
-    state: MultipartUploadState,
+    uploadedBytes: number,
     onProgress?: ProgressCallback,
   ): void {
-    const uploadedBytes = state.uploadedParts * this.chunkSize;
     const percentage = Math.round((uploadedBytes / designFile.size) * 100);
 
     onProgress?.({
@@ -518,6 +725,18 @@ export class S3DirectUpload {
     });
   }
 
+  /**
+   * Part size for a file: at least the configured chunk size and S3's 5MB minimum,
+   * growing with the file so large uploads need fewer requests,
+   * and never more than MAX_PARTS parts or MAX_PART_SIZE bytes per part.
+   */
+  getPartSize(fileSize: number): number {
+    const target = Math.ceil(fileSize / TARGET_PARTS / PART_SIZE_ALIGNMENT) * PART_SIZE_ALIGNMENT;
+    const minForPartLimit = Math.ceil(fileSize / MAX_PARTS);
+
+    return Math.min(MAX_PART_SIZE, Math.max(this.chunkSize, target, minForPartLimit));
+  }
+
   /**
    * Check if file size requires multipart upload.
    */
@@ -598,6 +817,74 @@ export class S3DirectUpload {
     return err instanceof TypeError && 'message' in err;
   }
 
+  /**
+   * Check if a failed part upload is worth retrying.
+   * Network errors, throttling (429) and S3 server errors (5xx, e.g. 503 SlowDown).
+   */
+  private isRetryableError(err: unknown): boolean {
+    if (this.isNetworkError(err)) {
+      return true;
+    }
+
+    const uploadError = err as Partial<UploadError> | null;
+    const status = uploadError?.details?.status;
+    return (
+      uploadError?.code === 'NETWORK_ERROR' ||
+      (uploadError?.code === 'S3_ERROR' &&
+        typeof status === 'number' &&
+        (status >= 500 || status === 429))
+    );
+  }
+
+  /**
+   * Byte range of a part (the last part may be shorter).
+   */
+  private partRange(
+    state: MultipartResumeState,
+    partNumber: number,
+    fileSize: number,
+  ): { start: number; end: number; size: number } {
+    const start = (partNumber - 1) * state.partSize;
+    const end = Math.min(start + state.partSize, fileSize);
+    return { start, end, size: end - start };
+  }
+
+  /**
+   * Map presigned part URLs by part number.
+   */
+  private indexPartUrls(parts: MultipartPartResponse[] | undefined): Map<number, string> {
+    const urls = new Map<number, string>();
+    for (const part of parts ?? []) {
+      urls.set(part.partNumber, part.uploadUrl);
+    }
+    return urls;
+  }
+
+  /**
+   * Persistable subset of multipart state (presigned URLs expire and are never stored).
+   */
+  private toResumeState(state: MultipartUploadState): MultipartResumeState {
+    return {
+      fingerprint: state.fingerprint,
+      uploadId: state.uploadId,
+      objectKey: state.objectKey,
+      partSize: state.partSize,
+      totalParts: state.totalParts,
+      parts: state.parts,
+      updatedAt: state.updatedAt,
+    };
+  }
+
+  /**
+   * JSON request headers with authentication.
+   */
+  private jsonHeaders(): Record<string, string> {
+    return {
+      'Content-Type': 'application/json',
+      ...(this.authToken ? { Authorization: `Bearer ${this.authToken}` } : {}),
+    };
+  }
+
   /**
    * Delay helper for retry logic.
    */
@@ -0,0 +1,33 @@
+// Tests for import upsert batching (scripts/import/helpers/bulk-upsert.ts).
+
+import { describe, it, expect } from 'vitest';
+import { pgTable, integer } from 'drizzle-orm/pg-core';
+import { upsertBatchSize, chunkRows, UPSERT_BATCH_SIZE } from '../helpers/bulk-upsert.js';
+
+function tableWithColumns(name: string, count: number) {
+  const columns = Object.fromEntries(Array.from({ length: count }, (_, i) => [`c${i}`, integer(`c${i}`)]));
+  return pgTable(name, columns);
+}
+
+describe('upsertBatchSize', () => {
+  it('uses the default batch size for narrow tables', () => {
+    expect(upsertBatchSize(tableWithColumns('narrow', 12))).toBe(UPSERT_BATCH_SIZE);
+  });
+
+  it('keeps wide rows under the 65535 bind parameter limit', () => {
+    const size = upsertBatchSize(tableWithColumns('wide', 100));
+
+    expect(size).toBe(655);
+    expect(size * 100).toBeLessThanOrEqual(65_535);
+  });
+
+  it('sizes for the widest of several tables', () => {
+    expect(upsertBatchSize(tableWithColumns('a', 10), tableWithColumns('b', 200))).toBe(327);
+  });
+});
+
+describe('chunkRows', () => {
+  it('splits rows into consecutive batches', () => {
+    expect(chunkRows([1, 2, 3, 4, 5], 2)).toEqual([[1, 2], [3, 4], [5]]);
+  });
+});
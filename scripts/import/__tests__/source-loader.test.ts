@@ -0,0 +1,82 @@
+// Tests for the memoized import source loader (scripts/import/helpers/source-loader.ts).
+
+import { describe, it, expect, beforeEach, afterEach } from "vitest";
+import * as fs from "fs";
+import * as os from "os";
+import * as path from "path";
+import {
+  clearSourceCache,
+  combinedSourceHash,
+  loadJsonSource,
+  loadTextSource,
+  sourceFileHash,
+} from "../helpers/source-loader.js";
+
+let dir: string;
+
+beforeEach(() => {
+  dir = fs.mkdtempSync(path.join(os.tmpdir(), "import-sources-"));
+  clearSourceCache();
+});
+
+afterEach(() => {
+  fs.rmSync(dir, { recursive: true, force: true });
+});
+
+function write(name: string, content: string, mtime?: Date): string {
+  const file = path.join(dir, name);
+  fs.writeFileSync(file, content);
+  if (mtime) fs.utimesSync(file, mtime, mtime);
+  return file;
+}
+
+describe("loadJsonSource", () => {
+  it("parses a file once and shares the result", () => {
+    const file = write("data.json", JSON.stringify({ sheets: [{ name: "A" }] }));
+
+    const first = loadJsonSource<{ sheets: { name: string }[] }>(file);
+    const second = loadJsonSource<{ sheets: { name: string }[] }>(file);
+
+    expect(first.sheets[0].name).toBe("A");
+    expect(second).toBe(first);
+  });
+
+  it("re-reads a file whose contents changed", () => {
+    const file = write("data.json", JSON.stringify({ v: 1 }), new Date(2020, 0, 1));
+    expect(loadJsonSource<{ v: number }>(file).v).toBe(1);
+
+    write("data.json", JSON.stringify({ v: 22 }), new Date(2021, 0, 1));
+    expect(loadJsonSource<{ v: number }>(file).v).toBe(22);
+  });
+});
+
+describe("loadTextSource", () => {
+  it("returns the file contents", () => {
+    const file = write("items.toon", "## Sheet: Sheet\na|b\n");
+    expect(loadTextSource(file)).toBe("## Sheet: Sheet\na|b\n");
+  });
+});
+
+describe("combinedSourceHash", () => {
+  it("is independent of argument order", () => {
+    const a = write("a.json", "{}");
+    const b = write("b.json", "[]");
+    expect(combinedSourceHash([a, b])).toBe(combinedSourceHash([b, a]));
+  });
+
+  it("changes when any file changes", () => {
+    const a = write("a.json", "{}", new Date(2020, 0, 1));
+    const b = write("b.json", "[]");
+    const before = combinedSourceHash([a, b]);
+
+    write("a.json", '{"x":1}', new Date(2021, 0, 1));
+    expect(combinedSourceHash([a, b])).not.toBe(before);
+  });
+
+  it("treats a missing file as part of the hash", () => {
+    const a = write("a.json", "{}");
+    const missing = path.join(dir, "missing.json");
+    expect(combinedSourceHash([a, missing])).not.toBe(combinedSourceHash([a]));
+    expect(sourceFileHash(a)).toHaveLength(64);
+  });
+});
@@ -0,0 +1,131 @@
+// Tests for the import step DAG scheduler (scripts/import/helpers/step-graph.ts).
+
+import { describe, it, expect } from "vitest";
+import { planWaves, runStepGraph, validateStepGraph } from "../helpers/step-graph.js";
+import type { StepNode } from "../helpers/step-graph.js";
+
+const GRAPH: StepNode[] = [
+  { id: "categories", dependsOn: [] },
+  { id: "papers", dependsOn: [] },
+  { id: "products", dependsOn: ["categories"] },
+  { id: "paper-mappings", dependsOn: ["papers", "products"] },
+];
+
+function deferred() {
+  let resolve!: () => void;
+  const promise = new Promise<void>((r) => (resolve = r));
+  return { promise, resolve };
+}
+
+describe("validateStepGraph", () => {
+  it("accepts an acyclic graph", () => {
+    expect(() => validateStepGraph(GRAPH)).not.toThrow();
+  });
+
+  it("rejects unknown dependencies", () => {
+    expect(() => validateStepGraph([{ id: "a", dependsOn: ["missing"] }])).toThrow(/unknown step 'missing'/);
+  });
+
+  it("rejects duplicate ids", () => {
+    expect(() => validateStepGraph([{ id: "a", dependsOn: [] }, { id: "a", dependsOn: [] }])).toThrow(/Duplicate/);
+  });
+
+  it("rejects cycles", () => {
+    expect(() =>
+      validateStepGraph([
+        { id: "a", dependsOn: ["b"] },
+        { id: "b", dependsOn: ["a"] },
+      ]),
+    ).toThrow(/cycle/);
+  });
+});
+
+describe("planWaves", () => {
+  it("groups steps into dependency levels in declaration order", () => {
+    const waves = planWaves(GRAPH).map((wave) => wave.map((s) => s.id));
+    expect(waves).toEqual([["categories", "papers"], ["products"], ["paper-mappings"]]);
+  });
+});
+
+describe("runStepGraph", () => {
+  it("runs independent steps concurrently and dependents only after their dependencies", async () => {
+    const started: string[] = [];
+    const gates = new Map(GRAPH.map((s) => [s.id, deferred()]));
+    let running = 0;
+    let maxRunning = 0;
+
+    const done = runStepGraph(GRAPH, async (step) => {
+      started.push(step.id);
+      running++;
+      maxRunning = Math.max(maxRunning, running);
+      await gates.get(step.id)!.promise;
+      running--;
+      return "ran";
+    });
+
+    await new Promise((r) => setTimeout(r, 0));
+    expect(started).toEqual(["categories", "papers"]);
+
+    gates.get("papers")!.resolve();
+    await new Promise((r) => setTimeout(r, 0));
+    // paper-mappings still waits for products
+    expect(started).toEqual(["categories", "papers"]);
+
+    gates.get("categories")!.resolve();
+    await new Promise((r) => setTimeout(r, 0));
+    expect(started).toEqual(["categories", "papers", "products"]);
+
+    gates.get("products")!.resolve();
+    gates.get("paper-mappings")!.resolve();
+    const results = await done;
+
+    expect(started).toEqual(["categories", "papers", "products", "paper-mappings"]);
+    expect(maxRunning).toBe(2);
+    expect([...results.values()].every((r) => r.outcome === "ran")).toBe(true);
+  });
+
+  it("respects the concurrency limit", async () => {
+    let running = 0;
+    let maxRunning = 0;
+    const steps = Array.from({ length: 6 }, (_, i) => ({ id: `s${i}`, dependsOn: [] }));
+
+    await runStepGraph(
+      steps,
+      async () => {
+        running++;
+        maxRunning = Math.max(maxRunning, running);
+        await new Promise((r) => setTimeout(r, 1));
+        running--;
+        return "ran";
+      },
+      { concurrency: 2 },
+    );
+
+    expect(maxRunning).toBe(2);
+  });
+
+  it("blocks dependents of a failed step but finishes independent branches", async () => {
+    const results = await runStepGraph(GRAPH, async (step) => {
+      if (step.id === "categories") throw new Error("boom");
+      return "ran";
+    });
+
+    expect(results.get("categories")?.outcome).toBe("failed");
+    expect((results.get("categories")?.error as Error).message).toBe("boom");
+    expect(results.get("products")?.outcome).toBe("blocked");
+    expect(results.get("paper-mappings")?.outcome).toBe("blocked");
+    expect(results.get("papers")?.outcome).toBe("ran");
+  });
+
+  it("reports upstreamChanged only when a dependency actually ran", async () => {
+    const upstream = new Map<string, boolean>();
+    await runStepGraph(GRAPH, async (step, ctx) => {
+      upstream.set(step.id, ctx.upstreamChanged);
+      return step.id === "categories" ? "skipped" : "ran";
+    });
+
+    expect(upstream.get("categories")).toBe(false);
+    expect(upstream.get("products")).toBe(false);
+    expect(upstream.get("paper-mappings")).toBe(true);
+  });
+});
@@ -0,0 +1,28 @@
+// @MX:NOTE: [AUTO] Shared batch sizing for set-based INSERT ... ON CONFLICT upserts in import steps
+// @MX:NOTE: [AUTO] Postgres caps one statement at 65535 bind parameters, so wide rows get smaller batches
+
+import { getTableColumns } from "drizzle-orm";
+import type { Table } from "drizzle-orm";
+
+const MAX_BIND_PARAMETERS = 65_535;
+
+/** Upper bound on rows per multi-row INSERT ... ON CONFLICT statement in import steps */
+export const UPSERT_BATCH_SIZE = 1000;
+
+/**
+ * Rows per upsert statement for the given tables: UPSERT_BATCH_SIZE, lowered when the widest
+ * table's columns (every column may be bound per row) would exceed the bind parameter limit.
+ */
+export function upsertBatchSize(...tables: Table[]): number {
+  const columns = Math.max(1, ...tables.map((t) => Object.keys(getTableColumns(t)).length));
+  return Math.max(1, Math.min(UPSERT_BATCH_SIZE, Math.floor(MAX_BIND_PARAMETERS / columns)));
+}
+
+/** Split rows into consecutive batches of at most `size` */
+export function chunkRows<T>(rows: readonly T[], size: number): T[][] {
+  const batches: T[][] = [];
+  for (let i = 0; i < rows.length; i += size) {
+    batches.push(rows.slice(i, i + size));
+  }
+  return batches;
+}
@@ -0,0 +1,91 @@
+// @MX:NOTE: [AUTO] Incremental import state — per-step source hash + target table checksum, kept in data_import_log
+// @MX:SPEC: SPEC-DATA-003 Milestone 1 (skip-if-unchanged)
+// @MX:NOTE: [AUTO] A step is unchanged when its script, its source files and the rows of its target tables all match the last recorded run
+
+import * as path from "path";
+import { createHash } from "crypto";
+import { and, desc, eq, sql } from "drizzle-orm";
+import type { drizzle } from "drizzle-orm/postgres-js";
+import { dataImportLog } from "../../../packages/shared/src/db/schema/huni-import-log.schema.js";
+import { combinedSourceHash } from "./source-loader.js";
+
+type Db = ReturnType<typeof drizzle>;
+
+export interface StepState {
+  sourceHash: string;
+  targetChecksum: string;
+}
+
+export interface TrackedStep {
+  id: string;
+  /** Absolute path of the step script — code changes must re-run the step */
+  scriptPath: string;
+  /** Absolute paths of the files the step reads */
+  sources: readonly string[];
+  /** Tables the step writes */
+  targets: readonly string[];
+}
+
+// data_import_log rows written by the orchestrator, kept apart from the per-table rows the steps write
+const STATE_TABLE_PREFIX = "import-step:";
+
+export function stepSourceHash(step: TrackedStep): string {
+  return combinedSourceHash([step.scriptPath, ...step.sources]);
+}
+
+/**
+ * Order-independent checksum over every row of the given tables.
+ * md5 per row, then md5 over the sorted row hashes, so it is stable for identical contents.
+ */
+export async function tableChecksum(db: Db, tables: readonly string[]): Promise<string> {
+  const hash = createHash("sha256");
+  for (const table of [...tables].sort()) {
+    const rows = await db.execute<{ row_count: string; digest: string }>(sql`
+      SELECT count(*)::text AS row_count,
+             coalesce(md5(string_agg(h, '' ORDER BY h)), '') AS digest
+      FROM (SELECT md5(t::text) AS h FROM ${sql.identifier(table)} t) hashed
+    `);
+    const { row_count, digest } = rows[0] ?? { row_count: "0", digest: "" };
+    hash.update(`${table}:${row_count}:${digest}\n`);
+  }
+  return hash.digest("hex");
+}
+
+/** State recorded by the last successful run of the step, or null when there is none */
+export async function lastStepState(db: Db, stepId: string): Promise<StepState | null> {
+  const [row] = await db
+    .select({ sourceHash: dataImportLog.sourceHash, metadata: dataImportLog.metadata })
+    .from(dataImportLog)
+    .where(and(eq(dataImportLog.tableName, `${STATE_TABLE_PREFIX}${stepId}`), eq(dataImportLog.status, "success")))
+    .orderBy(desc(dataImportLog.id))
+    .limit(1);
+
+  const targetChecksum = (row?.metadata as { targetChecksum?: unknown } | null | undefined)?.targetChecksum;
+  if (!row || typeof targetChecksum !== "string") return null;
+  return { sourceHash: row.sourceHash, targetChecksum };
+}
+
+export async function recordStepState(db: Db, step: TrackedStep, state: StepState): Promise<void> {
+  const sourceFile = [step.scriptPath, ...step.sources].map((p) => path.basename(p)).join(", ");
+  await db.insert(dataImportLog).values({
+    tableName: `${STATE_TABLE_PREFIX}${step.id}`,
+    sourceFile: sourceFile.slice(0, 500),
+    sourceHash: state.sourceHash,
+    importVersion: 1,
+    status: "success",
+    completedAt: new Date(),
+    metadata: {
+      step: step.id,
+      targets: step.targets,
+      targetChecksum: state.targetChecksum,
+    },
+  });
+}
+
+export function isUnchanged(previous: StepState | null, current: StepState): boolean {
+  return (
+    previous !== null &&
+    previous.sourceHash === current.sourceHash &&
+    previous.targetChecksum === current.targetChecksum
+  );
+}
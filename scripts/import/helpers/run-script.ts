@@ -0,0 +1,28 @@
+// @MX:NOTE: [AUTO] Lets every import-*.ts run standalone (tsx import-x.ts) and be imported by the orchestrator
+// @MX:REASON: In-process steps must report failure by throwing — process.exit would take the whole import down
+
+/** Raised by an import step after it has logged the details of its failure */
+export class ImportStepError extends Error {
+  constructor(message: string) {
+    super(message);
+    this.name = "ImportStepError";
+  }
+}
+
+/** An import step module: main() resolves on success and throws on failure */
+export interface ImportStepModule {
+  main(): Promise<void>;
+}
+
+/** Run main() when the module is the process entry point; do nothing when it is imported */
+export function runIfEntryPoint(mod: NodeModule, label: string, main: () => Promise<void>): void {
+  if (require.main !== mod) return;
+  main().catch((err) => {
+    if (err instanceof ImportStepError) {
+      console.error(err.message);
+    } else {
+      console.error(`${label} Fatal error:`, err);
+    }
+    process.exit(1);
+  });
+}
@@ -0,0 +1,74 @@
+// @MX:ANCHOR: [AUTO] Memoized import source loader — one read, one hash and one JSON.parse per file per process
+// @MX:REASON: fan_in >= 3 — 가격표_extracted.json, 상품마스터_extracted.json and 출력소재관리_extracted.json are each read by several import steps
+// @MX:WARN: [AUTO] Parsed JSON is shared between steps — callers must treat it as read-only
+// @MX:REASON: Steps run in-process and concurrently under the orchestrator; a mutation in one step would leak into another
+
+import * as fs from "fs";
+import * as path from "path";
+import { createHash } from "crypto";
+
+interface CachedSource {
+  mtimeMs: number;
+  size: number;
+  text: string;
+  hash: string;
+  json?: unknown;
+}
+
+const cache = new Map<string, CachedSource>();
+
+function load(filePath: string): CachedSource {
+  const resolved = path.resolve(filePath);
+  const stat = fs.statSync(resolved);
+  const cached = cache.get(resolved);
+  if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) {
+    return cached;
+  }
+
+  const text = fs.readFileSync(resolved, "utf-8");
+  const entry: CachedSource = {
+    mtimeMs: stat.mtimeMs,
+    size: stat.size,
+    text,
+    hash: createHash("sha256").update(text).digest("hex"),
+  };
+  cache.set(resolved, entry);
+  return entry;
+}
+
+/** File contents as UTF-8 text (cached until the file's mtime or size changes) */
+export function loadTextSource(filePath: string): string {
+  return load(filePath).text;
+}
+
+/** Parsed JSON contents, parsed once per file version */
+export function loadJsonSource<T>(filePath: string): T {
+  const entry = load(filePath);
+  if (entry.json === undefined) {
+    entry.json = JSON.parse(entry.text);
+  }
+  return entry.json as T;
+}
+
+/** sha256 of one file's contents */
+export function sourceFileHash(filePath: string): string {
+  return load(filePath).hash;
+}
+
+/**
+ * Combined sha256 over several files, independent of argument order.
+ * Missing files hash as "missing" so that a file appearing later changes the result.
+ */
+export function combinedSourceHash(filePaths: readonly string[]): string {
+  const hash = createHash("sha256");
+  for (const filePath of [...filePaths].map((p) => path.resolve(p)).sort()) {
+    const fileHash = fs.existsSync(filePath) ? sourceFileHash(filePath) : "missing";
+    hash.update(`${path.basename(filePath)}:${fileHash}\n`);
+  }
+  return hash.digest("hex");
+}
+
+/** Drop every cached file. For tests and long-lived processes. */
+export function clearSourceCache(): void {
+  cache.clear();
+}
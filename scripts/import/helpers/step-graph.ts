@@ -0,0 +1,125 @@
+// @MX:ANCHOR: [AUTO] Import step DAG scheduler — runs each step as soon as its dependencies have finished
+// @MX:REASON: fan_in >= 3 — orchestrator run, dry-run plan output, incremental skip decisions
+// @MX:NOTE: [AUTO] A failed step blocks its dependents but not independent branches
+
+export interface StepNode {
+  id: string;
+  dependsOn: readonly string[];
+}
+
+/** ran = executed, skipped = unchanged since the last run, failed = threw, blocked = a dependency did not complete */
+export type StepOutcome = "ran" | "skipped" | "failed" | "blocked";
+
+export interface StepRunContext {
+  /** True when at least one dependency ran in this pass (its rows may have new ids or values) */
+  upstreamChanged: boolean;
+}
+
+export interface StepResult {
+  outcome: StepOutcome;
+  durationMs: number;
+  error?: unknown;
+}
+
+/** Throws when ids are duplicated, a dependency is unknown, or the graph has a cycle */
+export function validateStepGraph(steps: readonly StepNode[]): void {
+  const ids = new Set<string>();
+  for (const step of steps) {
+    if (ids.has(step.id)) throw new Error(`Duplicate import step id: ${step.id}`);
+    ids.add(step.id);
+  }
+  for (const step of steps) {
+    for (const dep of step.dependsOn) {
+      if (!ids.has(dep)) throw new Error(`Import step '${step.id}' depends on unknown step '${dep}'`);
+    }
+  }
+  // planWaves only terminates cleanly on an acyclic graph
+  planWaves(steps);
+}
+
+/**
+ * Topological levels: every step in wave n depends only on steps in waves < n.
+ * Steps keep their declaration order within a wave.
+ */
+export function planWaves<T extends StepNode>(steps: readonly T[]): T[][] {
+  const done = new Set<string>();
+  let remaining = [...steps];
+  const waves: T[][] = [];
+
+  while (remaining.length > 0) {
+    const wave = remaining.filter((s) => s.dependsOn.every((d) => done.has(d)));
+    if (wave.length === 0) {
+      throw new Error(`Import step graph has a cycle: ${remaining.map((s) => s.id).join(", ")}`);
+    }
+    for (const s of wave) done.add(s.id);
+    remaining = remaining.filter((s) => !done.has(s.id));
+    waves.push(wave);
+  }
+  return waves;
+}
+
+/**
+ * Run the graph with at most `concurrency` steps in flight.
+ * `run` resolves to "ran" or "skipped"; a throw marks the step failed.
+ */
+export async function runStepGraph<T extends StepNode>(
+  steps: readonly T[],
+  run: (step: T, ctx: StepRunContext) => Promise<"ran" | "skipped">,
+  options: { concurrency?: number } = {},
+): Promise<Map<string, StepResult>> {
+  validateStepGraph(steps);
+  const concurrency = Math.max(1, options.concurrency ?? Infinity);
+  const results = new Map<string, StepResult>();
+  const pending = [...steps];
+  let inFlight = 0;
+
+  return new Promise((resolve) => {
+    const schedule = (): void => {
+      // Resolve blocked steps first so their own dependents are released in the same pass
+      let changed = true;
+      while (changed) {
+        changed = false;
+        for (let i = 0; i < pending.length; i++) {
+          const step = pending[i];
+          const blocked = step.dependsOn.some((d) => {
+            const outcome = results.get(d)?.outcome;
+            return outcome === "failed" || outcome === "blocked";
+          });
+          if (blocked) {
+            results.set(step.id, { outcome: "blocked", durationMs: 0 });
+            pending.splice(i, 1);
+            changed = true;
+            break;
+          }
+        }
+      }
+
+      for (let i = 0; i < pending.length && inFlight < concurrency; ) {
+        const step = pending[i];
+        if (!step.dependsOn.every((d) => results.has(d))) {
+          i++;
+          continue;
+        }
+        pending.splice(i, 1);
+        inFlight++;
+
+        const upstreamChanged = step.dependsOn.some((d) => results.get(d)?.outcome === "ran");
+        const startedAt = Date.now();
+        Promise.resolve()
+          .then(() => run(step, { upstreamChanged }))
+          .then(
+            (outcome) => results.set(step.id, { outcome, durationMs: Date.now() - startedAt }),
+            (error: unknown) => results.set(step.id, { outcome: "failed", durationMs: Date.now() - startedAt, error }),
+          )
+          .finally(() => {
+            inFlight--;
+            schedule();
+          });
+      }
+
+      if (pending.length === 0 && inFlight === 0) resolve(results);
+    };
+
+    schedule();
+  });
+}
@@ -9,6 +9,8 @@ import postgres from "postgres";
 import { sql } from "drizzle-orm";
 import { categories } from "../../packages/shared/src/db/schema/huni-catalog.schema.js";
 import { dataImportLog } from "../../packages/shared/src/db/schema/huni-import-log.schema.js";
+import { upsertBatchSize } from "./helpers/bulk-upsert.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -23,7 +25,7 @@ const VALIDATE_ONLY = args.includes("--validate-only");
 // ---------------------------------------------------------------------------
 
 const LABEL = "[import-categories]";
-const BATCH_SIZE = 50;
+const BATCH_SIZE = upsertBatchSize(categories);
 
 // ---------------------------------------------------------------------------
 // Types
@@ -106,8 +108,7 @@ const CATEGORIES: CategoryRecord[] = [
 function createDb() {
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL not set`);
   }
   const client = postgres(connectionString, { max: 5 });
   return { db: drizzle(client), client };
@@ -156,7 +157,7 @@ async function writeImportLog(
 // Main
 // ---------------------------------------------------------------------------
 
-async function main(): Promise<void> {
+export async function main(): Promise<void> {
   console.log(`${LABEL} Starting category import`);
   console.log(`${LABEL} Total categories: ${CATEGORIES.length}`);
   if (DRY_RUN) console.log(`${LABEL} Mode: dry-run (no DB writes)`);
@@ -167,8 +168,7 @@ async function main(): Promise<void> {
     const codes = new Set(CATEGORIES.map((c) => c.code));
     for (const cat of CATEGORIES) {
       if (cat.parentCode && !codes.has(cat.parentCode)) {
-        console.error(`${LABEL} ERROR: parentCode '${cat.parentCode}' not found for '${cat.code}'`);
-        process.exit(1);
+        throw new ImportStepError(`${LABEL} ERROR: parentCode '${cat.parentCode}' not found for '${cat.code}'`);
       }
     }
     console.log(`${LABEL} Validation OK`);
@@ -302,13 +302,10 @@ async function main(): Promise<void> {
   }
 
   console.log(`${LABEL} Done: inserted=${inserted}, updated=${updated}, errored=${errored}`);
-  if (errored > 0) process.exit(1);
+  if (errored > 0) throw new ImportStepError(`${LABEL} Completed with errors`);
   } finally {
     await client.end();
   }
 }
 
-main().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
@@ -13,6 +13,9 @@ import { products, productSizes, categories } from "../../packages/shared/src/db
 import { papers } from "../../packages/shared/src/db/schema/huni-materials.schema.js";
 import { printModes } from "../../packages/shared/src/db/schema/huni-processes.schema.js";
 import { dataImportLog } from "../../packages/shared/src/db/schema/huni-import-log.schema.js";
+import { upsertBatchSize } from "./helpers/bulk-upsert.js";
+import { loadJsonSource } from "./helpers/source-loader.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -27,7 +30,7 @@ const VALIDATE_ONLY = args.includes("--validate-only");
 // ---------------------------------------------------------------------------
 
 const LABEL = "[import-fixed-prices]";
-const BATCH_SIZE = 50;
+const BATCH_SIZE = upsertBatchSize(fixedPrices);
 const DATA_PATH = path.resolve(
   __dirname,
   "../../ref/huni/extracted/가격표_extracted.json"
@@ -105,8 +108,7 @@ function parseFixedPrices(data: ExtractedData): RawFixedPrice[] {
 function createDb() {
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL not set`);
   }
   const client = postgres(connectionString, { max: 5 });
   return { db: drizzle(client), client };
@@ -155,16 +157,14 @@ async function writeImportLog(
 // Main
 // ---------------------------------------------------------------------------
 
-async function main(): Promise<void> {
+export async function main(): Promise<void> {
   console.log(`${LABEL} Starting fixed prices import (명함 sheet)`);
 
   if (!fs.existsSync(DATA_PATH)) {
-    console.error(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
   }
 
-  const rawData = fs.readFileSync(DATA_PATH, "utf-8");
-  const data: ExtractedData = JSON.parse(rawData);
+  const data = loadJsonSource<ExtractedData>(DATA_PATH);
 
   const rawPrices = parseFixedPrices(data);
   console.log(`${LABEL} Parsed ${rawPrices.length} raw fixed price records`);
@@ -172,8 +172,7 @@ async function main(): Promise<void> {
   if (VALIDATE_ONLY) {
     console.log(`${LABEL} Mode: validate-only`);
     if (rawPrices.length === 0) {
-      console.error(`${LABEL} ERROR: No fixed prices found`);
-      process.exit(1);
+      throw new ImportStepError(`${LABEL} ERROR: No fixed prices found`);
     }
     console.log(`${LABEL} Validation OK`);
     return;
@@ -340,10 +339,7 @@ async function main(): Promise<void> {
   await client.end();
 
   console.log(`${LABEL} Done: inserted=${inserted}, skipped=${skipped}, errored=${errored}`);
-  if (errored > 0) process.exit(1);
+  if (errored > 0) throw new ImportStepError(`${LABEL} Completed with errors`);
 }
 
-main().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
@@ -10,6 +10,9 @@ import postgres from "postgres";
 import { sql } from "drizzle-orm";
 import { foilPrices } from "../../packages/shared/src/db/schema/huni-pricing.schema.js";
 import { dataImportLog } from "../../packages/shared/src/db/schema/huni-import-log.schema.js";
+import { upsertBatchSize } from "./helpers/bulk-upsert.js";
+import { loadJsonSource } from "./helpers/source-loader.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -24,7 +27,7 @@ const VALIDATE_ONLY = args.includes("--validate-only");
 // ---------------------------------------------------------------------------
 
 const LABEL = "[import-foil-prices]";
-const BATCH_SIZE = 50;
+const BATCH_SIZE = upsertBatchSize(foilPrices);
 const DATA_PATH = path.resolve(
   __dirname,
   "../../ref/huni/extracted/가격표_extracted.json"
@@ -282,8 +285,7 @@ function parseFoilPrices(data: ExtractedData): FoilPriceRow[] {
 function createDb() {
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL not set`);
   }
   const client = postgres(connectionString, { max: 5 });
   return { db: drizzle(client), client };
@@ -332,16 +334,14 @@ async function writeImportLog(
 // Main
 // ---------------------------------------------------------------------------
 
-async function main(): Promise<void> {
+export async function main(): Promise<void> {
   console.log(`${LABEL} Starting foil prices import (후가공_박 sheet)`);
 
   if (!fs.existsSync(DATA_PATH)) {
-    console.error(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
   }
 
-  const rawData = fs.readFileSync(DATA_PATH, "utf-8");
-  const data: ExtractedData = JSON.parse(rawData);
+  const data = loadJsonSource<ExtractedData>(DATA_PATH);
 
   const foilRows = parseFoilPrices(data);
   console.log(`${LABEL} Parsed ${foilRows.length} foil price records`);
@@ -349,8 +349,7 @@ async function main(): Promise<void> {
   if (VALIDATE_ONLY) {
     console.log(`${LABEL} Mode: validate-only`);
     if (foilRows.length === 0) {
-      console.error(`${LABEL} ERROR: No foil prices found`);
-      process.exit(1);
+      throw new ImportStepError(`${LABEL} ERROR: No foil prices found`);
     }
     console.log(`${LABEL} Validation OK`);
     return;
@@ -410,10 +409,7 @@ async function main(): Promise<void> {
   await client.end();
 
   console.log(`${LABEL} Done: inserted=${inserted}, errored=${errored}`);
-  if (errored > 0) process.exit(1);
+  if (errored > 0) throw new ImportStepError(`${LABEL} Completed with errors`);
 }
 
-main().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
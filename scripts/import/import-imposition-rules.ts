@@ -9,6 +9,9 @@ import postgres from "postgres";
 import { sql } from "drizzle-orm";
 import { impositionRules } from "../../packages/shared/src/db/schema/huni-processes.schema.js";
 import { dataImportLog } from "../../packages/shared/src/db/schema/huni-import-log.schema.js";
+import { upsertBatchSize } from "./helpers/bulk-upsert.js";
+import { loadJsonSource } from "./helpers/source-loader.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -23,7 +26,7 @@ const VALIDATE_ONLY = args.includes("--validate-only");
 // ---------------------------------------------------------------------------
 
 const LABEL = "[import-imposition-rules]";
-const BATCH_SIZE = 50;
+const BATCH_SIZE = upsertBatchSize(impositionRules);
 const DATA_PATH = path.resolve(
   __dirname,
   "../../ref/huni/extracted/가격표_extracted.json"
@@ -150,8 +153,7 @@ function parseImpositionSheet(data: ExtractedData): ImpositionRecord[] {
 function createDb() {
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL not set`);
   }
   const client = postgres(connectionString, { max: 5 });
   return { db: drizzle(client), client };
@@ -200,16 +202,14 @@ async function writeImportLog(
 // Main
 // ---------------------------------------------------------------------------
 
-async function main(): Promise<void> {
+export async function main(): Promise<void> {
   console.log(`${LABEL} Starting imposition rules import`);
 
   if (!fs.existsSync(DATA_PATH)) {
-    console.error(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
   }
 
-  const rawData = fs.readFileSync(DATA_PATH, "utf-8");
-  const data: ExtractedData = JSON.parse(rawData);
+  const data = loadJsonSource<ExtractedData>(DATA_PATH);
 
   // @MX:NOTE: [AUTO] Dedup by conflict target before batching — prevents "ON CONFLICT DO UPDATE cannot affect row a second time"
   const rawRecords = parseImpositionSheet(data);
@@ -229,8 +229,7 @@ async function main(): Promise<void> {
     console.log(`${LABEL} Mode: validate-only`);
     for (const r of records) {
       if (!r.cutWidth || !r.cutHeight || !r.impositionCount) {
-        console.error(`${LABEL} ERROR: Invalid record: ${JSON.stringify(r)}`);
-        process.exit(1);
+        throw new ImportStepError(`${LABEL} ERROR: Invalid record: ${JSON.stringify(r)}`);
       }
     }
     console.log(`${LABEL} Validation OK`);
@@ -302,13 +301,10 @@ async function main(): Promise<void> {
   });
 
   console.log(`${LABEL} Done: inserted=${inserted}, errored=${errored}`);
-  if (errored > 0) process.exit(1);
+  if (errored > 0) throw new ImportStepError(`${LABEL} Completed with errors`);
   } finally {
     await client.end();
   }
 }
 
-main().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
@@ -8,6 +8,7 @@ import postgres from "postgres";
 import { sql } from "drizzle-orm";
 import { lossQuantityConfigs } from "../../packages/shared/src/db/schema/huni-pricing.schema.js";
 import { dataImportLog } from "../../packages/shared/src/db/schema/huni-import-log.schema.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -46,8 +47,7 @@ const DEFAULT_LOSS_CONFIGS = [
 function createDb() {
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL not set`);
   }
   const client = postgres(connectionString, { max: 5 });
   return { db: drizzle(client), client };
@@ -96,7 +96,7 @@ async function writeImportLog(
 // Main
 // ---------------------------------------------------------------------------
 
-async function main(): Promise<void> {
+export async function main(): Promise<void> {
   console.log(`${LABEL} Starting loss quantity config import`);
   console.log(`${LABEL} Records to insert: ${DEFAULT_LOSS_CONFIGS.length}`);
 
@@ -158,10 +158,7 @@ async function main(): Promise<void> {
   await client.end();
 
   console.log(`${LABEL} Done: inserted=${inserted}, updated=${updated}, errored=${errored}`);
-  if (errored > 0) process.exit(1);
+  if (errored > 0) throw new ImportStepError(`${LABEL} Completed with errors`);
 }
 
-main().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
@@ -8,6 +8,9 @@ import { drizzle } from "drizzle-orm/postgres-js";
 import postgres from "postgres";
 import { sql } from "drizzle-orm";
 import { mesItems } from "../../packages/shared/src/db/schema/huni-integration.schema.js";
+import { upsertBatchSize } from "./helpers/bulk-upsert.js";
+import { loadTextSource } from "./helpers/source-loader.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // Types
@@ -32,7 +35,7 @@ interface ParsedSheet {
 // @MX:REASON: The TOON format is a compact pipe-delimited representation of Excel sheets
 
 function parseToon(filePath: string): Map<string, ParsedSheet> {
-  const content = fs.readFileSync(filePath, "utf-8");
+  const content = loadTextSource(filePath);
   const lines = content.split("\n");
 
   const sheets = new Map<string, ParsedSheet>();
@@ -105,9 +108,9 @@ function parseIsActive(value: string): boolean {
 // ---------------------------------------------------------------------------
 
 const LABEL = "[import-mes-items]";
-const BATCH_SIZE = 100;
+const BATCH_SIZE = upsertBatchSize(mesItems);
 
-async function run(): Promise<void> {
+export async function main(): Promise<void> {
   const toonPath = path.resolve(
     __dirname,
     "../../ref/huni/toon/item-management.toon"
@@ -116,8 +119,7 @@ async function run(): Promise<void> {
   console.log(`${LABEL} Reading TOON file: ref/huni/toon/item-management.toon`);
 
   if (!fs.existsSync(toonPath)) {
-    console.error(`${LABEL} ERROR: TOON file not found at ${toonPath}`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: TOON file not found at ${toonPath}`);
   }
 
   // Parse TOON
@@ -125,9 +127,8 @@ async function run(): Promise<void> {
   const sheet = sheets.get("Sheet");
 
   if (!sheet) {
-    console.error(`${LABEL} ERROR: Sheet named "Sheet" not found in TOON file`);
     console.error(`${LABEL} Available sheets: ${Array.from(sheets.keys()).join(", ")}`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: Sheet named "Sheet" not found in TOON file`);
   }
 
   console.log(`${LABEL} Parsing Sheet (${sheet.rows.length} rows)...`);
@@ -135,8 +136,7 @@ async function run(): Promise<void> {
   // Build database connection
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL environment variable is not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL environment variable is not set`);
   }
 
   const client = postgres(connectionString, { max: 5 });
@@ -287,11 +287,8 @@ async function run(): Promise<void> {
     for (const e of errors) {
       console.error(`  - ${e}`);
     }
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} Completed with errors`);
   }
 }
 
-run().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
@@ -9,6 +9,8 @@ import {
   optionDefinitions,
   optionChoices,
 } from "../../packages/shared/src/db/schema/huni-options.schema.js";
+import { upsertBatchSize } from "./helpers/bulk-upsert.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -23,7 +25,7 @@ const VALIDATE_ONLY = args.includes("--validate-only");
 // ---------------------------------------------------------------------------
 
 const LABEL = "[import-options]";
-const BATCH_SIZE = 50;
+const BATCH_SIZE = upsertBatchSize(optionDefinitions, optionChoices);
 
 // ---------------------------------------------------------------------------
 // Types
@@ -2798,7 +2800,7 @@ async function importOptionChoices(
 // Main
 // ---------------------------------------------------------------------------
 
-async function main(): Promise<void> {
+export async function main(): Promise<void> {
   console.log(
     `${LABEL} Starting option definitions + choices import${DRY_RUN ? " (DRY RUN)" : ""}${VALIDATE_ONLY ? " (VALIDATE ONLY)" : ""}...`
   );
@@ -2812,7 +2814,7 @@ async function main(): Promise<void> {
     for (const err of validation.errors) {
       console.error(`  - ${err}`);
     }
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} Validation FAILED`);
   }
 
   console.log(
@@ -2827,8 +2829,7 @@ async function main(): Promise<void> {
   // Step 2: Connect to DB
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL environment variable is not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL environment variable is not set`);
   }
 
   const client = DRY_RUN ? null : postgres(connectionString, { max: 5 });
@@ -2844,9 +2845,8 @@ async function main(): Promise<void> {
   );
 
   if (defResult.errors.length > 0 && !DRY_RUN) {
-    console.error(`${LABEL} Aborting choices import due to definition errors.`);
     await client?.end();
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} Aborting choices import due to definition errors.`);
   }
 
   // Step 4: Import option_choices (depends on option_definitions being in DB)
@@ -2865,12 +2865,8 @@ async function main(): Promise<void> {
 
   const totalErrors = defResult.errors.length + choiceResult.errors.length;
   if (totalErrors > 0) {
-    console.error(`${LABEL} Completed with ${totalErrors} error(s).`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} Completed with ${totalErrors} error(s).`);
   }
 }
 
-main().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
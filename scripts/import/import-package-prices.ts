@@ -12,6 +12,9 @@ import { packagePrices } from "../../packages/shared/src/db/schema/huni-pricing.
 import { products, productSizes } from "../../packages/shared/src/db/schema/huni-catalog.schema.js";
 import { printModes } from "../../packages/shared/src/db/schema/huni-processes.schema.js";
 import { dataImportLog } from "../../packages/shared/src/db/schema/huni-import-log.schema.js";
+import { upsertBatchSize } from "./helpers/bulk-upsert.js";
+import { loadJsonSource } from "./helpers/source-loader.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -26,7 +29,7 @@ const VALIDATE_ONLY = args.includes("--validate-only");
 // ---------------------------------------------------------------------------
 
 const LABEL = "[import-package-prices]";
-const BATCH_SIZE = 50;
+const BATCH_SIZE = upsertBatchSize(packagePrices);
 const DATA_PATH = path.resolve(
   __dirname,
   "../../ref/huni/extracted/가격표_extracted.json"
@@ -183,8 +186,7 @@ function parsePackagePrices(data: ExtractedData): PackagePriceRow[] {
 function createDb() {
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL not set`);
   }
   const client = postgres(connectionString, { max: 5 });
   return { db: drizzle(client), client };
@@ -233,16 +235,14 @@ async function writeImportLog(
 // Main
 // ---------------------------------------------------------------------------
 
-async function main(): Promise<void> {
+export async function main(): Promise<void> {
   console.log(`${LABEL} Starting package prices import (옵션결합상품 sheet)`);
 
   if (!fs.existsSync(DATA_PATH)) {
-    console.error(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
   }
 
-  const rawData = fs.readFileSync(DATA_PATH, "utf-8");
-  const data: ExtractedData = JSON.parse(rawData);
+  const data = loadJsonSource<ExtractedData>(DATA_PATH);
 
   const rawPrices = parsePackagePrices(data);
   console.log(`${LABEL} Parsed ${rawPrices.length} package price records`);
@@ -250,8 +250,7 @@ async function main(): Promise<void> {
   if (VALIDATE_ONLY) {
     console.log(`${LABEL} Mode: validate-only`);
     if (rawPrices.length === 0) {
-      console.error(`${LABEL} ERROR: No package prices found`);
-      process.exit(1);
+      throw new ImportStepError(`${LABEL} ERROR: No package prices found`);
     }
     console.log(`${LABEL} Validation OK`);
     return;
@@ -391,10 +390,7 @@ async function main(): Promise<void> {
   await client.end();
 
   console.log(`${LABEL} Done: inserted=${inserted}, skipped=${skipped}, errored=${errored}`);
-  if (errored > 0) process.exit(1);
+  if (errored > 0) throw new ImportStepError(`${LABEL} Completed with errors`);
 }
 
-main().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
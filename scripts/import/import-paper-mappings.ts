@@ -11,6 +11,9 @@ import { generatePaperCode } from "./helpers/code-generators.js";
 import { papers, paperProductMappings } from "../../packages/shared/src/db/schema/huni-materials.schema.js";
 import { products } from "../../packages/shared/src/db/schema/huni-catalog.schema.js";
 import { dataImportLog } from "../../packages/shared/src/db/schema/huni-import-log.schema.js";
+import { upsertBatchSize } from "./helpers/bulk-upsert.js";
+import { loadJsonSource } from "./helpers/source-loader.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -25,7 +28,7 @@ const VALIDATE_ONLY = args.includes("--validate-only");
 // ---------------------------------------------------------------------------
 
 const LABEL = "[import-paper-mappings]";
-const BATCH_SIZE = 50;
+const BATCH_SIZE = upsertBatchSize(paperProductMappings);
 const DATA_PATH = path.resolve(
   __dirname,
   "../../ref/huni/extracted/출력소재관리_extracted.json"
@@ -158,8 +161,7 @@ function parsePaperMappings(data: ExtractedData): { paperCode: string; paperName
 function createDb() {
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL not set`);
   }
   const client = postgres(connectionString, { max: 5 });
   return { db: drizzle(client), client };
@@ -208,16 +210,14 @@ async function writeImportLog(
 // Main
 // ---------------------------------------------------------------------------
 
-async function main(): Promise<void> {
+export async function main(): Promise<void> {
   console.log(`${LABEL} Starting paper-product mapping import`);
 
   if (!fs.existsSync(DATA_PATH)) {
-    console.error(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
   }
 
-  const rawData = fs.readFileSync(DATA_PATH, "utf-8");
-  const data: ExtractedData = JSON.parse(rawData);
+  const data = loadJsonSource<ExtractedData>(DATA_PATH);
 
   const parsedMappings = parsePaperMappings(data);
   console.log(`${LABEL} Parsed ${parsedMappings.length} papers with product mappings`);
@@ -364,13 +364,10 @@ async function main(): Promise<void> {
   });
 
   console.log(`${LABEL} Done: inserted=${inserted}, skipped=${skipped}, errored=${errored}`);
-  if (errored > 0) process.exit(1);
+  if (errored > 0) throw new ImportStepError(`${LABEL} Completed with errors`);
   } finally {
     await client.end();
   }
 }
 
-main().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
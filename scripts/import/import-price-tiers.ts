@@ -10,6 +10,9 @@ import postgres from "postgres";
 import { sql } from "drizzle-orm";
 import { priceTables, priceTiers } from "../../packages/shared/src/db/schema/huni-pricing.schema.js";
 import { dataImportLog } from "../../packages/shared/src/db/schema/huni-import-log.schema.js";
+import { upsertBatchSize } from "./helpers/bulk-upsert.js";
+import { loadJsonSource } from "./helpers/source-loader.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -24,7 +27,7 @@ const VALIDATE_ONLY = args.includes("--validate-only");
 // ---------------------------------------------------------------------------
 
 const LABEL = "[import-price-tiers]";
-const BATCH_SIZE = 50;
+const BATCH_SIZE = upsertBatchSize(priceTiers);
 const DATA_PATH = path.resolve(
   __dirname,
   "../../ref/huni/extracted/가격표_extracted.json"
@@ -247,8 +250,7 @@ function parsePostprocessPriceTiers(data: ExtractedData): PriceTierRow[] {
 function createDb() {
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL not set`);
   }
   const client = postgres(connectionString, { max: 5 });
   return { db: drizzle(client), client };
@@ -297,16 +299,14 @@ async function writeImportLog(
 // Main
 // ---------------------------------------------------------------------------
 
-async function main(): Promise<void> {
+export async function main(): Promise<void> {
   console.log(`${LABEL} Starting price tiers import`);
 
   if (!fs.existsSync(DATA_PATH)) {
-    console.error(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
   }
 
-  const rawData = fs.readFileSync(DATA_PATH, "utf-8");
-  const data: ExtractedData = JSON.parse(rawData);
+  const data = loadJsonSource<ExtractedData>(DATA_PATH);
 
   const digitalTiers = parseDigitalPriceTiers(data);
   const postprocessTiers = parsePostprocessPriceTiers(data);
@@ -317,12 +317,10 @@ async function main(): Promise<void> {
   if (VALIDATE_ONLY) {
     console.log(`${LABEL} Mode: validate-only`);
     if (digitalTiers.length === 0) {
-      console.error(`${LABEL} ERROR: No digital price tiers found`);
-      process.exit(1);
+      throw new ImportStepError(`${LABEL} ERROR: No digital price tiers found`);
     }
     if (postprocessTiers.length === 0) {
-      console.error(`${LABEL} ERROR: No postprocess price tiers found`);
-      process.exit(1);
+      throw new ImportStepError(`${LABEL} ERROR: No postprocess price tiers found`);
     }
     console.log(`${LABEL} Validation OK`);
     return;
@@ -340,6 +338,7 @@ async function main(): Promise<void> {
   console.log(`${LABEL} Inserting ${PRICE_TABLE_DEFS.length} price tables...`);
   let tablesInserted = 0;
   let tablesErrored = 0;
+  let tiersFailed = false;
   try {
     const result = await db
       .insert(priceTables)
@@ -410,7 +409,7 @@ async function main(): Promise<void> {
     });
 
     console.log(`${LABEL} Done: tables=${tablesInserted}, tiers=${tiersInserted}`);
-    if (tiersErrored > 0) process.exit(1);
+    tiersFailed = tiersErrored > 0;
 
   } catch (err) {
     console.error(`${LABEL} ERROR inserting price tables:`, err);
@@ -427,7 +426,7 @@ async function main(): Promise<void> {
       startedAt,
     });
     await client.end();
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} Completed with errors`);
   }
 
   await writeImportLog(db, {
@@ -442,9 +441,7 @@ async function main(): Promise<void> {
   });
 
   await client.end();
+  if (tiersFailed) throw new ImportStepError(`${LABEL} Completed with errors`);
 }
 
-main().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
@@ -13,6 +13,7 @@ import {
   bindings,
 } from "../../packages/shared/src/db/schema/huni-processes.schema.js";
 import { dataImportLog } from "../../packages/shared/src/db/schema/huni-import-log.schema.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -145,8 +146,7 @@ const BINDINGS = [
 function createDb() {
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL not set`);
   }
   const client = postgres(connectionString, { max: 5 });
   return { db: drizzle(client), client };
@@ -195,7 +195,7 @@ async function writeImportLog(
 // Main
 // ---------------------------------------------------------------------------
 
-async function main(): Promise<void> {
+export async function main(): Promise<void> {
   console.log(`${LABEL} Starting process definitions import`);
   console.log(`${LABEL} Print modes: ${PRINT_MODES.length}, Post-processes: ${POST_PROCESSES.length}, Bindings: ${BINDINGS.length}`);
 
@@ -203,13 +203,11 @@ async function main(): Promise<void> {
     console.log(`${LABEL} Mode: validate-only`);
     const codes = new Set(PRINT_MODES.map((m) => m.code));
     if (codes.size !== PRINT_MODES.length) {
-      console.error(`${LABEL} ERROR: Duplicate print mode codes detected`);
-      process.exit(1);
+      throw new ImportStepError(`${LABEL} ERROR: Duplicate print mode codes detected`);
     }
     const ppCodes = new Set(POST_PROCESSES.map((p) => p.code));
     if (ppCodes.size !== POST_PROCESSES.length) {
-      console.error(`${LABEL} ERROR: Duplicate post-process codes detected`);
-      process.exit(1);
+      throw new ImportStepError(`${LABEL} ERROR: Duplicate post-process codes detected`);
     }
     console.log(`${LABEL} Validation OK`);
     return;
@@ -348,14 +346,11 @@ async function main(): Promise<void> {
   console.log(`${LABEL} Done: print_modes=${pmInserted}, post_processes=${ppInserted}, bindings=${bindInserted}`);
 
   if (totalErrored > 0 || ppErrored > 0 || bindErrored > 0) {
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} Completed with errors`);
   }
   } finally {
     await client.end();
   }
 }
 
-main().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
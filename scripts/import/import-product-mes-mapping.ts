@@ -10,6 +10,9 @@ import { sql, eq } from "drizzle-orm";
 import { products } from "../../packages/shared/src/db/schema/huni-catalog.schema.js";
 import { mesItems, productMesMappings } from "../../packages/shared/src/db/schema/huni-integration.schema.js";
 import { dataImportLog } from "../../packages/shared/src/db/schema/huni-import-log.schema.js";
+import { upsertBatchSize } from "./helpers/bulk-upsert.js";
+import { loadJsonSource } from "./helpers/source-loader.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -24,7 +27,7 @@ const VALIDATE_ONLY = args.includes("--validate-only");
 // ---------------------------------------------------------------------------
 
 const LABEL = "[import-product-mes-mapping]";
-const BATCH_SIZE = 50;
+const BATCH_SIZE = upsertBatchSize(productMesMappings);
 const DATA_PATH = path.resolve(
   __dirname,
   "../../ref/huni/extracted/상품마스터_extracted.json"
@@ -127,8 +130,7 @@ function parseProductSheets(data: ExtractedData): MappingRecord[] {
 function createDb() {
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL not set`);
   }
   const client = postgres(connectionString, { max: 5 });
   return { db: drizzle(client), client };
@@ -179,16 +181,14 @@ async function writeImportLog(
 
 // @MX:ANCHOR: [AUTO] Main product-MES mapping import -- populates product<->MES mapping table
 // @MX:REASON: fan_in >= 3 -- called by pipeline orchestrator, referenced by order dispatch and widget initialization
-async function main(): Promise<void> {
+export async function main(): Promise<void> {
   console.log(`${LABEL} Starting product-MES mapping import`);
 
   if (!fs.existsSync(DATA_PATH)) {
-    console.error(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
   }
 
-  const rawData = fs.readFileSync(DATA_PATH, "utf-8");
-  const data: ExtractedData = JSON.parse(rawData);
+  const data = loadJsonSource<ExtractedData>(DATA_PATH);
 
   const allRecords = parseProductSheets(data);
   const recordsWithMes = allRecords;  // already filtered to mesCode-only rows
@@ -336,14 +336,11 @@ async function main(): Promise<void> {
     });
 
     if (errored > 0) {
-      process.exit(1);
+      throw new ImportStepError(`${LABEL} Completed with errors`);
     }
   } finally {
     await client.end();
   }
 }
 
-main().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
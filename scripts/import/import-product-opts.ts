@@ -15,6 +15,9 @@ import {
   categories,
   products,
 } from "../../packages/shared/src/db/schema/huni-catalog.schema.js";
+import { upsertBatchSize } from "./helpers/bulk-upsert.js";
+import { loadJsonSource } from "./helpers/source-loader.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -29,7 +32,7 @@ const VALIDATE_ONLY = args.includes("--validate-only");
 // ---------------------------------------------------------------------------
 
 const LABEL = "[import-product-opts]";
-const BATCH_SIZE = 50;
+const BATCH_SIZE = upsertBatchSize(productOptions);
 
 // ---------------------------------------------------------------------------
 // Types
@@ -361,7 +364,7 @@ async function upsertProductOptionsBatch(
 // Main Run
 // ---------------------------------------------------------------------------
 
-async function run(): Promise<void> {
+export async function main(): Promise<void> {
   if (DRY_RUN) {
     console.log(`${LABEL} DRY RUN mode — no database writes`);
   }
@@ -371,8 +374,7 @@ async function run(): Promise<void> {
 
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL environment variable is not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL environment variable is not set`);
   }
 
   const client = postgres(connectionString, { max: 5 });
@@ -567,8 +569,7 @@ async function run(): Promise<void> {
 
   let jsonData: { sheets: JsonSheet[] };
   try {
-    const raw = fs.readFileSync(jsonPath, "utf-8");
-    jsonData = JSON.parse(raw) as { sheets: JsonSheet[] };
+    jsonData = loadJsonSource<{ sheets: JsonSheet[] }>(jsonPath);
   } catch (err) {
     const message = err instanceof Error ? err.message : String(err);
     console.error(
@@ -684,11 +685,8 @@ async function run(): Promise<void> {
     for (const e of totalErrors) {
       console.error(`  - ${e}`);
     }
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} Completed with errors`);
   }
 }
 
-run().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
@@ -9,6 +9,9 @@ import postgres from "postgres";
 import { sql, eq } from "drizzle-orm";
 import { categories, products, productSizes } from "../../packages/shared/src/db/schema/huni-catalog.schema.js";
 import { dataImportLog } from "../../packages/shared/src/db/schema/huni-import-log.schema.js";
+import { upsertBatchSize, chunkRows } from "./helpers/bulk-upsert.js";
+import { loadJsonSource } from "./helpers/source-loader.js";
+import { ImportStepError, runIfEntryPoint } from "./helpers/run-script.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -23,7 +26,7 @@ const VALIDATE_ONLY = args.includes("--validate-only");
 // ---------------------------------------------------------------------------
 
 const LABEL = "[import-products]";
-const BATCH_SIZE = 50;
+const BATCH_SIZE = upsertBatchSize(products, productSizes);
 const DATA_PATH = path.resolve(
   __dirname,
   "../../ref/huni/extracted/상품마스터_extracted.json"
@@ -287,8 +290,7 @@ function parseProducts(data: ExtractedData): ProductRecord[] {
 function createDb() {
   const connectionString = process.env.DATABASE_URL;
   if (!connectionString) {
-    console.error(`${LABEL} ERROR: DATABASE_URL not set`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: DATABASE_URL not set`);
   }
   const client = postgres(connectionString, { max: 5 });
   return { db: drizzle(client), client };
@@ -337,17 +339,15 @@ async function writeImportLog(
 // Main
 // ---------------------------------------------------------------------------
 
-async function main(): Promise<void> {
+export async function main(): Promise<void> {
   console.log(`${LABEL} Starting product master import`);
 
   // Load JSON data
   if (!fs.existsSync(DATA_PATH)) {
-    console.error(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} ERROR: Data file not found: ${DATA_PATH}`);
   }
 
-  const rawData = fs.readFileSync(DATA_PATH, "utf-8");
-  const data: ExtractedData = JSON.parse(rawData);
+  const data = loadJsonSource<ExtractedData>(DATA_PATH);
 
   // @MX:NOTE: [AUTO] Dedup by huniId or name+sheet before batching — prevents "ON CONFLICT DO UPDATE cannot affect row a second time"
   // @MX:SPEC: SPEC-IM-004 M2-006
@@ -370,8 +370,7 @@ async function main(): Promise<void> {
     for (const p of allProducts) {
       sizeCount += p.sizes.length;
       if (!p.name) {
-        console.error(`${LABEL} ERROR: Product missing name: ${JSON.stringify(p)}`);
-        process.exit(1);
+        throw new ImportStepError(`${LABEL} ERROR: Product missing name: ${JSON.stringify(p)}`);
       }
     }
     console.log(`${LABEL} Total sizes: ${sizeCount}`);
@@ -492,6 +491,21 @@ async function main(): Promise<void> {
   // Insert product sizes
   console.log(`${LABEL} Inserting product sizes...`);
   let sizeDisplayOrder = 0;
+  type SizeRow = {
+    productId: number;
+    code: string;
+    displayName: string;
+    cutWidth: string | null;
+    cutHeight: string | null;
+    workWidth: string | null;
+    workHeight: string | null;
+    bleed: string | null;
+    impositionCount: number | null;
+    sheetStandard: string | null;
+    displayOrder: number;
+    isCustom: boolean;
+  };
+  const sizeDedup = new Map<string, SizeRow>();
 
   for (const product of allProducts) {
     const slug = buildSlug(product.name, product.huniId, product.mesCode);
@@ -527,39 +541,38 @@ async function main(): Promise<void> {
       };
     });
 
-    // @MX:NOTE: [AUTO] Dedup sizes by code within each product — prevents within-batch UPSERT conflict
-    const sizeDedup = new Map<string, (typeof rawSizeRows)[number]>();
+    // @MX:NOTE: [AUTO] Dedup sizes by (product, code) — prevents within-batch UPSERT conflict
     for (const s of rawSizeRows) {
-      sizeDedup.set(s.code, s);
+      sizeDedup.set(`${s.productId}:${s.code}`, s);
     }
-    const sizeRows = [...sizeDedup.values()];
-
-    for (let i = 0; i < sizeRows.length; i += BATCH_SIZE) {
-      const batch = sizeRows.slice(i, i + BATCH_SIZE);
-      try {
-        const result = await db
-          .insert(productSizes)
-          .values(batch)
-          .onConflictDoUpdate({
-            target: [productSizes.productId, productSizes.code],
-            set: {
-              displayName: sql`excluded.display_name`,
-              cutWidth: sql`excluded.cut_width`,
-              cutHeight: sql`excluded.cut_height`,
-              workWidth: sql`excluded.work_width`,
-              workHeight: sql`excluded.work_height`,
-              bleed: sql`excluded.bleed`,
-              impositionCount: sql`excluded.imposition_count`,
-              sheetStandard: sql`excluded.sheet_standard`,
-              updatedAt: sql`now()`,
-            },
-          })
-          .returning({ id: productSizes.id });
-        sizesInserted += result.length;
-      } catch (err) {
-        console.error(`${LABEL} ERROR inserting sizes for product '${product.name}':`, err);
-        sizesErrored += batch.length;
-      }
+  }
+
+  // @MX:NOTE: [AUTO] Sizes of all products go out in shared multi-row upserts, not one statement per product
+  const sizeRows = [...sizeDedup.values()];
+  for (const batch of chunkRows(sizeRows, BATCH_SIZE)) {
+    try {
+      const result = await db
+        .insert(productSizes)
+        .values(batch)
+        .onConflictDoUpdate({
+          target: [productSizes.productId, productSizes.code],
+          set: {
+            displayName: sql`excluded.display_name`,
+            cutWidth: sql`excluded.cut_width`,
+            cutHeight: sql`excluded.cut_height`,
+            workWidth: sql`excluded.work_width`,
+            workHeight: sql`excluded.work_height`,
+            bleed: sql`excluded.bleed`,
+            impositionCount: sql`excluded.imposition_count`,
+            sheetStandard: sql`excluded.sheet_standard`,
+            updatedAt: sql`now()`,
+          },
+        })
+        .returning({ id: productSizes.id });
+      sizesInserted += result.length;
+    } catch (err) {
+      console.error(`${LABEL} ERROR inserting size batch (${batch.length} sizes):`, err);
+      sizesErrored += batch.length;
     }
   }
 
@@ -596,14 +609,11 @@ async function main(): Promise<void> {
   console.log(`${LABEL} Done: products=${productsInserted}, sizes=${sizesInserted}`);
 
   if (productsErrored > 0 || sizesErrored > 0) {
-    process.exit(1);
+    throw new ImportStepError(`${LABEL} Completed with errors`);
   }
   } finally {
     await client.end();
   }
 }
 
-main().catch((err) => {
-  console.error(`${LABEL} Fatal error:`, err);
-  process.exit(1);
-});
+runIfEntryPoint(module, LABEL, main);
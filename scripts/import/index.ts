@@ -1,9 +1,23 @@
-// @MX:NOTE: [AUTO] Master import orchestrator — runs all HuniPrinting data imports in sequence
-// @MX:NOTE: [AUTO] Supports --dry-run and --validate-only flags (passed through to child scripts via env)
+// @MX:NOTE: [AUTO] Master import orchestrator — runs all HuniPrinting data imports as an in-process dependency DAG
+// @MX:NOTE: [AUTO] Supports --dry-run and --validate-only (print the plan only), --incremental and --concurrency=N
 // @MX:REASON: Single entry point for db:import; allows full re-seeding of master data in one command
 
-import { spawnSync } from "child_process";
 import * as path from "path";
+import { drizzle } from "drizzle-orm/postgres-js";
+import postgres from "postgres";
+import { planWaves, runStepGraph } from "./helpers/step-graph.js";
+import type { StepResult } from "./helpers/step-graph.js";
+import {
+  isUnchanged,
+  lastStepState,
+  recordStepState,
+  stepSourceHash,
+  tableChecksum,
+} from "./helpers/import-state.js";
+import type { StepState, TrackedStep } from "./helpers/import-state.js";
+import type { ImportStepModule } from "./helpers/run-script.js";
+import { STEPS } from "./steps.js";
+import type { ImportStep } from "./steps.js";
 
 // ---------------------------------------------------------------------------
 // CLI Flags
@@ -12,94 +26,10 @@ import * as path from "path";
 const args = process.argv.slice(2);
 const isDryRun = args.includes("--dry-run");
 const isValidateOnly = args.includes("--validate-only");
-
-// ---------------------------------------------------------------------------
-// Import Steps
-// ---------------------------------------------------------------------------
-
-interface ImportStep {
-  name: string;
-  script: string;
-}
-
-// @MX:NOTE: [AUTO] Import order matters — 15-step sequence with FK dependencies (SPEC-IM-004: +Step 4.5)
-// @MX:NOTE: [AUTO] M0: Foundation (Steps 1-2): MES Items, Papers
-// @MX:NOTE: [AUTO] M1: Catalog (Steps 3-4): Categories → Products
-// @MX:NOTE: [AUTO] M3-NEW: Product-MES Mapping (Step 4.5): product<->MES cross-reference
-// @MX:NOTE: [AUTO] M2: Manufacturing (Steps 5-7): Processes → Options → Product Options
-// @MX:NOTE: [AUTO] M2b: Production rules (Steps 8-9): Imposition Rules → Paper Mappings
-// @MX:NOTE: [AUTO] M3: Pricing (Steps 10-13): Price Tiers → Fixed Prices → Package Prices → Foil Prices
-// @MX:NOTE: [AUTO] M4: Configuration (Step 14): Loss Config
-// @MX:REASON: FK dependency order: categories → products; products+categories → product-opts; processes → options; papers → paper_product_mapping; price_tables → price_tiers; products+papers+print_modes → fixed/package prices
-const STEPS: ImportStep[] = [
-  // M0: Foundation layer (Steps 1-2)
-  {
-    name: "MES Items (item-management.toon)",
-    script: "import-mes-items.ts",
-  },
-  {
-    name: "Papers (출력소재관리_extracted.json → !출력소재)",
-    script: "import-papers.ts",
-  },
-  // M1: Catalog layer (Steps 3-4)
-  {
-    name: "Categories (hardcoded 12 roots + ~36 subs)",
-    script: "import-categories.ts",
-  },
-  {
-    name: "Products (상품마스터_extracted.json → 11 sheets)",
-    script: "import-products.ts",
-  },
-  // Step 4.5: Product-MES Mapping (SPEC-IM-004 M3)
-  {
-    name: "Product-MES Mapping (상품마스터_extracted.json mesCode cross-reference)",
-    script: "import-product-mes-mapping.ts",
-  },
-  // M2: Manufacturing layer (Steps 5-7)
-  {
-    name: "Processes (print modes + post-processes + bindings)",
-    script: "import-processes.ts",
-  },
-  {
-    name: "Options (option_definitions + option_choices)",
-    script: "import-options.ts",
-  },
-  {
-    name: "Product Options (product_options + special colors)",
-    script: "import-product-opts.ts",
-  },
-  // M2b: Production rules layer (Steps 8-9)
-  {
-    name: "Imposition Rules (가격표_extracted.json → 사이즈별 판걸이수)",
-    script: "import-imposition-rules.ts",
-  },
-  {
-    name: "Paper Mappings (출력소재관리_extracted.json → !출력소재 K-Y columns)",
-    script: "import-paper-mappings.ts",
-  },
-  // M3: Pricing layer (Steps 10-13)
-  {
-    name: "Price Tiers (가격표_extracted.json → 디지털출력비 + 후가공)",
-    script: "import-price-tiers.ts",
-  },
-  {
-    name: "Fixed Prices (가격표_extracted.json → 명함 sheet)",
-    script: "import-fixed-prices.ts",
-  },
-  {
-    name: "Package Prices (가격표_extracted.json → 옵션결합상품 sheet)",
-    script: "import-package-prices.ts",
-  },
-  {
-    name: "Foil Prices (가격표_extracted.json → 후가공_박 sheet)",
-    script: "import-foil-prices.ts",
-  },
-  // M4: Configuration layer (Step 14)
-  {
-    name: "Loss Config (hardcoded defaults: global lossRate=0.05)",
-    script: "import-loss-config.ts",
-  },
-];
+// @MX:NOTE: [AUTO] --incremental skips steps whose script, sources and target rows match the last recorded run
+const isIncremental = args.includes("--incremental");
+const concurrencyArg = args.find((a) => a.startsWith("--concurrency="));
+const CONCURRENCY = Math.max(1, parseInt(concurrencyArg?.split("=")[1] ?? "", 10) || 4);
 
 // ---------------------------------------------------------------------------
 // Runner
@@ -107,37 +37,39 @@ const STEPS: ImportStep[] = [
 
 const LABEL = "[import/index]";
 
-function runStep(step: ImportStep): boolean {
-  const scriptPath = path.resolve(__dirname, step.script);
-  console.log(`\n${LABEL} ── Running: ${step.name}`);
-  console.log(`${LABEL}    Script:  ${step.script}`);
-
-  if (isValidateOnly) {
-    console.log(`${LABEL}    [validate-only] Skipping execution.`);
-    return true;
-  }
+function tracked(step: ImportStep): TrackedStep {
+  return {
+    id: step.id,
+    scriptPath: path.resolve(__dirname, step.script),
+    sources: step.sources,
+    targets: step.targets,
+  };
+}
 
-  if (isDryRun) {
-    console.log(`${LABEL}    [dry-run] Would execute: tsx ${scriptPath}`);
-    return true;
+function createDb() {
+  const connectionString = process.env.DATABASE_URL;
+  if (!connectionString) {
+    throw new Error("DATABASE_URL not set");
   }
+  const client = postgres(connectionString, { max: 2 });
+  return { db: drizzle(client), client };
+}
 
-  const result = spawnSync("tsx", [scriptPath], {
-    stdio: "inherit",
-    env: process.env,
+function printPlan(): void {
+  planWaves(STEPS).forEach((wave, i) => {
+    console.log(`${LABEL} Wave ${i + 1}:`);
+    for (const step of wave) {
+      const after = step.dependsOn.length > 0 ? ` (after ${step.dependsOn.join(", ")})` : "";
+      console.log(`${LABEL}    ${step.name} — ${step.script}${after}`);
+    }
   });
+}
 
-  if (result.error) {
-    console.error(`${LABEL}    ERROR: ${result.error.message}`);
-    return false;
-  }
-
-  if (result.status !== 0) {
-    console.error(`${LABEL}    FAILED with exit code ${result.status}`);
-    return false;
-  }
-
-  return true;
+async function runStep(step: ImportStep): Promise<void> {
+  console.log(`\n${LABEL} ── Running: ${step.name}`);
+  // Steps are plain modules: importing one is side-effect free, main() does the work and throws on failure
+  const mod = (await import(path.resolve(__dirname, step.script))) as ImportStepModule;
+  await mod.main();
 }
 
 // ---------------------------------------------------------------------------
@@ -146,32 +78,89 @@ function runStep(step: ImportStep): boolean {
 
 async function main(): Promise<void> {
   console.log(`${LABEL} HuniPrinting master data import`);
-  console.log(`${LABEL} Steps: ${STEPS.length}`);
-
-  if (isDryRun) console.log(`${LABEL} Mode: dry-run (no DB writes)`);
-  if (isValidateOnly) console.log(`${LABEL} Mode: validate-only (no execution)`);
+  console.log(`${LABEL} Steps: ${STEPS.length}, concurrency: ${CONCURRENCY}`);
+
+  if (isDryRun || isValidateOnly) {
+    console.log(
+      `${LABEL} Mode: ${isDryRun ? "dry-run (no DB writes)" : "validate-only (no execution)"}`
+    );
+    printPlan();
+    return;
+  }
 
-  let failed = 0;
+  if (isIncremental) console.log(`${LABEL} Mode: incremental (unchanged steps are skipped)`);
+
+  const state = isIncremental ? createDb() : null;
+  const currentState = new Map<string, StepState>();
+
+  const results = await runStepGraph(
+    STEPS,
+    async (step, { upstreamChanged }) => {
+      if (state) {
+        const current = {
+          sourceHash: stepSourceHash(tracked(step)),
+          targetChecksum: await tableChecksum(state.db, step.targets),
+        };
+        currentState.set(step.id, current);
+        // A dependency that ran may have re-keyed rows this step points at, so it must run too
+        if (!upstreamChanged && isUnchanged(await lastStepState(state.db, step.id), current)) {
+          console.log(`${LABEL} ── Skipped (unchanged): ${step.name}`);
+          return "skipped";
+        }
+      }
+      await runStep(step);
+      return "ran";
+    },
+    { concurrency: CONCURRENCY },
+  );
 
-  for (const step of STEPS) {
-    const ok = runStep(step);
-    if (!ok) {
-      failed++;
-      console.error(`${LABEL} Step failed: ${step.name}`);
+  if (state) {
+    // Checksums are taken after every step has finished: later steps (and triggers) may touch earlier targets
+    for (const step of STEPS) {
+      const outcome = results.get(step.id)?.outcome;
+      if (outcome !== "ran" && outcome !== "skipped") continue;
+      const next = {
+        sourceHash: stepSourceHash(tracked(step)),
+        targetChecksum: await tableChecksum(state.db, step.targets),
+      };
+      if (outcome === "ran" || !isUnchanged(currentState.get(step.id) ?? null, next)) {
+        await recordStepState(state.db, tracked(step), next);
+      }
     }
+    await state.client.end();
   }
 
-  console.log(`\n${LABEL} ── Summary`);
-  console.log(
-    `${LABEL} ${STEPS.length - failed}/${STEPS.length} steps completed successfully`
-  );
+  printSummary(results);
 
-  if (failed > 0) {
-    console.error(`${LABEL} ${failed} step(s) failed`);
+  const failed = [...results.values()].filter((r) => r.outcome === "failed" || r.outcome === "blocked");
+  if (failed.length > 0) {
     process.exit(1);
   }
 
   console.log(`${LABEL} All imports complete.`);
+  // Step modules may leave idle pool connections behind; the import is done either way
+  process.exit(0);
+}
+
+function printSummary(results: Map<string, StepResult>): void {
+  console.log(`\n${LABEL} ── Summary`);
+  for (const step of STEPS) {
+    const result = results.get(step.id);
+    if (!result) continue;
+    const seconds = (result.durationMs / 1000).toFixed(1);
+    console.log(`${LABEL}    ${result.outcome.padEnd(7)} ${step.name} (${seconds}s)`);
+    if (result.outcome === "failed") {
+      const message = result.error instanceof Error ? result.error.message : String(result.error);
+      console.error(`${LABEL}    Step failed: ${step.name}: ${message}`);
+    }
+  }
+
+  const counts = { ran: 0, skipped: 0, failed: 0, blocked: 0 };
+  for (const r of results.values()) counts[r.outcome]++;
+  console.log(
+    `${LABEL} ${counts.ran + counts.skipped}/${STEPS.length} steps completed successfully ` +
+      `(ran=${counts.ran}, skipped=${counts.skipped}, failed=${counts.failed}, blocked=${counts.blocked})`
+  );
 }
 
 main().catch((err) => {
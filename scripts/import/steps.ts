@@ -0,0 +1,160 @@
+// @MX:ANCHOR: [AUTO] Import step graph — what each db:import step reads, writes and waits for
+// @MX:REASON: fan_in >= 3 — orchestrator scheduling, incremental source/target tracking, orchestrator tests
+// @MX:NOTE: [AUTO] Independent branches (e.g. papers alongside categories → products) run concurrently
+
+import * as path from "path";
+import type { StepNode } from "./helpers/step-graph.js";
+
+const REF_DIR = path.resolve(__dirname, "../../ref/huni");
+const MES_ITEMS_TOON = path.join(REF_DIR, "toon/item-management.toon");
+const PAPER_JSON = path.join(REF_DIR, "extracted/출력소재관리_extracted.json");
+const PRODUCT_MASTER_JSON = path.join(REF_DIR, "extracted/상품마스터_extracted.json");
+const PRICE_TABLE_JSON = path.join(REF_DIR, "extracted/가격표_extracted.json");
+
+export interface ImportStep extends StepNode {
+  name: string;
+  script: string;
+  /** Files the step reads besides its own script */
+  sources: string[];
+  /** Tables the step writes */
+  targets: string[];
+}
+
+// @MX:NOTE: [AUTO] 15 steps with FK dependencies (SPEC-IM-004: +Step 4.5); dependsOn mirrors the tables each script reads
+// @MX:NOTE: [AUTO] M0: Foundation: MES Items, Papers
+// @MX:NOTE: [AUTO] M1: Catalog: Categories → Products
+// @MX:NOTE: [AUTO] M3-NEW: Product-MES Mapping (Step 4.5): product<->MES cross-reference
+// @MX:NOTE: [AUTO] M2: Manufacturing: Processes, Options → Product Options
+// @MX:NOTE: [AUTO] M2b: Production rules: Imposition Rules, Paper Mappings
+// @MX:NOTE: [AUTO] M3: Pricing: Price Tiers, Fixed Prices, Package Prices, Foil Prices
+// @MX:NOTE: [AUTO] M4: Configuration: Loss Config
+// @MX:REASON: FK dependency order: categories → products; products+categories → product-opts; papers+products → paper_product_mapping; products+papers+print_modes → fixed/package prices
+export const STEPS: ImportStep[] = [
+  // M0: Foundation layer
+  {
+    id: "mes-items",
+    name: "MES Items (item-management.toon)",
+    script: "import-mes-items.ts",
+    dependsOn: [],
+    sources: [MES_ITEMS_TOON],
+    targets: ["mes_items"],
+  },
+  {
+    id: "papers",
+    name: "Papers (출력소재관리_extracted.json → !출력소재)",
+    script: "import-papers.ts",
+    dependsOn: [],
+    sources: [PAPER_JSON],
+    targets: ["papers"],
+  },
+  // M1: Catalog layer
+  {
+    id: "categories",
+    name: "Categories (hardcoded 12 roots + ~36 subs)",
+    script: "import-categories.ts",
+    dependsOn: [],
+    sources: [],
+    targets: ["categories"],
+  },
+  {
+    id: "products",
+    name: "Products (상품마스터_extracted.json → 11 sheets)",
+    script: "import-products.ts",
+    dependsOn: ["categories"],
+    sources: [PRODUCT_MASTER_JSON],
+    targets: ["products", "product_sizes"],
+  },
+  // Step 4.5: Product-MES Mapping (SPEC-IM-004 M3)
+  {
+    id: "product-mes-mapping",
+    name: "Product-MES Mapping (상품마스터_extracted.json mesCode cross-reference)",
+    script: "import-product-mes-mapping.ts",
+    dependsOn: ["products", "mes-items"],
+    sources: [PRODUCT_MASTER_JSON],
+    targets: ["product_mes_mapping"],
+  },
+  // M2: Manufacturing layer
+  {
+    id: "processes",
+    name: "Processes (print modes + post-processes + bindings)",
+    script: "import-processes.ts",
+    dependsOn: [],
+    sources: [],
+    targets: ["print_modes", "post_processes", "bindings"],
+  },
+  {
+    id: "options",
+    name: "Options (option_definitions + option_choices)",
+    script: "import-options.ts",
+    dependsOn: [],
+    sources: [],
+    targets: ["option_definitions", "option_choices"],
+  },
+  {
+    id: "product-opts",
+    name: "Product Options (product_options + special colors)",
+    script: "import-product-opts.ts",
+    dependsOn: ["products", "options"],
+    sources: [PRODUCT_MASTER_JSON],
+    targets: ["product_options"],
+  },
+  // M2b: Production rules layer
+  {
+    id: "imposition-rules",
+    name: "Imposition Rules (가격표_extracted.json → 사이즈별 판걸이수)",
+    script: "import-imposition-rules.ts",
+    dependsOn: [],
+    sources: [PRICE_TABLE_JSON],
+    targets: ["imposition_rules"],
+  },
+  {
+    id: "paper-mappings",
+    name: "Paper Mappings (출력소재관리_extracted.json → !출력소재 K-Y columns)",
+    script: "import-paper-mappings.ts",
+    dependsOn: ["papers", "products"],
+    sources: [PAPER_JSON],
+    targets: ["paper_product_mapping"],
+  },
+  // M3: Pricing layer
+  {
+    id: "price-tiers",
+    name: "Price Tiers (가격표_extracted.json → 디지털출력비 + 후가공)",
+    script: "import-price-tiers.ts",
+    dependsOn: [],
+    sources: [PRICE_TABLE_JSON],
+    targets: ["price_tables", "price_tiers"],
+  },
+  {
+    id: "fixed-prices",
+    name: "Fixed Prices (가격표_extracted.json → 명함 sheet)",
+    script: "import-fixed-prices.ts",
+    dependsOn: ["products", "papers", "processes"],
+    sources: [PRICE_TABLE_JSON],
+    targets: ["fixed_prices"],
+  },
+  {
+    id: "package-prices",
+    name: "Package Prices (가격표_extracted.json → 옵션결합상품 sheet)",
+    script: "import-package-prices.ts",
+    dependsOn: ["products", "processes"],
+    sources: [PRICE_TABLE_JSON],
+    targets: ["package_prices"],
+  },
+  {
+    id: "foil-prices",
+    name: "Foil Prices (가격표_extracted.json → 후가공_박 sheet)",
+    script: "import-foil-prices.ts",
+    dependsOn: [],
+    sources: [PRICE_TABLE_JSON],
+    targets: ["foil_prices"],
+  },
+  // M4: Configuration layer
+  {
+    id: "loss-config",
+    name: "Loss Config (hardcoded defaults: global lossRate=0.05)",
+    script: "import-loss-config.ts",
+    dependsOn: [],
+    sources: [],
+    targets: ["loss_quantity_config"],
+  },
+];